@@ -0,0 +1,146 @@
+import logging
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from dataclasses import dataclass, field
+from typing import Callable, Optional
+
+logger = logging.getLogger(__name__)
+
+LARGURA_LINHA_TEMPO = 40
+
+
+@dataclass
+class Etapa:
+    tabela: str
+    funcao: Callable[[], None]
+    dependencias: tuple = ()
+
+
+@dataclass
+class ExecucaoEtapa:
+    tabela: str
+    inicio: float = 0.0
+    fim: float = 0.0
+    thread: str = ""
+    erro: Optional[str] = None
+    ignorada: bool = False
+
+    @property
+    def duracao(self) -> float:
+        return self.fim - self.inicio
+
+
+@dataclass
+class ResultadoAgendamento:
+    execucoes: list = field(default_factory=list)
+    duracao_total: float = 0.0
+
+    @property
+    def duracao_sequencial(self) -> float:
+        return sum(execucao.duracao for execucao in self.execucoes)
+
+
+# ========== FUNÇÕES AUXILIARES ==========
+def validar_etapas(etapas: list) -> None:
+    tabelas = {etapa.tabela for etapa in etapas}
+    for etapa in etapas:
+        desconhecidas = set(etapa.dependencias) - tabelas
+        if desconhecidas:
+            raise ValueError(
+                f"Etapa {etapa.tabela} depende de tabelas sem etapa: {desconhecidas}"
+            )
+
+    # Detecta ciclos removendo, em ondas, as etapas sem dependências pendentes.
+    pendentes = {etapa.tabela: set(etapa.dependencias) for etapa in etapas}
+    while pendentes:
+        prontas = [tabela for tabela, deps in pendentes.items() if not deps]
+        if not prontas:
+            raise ValueError(f"Dependência circular entre: {sorted(pendentes)}")
+        for tabela in prontas:
+            del pendentes[tabela]
+        for deps in pendentes.values():
+            deps.difference_update(prontas)
+
+
+def executar_etapa(etapa: Etapa, execucao: ExecucaoEtapa, referencia: float) -> None:
+    execucao.thread = threading.current_thread().name
+    execucao.inicio = time.perf_counter() - referencia
+    try:
+        etapa.funcao()
+    except Exception as e:
+        execucao.erro = str(e)
+        raise
+    finally:
+        execucao.fim = time.perf_counter() - referencia
+
+
+# ========== AGENDAMENTO ==========
+def executar_etapas(etapas: list, workers: int = 1) -> ResultadoAgendamento:
+    validar_etapas(etapas)
+    resultado = ResultadoAgendamento()
+    execucoes = {etapa.tabela: ExecucaoEtapa(etapa.tabela) for etapa in etapas}
+    concluidas: set = set()
+    falhas: set = set()
+    pendentes = list(etapas)
+    em_execucao: dict[Future, Etapa] = {}
+    referencia = time.perf_counter()
+
+    with ThreadPoolExecutor(
+        max_workers=max(1, workers), thread_name_prefix="carga"
+    ) as executor:
+        while pendentes or em_execucao:
+            for etapa in list(pendentes):
+                if falhas.intersection(etapa.dependencias):
+                    pendentes.remove(etapa)
+                    execucoes[etapa.tabela].ignorada = True
+                    falhas.add(etapa.tabela)
+                    logger.error(
+                        f"Etapa {etapa.tabela} ignorada: dependência com falha."
+                    )
+                elif concluidas.issuperset(etapa.dependencias):
+                    pendentes.remove(etapa)
+                    futuro = executor.submit(
+                        executar_etapa, etapa, execucoes[etapa.tabela], referencia
+                    )
+                    em_execucao[futuro] = etapa
+
+            if not em_execucao:
+                continue
+
+            finalizados, _ = wait(em_execucao, return_when=FIRST_COMPLETED)
+            for futuro in finalizados:
+                etapa = em_execucao.pop(futuro)
+                if futuro.exception() is not None:
+                    falhas.add(etapa.tabela)
+                    logger.error(f"Erro na etapa {etapa.tabela}: {futuro.exception()}")
+                else:
+                    concluidas.add(etapa.tabela)
+
+    resultado.duracao_total = time.perf_counter() - referencia
+    resultado.execucoes = [execucoes[etapa.tabela] for etapa in etapas]
+    return resultado
+
+
+def registrar_linha_tempo(resultado: ResultadoAgendamento) -> None:
+    escala = LARGURA_LINHA_TEMPO / max(resultado.duracao_total, 1e-9)
+    linhas = []
+    for execucao in sorted(resultado.execucoes, key=lambda e: (e.ignorada, e.inicio)):
+        if execucao.ignorada:
+            linhas.append(f"{execucao.tabela:<28} ignorada")
+            continue
+        deslocamento = int(execucao.inicio * escala)
+        barra = max(1, int(execucao.duracao * escala))
+        linhas.append(
+            f"{execucao.tabela:<28} {execucao.inicio:8.2f}s {execucao.duracao:8.2f}s "
+            f"{execucao.thread:<10} |{' ' * deslocamento}{'#' * barra}"
+        )
+
+    economia = resultado.duracao_sequencial - resultado.duracao_total
+    logger.info(
+        "Linha do tempo da carga (tabela, início, duração, thread):\n"
+        + "\n".join(linhas)
+        + f"\nTempo total: {resultado.duracao_total:.2f}s | "
+        f"soma das etapas: {resultado.duracao_sequencial:.2f}s | "
+        f"economia com paralelismo: {economia:.2f}s"
+    )
@@ -0,0 +1,278 @@
+import logging
+import time
+import unicodedata
+from dataclasses import dataclass
+from datetime import date, timedelta
+from decimal import ROUND_HALF_UP, Decimal
+from typing import Optional
+
+import numpy as np
+import pandas as pd
+from sqlalchemy.engine import Engine
+
+logger = logging.getLogger(__name__)
+
+# Os dois relatórios das procedures calculados em memória, sobre um retrato
+# colunar das tabelas lido uma única vez. Consultas repetidas (outros períodos,
+# categorias ou páginas) não voltam ao banco. O retrato é organizado para que
+# cada consulta seja uma busca binária por período e uma agregação vetorizada
+# sobre a fatia encontrada:
+# - pedidos ordenados por data, com somas acumuladas de valor e quantidade:
+#   os totais de qualquer período saem de duas posições das somas;
+# - itens ordenados por (categoria, data do pedido): os itens de uma categoria
+#   no período formam uma fatia contígua, somada por produto com bincount;
+# - pedidos de cada situação ordenados por (data, id), percorridos do fim.
+#
+# Valores monetários ficam em centavos (int64) e voltam como Decimal, com os
+# mesmos arredondamentos do MySQL, para o JSON ter o mesmo formato e valores das
+# procedures. As datas têm resolução de dia, como dt_pedido.
+SQL_PEDIDOS = """
+SELECT id_pedido, id_cliente, co_pedido_situacao, dt_pedido,
+       ROUND(vl_pedido_total * 100) AS vl_centavos
+FROM tb_pedido
+"""
+SQL_ITENS = "SELECT id_pedido, id_produto, qt_item FROM tb_pedido_item"
+SQL_PRODUTOS = "SELECT id_produto, no_produto, id_produto_categoria FROM tb_produto"
+SQL_CATEGORIAS = (
+    "SELECT id_produto_categoria, no_produto_categoria FROM tb_produto_categoria"
+)
+SQL_CLIENTES = "SELECT id_cliente, no_cliente FROM tb_cliente"
+SQL_SITUACOES = "SELECT co_pedido_situacao, no_pedido_situacao FROM tb_pedido_situacao"
+
+# A divisão de DECIMAL no MySQL acrescenta div_precision_increment (padrão 4)
+# casas à escala do dividendo: SUM(vl_pedido_total) / n tem 2 + 4 casas antes
+# do ROUND(..., 2) da procedure.
+CASAS_DIVISAO_MYSQL = 6
+
+
+# ========== FUNÇÕES AUXILIARES ==========
+def centavos_para_decimal(centavos: int) -> Decimal:
+    return Decimal(int(centavos)).scaleb(-2)
+
+
+def media_centavos(total_centavos: int, quantidade: int) -> Decimal:
+    if quantidade == 0:
+        return Decimal("0.00")
+    quociente = (Decimal(int(total_centavos)) / (100 * quantidade)).quantize(
+        Decimal(1).scaleb(-CASAS_DIVISAO_MYSQL), ROUND_HALF_UP
+    )
+    return quociente.quantize(Decimal("0.01"), ROUND_HALF_UP)
+
+
+def chave_nome(nome: str) -> str:
+    # Nomes comparados como na collation utf8mb4_unicode_ci das procedures:
+    # sem diferenciar maiúsculas, acentos e espaços ao final.
+    texto = unicodedata.normalize("NFKD", str(nome))
+    return (
+        "".join(c for c in texto if not unicodedata.combining(c)).casefold().rstrip(" ")
+    )
+
+
+def dia(valor) -> np.datetime64:
+    return np.datetime64(valor, "D")
+
+
+def indice_de(ids_ordenados: np.ndarray, ids: np.ndarray) -> np.ndarray:
+    # Posição de cada id no array ordenado (ids inexistentes ficam com -1).
+    posicao = np.searchsorted(ids_ordenados, ids)
+    posicao = np.minimum(posicao, max(len(ids_ordenados) - 1, 0))
+    encontrado = len(ids_ordenados) > 0
+    if encontrado:
+        encontrado = ids_ordenados[posicao] == ids
+    return np.where(encontrado, posicao, -1)
+
+
+@dataclass
+class PedidosSituacao:
+    # Pedidos de uma situação, ordenados por (dt_pedido, id_pedido).
+    dt_pedido: np.ndarray
+    id_pedido: np.ndarray
+    indice_cliente: np.ndarray  # posição em AnaliseRelatorio.ids_cliente
+    vl_centavos: np.ndarray
+
+
+# ========== RETRATO ==========
+class AnaliseRelatorio:
+    def __init__(
+        self,
+        pedidos: pd.DataFrame,
+        itens: pd.DataFrame,
+        produtos: pd.DataFrame,
+        categorias: pd.DataFrame,
+        clientes: pd.DataFrame,
+        situacoes: pd.DataFrame,
+    ):
+        # Pedidos por data, com somas acumuladas (posição 0 = período vazio).
+        # Pedidos sem valor total contam em qt_total_pedido, mas não na média.
+        pedidos = pedidos.sort_values(["dt_pedido", "id_pedido"], kind="stable")
+        dt_pedido = pedidos["dt_pedido"].to_numpy(dtype="datetime64[D]")
+        vl_centavos = pedidos["vl_centavos"].to_numpy(dtype=float)
+        com_valor = ~np.isnan(vl_centavos)
+        vl_centavos = np.where(com_valor, vl_centavos, 0).astype(np.int64)
+        self.dt_pedido = dt_pedido
+        self.soma_valor = np.concatenate([[0], np.cumsum(vl_centavos)])
+        self.soma_com_valor = np.concatenate([[0], np.cumsum(com_valor)])
+
+        # Itens por (categoria, data do pedido). Itens de pedidos ou produtos
+        # inexistentes (sem o INNER JOIN da procedure) ficam de fora.
+        ids_pedido = pedidos["id_pedido"].to_numpy(dtype=np.int64)
+        ordem_ids = np.argsort(ids_pedido, kind="stable")
+        ids_pedido_ordenados = ids_pedido[ordem_ids]
+        posicao_pedido = indice_de(
+            ids_pedido_ordenados, itens["id_pedido"].to_numpy(dtype=np.int64)
+        )
+        produtos = produtos.sort_values("id_produto")
+        self.ids_produto = produtos["id_produto"].to_numpy(dtype=np.int64)
+        self.no_produto = produtos["no_produto"].to_numpy(dtype=object)
+        categoria_produto = produtos["id_produto_categoria"].to_numpy(dtype=np.int64)
+        indice_produto = indice_de(
+            self.ids_produto, itens["id_produto"].to_numpy(dtype=np.int64)
+        )
+        valido = (posicao_pedido >= 0) & (indice_produto >= 0)
+        indice_produto = indice_produto[valido]
+        item_dt = dt_pedido[ordem_ids[posicao_pedido[valido]]]
+        item_categoria = categoria_produto[indice_produto]
+        ordem = np.lexsort((item_dt, item_categoria))
+        self.item_categoria = item_categoria[ordem]
+        self.item_dt = item_dt[ordem]
+        self.item_produto = indice_produto[ordem]
+        self.item_qt = itens["qt_item"].to_numpy(dtype=np.int64)[valido][ordem]
+
+        self.categorias = {
+            chave_nome(nome): id_categoria
+            for nome, id_categoria in zip(
+                categorias["no_produto_categoria"], categorias["id_produto_categoria"]
+            )
+        }
+
+        # Pedidos por situação, para o relatório de pedidos por cliente.
+        clientes = clientes.sort_values("id_cliente")
+        self.ids_cliente = clientes["id_cliente"].to_numpy(dtype=np.int64)
+        self.no_cliente = clientes["no_cliente"].to_numpy(dtype=object)
+        codigos = pedidos["co_pedido_situacao"].to_numpy(dtype=np.int64)
+        indice_cliente = indice_de(
+            self.ids_cliente, pedidos["id_cliente"].to_numpy(dtype=np.int64)
+        )
+        self.situacoes: dict[str, PedidosSituacao] = {}
+        for codigo, nome in zip(
+            situacoes["co_pedido_situacao"], situacoes["no_pedido_situacao"]
+        ):
+            selecao = (codigos == codigo) & com_valor & (indice_cliente >= 0)
+            self.situacoes[chave_nome(nome)] = PedidosSituacao(
+                dt_pedido[selecao],
+                ids_pedido[selecao],
+                indice_cliente[selecao],
+                vl_centavos[selecao],
+            )
+
+    @classmethod
+    def carregar(cls, engine: Engine) -> "AnaliseRelatorio":
+        inicio = time.perf_counter()
+        with engine.connect() as conn:
+            tabelas = [
+                pd.read_sql(sql, conn)
+                for sql in (
+                    SQL_PEDIDOS,
+                    SQL_ITENS,
+                    SQL_PRODUTOS,
+                    SQL_CATEGORIAS,
+                    SQL_CLIENTES,
+                    SQL_SITUACOES,
+                )
+            ]
+        analise = cls(*tabelas)
+        logger.info(
+            f"Retrato para relatórios carregado em {time.perf_counter() - inicio:.2f}s: "
+            f"{len(analise.dt_pedido)} pedidos e {len(analise.item_qt)} itens."
+        )
+        return analise
+
+    # ========== RELATÓRIOS ==========
+    def relatorio_venda_periodo(self, data_inicio, data_fim, categoria: str) -> dict:
+        # Mesmo JSON de prc_relatorio_venda_periodo, com datas inclusivas.
+        inicio, fim = dia(data_inicio), dia(data_fim)
+        a = np.searchsorted(self.dt_pedido, inicio, side="left")
+        b = np.searchsorted(self.dt_pedido, fim, side="right")
+        total_centavos = int(self.soma_valor[b] - self.soma_valor[a])
+        qt_com_valor = int(self.soma_com_valor[b] - self.soma_com_valor[a])
+
+        produtos = []
+        id_categoria = self.categorias.get(chave_nome(categoria))
+        if id_categoria is not None:
+            c = np.searchsorted(self.item_categoria, id_categoria, side="left")
+            d = np.searchsorted(self.item_categoria, id_categoria, side="right")
+            datas = self.item_dt[c:d]
+            e = c + np.searchsorted(datas, inicio, side="left")
+            f = c + np.searchsorted(datas, fim, side="right")
+            quantidades = np.bincount(
+                self.item_produto[e:f],
+                weights=self.item_qt[e:f],
+                minlength=len(self.ids_produto),
+            )
+            vendidos = np.unique(self.item_produto[e:f])
+            # A procedure agrupa por no_produto (único em tb_produto).
+            produtos = sorted(
+                (self.no_produto[p], int(quantidades[p])) for p in vendidos
+            )
+
+        return {
+            "qt_total_pedido": int(b - a),
+            "vl_total_pedido": centavos_para_decimal(total_centavos),
+            "vl_media_pedido": media_centavos(total_centavos, qt_com_valor),
+            "dc_produto": [
+                {"no_produto": nome, "qt_item_vendido": qt} for nome, qt in produtos
+            ],
+        }
+
+    def relatorio_pedido_cliente_valor_minimo(
+        self,
+        data_inicio=None,
+        data_fim=None,
+        situacao_pedido: Optional[str] = None,
+        valor_minimo=None,
+        limite: Optional[int] = None,
+        pagina: Optional[int] = None,
+    ) -> dict:
+        # Mesmo JSON e mesmos padrões de prc_relatorio_pedido_cliente_valor_minino.
+        # Pedidos da mesma data saem do maior id para o menor (a procedure
+        # ordena só por dt_pedido e não define a ordem dos empates).
+        hoje = date.today()
+        data_inicio = data_inicio or hoje - timedelta(days=365)
+        data_fim = data_fim or hoje
+        situacao_pedido = situacao_pedido or "Concluido"
+        minimo = Decimal(str(1000 if valor_minimo is None else valor_minimo))
+        minimo = minimo.quantize(Decimal(1), ROUND_HALF_UP)  # DECIMAL(15,0)
+        limite = 50 if limite is None else limite
+        pagina = 1 if pagina is None else pagina
+
+        inicio, fim = dia(data_inicio), dia(data_fim)
+        resultado = []
+        pedidos = self.situacoes.get(chave_nome(situacao_pedido))
+        if pedidos is not None:
+            a = np.searchsorted(pedidos.dt_pedido, inicio, side="left")
+            b = np.searchsorted(pedidos.dt_pedido, fim, side="right")
+            selecao = a + np.flatnonzero(pedidos.vl_centavos[a:b] > int(minimo) * 100)
+            selecao = selecao[::-1][(pagina - 1) * limite : pagina * limite]
+            nomes = self.no_cliente[pedidos.indice_cliente[selecao]]
+            resultado = [
+                {
+                    "no_cliente": nome,
+                    "id_pedido": int(id_pedido),
+                    "vl_pedido_total": centavos_para_decimal(vl),
+                    "dt_pedido": str(dt_pedido),
+                }
+                for nome, id_pedido, vl, dt_pedido in zip(
+                    nomes,
+                    pedidos.id_pedido[selecao],
+                    pedidos.vl_centavos[selecao],
+                    pedidos.dt_pedido[selecao],
+                )
+            ]
+
+        return {
+            "dt_inicio_relatorio": f"{inicio} 00:00:00",
+            "dt_fim_relatorio": f"{fim} 23:59:59",
+            "nu_pagina": pagina,
+            "qt_registro": len(resultado),
+            "dc_resultado": resultado,
+        }
@@ -0,0 +1,67 @@
+import argparse
+import time
+
+import numpy as np
+import pandas as pd
+from sqlalchemy import text
+
+from boa_compra_carga import ID_USUARIO_PADRAO
+from conexao import obter_engine
+from escrita_bulk import METODOS_CARGA, TAMANHO_LOTE_PADRAO, inserir_em_massa
+from gerador_pedido import fatiar_ids, gerar_lotes_itens_pedido
+
+# Mede a vazão de cada método de carga gravando itens de pedido sintéticos em
+# uma cópia de tb_pedido_item (mesmos índices, sem chaves estrangeiras). Uso:
+#   python benchmark_carga.py --itens 500000 --metodos to_sql multi load_data
+TABELA_BENCHMARK = "tb_pedido_item_benchmark"
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--itens", type=int, default=500000)
+    parser.add_argument("--tamanho-lote", type=int, default=TAMANHO_LOTE_PADRAO)
+    parser.add_argument(
+        "--metodos", nargs="+", choices=METODOS_CARGA, default=list(METODOS_CARGA)
+    )
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(0)
+    qt_pedidos = max(1, args.itens // 10)
+    df = pd.concat(
+        gerar_lotes_itens_pedido(
+            fatiar_ids(np.arange(1, qt_pedidos + 1, dtype=np.int64), 50000),
+            np.arange(1, 1001, dtype=np.int64),
+            rng.integers(1, 11, size=1000),
+            rng.integers(1000, 100001, size=1000),
+            19,
+            rng,
+            ID_USUARIO_PADRAO,
+        ),
+        ignore_index=True,
+    )
+
+    with obter_engine().begin() as conn:
+        conn.execute(text(f"DROP TABLE IF EXISTS {TABELA_BENCHMARK}"))
+        conn.execute(text(f"CREATE TABLE {TABELA_BENCHMARK} LIKE tb_pedido_item"))
+
+    try:
+        for metodo in args.metodos:
+            with obter_engine().begin() as conn:
+                conn.execute(text(f"TRUNCATE TABLE {TABELA_BENCHMARK}"))
+
+            inicio = time.perf_counter()
+            inserir_em_massa(
+                obter_engine(), df, TABELA_BENCHMARK, metodo, args.tamanho_lote
+            )
+            duracao = time.perf_counter() - inicio
+            print(
+                f"{metodo:<10} {len(df):>10} registros em {duracao:8.2f}s "
+                f"({len(df) / duracao:>10.0f} registros/s)"
+            )
+    finally:
+        with obter_engine().begin() as conn:
+            conn.execute(text(f"DROP TABLE IF EXISTS {TABELA_BENCHMARK}"))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,637 @@
+import argparse
+import json
+import logging
+import threading
+import time
+from collections import Counter
+from dataclasses import dataclass, field
+from datetime import date, datetime, timedelta
+from pathlib import Path
+from typing import Iterator, Optional
+
+import numpy as np
+from sqlalchemy import bindparam, text
+from sqlalchemy.engine import Engine
+
+import boa_compra_carga as carga
+from benchmark_relatorio import percentis
+from conexao import configurar_engine, obter_engine
+from escrita_bulk import linhas_para_driver
+from gerador_pedido import (
+    DIAS_PERIODO_PEDIDO,
+    datar_itens,
+    gerar_itens_pedido,
+    gerar_pedidos,
+    inicio_pedidos,
+    itens_para_dataframe,
+    totalizar_pedidos,
+)
+from sementes import GeradorSementes
+
+logger = logging.getLogger(__name__)
+
+# Carga mista OLTP + relatórios: N escritores criam pedidos com itens, um pedido
+# por transação e com as mesmas regras de valor da carga (gerador_pedido.py),
+# enquanto M leitores chamam as duas procedures de relatório. Cada fase (um
+# valor de --escritores) mede vazão, percentis de latência, deadlocks e espera
+# por bloqueio, lidos do performance_schema no início e no fim da fase. Uma
+# amostragem de data_lock_waits mostra em quais índices as transações esperam
+# (ex.: uk_pediitem_01 e os índices das chaves estrangeiras). Os pedidos
+# criados são removidos ao fim de cada fase, salvo com --manter-pedidos. Uso:
+#   docker compose run --rm boacompra-carga python benchmark_carga_mista.py \
+#       --escritores 1 4 16 --leitores 4 --duracao 60
+# O usuário do banco precisa de SELECT em performance_schema (ver
+# docker/scripts/init/mysql.sql).
+ERRO_DEADLOCK = 1213
+ERRO_ESPERA_BLOQUEIO = 1205
+TENTATIVAS_TRANSACAO = 3
+PEDIDOS_POR_GERACAO = 200
+INTERVALO_AMOSTRAGEM_SEGUNDOS = 0.1
+PICOSSEGUNDOS_POR_MS = 10**9
+MAXIMO_CONSULTAS_RELATORIO = 10
+PERIODOS_DIAS = (30, 90, 365)
+VALORES_MINIMOS = (100, 1000, 10000)
+PAGINAS = (1, 2, 5)
+LIMITE_PAGINA = 20
+TABELAS_INDICES = (
+    "tb_pedido",
+    "tb_pedido_item",
+    "tb_venda_dia",
+    "tb_venda_produto_dia",
+)
+
+# id_pedido vem do AUTO_INCREMENT, como em uma aplicação.
+COLUNAS_PEDIDO = (
+    "id_cliente",
+    "co_pedido_situacao",
+    "dt_pedido",
+    "vl_pedido_total",
+    "tx_observacao",
+    "id_usuario_criacao",
+    "id_usuario_atualizacao",
+)
+SQL_PEDIDO = (
+    f"INSERT INTO tb_pedido ({', '.join(COLUNAS_PEDIDO)}) "
+    f"VALUES ({', '.join(['%s'] * len(COLUNAS_PEDIDO))})"
+)
+COLUNAS_ITEM = (
+    "id_pedido",
+    "id_produto",
+    "dt_pedido",
+    "id_produto_categoria",
+    "qt_item",
+    "vl_unitario",
+    "vl_desconto",
+    "vl_item_total",
+    "id_usuario_criacao",
+    "id_usuario_atualizacao",
+)
+SQL_ITEM = (
+    f"INSERT INTO tb_pedido_item ({', '.join(COLUNAS_ITEM)}) "
+    f"VALUES ({', '.join(['%s'] * len(COLUNAS_ITEM))})"
+)
+
+SQL_STATUS = """
+SELECT VARIABLE_NAME, VARIABLE_VALUE
+FROM performance_schema.global_status
+WHERE VARIABLE_NAME IN ('Innodb_row_lock_waits', 'Innodb_row_lock_time',
+                        'Innodb_row_lock_time_max', 'Com_commit', 'Com_rollback')
+"""
+SQL_ERROS = """
+SELECT ERROR_NAME, SUM_ERROR_RAISED
+FROM performance_schema.events_errors_summary_global_by_error
+WHERE ERROR_NAME IN ('ER_LOCK_DEADLOCK', 'ER_LOCK_WAIT_TIMEOUT')
+"""
+SQL_DIGESTS = """
+SELECT DIGEST, LEFT(DIGEST_TEXT, 200), COUNT_STAR, SUM_TIMER_WAIT, SUM_LOCK_TIME, SUM_ERRORS
+FROM performance_schema.events_statements_summary_by_digest
+WHERE SCHEMA_NAME = DATABASE()
+"""
+SQL_INDICES = """
+SELECT OBJECT_NAME, IFNULL(INDEX_NAME, '(sem índice)'), COUNT_STAR, SUM_TIMER_WAIT
+FROM performance_schema.table_io_waits_summary_by_index_usage
+WHERE OBJECT_SCHEMA = DATABASE()
+  AND OBJECT_NAME IN :tabelas
+"""
+# Cada linha é um bloqueio pedido e ainda não concedido, com o índice em disputa.
+SQL_ESPERAS = """
+SELECT pedido.OBJECT_NAME, IFNULL(pedido.INDEX_NAME, '(tabela)'), pedido.LOCK_MODE
+FROM performance_schema.data_lock_waits espera
+    INNER JOIN performance_schema.data_locks pedido
+        ON espera.REQUESTING_ENGINE_LOCK_ID = pedido.ENGINE_LOCK_ID
+"""
+
+
+# ========== FUNÇÕES AUXILIARES ==========
+@dataclass
+class Contexto:
+    ids_cliente: np.ndarray
+    ids_produto: np.ndarray
+    categorias_produto: np.ndarray
+    precos_centavos: np.ndarray
+    codigos_situacao: np.ndarray
+    nomes_situacao: list
+    nomes_categoria: list
+    textos_observacao: list
+    max_itens: int
+    data_referencia: date
+
+
+@dataclass
+class ResultadoThread:
+    latencias: dict = field(default_factory=dict)
+    deadlocks: int = 0
+    esperas_expiradas: int = 0
+    erros: Counter = field(default_factory=Counter)
+    pedidos_criados: list = field(default_factory=list)
+
+    def medir(self, operacao: str, duracao: float) -> None:
+        self.latencias.setdefault(operacao, []).append(duracao)
+
+
+def codigo_erro(erro: Exception) -> Optional[int]:
+    return getattr(erro, "errno", None)
+
+
+def resumir_latencias(latencias: list) -> Optional[dict]:
+    return percentis(latencias) if latencias else None
+
+
+def carregar_contexto(engine: Engine, max_itens: int, semente: int, data_referencia):
+    produtos = carga.carregar_produtos()
+    with engine.connect() as conn:
+        situacoes = conn.execute(
+            text(
+                "SELECT co_pedido_situacao, no_pedido_situacao FROM tb_pedido_situacao "
+                "ORDER BY co_pedido_situacao"
+            )
+        ).all()
+        categorias = (
+            conn.execute(text("SELECT no_produto_categoria FROM tb_produto_categoria"))
+            .scalars()
+            .all()
+        )
+    fake = GeradorSementes(semente).faker("carga_mista.observacao", 0)
+    return Contexto(
+        ids_cliente=carga.carregar_ids("tb_cliente", "id_cliente")["id"],
+        ids_produto=produtos["id"],
+        categorias_produto=produtos["id_produto_categoria"],
+        precos_centavos=produtos["vl_centavos"],
+        codigos_situacao=np.array([s[0] for s in situacoes], dtype=np.int64),
+        nomes_situacao=[s[1] for s in situacoes],
+        nomes_categoria=list(categorias),
+        textos_observacao=[fake.text(100) for _ in range(100)],
+        max_itens=max_itens,
+        data_referencia=data_referencia,
+    )
+
+
+def pedidos_sinteticos(contexto: Contexto, rng: np.random.Generator) -> Iterator:
+    # Gera os pedidos em blocos vetorizados e os entrega um a um, como tuplas
+    # prontas para o conector: (pedido, [itens sem id_pedido]).
+    ids_provisorios = np.arange(1, PEDIDOS_POR_GERACAO + 1, dtype=np.int64)
+    while True:
+        itens = gerar_itens_pedido(
+            ids_provisorios,
+            contexto.ids_produto,
+            contexto.categorias_produto,
+            contexto.precos_centavos,
+            contexto.max_itens,
+            rng,
+        )
+        df_pedidos = gerar_pedidos(
+            ids_provisorios,
+            contexto.ids_cliente,
+            contexto.codigos_situacao,
+            contexto.textos_observacao,
+            rng,
+            carga.ID_USUARIO_PADRAO,
+            totalizar_pedidos(itens),
+            contexto.data_referencia,
+        )
+        datar_itens(itens, df_pedidos["dt_pedido"].to_numpy(dtype="datetime64[D]"))
+        df_itens = itens_para_dataframe(itens, carga.ID_USUARIO_PADRAO)
+        pedidos = linhas_para_driver(df_pedidos[list(COLUNAS_PEDIDO)])
+        linhas_itens = linhas_para_driver(df_itens[list(COLUNAS_ITEM[1:])])
+        limites = np.r_[inicio_pedidos(itens["id_pedido"]), len(linhas_itens)]
+        for posicao, pedido in enumerate(pedidos):
+            yield pedido, linhas_itens[limites[posicao] : limites[posicao + 1]]
+
+
+# ========== THREADS ==========
+def escrever(
+    engine: Engine,
+    contexto: Contexto,
+    rng: np.random.Generator,
+    parar: threading.Event,
+    resultado: ResultadoThread,
+) -> None:
+    raw_conn = engine.raw_connection()
+    cursor = raw_conn.cursor()
+    try:
+        for pedido, itens in pedidos_sinteticos(contexto, rng):
+            if parar.is_set():
+                return
+            inicio = time.perf_counter()
+            for tentativa in range(1, TENTATIVAS_TRANSACAO + 1):
+                try:
+                    cursor.execute(SQL_PEDIDO, pedido)
+                    id_pedido = cursor.lastrowid
+                    cursor.executemany(SQL_ITEM, [(id_pedido, *item) for item in itens])
+                    raw_conn.commit()
+                    resultado.pedidos_criados.append(id_pedido)
+                    resultado.medir("pedido", time.perf_counter() - inicio)
+                    break
+                except Exception as e:
+                    raw_conn.rollback()
+                    codigo = codigo_erro(e)
+                    if codigo == ERRO_DEADLOCK:
+                        resultado.deadlocks += 1
+                    elif codigo == ERRO_ESPERA_BLOQUEIO:
+                        resultado.esperas_expiradas += 1
+                    else:
+                        resultado.erros[str(codigo or type(e).__name__)] += 1
+                        break
+                    if tentativa == TENTATIVAS_TRANSACAO:
+                        resultado.erros["tentativas_esgotadas"] += 1
+    finally:
+        cursor.close()
+        raw_conn.close()
+
+
+def ler_relatorios(
+    engine: Engine,
+    contexto: Contexto,
+    rng: np.random.Generator,
+    parar: threading.Event,
+    resultado: ResultadoThread,
+) -> None:
+    raw_conn = engine.raw_connection()
+    cursor = raw_conn.cursor()
+    fim = contexto.data_referencia
+    try:
+        while not parar.is_set():
+            inicio_periodo = fim - timedelta(days=int(rng.choice(PERIODOS_DIAS)))
+            if rng.random() < 0.5:
+                procedure = "prc_relatorio_venda_periodo"
+                parametros = [
+                    inicio_periodo.isoformat(),
+                    fim.isoformat(),
+                    str(rng.choice(contexto.nomes_categoria)),
+                    None,
+                ]
+            else:
+                procedure = "prc_relatorio_pedido_cliente_valor_minino"
+                parametros = [
+                    inicio_periodo.isoformat(),
+                    fim.isoformat(),
+                    str(rng.choice(contexto.nomes_situacao)),
+                    int(rng.choice(VALORES_MINIMOS)),
+                    LIMITE_PAGINA,
+                    int(rng.choice(PAGINAS)),
+                    None,
+                ]
+            inicio = time.perf_counter()
+            try:
+                cursor.callproc(procedure, parametros)
+                # Sem transação aberta entre chamadas: cada leitura vê o
+                # estado mais recente, como um cliente de relatório real.
+                raw_conn.commit()
+                resultado.medir(procedure, time.perf_counter() - inicio)
+            except Exception as e:
+                raw_conn.rollback()
+                resultado.erros[str(codigo_erro(e) or type(e).__name__)] += 1
+    finally:
+        cursor.close()
+        raw_conn.close()
+
+
+def amostrar_esperas(
+    engine: Engine, parar: threading.Event, amostras: Counter, falhas: list
+) -> None:
+    # data_lock_waits só mostra as esperas do instante: a amostragem periódica
+    # aproxima em quais índices o tempo de espera se concentra.
+    with engine.connect() as conn:
+        while not parar.wait(INTERVALO_AMOSTRAGEM_SEGUNDOS):
+            try:
+                for tabela, indice, modo in conn.execute(text(SQL_ESPERAS)):
+                    amostras[f"{tabela}.{indice} {modo}"] += 1
+                conn.commit()
+            except Exception as e:
+                falhas.append(str(e))
+                return
+
+
+# ========== PERFORMANCE_SCHEMA ==========
+def ler_performance_schema(engine: Engine) -> Optional[dict]:
+    try:
+        with engine.connect() as conn:
+            status = {
+                nome: int(valor) for nome, valor in conn.execute(text(SQL_STATUS))
+            }
+            erros = {nome: int(valor) for nome, valor in conn.execute(text(SQL_ERROS))}
+            digests = {
+                linha[0]: {
+                    "sql": linha[1],
+                    "execucoes": int(linha[2]),
+                    "tempo_ps": int(linha[3]),
+                    "bloqueio_ps": int(linha[4]),
+                    "erros": int(linha[5]),
+                }
+                for linha in conn.execute(text(SQL_DIGESTS))
+            }
+            indices = {
+                f"{tabela}.{indice}": {"operacoes": int(qtd), "tempo_ps": int(tempo)}
+                for tabela, indice, qtd, tempo in conn.execute(
+                    text(SQL_INDICES).bindparams(bindparam("tabelas", expanding=True)),
+                    {"tabelas": list(TABELAS_INDICES)},
+                )
+            }
+    except Exception as e:
+        logger.warning(f"performance_schema indisponível: {e}")
+        return None
+    return {"status": status, "erros": erros, "digests": digests, "indices": indices}
+
+
+def diferenca_performance_schema(antes: Optional[dict], depois: Optional[dict]):
+    if antes is None or depois is None:
+        return None
+    status = {
+        nome: depois["status"].get(nome, 0) - antes["status"].get(nome, 0)
+        for nome in depois["status"]
+    }
+    # O máximo não é acumulado: vale o do servidor desde o início.
+    status["Innodb_row_lock_time_max"] = depois["status"].get(
+        "Innodb_row_lock_time_max", 0
+    )
+
+    consultas = []
+    for digest, atual in depois["digests"].items():
+        anterior = antes["digests"].get(digest, {})
+        execucoes = atual["execucoes"] - anterior.get("execucoes", 0)
+        if execucoes <= 0:
+            continue
+        consultas.append(
+            {
+                "sql": atual["sql"],
+                "execucoes": execucoes,
+                "tempo_ms": (atual["tempo_ps"] - anterior.get("tempo_ps", 0))
+                / PICOSSEGUNDOS_POR_MS,
+                "espera_bloqueio_ms": (
+                    atual["bloqueio_ps"] - anterior.get("bloqueio_ps", 0)
+                )
+                / PICOSSEGUNDOS_POR_MS,
+                "erros": atual["erros"] - anterior.get("erros", 0),
+            }
+        )
+    consultas.sort(key=lambda c: c["espera_bloqueio_ms"], reverse=True)
+
+    indices = {}
+    for chave, atual in depois["indices"].items():
+        anterior = antes["indices"].get(chave, {})
+        operacoes = atual["operacoes"] - anterior.get("operacoes", 0)
+        if operacoes > 0:
+            indices[chave] = {
+                "operacoes": operacoes,
+                "tempo_ms": (atual["tempo_ps"] - anterior.get("tempo_ps", 0))
+                / PICOSSEGUNDOS_POR_MS,
+            }
+
+    return {
+        "deadlocks": depois["erros"].get("ER_LOCK_DEADLOCK", 0)
+        - antes["erros"].get("ER_LOCK_DEADLOCK", 0),
+        "esperas_expiradas": depois["erros"].get("ER_LOCK_WAIT_TIMEOUT", 0)
+        - antes["erros"].get("ER_LOCK_WAIT_TIMEOUT", 0),
+        "esperas_bloqueio_linha": status.get("Innodb_row_lock_waits", 0),
+        "tempo_espera_bloqueio_linha_ms": status.get("Innodb_row_lock_time", 0),
+        "maior_espera_bloqueio_linha_ms": status["Innodb_row_lock_time_max"],
+        "commits": status.get("Com_commit", 0),
+        "rollbacks": status.get("Com_rollback", 0),
+        "consultas": consultas[:MAXIMO_CONSULTAS_RELATORIO],
+        "indices": indices,
+    }
+
+
+# ========== FASES ==========
+def remover_pedidos_criados(engine: Engine, ids_pedido: list) -> None:
+    # Com os triggers ativos, a remoção também desfaz os consolidados de venda.
+    for inicio in range(0, len(ids_pedido), 1000):
+        lote = ids_pedido[inicio : inicio + 1000]
+        with engine.begin() as conn:
+            for tabela in ("tb_pedido_item", "tb_pedido"):
+                conn.execute(
+                    text(f"DELETE FROM {tabela} WHERE id_pedido IN :ids").bindparams(
+                        bindparam("ids", expanding=True)
+                    ),
+                    {"ids": lote},
+                )
+
+
+def executar_fase(
+    engine: Engine,
+    contexto: Contexto,
+    escritores: int,
+    leitores: int,
+    duracao: float,
+    sementes: GeradorSementes,
+) -> tuple:
+    parar = threading.Event()
+    resultados_escrita = [ResultadoThread() for _ in range(escritores)]
+    resultados_leitura = [ResultadoThread() for _ in range(leitores)]
+    amostras_espera, falhas_amostragem = Counter(), []
+
+    threads = [
+        threading.Thread(
+            target=escrever,
+            args=(
+                engine,
+                contexto,
+                sementes.numpy(f"carga_mista.escritor.{escritores}", numero),
+                parar,
+                resultado,
+            ),
+        )
+        for numero, resultado in enumerate(resultados_escrita)
+    ] + [
+        threading.Thread(
+            target=ler_relatorios,
+            args=(
+                engine,
+                contexto,
+                sementes.numpy(f"carga_mista.leitor.{escritores}", numero),
+                parar,
+                resultado,
+            ),
+        )
+        for numero, resultado in enumerate(resultados_leitura)
+    ]
+    threads.append(
+        threading.Thread(
+            target=amostrar_esperas,
+            args=(engine, parar, amostras_espera, falhas_amostragem),
+        )
+    )
+
+    antes = ler_performance_schema(engine)
+    inicio = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    time.sleep(duracao)
+    parar.set()
+    for thread in threads:
+        thread.join()
+    decorrido = time.perf_counter() - inicio
+    depois = ler_performance_schema(engine)
+
+    latencias_escrita = [
+        d for r in resultados_escrita for d in r.latencias.get("pedido", [])
+    ]
+    latencias_leitura = {}
+    for r in resultados_leitura:
+        for procedure, duracoes in r.latencias.items():
+            latencias_leitura.setdefault(procedure, []).extend(duracoes)
+    erros = Counter()
+    for r in resultados_escrita + resultados_leitura:
+        erros.update(r.erros)
+    if falhas_amostragem:
+        logger.warning(
+            f"Amostragem de data_lock_waits interrompida: {falhas_amostragem[0]}"
+        )
+
+    fase = {
+        "escritores": escritores,
+        "leitores": leitores,
+        "duracao_s": round(decorrido, 2),
+        "escrita": {
+            "pedidos": len(latencias_escrita),
+            "pedidos_por_s": round(len(latencias_escrita) / decorrido, 1),
+            "latencia": resumir_latencias(latencias_escrita),
+            "deadlocks": sum(r.deadlocks for r in resultados_escrita),
+            "esperas_expiradas": sum(r.esperas_expiradas for r in resultados_escrita),
+        },
+        "leitura": {
+            "chamadas_por_s": round(
+                sum(len(d) for d in latencias_leitura.values()) / decorrido, 1
+            ),
+            "latencia": {
+                procedure: resumir_latencias(duracoes)
+                for procedure, duracoes in latencias_leitura.items()
+            },
+        },
+        "erros": dict(erros),
+        "amostras_espera_indice": dict(amostras_espera.most_common()),
+        "performance_schema": diferenca_performance_schema(antes, depois),
+    }
+    ids_criados = [i for r in resultados_escrita for i in r.pedidos_criados]
+    return fase, ids_criados
+
+
+def imprimir_fase(fase: dict) -> None:
+    escrita = fase["escrita"]
+    latencia = escrita["latencia"] or {}
+    print(
+        f"escritores={fase['escritores']} leitores={fase['leitores']}: "
+        f"{escrita['pedidos_por_s']} pedidos/s "
+        f"(p50={latencia.get('p50_ms')}ms p95={latencia.get('p95_ms')}ms "
+        f"p99={latencia.get('p99_ms')}ms), "
+        f"deadlocks no cliente={escrita['deadlocks']}, "
+        f"{fase['leitura']['chamadas_por_s']} relatórios/s"
+    )
+    for procedure, latencia in fase["leitura"]["latencia"].items():
+        print(
+            f"    {procedure}: p50={latencia['p50_ms']}ms p95={latencia['p95_ms']}ms "
+            f"p99={latencia['p99_ms']}ms"
+        )
+    servidor = fase["performance_schema"]
+    if servidor is not None:
+        print(
+            f"    servidor: {servidor['deadlocks']} deadlocks, "
+            f"{servidor['esperas_bloqueio_linha']} esperas por bloqueio de linha "
+            f"({servidor['tempo_espera_bloqueio_linha_ms']}ms)"
+        )
+    for chave, qtd in list(fase["amostras_espera_indice"].items())[:5]:
+        print(f"    esperando em {chave}: {qtd} amostras")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Carga mista de pedidos e relatórios")
+    parser.add_argument("--escritores", type=int, nargs="+", default=[1, 4, 16])
+    parser.add_argument("--leitores", type=int, default=4)
+    parser.add_argument("--duracao", type=float, default=60.0)
+    parser.add_argument("--max-itens", type=int, default=20)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument(
+        "--data-referencia", type=date.fromisoformat, default=date.today()
+    )
+    parser.add_argument(
+        "--sem-rollup",
+        action="store_true",
+        help="Desliga os triggers dos consolidados de venda nas sessões de escrita",
+    )
+    parser.add_argument(
+        "--manter-pedidos",
+        action="store_true",
+        help="Não remove os pedidos criados ao fim de cada fase",
+    )
+    parser.add_argument(
+        "--saida", type=Path, default=Path("benchmark_carga_mista.json")
+    )
+    args = parser.parse_args()
+
+    # +1 conexão para a amostragem de esperas e a leitura do performance_schema.
+    # carga.carregar_produtos e carga.carregar_ids usam a mesma engine.
+    configurar_engine(
+        workers=max(args.escritores) + args.leitores + 1,
+        ignorar_rollup=args.sem_rollup,
+    )
+    engine = obter_engine()
+    contexto = carregar_contexto(
+        engine, args.max_itens, args.seed, args.data_referencia
+    )
+    if not len(contexto.ids_cliente) or not len(contexto.ids_produto):
+        logger.error("Clientes e produtos não encontrados: execute a carga antes.")
+        return
+    sementes = GeradorSementes(args.seed)
+
+    fases = []
+    for escritores in args.escritores:
+        fase, ids_criados = executar_fase(
+            engine, contexto, escritores, args.leitores, args.duracao, sementes
+        )
+        fases.append(fase)
+        imprimir_fase(fase)
+        if not args.manter_pedidos:
+            remover_pedidos_criados(engine, ids_criados)
+
+    if args.sem_rollup and args.manter_pedidos:
+        # Os pedidos mantidos não entraram nos consolidados.
+        with engine.begin() as conn:
+            conn.execute(
+                text("CALL prc_carga_rollup_venda(:inicio, :fim)"),
+                {
+                    "inicio": args.data_referencia
+                    - timedelta(days=DIAS_PERIODO_PEDIDO),
+                    "fim": args.data_referencia,
+                },
+            )
+
+    with engine.connect() as conn:
+        versao_mysql = conn.execute(text("SELECT VERSION()")).scalar()
+    relatorio = {
+        "gerado_em": datetime.now().isoformat(timespec="seconds"),
+        "versao_mysql": versao_mysql,
+        "semente": args.seed,
+        "data_referencia": args.data_referencia.isoformat(),
+        "sem_rollup": args.sem_rollup,
+        "fases": fases,
+    }
+    args.saida.parent.mkdir(parents=True, exist_ok=True)
+    args.saida.write_text(
+        json.dumps(relatorio, indent=2, sort_keys=True, ensure_ascii=False),
+        encoding="utf-8",
+    )
+    print(f"Resultado gravado em {args.saida}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,56 @@
+import argparse
+from datetime import date
+
+from benchmark_relatorio import contar_registros, recarregar
+from conexao import obter_engine
+from carga_rapida import TABELAS_CARGA_RAPIDA, ler_chaves_estrangeiras, ler_indices
+
+# Compara a carga completa no caminho normal e com --carga-rapida, sobre o mesmo
+# conjunto de dados (mesma semente e data de referência), e confere que os
+# índices e chaves estrangeiras foram restaurados. Uso:
+#   python benchmark_carga_rapida.py --scale-factors 1 5 --seed 42
+MODOS = {"normal": [], "rapida": ["--carga-rapida"]}
+
+
+def contar_restricoes() -> dict:
+    with obter_engine().connect() as conn:
+        return {
+            tabela: (
+                len(ler_indices(conn, tabela)),
+                len(ler_chaves_estrangeiras(conn, tabela)),
+            )
+            for tabela in TABELAS_CARGA_RAPIDA
+        }
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--scale-factors", type=float, nargs="+", default=[1.0])
+    parser.add_argument("--modos", nargs="+", choices=MODOS, default=list(MODOS))
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument(
+        "--data-referencia", type=date.fromisoformat, default=date.today()
+    )
+    args = parser.parse_args()
+
+    restricoes = contar_restricoes()
+    print(f"{'fator':>6} {'modo':<8} {'carga (s)':>10} {'pedidos':>10} {'itens':>10}")
+    for fator_escala in args.scale_factors:
+        for modo in args.modos:
+            duracao = recarregar(
+                fator_escala, args.seed, args.data_referencia, MODOS[modo]
+            )
+            registros = contar_registros()
+            print(
+                f"{fator_escala:>6} {modo:<8} {duracao:>10.2f} "
+                f"{registros['tb_pedido']:>10} {registros['tb_pedido_item']:>10}"
+            )
+            if contar_restricoes() != restricoes:
+                raise RuntimeError(
+                    f"Índices ou chaves estrangeiras não restaurados após a carga "
+                    f"{modo}: {contar_restricoes()} | antes: {restricoes}"
+                )
+
+
+if __name__ == "__main__":
+    main()
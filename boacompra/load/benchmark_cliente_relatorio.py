@@ -0,0 +1,55 @@
+import argparse
+import time
+from datetime import date
+
+from sqlalchemy import text
+
+from cliente_relatorio import ClienteRelatorio, requisicoes_venda_periodo_mensal
+from conexao import criar_engine
+
+# Executa o relatório de venda de todas as categorias em todos os meses do ano,
+# primeiro com um worker e depois com vários, e compara o tempo total com a
+# soma das chamadas. Uso:
+#   python benchmark_cliente_relatorio.py --ano 2025 --workers 1 8 16
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--ano", type=int, default=date.today().year)
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 8])
+    parser.add_argument("--timeout", type=float, default=30.0)
+    args = parser.parse_args()
+
+    engine = criar_engine(max(args.workers))
+    with engine.connect() as conn:
+        categorias = (
+            conn.execute(
+                text(
+                    "SELECT no_produto_categoria FROM tb_produto_categoria "
+                    "ORDER BY no_produto_categoria"
+                )
+            )
+            .scalars()
+            .all()
+        )
+    requisicoes = requisicoes_venda_periodo_mensal(args.ano, categorias, args.timeout)
+
+    print(f"{len(requisicoes)} chamadas ({len(categorias)} categorias x 12 meses)")
+    print(
+        f"{'workers':>8} {'total (s)':>10} {'soma (s)':>10} {'maior (s)':>10} {'falhas':>7}"
+    )
+    for workers in args.workers:
+        cliente = ClienteRelatorio(engine, workers, args.timeout)
+        inicio = time.perf_counter()
+        resultados = cliente.executar(requisicoes)
+        total = time.perf_counter() - inicio
+        duracoes = [resultado.duracao for resultado in resultados]
+        falhas = sum(not resultado.sucesso for resultado in resultados)
+        print(
+            f"{workers:>8} {total:>10.2f} {sum(duracoes):>10.2f} "
+            f"{max(duracoes):>10.2f} {falhas:>7}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,113 @@
+import argparse
+import random
+import time
+from decimal import ROUND_HALF_UP, Decimal
+
+import numpy as np
+import pandas as pd
+
+from gerador_pedido import (
+    arredondar_meio_para_cima,
+    fatiar_ids,
+    gerar_lotes_itens_pedido,
+    PERCENTUAL_MAXIMO_DESCONTO,
+)
+
+# Compara a geração de tb_pedido_item linha a linha (Decimal) com a geração
+# vetorizada em centavos, sem acesso ao banco. Uso:
+#   python benchmark_gerador_pedido.py --itens 1000000
+
+
+def gerar_itens_legado(pedidos: list, produtos: list, max_itens: int) -> pd.DataFrame:
+    itens = []
+    for pedido_id in pedidos:
+        qtd_itens = random.randint(1, min(max_itens, len(produtos)))
+        produtos_sorteados = random.sample(produtos, qtd_itens)
+
+        for id_produto, vl_unitario in produtos_sorteados:
+            qt = random.randint(1, 50)
+            qt_decimal = Decimal(str(qt))
+            max_desconto = (vl_unitario * qt_decimal * Decimal("0.3")).quantize(
+                Decimal("0.01"), rounding=ROUND_HALF_UP
+            )
+            desconto_decimal = Decimal(
+                str(random.uniform(0, float(max_desconto)))
+            ).quantize(Decimal("0.01"), rounding=ROUND_HALF_UP)
+            total = (vl_unitario * qt_decimal - desconto_decimal).quantize(
+                Decimal("0.01"), rounding=ROUND_HALF_UP
+            )
+            itens.append(
+                {
+                    "id_pedido": pedido_id,
+                    "id_produto": id_produto,
+                    "qt_item": qt,
+                    "vl_unitario": vl_unitario,
+                    "vl_desconto": desconto_decimal,
+                    "vl_item_total": total,
+                    "id_usuario_criacao": 1,
+                    "id_usuario_atualizacao": 1,
+                }
+            )
+    return pd.DataFrame(itens)
+
+
+def validar_arredondamento(amostras: int = 200000) -> None:
+    # O desconto máximo em centavos deve coincidir com o quantize ROUND_HALF_UP.
+    rng = np.random.default_rng(0)
+    precos = rng.integers(1000, 100001, size=amostras)
+    quantidades = rng.integers(1, 51, size=amostras)
+    vetorizado = arredondar_meio_para_cima(
+        precos * quantidades * PERCENTUAL_MAXIMO_DESCONTO, 10
+    )
+    for preco, qt, esperado in zip(precos[:20000], quantidades[:20000], vetorizado):
+        decimal = (
+            Decimal(int(preco)) / 100 * Decimal(int(qt)) * Decimal("0.3")
+        ).quantize(Decimal("0.01"), rounding=ROUND_HALF_UP)
+        if int(decimal * 100) != int(esperado):
+            raise AssertionError(f"Divergência: {preco} x {qt} -> {decimal}")
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--itens", type=int, default=1000000)
+    parser.add_argument("--max-itens", type=int, default=20)
+    parser.add_argument("--produtos", type=int, default=1000)
+    args = parser.parse_args()
+
+    validar_arredondamento()
+
+    qt_pedidos = int(args.itens / ((1 + args.max_itens) / 2))
+    rng = np.random.default_rng()
+    ids_produto = np.arange(1, args.produtos + 1, dtype=np.int64)
+    precos_centavos = rng.integers(1000, 100001, size=args.produtos)
+    ids_pedido = np.arange(1, qt_pedidos + 1, dtype=np.int64)
+
+    inicio = time.perf_counter()
+    df_vetorizado = pd.concat(
+        gerar_lotes_itens_pedido(
+            fatiar_ids(ids_pedido, 50000),
+            ids_produto,
+            rng.integers(1, 11, size=args.produtos),
+            precos_centavos,
+            args.max_itens,
+            rng,
+            1,
+        )
+    )
+    tempo_vetorizado = time.perf_counter() - inicio
+
+    produtos = [
+        (int(i), Decimal(int(p)) / 100) for i, p in zip(ids_produto, precos_centavos)
+    ]
+    inicio = time.perf_counter()
+    df_legado = gerar_itens_legado(ids_pedido.tolist(), produtos, args.max_itens)
+    tempo_legado = time.perf_counter() - inicio
+
+    print(f"Pedidos: {qt_pedidos}")
+    print(f"Legado:     {len(df_legado):>10} itens em {tempo_legado:8.2f}s")
+    print(f"Vetorizado: {len(df_vetorizado):>10} itens em {tempo_vetorizado:8.2f}s")
+    print(f"Ganho: {tempo_legado / tempo_vetorizado:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,131 @@
+import argparse
+import json
+import statistics
+import subprocess
+import sys
+from pathlib import Path
+
+# Mede o tempo de importação do cliente de relatórios (consulta_relatorio) e da
+# carga (boa_compra_carga), cada importação em um processo novo, sem cache de
+# módulos. Termina com código 1 se o cliente passar do limite ou importar
+# alguma dependência pesada. Nenhuma das importações conecta ao banco. Uso:
+#   python benchmark_importacao.py --repeticoes 20 --limite-ms 100
+MODULO_CLIENTE = "consulta_relatorio"
+MODULO_CARGA = "boa_compra_carga"
+MODULOS_PESADOS = ("faker", "numpy", "pandas", "sqlalchemy")
+
+# Executado em cada processo: importa o módulo e devolve o tempo e as
+# dependências pesadas que ficaram carregadas.
+CODIGO_MEDICAO = """
+import json, sys, time
+inicio = time.perf_counter()
+import {modulo}
+duracao = time.perf_counter() - inicio
+print(json.dumps({{
+    "segundos": duracao,
+    "pesados": [m for m in {pesados!r} if m in sys.modules],
+}}))
+"""
+
+
+def medir_importacao(modulo: str) -> dict:
+    processo = subprocess.run(
+        [
+            sys.executable,
+            "-c",
+            CODIGO_MEDICAO.format(modulo=modulo, pesados=MODULOS_PESADOS),
+        ],
+        cwd=Path(__file__).parent,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    return json.loads(processo.stdout.strip().splitlines()[-1])
+
+
+def importacoes_mais_lentas(modulo: str, quantidade: int) -> list:
+    # -X importtime escreve no stderr o tempo acumulado (us) de cada importação.
+    processo = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {modulo}"],
+        cwd=Path(__file__).parent,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    tempos = []
+    for linha in processo.stderr.splitlines():
+        partes = linha.split("|")
+        if len(partes) == 3 and partes[1].strip().isdigit():
+            tempos.append((int(partes[1]) / 1000, partes[2].strip()))
+    tempos.sort(reverse=True)
+    return [
+        {"modulo": nome, "acumulado_ms": round(ms, 1)}
+        for ms, nome in tempos[:quantidade]
+    ]
+
+
+def resumir(modulo: str, repeticoes: int, detalhar: int) -> dict:
+    medicoes = [medir_importacao(modulo) for _ in range(repeticoes)]
+    tempos_ms = [medicao["segundos"] * 1000 for medicao in medicoes]
+    resumo = {
+        "mediana_ms": round(statistics.median(tempos_ms), 1),
+        "minimo_ms": round(min(tempos_ms), 1),
+        "maximo_ms": round(max(tempos_ms), 1),
+        "repeticoes": repeticoes,
+        "pesados": sorted({m for medicao in medicoes for m in medicao["pesados"]}),
+    }
+    if detalhar:
+        resumo["mais_lentas"] = importacoes_mais_lentas(modulo, detalhar)
+    return resumo
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--repeticoes", type=int, default=10)
+    parser.add_argument("--limite-ms", type=float, default=100.0)
+    parser.add_argument(
+        "--detalhar",
+        type=int,
+        default=0,
+        help="Lista as N importações mais lentas de cada módulo (-X importtime)",
+    )
+    parser.add_argument("--saida", type=Path)
+    args = parser.parse_args()
+
+    resultados = {
+        modulo: resumir(modulo, args.repeticoes, args.detalhar)
+        for modulo in (MODULO_CLIENTE, MODULO_CARGA)
+    }
+
+    print(
+        f"{'módulo':<20} {'mediana (ms)':>13} {'mín (ms)':>9} {'máx (ms)':>9}  pesados"
+    )
+    for modulo, resumo in resultados.items():
+        print(
+            f"{modulo:<20} {resumo['mediana_ms']:>13.1f} {resumo['minimo_ms']:>9.1f} "
+            f"{resumo['maximo_ms']:>9.1f}  {', '.join(resumo['pesados']) or '-'}"
+        )
+        for lenta in resumo.get("mais_lentas", []):
+            print(f"{'':<20} {lenta['acumulado_ms']:>13.1f}  {lenta['modulo']}")
+
+    if args.saida is not None:
+        args.saida.write_text(
+            json.dumps(resultados, indent=2, sort_keys=True, ensure_ascii=False),
+            encoding="utf-8",
+        )
+
+    cliente = resultados[MODULO_CLIENTE]
+    if cliente["pesados"]:
+        print(f"{MODULO_CLIENTE} importou {', '.join(cliente['pesados'])}.")
+        return 1
+    if cliente["mediana_ms"] > args.limite_ms:
+        print(
+            f"{MODULO_CLIENTE} importado em {cliente['mediana_ms']:.1f} ms "
+            f"(limite: {args.limite_ms:.0f} ms)."
+        )
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,194 @@
+import argparse
+import json
+import logging
+import random
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date, datetime, timedelta
+from decimal import Decimal
+from pathlib import Path
+
+import boa_compra_carga as carga
+from benchmark_carga_mista import remover_pedidos_criados
+from benchmark_relatorio import percentis
+from conexao import configurar_engine, obter_engine
+from gerador_pedido import (
+    DIAS_PERIODO_PEDIDO,
+    PERCENTUAL_MAXIMO_DESCONTO,
+    QT_ITEM_MAXIMA,
+)
+from ingestao_pedido import IngestaoPedido, ItemPedidoEntrada, PedidoEntrada
+from sementes import GeradorSementes
+
+logger = logging.getLogger(__name__)
+
+# Vazão de IngestaoPedido.gravar por tamanho de lote: com lote 1, cada pedido
+# tem a sua transação (um commit por pedido); com lotes maiores, o commit e as
+# idas ao banco são divididos entre os pedidos do lote. Os pedidos são gerados
+# antes da medição e os criados são removidos ao fim de cada tamanho, salvo
+# com --manter-pedidos. Uso:
+#   docker compose run --rm boacompra-carga python benchmark_ingestao_pedido.py \
+#       --tamanhos-lote 1 100 1000 --pedidos 5000 --escritores 1 4
+
+
+def gerar_pedidos_entrada(
+    qtd: int,
+    ingestao: IngestaoPedido,
+    ids_cliente: list,
+    max_itens: int,
+    data_referencia: date,
+    rng: random.Random,
+) -> list:
+    # Mesmas regras de quantidade e desconto da carga (gerador_pedido.py).
+    produtos = [
+        (id_produto, produto.vl_centavos)
+        for id_produto, produto in ingestao.produtos.items()
+        if produto.ativo
+    ]
+    situacoes = sorted(ingestao.situacoes)
+    pedidos = []
+    for _ in range(qtd):
+        itens = []
+        for id_produto, vl_centavos in rng.sample(
+            produtos, rng.randint(1, min(max_itens, len(produtos)))
+        ):
+            qt_item = rng.randint(1, QT_ITEM_MAXIMA)
+            desconto_maximo = vl_centavos * qt_item * PERCENTUAL_MAXIMO_DESCONTO // 10
+            itens.append(
+                ItemPedidoEntrada(
+                    id_produto,
+                    qt_item,
+                    Decimal(rng.randint(0, desconto_maximo)).scaleb(-2),
+                )
+            )
+        pedidos.append(
+            PedidoEntrada(
+                id_cliente=rng.choice(ids_cliente),
+                co_pedido_situacao=rng.choice(situacoes),
+                itens=itens,
+                dt_pedido=data_referencia
+                - timedelta(days=rng.randint(0, DIAS_PERIODO_PEDIDO)),
+            )
+        )
+    return pedidos
+
+
+def medir(
+    ingestao: IngestaoPedido, pedidos: list, tamanho_lote: int, escritores: int
+) -> tuple:
+    lotes = [
+        pedidos[inicio : inicio + tamanho_lote]
+        for inicio in range(0, len(pedidos), tamanho_lote)
+    ]
+    inicio = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=escritores) as executor:
+        resultados = list(executor.map(ingestao.gravar, lotes))
+    duracao = time.perf_counter() - inicio
+
+    ids_criados = [
+        id_pedido
+        for resultado in resultados
+        for id_pedido in resultado.ids_pedido
+        if id_pedido is not None
+    ]
+    qt_itens = sum(
+        len(pedido.itens)
+        for lote, resultado in zip(lotes, resultados)
+        for pedido, id_pedido in zip(lote, resultado.ids_pedido)
+        if id_pedido is not None
+    )
+    medicao = {
+        "tamanho_lote": tamanho_lote,
+        "escritores": escritores,
+        "lotes": len(lotes),
+        "pedidos": len(ids_criados),
+        "itens": qt_itens,
+        "recusados": sum(len(resultado.recusados) for resultado in resultados),
+        "tentativas_repetidas": sum(
+            resultado.tentativas - 1 for resultado in resultados
+        ),
+        "duracao_s": round(duracao, 3),
+        "pedidos_por_s": round(len(ids_criados) / duracao, 1),
+        "itens_por_s": round(qt_itens / duracao, 1),
+        "latencia_lote": percentis([resultado.duracao for resultado in resultados]),
+    }
+    return medicao, ids_criados
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--tamanhos-lote", type=int, nargs="+", default=[1, 100, 1000])
+    parser.add_argument("--pedidos", type=int, default=5000)
+    parser.add_argument("--escritores", type=int, nargs="+", default=[1])
+    parser.add_argument("--max-itens", type=int, default=5)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument(
+        "--data-referencia", type=date.fromisoformat, default=date.today()
+    )
+    parser.add_argument(
+        "--manter-pedidos",
+        action="store_true",
+        help="Não remove os pedidos criados ao fim de cada medição",
+    )
+    parser.add_argument(
+        "--saida", type=Path, default=Path("benchmark_ingestao_pedido.json")
+    )
+    args = parser.parse_args()
+
+    configurar_engine(workers=max(args.escritores))
+    engine = obter_engine()
+    ingestao = IngestaoPedido(engine, carga.ID_USUARIO_PADRAO)
+    ingestao.garantir_precos()
+    ids_cliente = carga.carregar_ids("tb_cliente", "id_cliente")["id"].tolist()
+    if not ids_cliente or not ingestao.produtos or not ingestao.situacoes:
+        logger.error(
+            "Clientes, produtos e situações não encontrados: execute a carga antes."
+        )
+        return
+    sementes = GeradorSementes(args.seed)
+
+    print(
+        f"{'lote':>6} {'escritores':>10} {'pedidos/s':>10} {'itens/s':>10} "
+        f"{'p50 lote (ms)':>14} {'p99 lote (ms)':>14} {'recusados':>9}"
+    )
+    medicoes = []
+    for escritores in args.escritores:
+        for tamanho_lote in args.tamanhos_lote:
+            # Os mesmos pedidos para todos os tamanhos de lote.
+            pedidos = gerar_pedidos_entrada(
+                args.pedidos,
+                ingestao,
+                ids_cliente,
+                args.max_itens,
+                args.data_referencia,
+                sementes.aleatorio("ingestao_pedido", 0),
+            )
+            medicao, ids_criados = medir(ingestao, pedidos, tamanho_lote, escritores)
+            medicoes.append(medicao)
+            print(
+                f"{tamanho_lote:>6} {escritores:>10} {medicao['pedidos_por_s']:>10.1f} "
+                f"{medicao['itens_por_s']:>10.1f} "
+                f"{medicao['latencia_lote']['p50_ms']:>14.1f} "
+                f"{medicao['latencia_lote']['p99_ms']:>14.1f} "
+                f"{medicao['recusados']:>9}"
+            )
+            if not args.manter_pedidos:
+                remover_pedidos_criados(engine, ids_criados)
+
+    relatorio = {
+        "gerado_em": datetime.now().isoformat(timespec="seconds"),
+        "semente": args.seed,
+        "pedidos": args.pedidos,
+        "max_itens": args.max_itens,
+        "medicoes": medicoes,
+    }
+    args.saida.parent.mkdir(parents=True, exist_ok=True)
+    args.saida.write_text(
+        json.dumps(relatorio, indent=2, sort_keys=True, ensure_ascii=False),
+        encoding="utf-8",
+    )
+    print(f"Resultado gravado em {args.saida}")
+
+
+if __name__ == "__main__":
+    main()
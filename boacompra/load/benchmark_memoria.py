@@ -0,0 +1,112 @@
+import argparse
+import os
+import resource
+import subprocess
+import sys
+
+import numpy as np
+
+# Mede o pico de memória (RSS) do pipeline de geração em lotes para volumes
+# crescentes, sem acesso ao banco. Cada execução roda em um processo separado
+# para que o pico de uma não contamine a outra. Uso:
+#   python benchmark_memoria.py --qtds 100000 1000000 5000000
+TABELAS = ("tb_pedido", "tb_pedido_item", "tb_cliente_email")
+
+
+def lotes_ids(qtd: int, tamanho_lote: int):
+    for inicio in range(1, qtd + 1, tamanho_lote):
+        yield np.arange(inicio, min(inicio + tamanho_lote, qtd + 1), dtype=np.int64)
+
+
+def executar(tabela: str, qtd: int) -> None:
+    from boa_compra_carga import (
+        ID_USUARIO_PADRAO,
+        TAMANHO_LOTE_CARGA,
+        gerar_em_lotes,
+        registros_cliente_email,
+    )
+    from escrita_bulk import dataframe_para_tsv
+    from gerador_pedido import (
+        gerar_lotes_itens_pedido,
+        gerar_lotes_pedidos,
+        pedidos_por_lote,
+    )
+
+    rng = np.random.default_rng()
+    if tabela == "tb_pedido":
+        # Pedidos e itens são gerados juntos: conta as linhas das duas tabelas.
+        lotes = (
+            df
+            for _, *dfs in gerar_lotes_pedidos(
+                qtd,
+                1,
+                np.arange(1, 10001, dtype=np.int64),
+                np.arange(1, 6, dtype=np.int64),
+                ["observacao"],
+                np.arange(1, 1001, dtype=np.int64),
+                rng.integers(1, 11, size=1000),
+                rng.integers(1000, 100001, size=1000),
+                20,
+                lambda nu_lote: rng,
+                ID_USUARIO_PADRAO,
+                TAMANHO_LOTE_CARGA,
+            )
+            for df in dfs
+        )
+    elif tabela == "tb_pedido_item":
+        lotes = gerar_lotes_itens_pedido(
+            lotes_ids(qtd, pedidos_por_lote(TAMANHO_LOTE_CARGA, 20)),
+            np.arange(1, 1001, dtype=np.int64),
+            rng.integers(1, 11, size=1000),
+            rng.integers(1000, 100001, size=1000),
+            20,
+            rng,
+            ID_USUARIO_PADRAO,
+        )
+    else:
+        lotes = (
+            df
+            for _, df in gerar_em_lotes(
+                "tb_cliente_email",
+                range(1, qtd + 1),
+                lambda clientes, fake, aleatorio: registros_cliente_email(
+                    clientes, fake, aleatorio, 3
+                ),
+            )
+        )
+
+    registros = 0
+    for df in lotes:
+        dataframe_para_tsv(df, os.devnull)
+        registros += len(df)
+
+    pico_mb = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+    print(f"{registros} {pico_mb:.1f}")
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--tabelas", nargs="+", choices=TABELAS, default=TABELAS)
+    parser.add_argument("--qtds", nargs="+", type=int, default=[10000, 100000, 1000000])
+    parser.add_argument("--executar", choices=TABELAS, help=argparse.SUPPRESS)
+    parser.add_argument("--qtd", type=int, help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.executar:
+        executar(args.executar, args.qtd)
+        return
+
+    print(f"{'tabela':<18} {'qtd':>10} {'registros':>12} {'pico RSS (MB)':>14}")
+    for tabela in args.tabelas:
+        for qtd in args.qtds:
+            saida = subprocess.run(
+                [sys.executable, __file__, "--executar", tabela, "--qtd", str(qtd)],
+                capture_output=True,
+                text=True,
+                check=True,
+            ).stdout.split()
+            print(f"{tabela:<18} {qtd:>10} {saida[-2]:>12} {saida[-1]:>14}")
+
+
+if __name__ == "__main__":
+    main()
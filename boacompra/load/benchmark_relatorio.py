@@ -0,0 +1,413 @@
+import argparse
+import itertools
+import json
+import re
+import subprocess
+import sys
+import time
+from datetime import date, datetime, timedelta
+from pathlib import Path
+from typing import Sequence
+
+import numpy as np
+from sqlalchemy import text
+
+from conexao import obter_engine
+
+# Mede a latência das procedures de relatório em uma matriz de parâmetros e
+# registra o plano (EXPLAIN ANALYZE) das consultas equivalentes. O resultado é
+# gravado em JSON com chaves ordenadas, para ser comparado entre execuções. Uso:
+#   python benchmark_relatorio.py --scale-factors 1 5 --recarregar \
+#       --saida resultados/relatorio.json
+TABELAS_GERADAS = (
+    "tb_venda_produto_dia",
+    "tb_venda_dia",
+    "tb_pedido_item",
+    "tb_pedido",
+    "tb_cliente_contato",
+    "tb_cliente_email",
+    "tb_cliente_endereco",
+    "tb_cliente",
+    "tb_produto",
+    # Controle de progresso da carga: sem ele, a recarga seria uma nova execução.
+    "tb_carga_lote",
+    "tb_carga_execucao",
+)
+PERIODOS_DIAS = (30, 90, 180, 365)
+CATEGORIAS = ("ELETRONICOS", "LIVROS", "PET SHOP")
+SITUACOES = ("CONCLUIDO",)
+VALORES_MINIMOS = (100, 1000, 10000)
+PAGINAS = (1, 10, 100, 1000)
+LIMITE_PAGINA = 20
+
+SQL_VENDA_PERIODO_TOTAIS = """
+SELECT IFNULL(SUM(venddia.qt_pedido), 0), ROUND(IFNULL(SUM(venddia.vl_pedido_total), 0), 2),
+       ROUND(IFNULL(SUM(venddia.vl_pedido_total) / NULLIF(SUM(venddia.qt_pedido_valor), 0), 0), 2)
+FROM boacompra_adm.tb_venda_dia venddia
+WHERE venddia.dt_venda BETWEEN :data_inicio AND :data_fim
+"""
+
+SQL_VENDA_PERIODO_PRODUTOS = """
+SELECT produto.no_produto, IFNULL(SUM(vendprod.qt_item_vendido), 0)
+FROM boacompra_adm.tb_venda_produto_dia vendprod
+    INNER JOIN boacompra_adm.tb_produto produto ON vendprod.id_produto = produto.id_produto
+WHERE vendprod.id_produto_categoria = (
+        SELECT id_produto_categoria FROM boacompra_adm.tb_produto_categoria
+        WHERE no_produto_categoria = :categoria)
+  AND vendprod.dt_venda BETWEEN :data_inicio AND :data_fim
+GROUP BY produto.no_produto
+"""
+
+# Corpo da versão anterior da procedure (V015), que agregava o detalhe; mantido
+# para comparar as linhas lidas com as dos consolidados.
+SQL_VENDA_PERIODO_TOTAIS_DETALHE = """
+SELECT COUNT(1), ROUND(IFNULL(SUM(pedido.vl_pedido_total), 0), 2),
+       ROUND(IFNULL(AVG(pedido.vl_pedido_total), 0), 2)
+FROM boacompra_adm.tb_pedido pedido
+WHERE pedido.dt_pedido BETWEEN :data_inicio AND :data_fim
+"""
+
+SQL_VENDA_PERIODO_PRODUTOS_DETALHE = """
+SELECT produto.no_produto, IFNULL(SUM(pediitem.qt_item), 0)
+FROM boacompra_adm.tb_pedido_item pediitem
+    INNER JOIN boacompra_adm.tb_pedido pedido ON pediitem.id_pedido = pedido.id_pedido
+    INNER JOIN boacompra_adm.tb_produto produto ON pediitem.id_produto = produto.id_produto
+    INNER JOIN boacompra_adm.tb_produto_categoria prodcate
+        ON produto.id_produto_categoria = prodcate.id_produto_categoria
+WHERE pedido.dt_pedido BETWEEN :data_inicio AND :data_fim
+  AND prodcate.no_produto_categoria = :categoria
+GROUP BY produto.no_produto
+"""
+
+SQL_PEDIDO_CLIENTE_VALOR_MINIMO = """
+SELECT cliente.no_cliente, pedido.id_pedido, pedido.vl_pedido_total, pedido.dt_pedido
+FROM boacompra_adm.tb_cliente cliente
+    INNER JOIN boacompra_adm.tb_pedido pedido ON cliente.id_cliente = pedido.id_cliente
+    INNER JOIN boacompra_adm.tb_pedido_situacao situacao
+        ON pedido.co_pedido_situacao = situacao.co_pedido_situacao
+WHERE situacao.no_pedido_situacao = :situacao
+  AND pedido.vl_pedido_total > :valor_minimo
+  AND pedido.dt_pedido BETWEEN :data_inicio AND :data_fim
+ORDER BY pedido.dt_pedido DESC
+LIMIT :limite OFFSET :deslocamento
+"""
+
+SQL_PEDIDO_CLIENTE_VALOR_MINIMO_CURSOR = """
+SELECT cliente.no_cliente, pedido.id_pedido, pedido.vl_pedido_total, pedido.dt_pedido
+FROM boacompra_adm.tb_pedido pedido
+    INNER JOIN boacompra_adm.tb_cliente cliente ON cliente.id_cliente = pedido.id_cliente
+WHERE pedido.co_pedido_situacao = (
+        SELECT co_pedido_situacao FROM boacompra_adm.tb_pedido_situacao
+        WHERE no_pedido_situacao = :situacao)
+  AND pedido.dt_pedido BETWEEN :data_inicio AND :data_fim
+  AND (pedido.dt_pedido < :dt_cursor
+       OR (pedido.dt_pedido = :dt_cursor AND pedido.id_pedido < :id_cursor))
+  AND pedido.vl_pedido_total > :valor_minimo
+ORDER BY pedido.dt_pedido DESC, pedido.id_pedido DESC
+LIMIT :limite
+"""
+
+# Último pedido da página anterior, usado como cursor para medir a página
+# pedida sem precisar percorrer as páginas intermediárias a cada repetição.
+SQL_CURSOR_PAGINA = """
+SELECT DATE_FORMAT(pedido.dt_pedido, '%Y-%m-%d'), pedido.id_pedido
+FROM boacompra_adm.tb_pedido pedido
+    INNER JOIN boacompra_adm.tb_pedido_situacao situacao
+        ON pedido.co_pedido_situacao = situacao.co_pedido_situacao
+WHERE situacao.no_pedido_situacao = :situacao
+  AND pedido.vl_pedido_total > :valor_minimo
+  AND pedido.dt_pedido BETWEEN :data_inicio AND :data_fim
+ORDER BY pedido.dt_pedido DESC, pedido.id_pedido DESC
+LIMIT 1 OFFSET :deslocamento
+"""
+
+# Nós de acesso a dados do EXPLAIN ANALYZE; a soma de rows * loops deles
+# aproxima a quantidade de linhas lidas pela consulta.
+PADRAO_ACESSO = re.compile(
+    r"-> (Table scan|Index scan|Index range scan|Index lookup|Single-row index lookup"
+    r"|Covering index scan|Covering index range scan|Covering index lookup)"
+    r".*?\(actual time=[\d.e+]+\.\.[\d.e+]+ rows=([\d.e+]+) loops=(\d+)\)"
+)
+
+
+# ========== FUNÇÕES AUXILIARES ==========
+def percentis(latencias: list) -> dict:
+    valores = np.array(latencias) * 1000
+    return {
+        "p50_ms": round(float(np.percentile(valores, 50)), 3),
+        "p95_ms": round(float(np.percentile(valores, 95)), 3),
+        "p99_ms": round(float(np.percentile(valores, 99)), 3),
+        "execucoes": len(latencias),
+    }
+
+
+def explicar(sql: str, parametros: dict) -> dict:
+    with obter_engine().connect() as conn:
+        plano = "\n".join(
+            row[0] for row in conn.execute(text(f"EXPLAIN ANALYZE {sql}"), parametros)
+        )
+    linhas_lidas = sum(
+        float(linhas) * int(loops) for _, linhas, loops in PADRAO_ACESSO.findall(plano)
+    )
+    return {"linhas_examinadas": int(linhas_lidas), "plano": plano.splitlines()}
+
+
+def medir_procedure(procedure: str, parametros: list, repeticoes: int) -> list:
+    latencias = []
+    raw_conn = obter_engine().raw_connection()
+    cursor = None
+    try:
+        cursor = raw_conn.cursor()
+        for _ in range(repeticoes):
+            inicio = time.perf_counter()
+            cursor.callproc(procedure, parametros)
+            latencias.append(time.perf_counter() - inicio)
+    finally:
+        if cursor is not None:
+            cursor.close()
+        raw_conn.close()
+    return latencias
+
+
+def recarregar(
+    fator_escala: float,
+    semente: int,
+    data_referencia: date,
+    argumentos: Sequence[str] = (),
+) -> float:
+    # Devolve a duração da carga, em segundos.
+    with obter_engine().begin() as conn:
+        conn.execute(text("SET FOREIGN_KEY_CHECKS = 0"))
+        for tabela in TABELAS_GERADAS:
+            conn.execute(text(f"TRUNCATE TABLE {tabela}"))
+        conn.execute(text("SET FOREIGN_KEY_CHECKS = 1"))
+
+    inicio = time.perf_counter()
+    subprocess.run(
+        [
+            sys.executable,
+            str(Path(__file__).with_name("boa_compra_carga.py")),
+            "--scale-factor",
+            str(fator_escala),
+            "--seed",
+            str(semente),
+            "--data-referencia",
+            data_referencia.isoformat(),
+            *argumentos,
+        ],
+        check=True,
+    )
+    return time.perf_counter() - inicio
+
+
+def contar_registros() -> dict:
+    with obter_engine().connect() as conn:
+        return {
+            tabela: conn.execute(text(f"SELECT COUNT(*) FROM {tabela}")).scalar()
+            for tabela in ("tb_pedido", "tb_pedido_item", "tb_cliente", "tb_produto")
+        }
+
+
+# ========== CENÁRIOS ==========
+def cenarios_venda_periodo(data_referencia: date):
+    for dias, categoria in itertools.product(PERIODOS_DIAS, CATEGORIAS):
+        parametros = {
+            "data_inicio": (data_referencia - timedelta(days=dias)).isoformat(),
+            "data_fim": data_referencia.isoformat(),
+            "categoria": categoria,
+        }
+        yield {
+            "procedure": "prc_relatorio_venda_periodo",
+            "parametros": parametros,
+            "argumentos": [
+                parametros["data_inicio"],
+                parametros["data_fim"],
+                categoria,
+                None,
+            ],
+            "consultas": {
+                "totais": (SQL_VENDA_PERIODO_TOTAIS, parametros),
+                "produtos": (SQL_VENDA_PERIODO_PRODUTOS, parametros),
+                "totais_detalhe": (SQL_VENDA_PERIODO_TOTAIS_DETALHE, parametros),
+                "produtos_detalhe": (SQL_VENDA_PERIODO_PRODUTOS_DETALHE, parametros),
+            },
+        }
+
+
+def cenarios_pedido_cliente_valor_minimo(data_referencia: date):
+    for dias, situacao, valor_minimo, pagina in itertools.product(
+        PERIODOS_DIAS, SITUACOES, VALORES_MINIMOS, PAGINAS
+    ):
+        parametros = {
+            "data_inicio": (data_referencia - timedelta(days=dias)).isoformat(),
+            "data_fim": data_referencia.isoformat(),
+            "situacao": situacao,
+            "valor_minimo": valor_minimo,
+            "limite": LIMITE_PAGINA,
+            "pagina": pagina,
+        }
+        yield {
+            "procedure": "prc_relatorio_pedido_cliente_valor_minino",
+            "parametros": parametros,
+            "argumentos": [
+                parametros["data_inicio"],
+                parametros["data_fim"],
+                situacao,
+                valor_minimo,
+                LIMITE_PAGINA,
+                pagina,
+                None,
+            ],
+            "consultas": {
+                "pedidos": (
+                    SQL_PEDIDO_CLIENTE_VALOR_MINIMO,
+                    {
+                        **parametros,
+                        "data_inicio": f"{parametros['data_inicio']} 00:00:00",
+                        "data_fim": f"{parametros['data_fim']} 23:59:59",
+                        "deslocamento": (pagina - 1) * LIMITE_PAGINA,
+                    },
+                ),
+            },
+        }
+
+
+def cenarios_pedido_cliente_valor_minimo_cursor(data_referencia: date):
+    for dias, situacao, valor_minimo, pagina in itertools.product(
+        PERIODOS_DIAS, SITUACOES, VALORES_MINIMOS, PAGINAS
+    ):
+        parametros = {
+            "data_inicio": (data_referencia - timedelta(days=dias)).isoformat(),
+            "data_fim": data_referencia.isoformat(),
+            "situacao": situacao,
+            "valor_minimo": valor_minimo,
+            "limite": LIMITE_PAGINA,
+            "pagina": pagina,
+        }
+        dt_cursor, id_cursor = None, None
+        if pagina > 1:
+            with obter_engine().connect() as conn:
+                linha = conn.execute(
+                    text(SQL_CURSOR_PAGINA),
+                    {**parametros, "deslocamento": (pagina - 1) * LIMITE_PAGINA - 1},
+                ).first()
+            if linha is None:
+                continue
+            dt_cursor, id_cursor = linha
+
+        yield {
+            "procedure": "prc_relatorio_pedido_cliente_valor_minino_cursor",
+            "parametros": parametros,
+            "argumentos": [
+                parametros["data_inicio"],
+                parametros["data_fim"],
+                situacao,
+                valor_minimo,
+                LIMITE_PAGINA,
+                dt_cursor,
+                id_cursor,
+                None,
+            ],
+            "consultas": {
+                "pedidos": (
+                    SQL_PEDIDO_CLIENTE_VALOR_MINIMO_CURSOR,
+                    {
+                        **parametros,
+                        "dt_cursor": dt_cursor
+                        or (data_referencia + timedelta(days=1)).isoformat(),
+                        "id_cursor": id_cursor or 2**63 - 1,
+                    },
+                ),
+            },
+        }
+
+
+CENARIOS = (
+    cenarios_venda_periodo,
+    cenarios_pedido_cliente_valor_minimo,
+    cenarios_pedido_cliente_valor_minimo_cursor,
+)
+
+
+def executar_cenarios(data_referencia: date, repeticoes: int, aquecimento: int):
+    resultados = []
+    for gerar_cenarios in CENARIOS:
+        for cenario in gerar_cenarios(data_referencia):
+            medir_procedure(cenario["procedure"], cenario["argumentos"], aquecimento)
+            latencias = medir_procedure(
+                cenario["procedure"], cenario["argumentos"], repeticoes
+            )
+            resultados.append(
+                {
+                    "procedure": cenario["procedure"],
+                    "parametros": cenario["parametros"],
+                    "latencia": percentis(latencias),
+                    "consultas": {
+                        nome: explicar(sql, parametros)
+                        for nome, (sql, parametros) in cenario["consultas"].items()
+                    },
+                }
+            )
+            print(
+                f"{cenario['procedure']} {cenario['parametros']} "
+                f"p50={resultados[-1]['latencia']['p50_ms']}ms"
+            )
+    return resultados
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--scale-factors", type=float, nargs="+", default=[1.0])
+    parser.add_argument(
+        "--recarregar",
+        action="store_true",
+        help="Esvazia as tabelas geradas e recarrega cada fator de escala",
+    )
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument(
+        "--data-referencia", type=date.fromisoformat, default=date.today()
+    )
+    parser.add_argument("--repeticoes", type=int, default=30)
+    parser.add_argument("--aquecimento", type=int, default=3)
+    parser.add_argument("--saida", type=Path, default=Path("benchmark_relatorio.json"))
+    args = parser.parse_args()
+
+    with obter_engine().connect() as conn:
+        versao_mysql = conn.execute(text("SELECT VERSION()")).scalar()
+
+    execucoes = []
+    for fator_escala in args.scale_factors:
+        duracao_carga = None
+        if args.recarregar:
+            duracao_carga = round(
+                recarregar(fator_escala, args.seed, args.data_referencia), 2
+            )
+        execucoes.append(
+            {
+                "fator_escala": fator_escala,
+                "duracao_carga_s": duracao_carga,
+                "registros": contar_registros(),
+                "resultados": executar_cenarios(
+                    args.data_referencia, args.repeticoes, args.aquecimento
+                ),
+            }
+        )
+
+    relatorio = {
+        "gerado_em": datetime.now().isoformat(timespec="seconds"),
+        "versao_mysql": versao_mysql,
+        "semente": args.seed,
+        "data_referencia": args.data_referencia.isoformat(),
+        "repeticoes": args.repeticoes,
+        "execucoes": execucoes,
+    }
+    args.saida.parent.mkdir(parents=True, exist_ok=True)
+    args.saida.write_text(
+        json.dumps(relatorio, indent=2, sort_keys=True, ensure_ascii=False),
+        encoding="utf-8",
+    )
+    print(f"Resultado gravado em {args.saida}")
+
+
+if __name__ == "__main__":
+    main()
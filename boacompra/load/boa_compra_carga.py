@@ -1,29 +1,56 @@
+import argparse
 import json
 import logging
 import os
 import random
+import time
 import unicodedata
-from decimal import ROUND_HALF_UP, Decimal
+from dataclasses import asdict
+from datetime import date, timedelta
+from decimal import Decimal
 from pathlib import Path
-from typing import Optional
+from typing import Callable, Iterable, Iterator, Optional, Sequence
 
+import numpy as np
 import pandas as pd
-from dotenv import load_dotenv
 from faker import Faker
-from sqlalchemy import create_engine, text
-
-# Carrega variáveis do .env
-load_dotenv()
-
-DB_USER = os.getenv("DB_USER")
-DB_PASSWORD = os.getenv("DB_PASSWORD")
-DB_HOST = os.getenv("DB_HOST")
-DB_PORT = os.getenv("DB_PORT", "3306")
-DB_NAME = os.getenv("DB_NAME")
-
-# Monta a URL de conexão
-DATABASE_URL = (
-    f"mysql+mysqlconnector://{DB_USER}:{DB_PASSWORD}@{DB_HOST}:{DB_PORT}/{DB_NAME}"
+from sqlalchemy import text
+
+from agendador import Etapa, executar_etapas, registrar_linha_tempo
+from chaves_unicas import gerar_cpfs, gerar_emails, gerar_nomes_produto
+from conexao import configurar_engine, obter_engine
+from carga_rapida import (
+    ETAPA_CARGA_RAPIDA,
+    buscar_execucao_pendente,
+    reconstruir_indices,
+    remover_indices,
+)
+from escrita_bulk import TAMANHO_LOTE_PADRAO, inserir_em_massa
+from exportacao_carga import FORMATOS_EXPORTACAO, ExportadorCarga
+from distribuicoes import PERFIL_PADRAO, PERFIS, AmostragemPedido, ler_distribuicoes
+from gerador_pedido import DIAS_PERIODO_PEDIDO, gerar_lotes_pedidos, pedidos_por_lote
+from metricas_carga import ColetorMetricas
+from registro_ids import RegistroIds
+from progresso_carga import (
+    ExecucaoCarga,
+    abrir_execucao,
+    buscar_ultima_execucao,
+    concluir_execucao,
+)
+from sementes import GeradorSementes
+
+# Os relatórios ficam em consulta_relatorio.py, que não depende da geração de
+# dados; continuam disponíveis por aqui para quem os importava deste módulo.
+from consulta_relatorio import (  # noqa: F401
+    cache_relatorio,
+    consultar_marca_dagua_pedido,
+    consultar_relatorio_pedido_cliente_valor_minino,
+    consultar_relatorio_pedido_cliente_valor_minino_cache,
+    consultar_relatorio_pedido_cliente_valor_minino_cursor,
+    consultar_relatorio_venda_periodo,
+    consultar_relatorio_venda_periodo_cache,
+    consultar_relatorio_venda_periodo_categorias,
+    iterar_relatorio_pedido_cliente_valor_minino,
 )
 
 # ========== CONFIGURAÇÕES ==========
@@ -32,26 +59,295 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
-fake = Faker("pt_BR")
-engine = create_engine(
-    "mysql+mysqlconnector://boacompra_adm:K&dTsfiI2],0K2/!@mysql:3306/boacompra_adm"
-)
 ID_USUARIO_PADRAO = 1
 CSV_BASE_PATH = Path("csv")
+QT_TEXTOS_OBSERVACAO = 1000
+METODO_CARGA = os.getenv("CARGA_METODO", "multi")
+TAMANHO_LOTE_CARGA = int(os.getenv("CARGA_TAMANHO_LOTE", TAMANHO_LOTE_PADRAO))
+WORKERS_CARGA = int(os.getenv("CARGA_WORKERS", "4"))
+
+# Volumes do fator de escala 1; --scale-factor multiplica todos eles.
+QTD_CLIENTES = 10000
+QTD_CLIENTE_ENDERECOS = 10000
+QTD_PRODUTOS_POR_CATEGORIA = 50
+QTD_PEDIDOS = 5000
+
+# Redefinidos em main() a partir de --seed, --data-referencia, --resume,
+# --append e --distribuicoes.
+sementes = GeradorSementes()
+data_referencia = date.today()
+retomar_carga = False
+anexar_carga = False
+distribuicoes_carga = ler_distribuicoes(PERFIL_PADRAO)
+
+# Tempos, registros, idas ao banco e erros de cada etapa da carga.
+metricas = ColetorMetricas()
+
+# Com --exportar, cada DataFrame gravado é também exportado para arquivos.
+exportador: Optional[ExportadorCarga] = None
+
+# Ids de tb_cliente e tb_produto (com o preço em centavos), compartilhados entre
+# as etapas que sorteiam ou percorrem esses ids.
+registro_ids = RegistroIds()
 
 
 # ========== FUNÇÕES AUXILIARES ==========
 def tabela_esta_vazia(nome_tabela: str) -> bool:
-    with engine.connect() as conn:
+    with obter_engine().connect() as conn:
         return conn.execute(text(f"SELECT COUNT(*) FROM {nome_tabela}")).scalar() == 0
 
 
-def inserir_dataframe(df: pd.DataFrame, tabela: str) -> None:
+def maior_id(nome_tabela: str, coluna: str) -> int:
+    with obter_engine().connect() as conn:
+        return conn.execute(
+            text(f"SELECT COALESCE(MAX({coluna}), 0) FROM {nome_tabela}")
+        ).scalar()
+
+
+def carregar_ids(nome_tabela: str, coluna: str) -> dict:
+    with obter_engine().connect() as conn:
+        return {
+            "id": np.fromiter(
+                conn.execute(
+                    text(f"SELECT {coluna} FROM {nome_tabela} ORDER BY {coluna}")
+                ).scalars(),
+                dtype=np.int64,
+            )
+        }
+
+
+def carregar_produtos() -> dict:
+    with obter_engine().connect() as conn:
+        produtos = conn.execute(
+            text(
+                "SELECT id_produto, CAST(vl_produto_unitario * 100 AS SIGNED), "
+                "id_produto_categoria FROM tb_produto ORDER BY id_produto"
+            )
+        ).fetchall()
+    return {
+        "id": np.array([row[0] for row in produtos], dtype=np.int64),
+        "vl_centavos": np.array([row[1] for row in produtos], dtype=np.int64),
+        "id_produto_categoria": np.array([row[2] for row in produtos], dtype=np.int64),
+    }
+
+
+def listar_ids(
+    nome_tabela: str, coluna: str, id_inicio: int = 0, id_fim: Optional[int] = None
+) -> np.ndarray:
+    # Ids na faixa (id_inicio, id_fim], em ordem. Vêm do registro de ids; a
+    # tabela só é lida (uma vez) quando a carga não a registrou.
+    return registro_ids.ids(
+        nome_tabela, lambda: carregar_ids(nome_tabela, coluna), id_inicio, id_fim
+    )
+
+
+def registrar_ids_execucao(
+    execucao: ExecucaoCarga, tabela: str, coluna: str, qtd: int, **atributos
+) -> None:
+    # Só uma execução concluída sobre a tabela vazia conhece todos os ids: os da
+    # faixa que ela pré-alocou. Nos demais casos, o registro relê a tabela.
+    id_maximo = execucao.parametros[f"{coluna}_maximo"]
+    if execucao.concluida and id_maximo == 0:
+        registro_ids.registrar_faixa(tabela, id_maximo + 1, qtd, **atributos)
+    else:
+        registro_ids.descartar(tabela)
+
+
+def contar_lotes(qtd: int, tamanho_lote: int) -> int:
+    return -(-qtd // tamanho_lote)
+
+
+def preparar_execucao(
+    etapa: str, montar_parametros: Callable[[int], dict]
+) -> Optional[ExecucaoCarga]:
+    # Devolve a execução a gravar: a interrompida (com --resume) ou uma nova,
+    # cujos parâmetros determinam o conteúdo de todos os lotes. montar_parametros
+    # recebe o tamanho do lote e devolve os parâmetros da etapa, com "qt_lote".
+    ultima = buscar_ultima_execucao(obter_engine(), etapa)
+    if ultima is not None and not ultima.concluida:
+        if not retomar_carga:
+            raise RuntimeError(
+                f"Carga de {etapa} interrompida com {ultima.lotes_pendentes} de "
+                f"{ultima.qt_lote} lotes pendentes: use --resume para continuar."
+            )
+        ultima.retomada = True
+        logger.info(
+            f"Retomando a execução {ultima.nu_execucao} de {etapa}: "
+            f"{ultima.lotes_pendentes} de {ultima.qt_lote} lotes pendentes."
+        )
+        return ultima
+
+    vazia = tabela_esta_vazia(etapa)
+    if not vazia and not anexar_carga:
+        logger.info(f"{etapa} já contém dados.")
+        return None
+
+    parametros = {
+        "semente": sementes.semente,
+        "tamanho_lote": TAMANHO_LOTE_CARGA,
+        "data_referencia": data_referencia.isoformat(),
+        **montar_parametros(TAMANHO_LOTE_CARGA),
+    }
+    if parametros["qt_lote"] == 0:
+        logger.info(f"{etapa}: nada a gerar.")
+        return None
+    return abrir_execucao(
+        obter_engine(), etapa, parametros, parametros["qt_lote"], anexar=not vazia
+    )
+
+
+def finalizar_execucao(execucao: ExecucaoCarga) -> None:
+    if execucao.lotes_pendentes == 0:
+        concluir_execucao(obter_engine(), execucao)
+    else:
+        # A etapa termina com erro: o agendador ignora as que dependem dela.
+        raise RuntimeError(
+            f"{execucao.no_etapa}: {execucao.lotes_pendentes} lotes não gravados; "
+            f"execute novamente com --resume."
+        )
+
+
+def faixa_clientes_pendentes(tabela: str, tamanho_lote: int) -> dict:
+    # Etapas filhas de tb_cliente cobrem apenas os clientes posteriores ao maior
+    # id_cliente já presente na tabela: um --append gera dados só para eles.
+    id_cliente_inicio = maior_id(tabela, "id_cliente")
+    id_cliente_fim = maior_id("tb_cliente", "id_cliente")
+    qtd = len(listar_ids("tb_cliente", "id_cliente", id_cliente_inicio, id_cliente_fim))
+    return {
+        "id_cliente_inicio": id_cliente_inicio,
+        "id_cliente_fim": id_cliente_fim,
+        "qtd": qtd,
+        "qt_lote": contar_lotes(qtd, tamanho_lote),
+    }
+
+
+def inserir_dataframe(
+    df: pd.DataFrame,
+    tabela: str,
+    metodo: Optional[str] = None,
+    tamanho_lote: Optional[int] = None,
+    registro: Optional[tuple] = None,
+) -> bool:
+    metodo = metodo or METODO_CARGA
     try:
-        df.to_sql(tabela, con=engine, if_exists="append", index=False)
-        logger.info(f"{len(df)} registros inseridos na tabela {tabela}.")
+        inicio = time.perf_counter()
+        idas_banco = inserir_em_massa(
+            obter_engine(),
+            df,
+            tabela,
+            metodo,
+            tamanho_lote or TAMANHO_LOTE_CARGA,
+            registro=registro,
+        )
+        duracao = time.perf_counter() - inicio
+
+        metricas.registrar_escrita(tabela, len(df), duracao)
+        metricas.registrar_idas_banco(idas_banco)
+        if exportador is not None:
+            exportador.gravar(tabela, df)
+        logger.debug(
+            f"{len(df)} registros inseridos na tabela {tabela} via {metodo} "
+            f"em {duracao:.2f}s ({len(df) / max(duracao, 1e-9):.0f} registros/s)."
+        )
+        return True
     except Exception as e:
         logger.error(f"Erro ao inserir dados na tabela {tabela}: {e}")
+        metricas.registrar_erro(f"{tabela}: {e}")
+        return False
+
+
+def gravar_dataframe(df: pd.DataFrame, tabela: str) -> None:
+    # Gravação sem registro de lote: um erro termina a etapa.
+    if not inserir_dataframe(df, tabela):
+        raise RuntimeError(f"Registros não gravados em {tabela}.")
+
+
+def inserir_lotes(
+    lotes: Iterable[tuple], tabela: str, execucao: Optional[ExecucaoCarga] = None
+) -> None:
+    # Cada lote é gravado assim que gerado: o consumo de memória depende do
+    # tamanho do lote, e não da quantidade total de registros. Com uma execução,
+    # o lote é registrado na mesma transação e os já gravados são pulados.
+    qt_lotes = 0
+    for nu_lote, df in lotes:
+        if execucao is None:
+            gravar_dataframe(df, tabela)
+        elif not execucao.lote_concluido(nu_lote):
+            if inserir_dataframe(
+                df, tabela, registro=execucao.registro_lote(nu_lote, len(df))
+            ):
+                execucao.lotes_concluidos.add(nu_lote)
+        else:
+            continue
+        qt_lotes += 1
+    if execucao is not None:
+        finalizar_execucao(execucao)
+    registrar_total_tabela(tabela, qt_lotes)
+
+
+def registrar_total_tabela(tabela: str, qt_lotes: int) -> None:
+    registros, duracao = metricas.totais_tabela(tabela)
+    logger.info(
+        f"{registros} registros inseridos na tabela {tabela} em {qt_lotes} lotes "
+        f"({registros / max(duracao, 1e-9):.0f} registros/s)."
+    )
+
+
+def gerar_em_lotes(
+    tabela: str,
+    elementos: Sequence,
+    gerar_registros: Callable[[Sequence, Faker, random.Random], Iterable[dict]],
+    tamanho_lote: Optional[int] = None,
+    execucao: Optional[ExecucaoCarga] = None,
+    regenerar_concluidos: bool = False,
+    coluna_id: Optional[str] = None,
+    id_inicial: int = 1,
+) -> Iterator[tuple]:
+    # Cada lote usa Faker e random com semente própria (tabela, número do lote),
+    # de modo que o conteúdo do lote não depende da ordem de geração. Devolve
+    # tuplas (nu_lote, DataFrame). Lotes já gravados pela execução não são
+    # gerados, exceto com regenerar_concluidos: etapas que reaproveitam dados
+    # de todos os lotes (ex.: preços dos produtos) precisam percorrê-los.
+    # Com coluna_id, o elemento i recebe o id id_inicial + i, pré-alocado pela
+    # carga em vez de atribuído pelo AUTO_INCREMENT.
+    gerador_sementes, chave = sementes, tabela
+    if execucao is not None:
+        gerador_sementes, chave = execucao.sementes, execucao.chave_semente
+        tamanho_lote = tamanho_lote or execucao.parametros["tamanho_lote"]
+    tamanho_lote = tamanho_lote or TAMANHO_LOTE_CARGA
+    for nu_lote, inicio in enumerate(range(0, len(elementos), tamanho_lote)):
+        if (
+            execucao is not None
+            and execucao.lote_concluido(nu_lote)
+            and not regenerar_concluidos
+        ):
+            continue
+        with metricas.medir("geracao"):
+            registros = list(
+                gerar_registros(
+                    elementos[inicio : inicio + tamanho_lote],
+                    gerador_sementes.faker(chave, nu_lote),
+                    gerador_sementes.aleatorio(chave, nu_lote),
+                )
+            )
+        with metricas.medir("dataframe"):
+            df = pd.DataFrame(registros)
+            if coluna_id is not None:
+                df.insert(
+                    0,
+                    coluna_id,
+                    np.arange(len(df), dtype=np.int64) + id_inicial + inicio,
+                )
+        yield nu_lote, df
+
+
+def registrar_resumo_carga() -> None:
+    for tabela in metricas.tabelas():
+        registros, duracao = metricas.totais_tabela(tabela)
+        logger.info(
+            f"Resumo {tabela}: {registros} registros em {duracao:.2f}s "
+            f"({registros / max(duracao, 1e-9):.0f} registros/s)."
+        )
 
 
 def remover_acentos(texto: str) -> str:
@@ -70,7 +366,7 @@ def inserir_unidade_federativa():
     df = pd.read_csv(CSV_BASE_PATH / "states.csv")
     df["id_usuario_criacao"] = ID_USUARIO_PADRAO
     df["id_usuario_atualizacao"] = ID_USUARIO_PADRAO
-    inserir_dataframe(df, "tb_unidade_federativa")
+    gravar_dataframe(df, "tb_unidade_federativa")
 
 
 def inserir_municipio():
@@ -81,7 +377,7 @@ def inserir_municipio():
     df_municipios = pd.read_csv(CSV_BASE_PATH / "cities.csv")
     df_ufs = pd.read_sql(
         "SELECT id_unidade_federativa, sg_unidade_federativa FROM tb_unidade_federativa",
-        engine,
+        obter_engine(),
     )
 
     df_merged = df_municipios.merge(df_ufs, on="sg_unidade_federativa", how="left")
@@ -90,8 +386,7 @@ def inserir_municipio():
         siglas_invalidas = df_merged.loc[
             df_merged["id_unidade_federativa"].isnull(), "sg_unidade_federativa"
         ].unique()
-        logger.error(f"Siglas inválidas: {siglas_invalidas}")
-        return
+        raise RuntimeError(f"Siglas inválidas: {siglas_invalidas}")
 
     df_merged["id_usuario_criacao"] = ID_USUARIO_PADRAO
     df_merged["id_usuario_atualizacao"] = ID_USUARIO_PADRAO
@@ -105,181 +400,273 @@ def inserir_municipio():
         "id_usuario_atualizacao",
     ]
 
-    inserir_dataframe(df_merged[colunas], "tb_municipio")
+    gravar_dataframe(df_merged[colunas], "tb_municipio")
+
+
+def registros_cliente(
+    indices: Sequence,
+    fake: Faker,
+    aleatorio: random.Random,
+    data_base: date,
+    id_inicial: int,
+) -> Iterator[dict]:
+    # O CPF é derivado do id pré-alocado do cliente (ver chaves_unicas).
+    cpfs = gerar_cpfs(np.asarray(indices, dtype=np.int64) + id_inicial)
+    for cpf in cpfs.tolist():
+        yield {
+            "no_cliente": fake.name(),
+            "nu_cpf": cpf,
+            "dt_nascimento": data_base
+            - timedelta(days=aleatorio.randint(18 * 365, 90 * 365)),
+            "in_ativo": aleatorio.choice([0, 1]),
+            "id_usuario_criacao": ID_USUARIO_PADRAO,
+            "id_usuario_atualizacao": ID_USUARIO_PADRAO,
+        }
 
 
-def inserir_cliente(qtd: int = 10000) -> None:
-    if not tabela_esta_vazia("tb_cliente"):
-        logger.info("tb_cliente já contém dados.")
+def inserir_cliente(qtd: int = QTD_CLIENTES) -> None:
+    execucao = preparar_execucao(
+        "tb_cliente",
+        lambda tamanho_lote: {
+            "qtd": qtd,
+            "id_cliente_maximo": maior_id("tb_cliente", "id_cliente"),
+            "qt_lote": contar_lotes(qtd, tamanho_lote),
+        },
+    )
+    if execucao is None:
         return
 
     try:
-        cpfs = set()
-        while len(cpfs) < qtd:
-            novo_cpf = fake.cpf().replace(".", "").replace("-", "")
-            cpfs.add(novo_cpf)
-
-        clientes = []
-        for cpf in cpfs:  # iterar diretamente no set gerado
-            clientes.append(
-                {
-                    "no_cliente": fake.name(),
-                    "nu_cpf": cpf,
-                    "dt_nascimento": fake.date_of_birth(minimum_age=18, maximum_age=90),
-                    "in_ativo": random.choice([0, 1]),
-                    "id_usuario_criacao": ID_USUARIO_PADRAO,
-                    "id_usuario_atualizacao": ID_USUARIO_PADRAO,
-                }
-            )
-
-        df = pd.DataFrame(clientes)
-        inserir_dataframe(df, "tb_cliente")
+        parametros = execucao.parametros
+        data_base = date.fromisoformat(parametros["data_referencia"])
+        id_inicial = parametros["id_cliente_maximo"] + 1
+        inserir_lotes(
+            gerar_em_lotes(
+                "tb_cliente",
+                range(parametros["qtd"]),
+                lambda indices, fake, aleatorio: registros_cliente(
+                    indices, fake, aleatorio, data_base, id_inicial
+                ),
+                execucao=execucao,
+                coluna_id="id_cliente",
+                id_inicial=id_inicial,
+            ),
+            "tb_cliente",
+            execucao,
+        )
+        registrar_ids_execucao(execucao, "tb_cliente", "id_cliente", parametros["qtd"])
     except Exception as e:
         logger.error(f"Erro ao inserir clientes: {e}")
+        raise
+
+
+def registros_cliente_endereco(
+    clientes_ids: Sequence,
+    fake: Faker,
+    aleatorio: random.Random,
+    municipios_ids: list,
+) -> Iterator[dict]:
+    for cliente_id in clientes_ids:
+        yield {
+            "id_cliente": cliente_id,
+            "id_municipio": aleatorio.choice(municipios_ids),
+            "no_logradouro": fake.street_name(),
+            "nu_endereco": str(aleatorio.randint(1, 9999)),
+            "ds_complemento": "SEM COMPLEMENTO",
+            "no_bairro": fake.city_suffix(),
+            "nu_cep": fake.postcode().replace("-", "")[:8],
+            "id_usuario_criacao": ID_USUARIO_PADRAO,
+            "id_usuario_atualizacao": ID_USUARIO_PADRAO,
+        }
 
 
-def inserir_cliente_endereco(qtd: int = 10000) -> None:
-    if not tabela_esta_vazia("tb_cliente_endereco"):
-        logger.info("tb_cliente_endereco já contém dados.")
+def inserir_cliente_endereco(qtd: int = QTD_CLIENTE_ENDERECOS) -> None:
+    def montar_parametros(tamanho_lote: int) -> dict:
+        parametros = faixa_clientes_pendentes("tb_cliente_endereco", tamanho_lote)
+        parametros["qtd"] = min(qtd, parametros["qtd"])
+        parametros["qt_lote"] = contar_lotes(parametros["qtd"], tamanho_lote)
+        return parametros
+
+    execucao = preparar_execucao("tb_cliente_endereco", montar_parametros)
+    if execucao is None:
         return
 
     try:
-        with engine.connect() as conn:
-            clientes_ids = [
-                row[0]
-                for row in conn.execute(
-                    text("SELECT id_cliente FROM tb_cliente")
-                ).fetchall()
-            ]
+        parametros = execucao.parametros
+        clientes_ids = listar_ids(
+            "tb_cliente",
+            "id_cliente",
+            parametros["id_cliente_inicio"],
+            parametros["id_cliente_fim"],
+        )
+        with obter_engine().connect() as conn:
             municipios_ids = [
                 row[0]
                 for row in conn.execute(
-                    text("SELECT id_municipio FROM tb_municipio")
+                    text("SELECT id_municipio FROM tb_municipio ORDER BY id_municipio")
                 ).fetchall()
             ]
 
-        qtd = min(qtd, len(clientes_ids))
-        clientes_selecionados = random.sample(clientes_ids, qtd)
-
-        registros = []
-        for cliente_id in clientes_selecionados:
-            municipio_id = random.choice(municipios_ids)
-            registros.append(
-                {
-                    "id_cliente": cliente_id,
-                    "id_municipio": municipio_id,
-                    "no_logradouro": fake.street_name(),
-                    "nu_endereco": str(random.randint(1, 9999)),
-                    "ds_complemento": "SEM COMPLEMENTO",
-                    "no_bairro": fake.city_suffix(),
-                    "nu_cep": fake.postcode().replace("-", "")[:8],
-                    "id_usuario_criacao": ID_USUARIO_PADRAO,
-                    "id_usuario_atualizacao": ID_USUARIO_PADRAO,
-                }
-            )
+        amostra = execucao.sementes.numpy(f"{execucao.chave_semente}.amostra", 0)
+        clientes_selecionados = amostra.choice(
+            clientes_ids, parametros["qtd"], replace=False
+        )
 
-        df = pd.DataFrame(registros)
-        inserir_dataframe(df, "tb_cliente_endereco")
+        inserir_lotes(
+            gerar_em_lotes(
+                "tb_cliente_endereco",
+                clientes_selecionados,
+                lambda clientes, fake, aleatorio: registros_cliente_endereco(
+                    clientes, fake, aleatorio, municipios_ids
+                ),
+                execucao=execucao,
+            ),
+            "tb_cliente_endereco",
+            execucao,
+        )
     except Exception as e:
         logger.error(f"Erro ao inserir endereços de clientes: {e}")
+        raise
+
+
+def registros_cliente_email(
+    clientes_ids: Sequence,
+    fake: Faker,
+    aleatorio: random.Random,
+    max_emails_por_cliente: int,
+) -> Iterator[dict]:
+    rng = np.random.default_rng(aleatorio.getrandbits(64))
+    qtd_emails = rng.integers(1, max_emails_por_cliente + 1, size=len(clientes_ids))
+    ids_cliente = np.repeat(np.asarray(clientes_ids, dtype=np.int64), qtd_emails)
+    # Posição de cada e-mail dentro do seu cliente: 0, 1, ... (0 é o principal).
+    ordinais = np.arange(len(ids_cliente)) - np.repeat(
+        np.cumsum(qtd_emails) - qtd_emails, qtd_emails
+    )
+    emails = gerar_emails(ids_cliente, ordinais, rng)
+    for cliente_id, ordinal, email in zip(
+        ids_cliente.tolist(), ordinais.tolist(), emails.tolist()
+    ):
+        yield {
+            "id_cliente": cliente_id,
+            "tx_email": email,
+            "in_principal": 1 if ordinal == 0 else 0,
+            "id_usuario_criacao": ID_USUARIO_PADRAO,
+            "id_usuario_atualizacao": ID_USUARIO_PADRAO,
+        }
 
 
 def inserir_cliente_email(max_emails_por_cliente: int = 3) -> None:
-    if not tabela_esta_vazia("tb_cliente_email"):
-        logger.info("tb_cliente_email já contém dados.")
+    execucao = preparar_execucao(
+        "tb_cliente_email",
+        lambda tamanho_lote: {
+            **faixa_clientes_pendentes("tb_cliente_email", tamanho_lote),
+            "max_emails_por_cliente": max_emails_por_cliente,
+        },
+    )
+    if execucao is None:
         return
 
     try:
-        with engine.connect() as conn:
-            clientes_ids = [
-                row[0]
-                for row in conn.execute(
-                    text("SELECT id_cliente FROM tb_cliente")
-                ).fetchall()
-            ]
-
-        registros = []
-        for cliente_id in clientes_ids:
-            qtd_emails = random.randint(1, max_emails_por_cliente)
-            emails_gerados = set()
-
-            for i in range(qtd_emails):
-                while True:
-                    email = fake.email()
-                    if email not in emails_gerados:
-                        emails_gerados.add(email)
-                        break
-
-                registros.append(
-                    {
-                        "id_cliente": cliente_id,
-                        "tx_email": email,
-                        "in_principal": 1 if i == 0 else 0,
-                        "id_usuario_criacao": ID_USUARIO_PADRAO,
-                        "id_usuario_atualizacao": ID_USUARIO_PADRAO,
-                    }
-                )
+        parametros = execucao.parametros
+        clientes_ids = listar_ids(
+            "tb_cliente",
+            "id_cliente",
+            parametros["id_cliente_inicio"],
+            parametros["id_cliente_fim"],
+        )
 
-        df = pd.DataFrame(registros)
-        inserir_dataframe(df, "tb_cliente_email")
+        inserir_lotes(
+            gerar_em_lotes(
+                "tb_cliente_email",
+                clientes_ids,
+                lambda clientes, fake, aleatorio: registros_cliente_email(
+                    clientes, fake, aleatorio, parametros["max_emails_por_cliente"]
+                ),
+                execucao=execucao,
+            ),
+            "tb_cliente_email",
+            execucao,
+        )
 
     except Exception as e:
         logger.error(f"Erro ao inserir emails de clientes: {e}")
+        raise
+
+
+def registros_cliente_contato(
+    clientes_ids: Sequence,
+    fake: Faker,
+    aleatorio: random.Random,
+    max_contatos_por_cliente: int,
+) -> Iterator[dict]:
+    tipos_contato_validos = [
+        1,
+        2,
+        3,
+        4,
+    ]  # 1-Celular, 2-Fixo, 3-Comercial, 4-Whatsapp
+
+    for cliente_id in clientes_ids:
+        qtd_contatos = aleatorio.randint(1, max_contatos_por_cliente)
+        contatos_gerados = set()
+
+        for i in range(qtd_contatos):
+            while True:
+                ddd = aleatorio.randint(11, 99)
+                telefone_numero = fake.msisdn()[-8:]
+                tipo = aleatorio.choice(tipos_contato_validos)
+                chave_unica = (cliente_id, ddd, telefone_numero, tipo)
+                if chave_unica not in contatos_gerados:
+                    contatos_gerados.add(chave_unica)
+                    break
+
+            yield {
+                "id_cliente": cliente_id,
+                "nu_ddd": ddd,
+                "nu_telefone": telefone_numero,
+                "tp_contato": tipo,
+                "in_principal": 1 if i == 0 else 0,
+                "id_usuario_criacao": ID_USUARIO_PADRAO,
+                "id_usuario_atualizacao": ID_USUARIO_PADRAO,
+            }
 
 
 def inserir_cliente_contato(max_contatos_por_cliente: int = 3) -> None:
-    if not tabela_esta_vazia("tb_cliente_contato"):
-        logger.info("tb_cliente_contato já contém dados.")
+    execucao = preparar_execucao(
+        "tb_cliente_contato",
+        lambda tamanho_lote: {
+            **faixa_clientes_pendentes("tb_cliente_contato", tamanho_lote),
+            "max_contatos_por_cliente": max_contatos_por_cliente,
+        },
+    )
+    if execucao is None:
         return
 
     try:
-        with engine.connect() as conn:
-            clientes_ids = [
-                row[0]
-                for row in conn.execute(
-                    text("SELECT id_cliente FROM tb_cliente")
-                ).fetchall()
-            ]
-
-        registros = []
-        tipos_contato_validos = [
-            1,
-            2,
-            3,
-            4,
-        ]  # 1-Celular, 2-Fixo, 3-Comercial, 4-Whatsapp
-
-        for cliente_id in clientes_ids:
-            qtd_contatos = random.randint(1, max_contatos_por_cliente)
-            contatos_gerados = set()
-
-            for i in range(qtd_contatos):
-                while True:
-                    ddd = random.randint(11, 99)
-                    telefone_numero = fake.msisdn()[-8:]
-                    tipo = random.choice(tipos_contato_validos)
-                    chave_unica = (cliente_id, ddd, telefone_numero, tipo)
-                    if chave_unica not in contatos_gerados:
-                        contatos_gerados.add(chave_unica)
-                        break
-
-                registros.append(
-                    {
-                        "id_cliente": cliente_id,
-                        "nu_ddd": ddd,
-                        "nu_telefone": telefone_numero,
-                        "tp_contato": tipo,
-                        "in_principal": 1 if i == 0 else 0,
-                        "id_usuario_criacao": ID_USUARIO_PADRAO,
-                        "id_usuario_atualizacao": ID_USUARIO_PADRAO,
-                    }
-                )
+        parametros = execucao.parametros
+        clientes_ids = listar_ids(
+            "tb_cliente",
+            "id_cliente",
+            parametros["id_cliente_inicio"],
+            parametros["id_cliente_fim"],
+        )
 
-        df = pd.DataFrame(registros)
-        inserir_dataframe(df, "tb_cliente_contato")
+        inserir_lotes(
+            gerar_em_lotes(
+                "tb_cliente_contato",
+                clientes_ids,
+                lambda clientes, fake, aleatorio: registros_cliente_contato(
+                    clientes, fake, aleatorio, parametros["max_contatos_por_cliente"]
+                ),
+                execucao=execucao,
+            ),
+            "tb_cliente_contato",
+            execucao,
+        )
 
     except Exception as e:
         logger.error(f"Erro ao inserir contatos de clientes: {e}")
+        raise
 
 
 def inserir_produto_categoria() -> None:
@@ -323,10 +710,11 @@ def inserir_produto_categoria() -> None:
             )
 
         df = pd.DataFrame(registros)
-        inserir_dataframe(df, "tb_produto_categoria")
+        gravar_dataframe(df, "tb_produto_categoria")
 
     except Exception as e:
         logger.error(f"Erro ao inserir categorias fixas: {e}")
+        raise
 
 
 def inserir_produto_medida() -> None:
@@ -373,274 +761,707 @@ def inserir_produto_medida() -> None:
             )
 
         df = pd.DataFrame(registros)
-        inserir_dataframe(df, "tb_produto_unidade_medida")
+        gravar_dataframe(df, "tb_produto_unidade_medida")
     except Exception as e:
         logger.error(f"Erro ao inserir unidades de medida: {e}")
+        raise
+
+
+def registros_produto(
+    indices: Sequence,
+    fake: Faker,
+    aleatorio: random.Random,
+    categorias: np.ndarray,
+    unidades_medida: list,
+    id_inicial: int,
+) -> Iterator[dict]:
+    # O nome é derivado do id pré-alocado do produto (ver chaves_unicas).
+    indices = np.asarray(indices, dtype=np.int64)
+    nomes = gerar_nomes_produto(
+        indices + id_inicial, np.random.default_rng(aleatorio.getrandbits(64))
+    )
+    for categoria_id, nome_produto in zip(categorias[indices].tolist(), nomes.tolist()):
+        yield {
+            "id_produto_categoria": categoria_id,
+            "id_produto_unidade_medida": aleatorio.choice(unidades_medida),
+            "no_produto": nome_produto,
+            "ds_produto": fake.text(max_nb_chars=500),
+            "vl_produto_unitario": round(aleatorio.uniform(10.0, 1000.0), 2),
+            "in_ativo": 1,
+            "id_usuario_criacao": ID_USUARIO_PADRAO,
+            "id_usuario_atualizacao": ID_USUARIO_PADRAO,
+        }
 
 
-def inserir_produto(max_por_categoria: int = 50) -> None:
-    if not tabela_esta_vazia("tb_produto"):
-        logger.info("tb_produto já contém dados.")
-        return
-
+def inserir_produto(max_por_categoria: int = QTD_PRODUTOS_POR_CATEGORIA) -> None:
     try:
-        with engine.connect() as conn:
+        with obter_engine().connect() as conn:
             categorias = [
                 row[0]
                 for row in conn.execute(
-                    text("SELECT id_produto_categoria FROM tb_produto_categoria")
+                    text(
+                        "SELECT id_produto_categoria FROM tb_produto_categoria "
+                        "ORDER BY id_produto_categoria"
+                    )
                 ).fetchall()
             ]
             unidades_medida = [
                 row[0]
                 for row in conn.execute(
                     text(
-                        "SELECT id_produto_unidade_medida FROM tb_produto_unidade_medida"
+                        "SELECT id_produto_unidade_medida FROM tb_produto_unidade_medida "
+                        "ORDER BY id_produto_unidade_medida"
                     )
                 ).fetchall()
             ]
 
             if not categorias or not unidades_medida:
-                logger.error(
+                raise RuntimeError(
                     "Categorias ou unidades de medida não encontradas. Insira-as antes de inserir produtos."
                 )
-                return
-
-        produtos = []
-        nomes_usados = set()
-
-        for categoria_id in categorias:
-            for _ in range(max_por_categoria):
-                # Garante nome único
-                while True:
-                    nome_produto = fake.unique.catch_phrase()[:150]  # Limita tamanho
-                    if nome_produto not in nomes_usados:
-                        nomes_usados.add(nome_produto)
-                        break
-
-                produtos.append(
-                    {
-                        "id_produto_categoria": categoria_id,
-                        "id_produto_unidade_medida": random.choice(unidades_medida),
-                        "no_produto": nome_produto.upper(),
-                        "ds_produto": fake.text(max_nb_chars=500),
-                        "vl_produto_unitario": round(random.uniform(10.0, 1000.0), 2),
-                        "in_ativo": 1,
-                        "id_usuario_criacao": ID_USUARIO_PADRAO,
-                        "id_usuario_atualizacao": ID_USUARIO_PADRAO,
-                    }
-                )
 
-        df = pd.DataFrame(produtos)
-        inserir_dataframe(df, "tb_produto")
+        execucao = preparar_execucao(
+            "tb_produto",
+            lambda tamanho_lote: {
+                "qtd_por_categoria": max_por_categoria,
+                "id_produto_maximo": maior_id("tb_produto", "id_produto"),
+                "qt_lote": contar_lotes(
+                    len(categorias) * max_por_categoria, tamanho_lote
+                ),
+            },
+        )
+        if execucao is None:
+            return
+
+        parametros = execucao.parametros
+        categorias_produto = np.repeat(categorias, parametros["qtd_por_categoria"])
+        id_inicial = parametros["id_produto_maximo"] + 1
+        # Todos os lotes são regerados: os preços vão para o registro de ids.
+        precos_centavos = {}
+
+        def coletar_precos(lotes: Iterable[tuple]) -> Iterator[tuple]:
+            for nu_lote, df in lotes:
+                precos_centavos[nu_lote] = np.rint(
+                    df["vl_produto_unitario"].to_numpy() * 100
+                ).astype(np.int64)
+                yield nu_lote, df
+
+        inserir_lotes(
+            coletar_precos(
+                gerar_em_lotes(
+                    "tb_produto",
+                    range(len(categorias_produto)),
+                    lambda indices, fake, aleatorio: registros_produto(
+                        indices,
+                        fake,
+                        aleatorio,
+                        categorias_produto,
+                        unidades_medida,
+                        id_inicial,
+                    ),
+                    execucao=execucao,
+                    regenerar_concluidos=True,
+                    coluna_id="id_produto",
+                    id_inicial=id_inicial,
+                )
+            ),
+            "tb_produto",
+            execucao,
+        )
+        registrar_ids_execucao(
+            execucao,
+            "tb_produto",
+            "id_produto",
+            len(categorias) * parametros["qtd_por_categoria"],
+            vl_centavos=np.concatenate(
+                [precos_centavos[n] for n in sorted(precos_centavos)]
+                or [np.empty(0, dtype=np.int64)]
+            ),
+            id_produto_categoria=np.asarray(categorias_produto, dtype=np.int64),
+        )
     except Exception as e:
         logger.error(f"Erro ao inserir produtos: {e}")
-
-
-def inserir_pedido(qtd: int = 5000) -> None:
-    if not tabela_esta_vazia("tb_pedido"):
-        logger.info("tb_pedido já contém dados.")
+        raise
+
+
+def inserir_pedido(qtd: int = QTD_PEDIDOS, max_itens: int = 20) -> None:
+    # Pedidos e itens são gerados juntos: vl_pedido_total já chega calculado
+    # em tb_pedido e não há atualização posterior a partir de tb_pedido_item.
+    execucao = preparar_execucao(
+        "tb_pedido",
+        lambda tamanho_lote: {
+            "qtd": qtd,
+            "max_itens": max_itens,
+            "id_inicial": maior_id("tb_pedido", "id_pedido") + 1,
+            "id_cliente_maximo": maior_id("tb_cliente", "id_cliente"),
+            "id_produto_maximo": maior_id("tb_produto", "id_produto"),
+            "qt_lote": contar_lotes(qtd, pedidos_por_lote(tamanho_lote, max_itens)),
+            "distribuicoes": distribuicoes_carga,
+        },
+    )
+    if execucao is None:
         return
 
-    with engine.connect() as conn:
-        clientes = [
-            row[0] for row in conn.execute(text("SELECT id_cliente FROM tb_cliente"))
-        ]
-        situacoes = [
-            row[0]
-            for row in conn.execute(
-                text("SELECT co_pedido_situacao FROM tb_pedido_situacao")
+    try:
+        parametros = execucao.parametros
+        with obter_engine().connect() as conn:
+            nomes_situacao = dict(
+                conn.execute(
+                    text(
+                        "SELECT co_pedido_situacao, no_pedido_situacao "
+                        "FROM tb_pedido_situacao ORDER BY co_pedido_situacao"
+                    )
+                ).all()
             )
-        ]
-
-    pedidos = []
-    for _ in range(qtd):
-        pedido = {
-            "id_cliente": random.choice(clientes),
-            "co_pedido_situacao": random.choice(situacoes),
-            "dt_pedido": fake.date_between(start_date="-1y", end_date="today"),
-            "vl_pedido_total": 0,
-            "tx_observacao": fake.text(100) if random.random() > 0.5 else None,
-            "id_usuario_criacao": ID_USUARIO_PADRAO,
-            "id_usuario_atualizacao": ID_USUARIO_PADRAO,
-        }
-        pedidos.append(pedido)
+        situacoes = np.array(list(nomes_situacao), dtype=np.int64)
+        # Execuções gravadas antes das distribuições não têm a chave: seguem
+        # uniformes, como foram iniciadas.
+        amostragem = AmostragemPedido(
+            parametros.get("distribuicoes"),
+            execucao.sementes.inteiro(f"{execucao.chave_semente}.distribuicao", 0),
+            nomes_situacao,
+        )
+        clientes = listar_ids(
+            "tb_cliente", "id_cliente", id_fim=parametros["id_cliente_maximo"]
+        )
+        produtos = registro_ids.faixa(
+            "tb_produto", carregar_produtos, id_fim=parametros["id_produto_maximo"]
+        )
+        ids_produto = produtos["id"]
+        categorias_produto = produtos["id_produto_categoria"]
+        precos_centavos = produtos["vl_centavos"]
+        fake = execucao.sementes.faker(f"{execucao.chave_semente}.observacao", 0)
+        textos_observacao = [fake.text(100) for _ in range(QT_TEXTOS_OBSERVACAO)]
+
+        # O gerador monta os DataFrames junto com os valores: todo o tempo dele
+        # conta como geração.
+        lotes = gerar_lotes_pedidos(
+            parametros["qtd"],
+            parametros["id_inicial"],
+            clientes,
+            situacoes,
+            textos_observacao,
+            ids_produto,
+            categorias_produto,
+            precos_centavos,
+            parametros["max_itens"],
+            lambda nu_lote: execucao.sementes.numpy(execucao.chave_semente, nu_lote),
+            ID_USUARIO_PADRAO,
+            parametros["tamanho_lote"],
+            date.fromisoformat(parametros["data_referencia"]),
+            lotes_ignorados=execucao.lotes_concluidos,
+            amostragem=amostragem,
+        )
+        qt_lotes = 0
+        for nu_lote, df_pedidos, df_itens in metricas.medir_iteracao(lotes, "geracao"):
+            qt_lotes += 1
+            if execucao.retomada:
+                remover_pedidos(
+                    int(df_pedidos["id_pedido"].iloc[0]),
+                    int(df_pedidos["id_pedido"].iloc[-1]),
+                )
+            # O lote é registrado junto com os itens: um lote com pedidos
+            # gravados e itens não gravados continua pendente.
+            if inserir_dataframe(df_pedidos, "tb_pedido") and inserir_dataframe(
+                df_itens,
+                "tb_pedido_item",
+                registro=execucao.registro_lote(nu_lote, len(df_pedidos)),
+            ):
+                execucao.lotes_concluidos.add(nu_lote)
+
+        finalizar_execucao(execucao)
+        registrar_total_tabela("tb_pedido", qt_lotes)
+        registrar_total_tabela("tb_pedido_item", qt_lotes)
+    except Exception as e:
+        logger.error(f"Erro ao inserir pedidos e itens de pedido: {e}")
+        raise
+
+
+def remover_pedidos(id_inicio: int, id_fim: int) -> None:
+    # Restos de um lote interrompido (pedidos gravados sem os itens, ou fatias
+    # de um lote gravado em vários commits) são descartados antes de regravá-lo.
+    with obter_engine().begin() as conn:
+        parametros = {"id_inicio": id_inicio, "id_fim": id_fim}
+        conn.execute(
+            text(
+                "DELETE FROM tb_pedido_item "
+                "WHERE id_pedido BETWEEN :id_inicio AND :id_fim"
+            ),
+            parametros,
+        )
+        conn.execute(
+            text(
+                "DELETE FROM tb_pedido WHERE id_pedido BETWEEN :id_inicio AND :id_fim"
+            ),
+            parametros,
+        )
 
-    df = pd.DataFrame(pedidos)
-    inserir_dataframe(df, "tb_pedido")
 
+def verificar_totais_pedido(tamanho_lote: int = 50000) -> int:
+    # Compara vl_pedido_total com a soma dos itens, em faixas de id_pedido,
+    # para não varrer as tabelas em uma única consulta.
+    with obter_engine().connect() as conn:
+        id_minimo, id_maximo = conn.execute(
+            text("SELECT MIN(id_pedido), MAX(id_pedido) FROM tb_pedido")
+        ).one()
 
-def inserir_pedido_item(max_itens: int = 20) -> None:
-    if not tabela_esta_vazia("tb_pedido_item"):
-        logger.info("tb_pedido_item já contém dados.")
-        return
+    if id_minimo is None:
+        logger.info("tb_pedido está vazia: nada a verificar.")
+        return 0
 
-    try:
-        with engine.connect() as conn:
-            pedidos = [
-                row[0] for row in conn.execute(text("SELECT id_pedido FROM tb_pedido"))
-            ]
-            produtos = conn.execute(
-                text("SELECT id_produto, vl_produto_unitario FROM tb_produto")
-            ).fetchall()
-
-        itens = []
-        for pedido_id in pedidos:
-            qtd_itens = random.randint(1, min(max_itens, len(produtos)))
-            produtos_sorteados = random.sample(produtos, qtd_itens)  # sem repetição
-
-            for prod in produtos_sorteados:
-                qt = random.randint(1, 50)
-                vl_unitario = prod.vl_produto_unitario  # já é Decimal
-                qt_decimal = Decimal(str(qt))
-                max_desconto = (vl_unitario * qt_decimal * Decimal("0.3")).quantize(
-                    Decimal("0.01"), rounding=ROUND_HALF_UP
-                )
-                desconto_decimal = Decimal(
-                    str(random.uniform(0, float(max_desconto)))
-                ).quantize(Decimal("0.01"), rounding=ROUND_HALF_UP)
-                total = (vl_unitario * qt_decimal - desconto_decimal).quantize(
-                    Decimal("0.01"), rounding=ROUND_HALF_UP
+    divergencias = 0
+    for inicio in range(id_minimo, id_maximo + 1, tamanho_lote):
+        with obter_engine().connect() as conn:
+            ids_divergentes = (
+                conn.execute(
+                    text(
+                        """
+                    SELECT p.id_pedido
+                    FROM tb_pedido p
+                    LEFT JOIN (
+                        SELECT id_pedido, SUM(vl_item_total) AS total
+                        FROM tb_pedido_item
+                        WHERE id_pedido BETWEEN :inicio AND :fim
+                        GROUP BY id_pedido
+                    ) t ON p.id_pedido = t.id_pedido
+                    WHERE p.id_pedido BETWEEN :inicio AND :fim
+                      AND p.vl_pedido_total <> IFNULL(t.total, 0)
+                """
+                    ),
+                    {"inicio": inicio, "fim": inicio + tamanho_lote - 1},
                 )
+                .scalars()
+                .all()
+            )
+        if ids_divergentes:
+            divergencias += len(ids_divergentes)
+            logger.error(
+                f"Pedidos com total divergente dos itens: {ids_divergentes[:20]}"
+            )
 
-                item = {
-                    "id_pedido": pedido_id,
-                    "id_produto": prod.id_produto,
-                    "qt_item": qt,
-                    "vl_unitario": vl_unitario,
-                    "vl_desconto": desconto_decimal,
-                    "vl_item_total": total,
-                    "id_usuario_criacao": ID_USUARIO_PADRAO,
-                    "id_usuario_atualizacao": ID_USUARIO_PADRAO,
-                }
-                itens.append(item)
+    if divergencias:
+        logger.error(f"{divergencias} pedidos com vl_pedido_total divergente.")
+    else:
+        logger.info("Totais dos pedidos conferem com a soma dos itens.")
+    return divergencias
+
+
+def atualizar_rollup_venda() -> None:
+    # Recalcula os consolidados do período em que a carga gera pedidos, em uma
+    # única passada sobre tb_pedido e tb_pedido_item. Uma carga retomada usa a
+    # data de referência gravada na execução de tb_pedido.
+    execucao = buscar_ultima_execucao(obter_engine(), "tb_pedido")
+    referencia = (
+        date.fromisoformat(execucao.parametros["data_referencia"])
+        if execucao is not None
+        else data_referencia
+    )
+    inicio = time.perf_counter()
+    with obter_engine().begin() as conn:
+        conn.execute(
+            text("CALL prc_carga_rollup_venda(:inicio, :fim)"),
+            {
+                "inicio": referencia - timedelta(days=DIAS_PERIODO_PEDIDO),
+                "fim": referencia,
+            },
+        )
+    # A procedure muda a marca d'água; o cache deste processo é descartado
+    # sem esperar a próxima consulta.
+    cache_relatorio.invalidar()
+    logger.info(
+        f"Consolidados tb_venda_dia e tb_venda_produto_dia recalculados em "
+        f"{time.perf_counter() - inicio:.2f}s."
+    )
+
+
+def verificar_copias_pedido_item(tamanho_lote: int = 50000) -> int:
+    # Conta, em faixas de id_pedido, os itens cujas cópias de data e categoria
+    # (V025) diferem de tb_pedido.dt_pedido e tb_produto.id_produto_categoria.
+    with obter_engine().connect() as conn:
+        id_minimo, id_maximo = conn.execute(
+            text("SELECT MIN(id_pedido), MAX(id_pedido) FROM tb_pedido")
+        ).one()
 
-        df = pd.DataFrame(itens)
-        inserir_dataframe(df, "tb_pedido_item")
+    if id_minimo is None:
+        logger.info("tb_pedido está vazia: nada a verificar.")
+        return 0
 
-        with engine.begin() as conn:
+    divergencias = 0
+    for inicio in range(id_minimo, id_maximo + 1, tamanho_lote):
+        with obter_engine().connect() as conn:
+            ids_divergentes = (
+                conn.execute(
+                    text(
+                        """
+                    SELECT pediitem.id_pedido_item
+                    FROM tb_pedido_item pediitem
+                    INNER JOIN tb_pedido pedido ON pediitem.id_pedido = pedido.id_pedido
+                    INNER JOIN tb_produto produto ON pediitem.id_produto = produto.id_produto
+                    WHERE pediitem.id_pedido BETWEEN :inicio AND :fim
+                      AND (pediitem.dt_pedido <> pedido.dt_pedido
+                           OR pediitem.id_produto_categoria <> produto.id_produto_categoria)
+                """
+                    ),
+                    {"inicio": inicio, "fim": inicio + tamanho_lote - 1},
+                )
+                .scalars()
+                .all()
+            )
+        if ids_divergentes:
+            divergencias += len(ids_divergentes)
+            logger.error(
+                f"Itens com data ou categoria divergente do pedido ou do produto: "
+                f"{ids_divergentes[:20]}"
+            )
+
+    if divergencias:
+        logger.error(f"{divergencias} itens com cópias divergentes.")
+    else:
+        logger.info("Cópias de data e categoria em tb_pedido_item conferem.")
+    return divergencias
+
+
+def verificar_rollup_venda(periodos_dias: Sequence[int] = (30, 90, 365)) -> int:
+    # Compara o JSON de prc_relatorio_venda_periodo (lido dos consolidados) com o
+    # mesmo relatório agregado diretamente de tb_pedido, tb_pedido_item e
+    # tb_produto. A data e a categoria vêm das tabelas de origem, e não das
+    # cópias em tb_pedido_item, que alimentam os consolidados: uma divergência
+    # das cópias apareceria nos dois lados (ver verificar_copias_pedido_item).
+    with obter_engine().connect() as conn:
+        categorias = (
             conn.execute(
                 text(
-                    """
-                UPDATE tb_pedido p
-                JOIN (
-                    SELECT id_pedido, SUM(vl_item_total) AS total
-                    FROM tb_pedido_item
-                    GROUP BY id_pedido
-                ) t ON p.id_pedido = t.id_pedido
-                SET p.vl_pedido_total = t.total
-            """
+                    "SELECT no_produto_categoria FROM tb_produto_categoria "
+                    "ORDER BY no_produto_categoria"
                 )
             )
-            logger.info("Total dos pedidos atualizados com sucesso.")
-
-    except Exception as e:
-        logger.error(f"Erro ao inserir itens de pedido ou atualizar total: {e}")
+            .scalars()
+            .all()
+        )
 
+    divergencias = 0
+    for dias, categoria in [(d, c) for d in periodos_dias for c in categorias]:
+        parametros = {
+            "data_inicio": data_referencia - timedelta(days=dias),
+            "data_fim": data_referencia,
+            "categoria": categoria,
+        }
+        with obter_engine().connect() as conn:
+            qt_pedido, vl_total, vl_media = conn.execute(
+                text(
+                    """
+                    SELECT COUNT(1),
+                           ROUND(IFNULL(SUM(vl_pedido_total), 0), 2),
+                           ROUND(IFNULL(AVG(vl_pedido_total), 0), 2)
+                    FROM tb_pedido
+                    WHERE dt_pedido BETWEEN :data_inicio AND :data_fim
+                """
+                ),
+                parametros,
+            ).one()
+            produtos = conn.execute(
+                text(
+                    """
+                    SELECT produto.no_produto, SUM(pediitem.qt_item)
+                    FROM tb_pedido_item pediitem
+                    INNER JOIN tb_pedido pedido ON pediitem.id_pedido = pedido.id_pedido
+                    INNER JOIN tb_produto produto ON pediitem.id_produto = produto.id_produto
+                    INNER JOIN tb_produto_categoria prodcate
+                        ON produto.id_produto_categoria = prodcate.id_produto_categoria
+                    WHERE prodcate.no_produto_categoria = :categoria
+                      AND pedido.dt_pedido BETWEEN :data_inicio AND :data_fim
+                    GROUP BY produto.no_produto
+                """
+                ),
+                parametros,
+            ).all()
+
+        raw_conn = obter_engine().raw_connection()
+        try:
+            cursor = raw_conn.cursor()
+            resultado = cursor.callproc(
+                "prc_relatorio_venda_periodo",
+                [parametros["data_inicio"], parametros["data_fim"], categoria, None],
+            )
+            cursor.close()
+        finally:
+            raw_conn.close()
 
-# ========== TESTE ==========
-def consultar_relatorio_venda_periodo(
-    data_inicio: str = "2025-01-01",
-    data_fim: str = "2025-06-01",
-    categoria: str = "ELETRONICOS",
-) -> Optional[dict]:
-    raw_conn = None
-    cursor = None
-    try:
-        raw_conn = engine.raw_connection()
-        cursor = raw_conn.cursor()
+        esperado = {
+            "qt_total_pedido": qt_pedido,
+            "vl_total_pedido": Decimal(vl_total),
+            "vl_media_pedido": Decimal(vl_media),
+            "dc_produto": sorted((nome, Decimal(qt)) for nome, qt in produtos),
+        }
+        relatorio = json.loads(resultado[-1], parse_float=Decimal)
+        obtido = {
+            "qt_total_pedido": relatorio["qt_total_pedido"],
+            "vl_total_pedido": Decimal(relatorio["vl_total_pedido"]),
+            "vl_media_pedido": Decimal(relatorio["vl_media_pedido"]),
+            # A ordem de JSON_ARRAYAGG não é garantida em nenhuma das versões.
+            "dc_produto": sorted(
+                (produto["no_produto"], Decimal(produto["qt_item_vendido"]))
+                for produto in relatorio["dc_produto"]
+            ),
+        }
+        if obtido != esperado:
+            divergencias += 1
+            logger.error(
+                f"Relatório de venda divergente para {dias} dias / {categoria}: "
+                f"consolidado {obtido} | detalhe {esperado}"
+            )
 
-        params = [data_inicio, data_fim, categoria, None]
-        resultado = cursor.callproc("prc_relatorio_venda_periodo", params)
+    if divergencias:
+        logger.error(f"{divergencias} relatórios de venda divergentes do detalhe.")
+    else:
+        logger.info("Relatório de venda pelos consolidados confere com o detalhe.")
+    return divergencias
 
-        relatorio_str = resultado[-1]
 
-        if relatorio_str:
-            relatorio_json = json.loads(relatorio_str)
-            logger.info(
-                "Relatório de venda por período consultado com sucesso:\n"
-                + json.dumps(relatorio_json, indent=4, ensure_ascii=False)
-            )
-            return relatorio_json
-        else:
-            logger.warning("Procedure retornou resultado vazio.")
-            return None
+# ========== EXECUÇÃO PRINCIPAL ==========
+def escalar(qtd: int, fator_escala: float) -> int:
+    return max(1, round(qtd * fator_escala))
+
+
+def montar_etapas(fator_escala: float = 1.0) -> list:
+    # Cada etapa declara as tabelas das quais depende; etapas independentes
+    # (ex.: endereço, email e contato do cliente) rodam em paralelo.
+    return [
+        Etapa("tb_unidade_federativa", inserir_unidade_federativa),
+        Etapa("tb_municipio", inserir_municipio, ("tb_unidade_federativa",)),
+        Etapa(
+            "tb_cliente",
+            lambda: inserir_cliente(escalar(QTD_CLIENTES, fator_escala)),
+        ),
+        Etapa(
+            "tb_cliente_endereco",
+            lambda: inserir_cliente_endereco(
+                escalar(QTD_CLIENTE_ENDERECOS, fator_escala)
+            ),
+            ("tb_cliente", "tb_municipio"),
+        ),
+        Etapa("tb_cliente_email", inserir_cliente_email, ("tb_cliente",)),
+        Etapa("tb_cliente_contato", inserir_cliente_contato, ("tb_cliente",)),
+        Etapa("tb_produto_categoria", inserir_produto_categoria),
+        Etapa("tb_produto_unidade_medida", inserir_produto_medida),
+        Etapa(
+            "tb_produto",
+            lambda: inserir_produto(escalar(QTD_PRODUTOS_POR_CATEGORIA, fator_escala)),
+            ("tb_produto_categoria", "tb_produto_unidade_medida"),
+        ),
+        # Gera tb_pedido e tb_pedido_item juntos.
+        Etapa(
+            "tb_pedido",
+            lambda: inserir_pedido(escalar(QTD_PEDIDOS, fator_escala)),
+            ("tb_cliente", "tb_produto"),
+        ),
+        # Recalcula tb_venda_dia e tb_venda_produto_dia, cujos triggers ficam
+        # desligados durante a carga.
+        Etapa("tb_venda_dia", atualizar_rollup_venda, ("tb_pedido",)),
+    ]
 
-    except Exception as e:
-        logger.error(f"Erro ao consultar relatório de venda por período: {e}")
-        return None
 
+def main() -> int:
+    global sementes, data_referencia, retomar_carga, anexar_carga, exportador
+    global distribuicoes_carga
 
-def consultar_relatorio_pedido_cliente_valor_minino(
-    data_inicio: str = "2025-01-01",
-    data_fim: str = "2025-06-01",
-    situacao_pedido: str = "CONCLUIDO",
-    valor_minimo: float = 10000.00,
-    valor_limit: int = 20,
-    nu_pagina: int = 1,
-) -> Optional[dict]:
-    raw_conn = None
-    cursor = None
+    parser = argparse.ArgumentParser(description="Carga de dados do Boa Compra")
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=WORKERS_CARGA,
+        help="Quantidade de etapas executadas em paralelo",
+    )
+    parser.add_argument(
+        "--verificar-totais",
+        action="store_true",
+        help="Confere vl_pedido_total com SUM(vl_item_total) após a carga",
+    )
+    parser.add_argument(
+        "--verificar-rollup",
+        action="store_true",
+        help="Confere o relatório de venda pelos consolidados com o detalhe após a carga",
+    )
+    parser.add_argument(
+        "--scale-factor",
+        dest="fator_escala",
+        type=float,
+        default=1.0,
+        help="Multiplica a quantidade de registros de todas as tabelas geradas",
+    )
+    parser.add_argument(
+        "--seed",
+        dest="semente",
+        type=int,
+        help="Semente da geração; a mesma semente reproduz o mesmo conjunto de dados",
+    )
+    parser.add_argument(
+        "--data-referencia",
+        type=date.fromisoformat,
+        default=date.today(),
+        help="Data base (AAAA-MM-DD) para datas de pedido e de nascimento",
+    )
+    parser.add_argument(
+        "--distribuicoes",
+        default=PERFIL_PADRAO,
+        help=f"Distribuições de clientes, produtos, datas, situações e descontos "
+        f"dos pedidos: perfil ({', '.join(PERFIS)}) ou arquivo JSON",
+    )
+    parser.add_argument(
+        "--carga-rapida",
+        action="store_true",
+        help="Remove índices secundários e chaves estrangeiras durante a carga e "
+        "os reconstrói ao final, após uma única validação",
+    )
+    parser.add_argument(
+        "--resume",
+        dest="retomar",
+        action="store_true",
+        help="Continua uma carga interrompida, gravando apenas os lotes pendentes",
+    )
+    parser.add_argument(
+        "--append",
+        dest="anexar",
+        action="store_true",
+        help="Acrescenta uma nova carga a tabelas que já contêm dados",
+    )
+    parser.add_argument(
+        "--metricas",
+        type=Path,
+        default=Path(os.getenv("CARGA_METRICAS", "metricas_carga.json")),
+        help="Arquivo JSON com as métricas de cada etapa da carga",
+    )
+    parser.add_argument(
+        "--prometheus-textfile",
+        type=Path,
+        help="Grava também as métricas no formato textfile do node_exporter "
+        "(ex.: /var/lib/node_exporter/textfile/boacompra_carga.prom)",
+    )
+    parser.add_argument(
+        "--exportar",
+        type=Path,
+        help="Exporta os dados gerados para arquivos neste diretório, para "
+        "reprodução com reproduzir_carga.py",
+    )
+    parser.add_argument(
+        "--formato-exportacao",
+        choices=FORMATOS_EXPORTACAO,
+        help="Formato dos arquivos exportados (padrão: parquet, se o pyarrow "
+        "estiver instalado; senão tsv.gz)",
+    )
+    args = parser.parse_args()
     try:
-        raw_conn = engine.raw_connection()
-        cursor = raw_conn.cursor()
-
-        params = [
-            data_inicio,
-            data_fim,
-            situacao_pedido,
-            valor_minimo,
-            valor_limit,
-            nu_pagina,
-            None,
-        ]
-        resultado = cursor.callproc("prc_relatorio_pedido_cliente_valor_minino", params)
-
-        relatorio_str = resultado[-1]
-
-        if relatorio_str:
-            relatorio_json = json.loads(relatorio_str)
-            logger.info(
-                "Relatório de pedido por cliente (valor mínimo) consultado com sucesso:\n"
-                + json.dumps(relatorio_json, indent=4, ensure_ascii=False)
-            )
-            return relatorio_json
-        else:
-            logger.warning(
-                "Procedure prc_relatorio_pedido_cliente_valor_minino retornou resultado vazio."
+        distribuicoes_carga = ler_distribuicoes(args.distribuicoes)
+    except (OSError, ValueError, TypeError) as erro:
+        parser.error(f"--distribuicoes: {erro}")
+    if args.exportar is not None and (args.retomar or args.anexar):
+        parser.error("--exportar exige uma carga completa, sem --resume ou --append")
+
+    configurar_engine(
+        workers=args.workers, ignorar_rollup=True, carga_rapida=args.carga_rapida
+    )
+    engine = obter_engine()
+    metricas.instrumentar_engine(engine)
+    sementes = GeradorSementes(args.semente)
+    data_referencia = args.data_referencia
+    retomar_carga = args.retomar
+    anexar_carga = args.anexar
+    logger.info(
+        f"Carga com fator de escala {args.fator_escala}, semente {sementes.semente} "
+        f"e data de referência {data_referencia.isoformat()}."
+    )
+    if args.distribuicoes != PERFIL_PADRAO:
+        logger.info(f"Distribuições dos pedidos: {args.distribuicoes}.")
+
+    etapas = montar_etapas(args.fator_escala)
+    if args.exportar is not None:
+        # A exportação precisa de todas as tabelas, inclusive as de referência,
+        # que a carga não grava quando já têm dados.
+        preenchidas = [e.tabela for e in etapas if not tabela_esta_vazia(e.tabela)]
+        if preenchidas:
+            logger.error(
+                f"--exportar requer um banco vazio; tabelas com dados: {preenchidas}"
             )
-            return None
-
-    except Exception as e:
-        logger.error(
-            f"Erro ao consultar relatório de pedido por cliente (valor mínimo): {e}"
+            return 1
+        exportador = ExportadorCarga(args.exportar, args.formato_exportacao)
+
+    # Uma carga rápida interrompida deixou os índices removidos: com
+    # --carga-rapida, a carga continua sem eles; sem, eles voltam antes.
+    execucao_carga_rapida = buscar_execucao_pendente(engine)
+    with metricas.etapa(ETAPA_CARGA_RAPIDA):
+        if execucao_carga_rapida is not None and not args.carga_rapida:
+            logger.warning("Carga rápida anterior não concluída: restaurando índices.")
+            reconstruir_indices(engine, execucao_carga_rapida)
+            execucao_carga_rapida = None
+        elif execucao_carga_rapida is None and args.carga_rapida:
+            execucao_carga_rapida = remover_indices(engine)
+
+    etapas = [
+        Etapa(
+            etapa.tabela,
+            metricas.instrumentar(etapa.tabela, etapa.funcao),
+            etapa.dependencias,
         )
-        return None
-
-    finally:
-        if cursor is not None:
-            cursor.close()
-        if raw_conn is not None:
-            raw_conn.close()
-
-
-# ========== EXECUÇÃO PRINCIPAL ==========
-def main():
-    inserir_unidade_federativa()
-    inserir_municipio()
-    inserir_cliente()
-    inserir_cliente_endereco()
-    inserir_cliente_email()
-    inserir_cliente_contato()
-    inserir_produto_categoria()
-    inserir_produto_medida()
-    inserir_produto()
-    inserir_pedido()
-    inserir_pedido_item()
+        for etapa in etapas
+    ]
+    resultado = executar_etapas(etapas, args.workers)
+    registrar_linha_tempo(resultado)
+    registrar_resumo_carga()
+    if execucao_carga_rapida is not None:
+        with metricas.etapa(ETAPA_CARGA_RAPIDA):
+            reconstruir_indices(engine, execucao_carga_rapida)
+    parametros = {
+        "fator_escala": args.fator_escala,
+        "semente": sementes.semente,
+        "data_referencia": data_referencia.isoformat(),
+        "workers": args.workers,
+        "metodo": METODO_CARGA,
+        "tamanho_lote": TAMANHO_LOTE_CARGA,
+        "carga_rapida": args.carga_rapida,
+        "retomar": args.retomar,
+        "anexar": args.anexar,
+        "distribuicoes": distribuicoes_carga,
+    }
+    metricas.gravar_json(
+        args.metricas,
+        {
+            "parametros": parametros,
+            "linha_tempo": [asdict(execucao) for execucao in resultado.execucoes],
+        },
+    )
+    logger.info(f"Métricas da carga gravadas em {args.metricas}.")
+    if args.prometheus_textfile is not None:
+        metricas.gravar_prometheus(args.prometheus_textfile)
+    falhas = [
+        execucao.tabela
+        for execucao in resultado.execucoes
+        if execucao.erro or execucao.ignorada
+    ]
+    if exportador is not None:
+        if falhas:
+            logger.error(f"Exportação não concluída: etapas com erro {falhas}.")
+        else:
+            exportador.concluir(engine, parametros)
+    if args.verificar_totais:
+        verificar_totais_pedido()
+    if args.verificar_rollup:
+        verificar_copias_pedido_item()
+        verificar_rollup_venda()
 
     relatorio_venda_periodo = consultar_relatorio_venda_periodo()
     relatorio_pedido = consultar_relatorio_pedido_cliente_valor_minino()
+    qt_pedido_cursor = sum(
+        pagina["qt_registro"]
+        for pagina in iterar_relatorio_pedido_cliente_valor_minino()
+    )
+    logger.info(
+        f"Relatório de pedido por cliente percorrido por cursor: {qt_pedido_cursor} registros."
+    )
+    if falhas:
+        logger.error(f"Carga não concluída: etapas com erro ou ignoradas {falhas}.")
+        return 1
+    return 0
 
 
 if __name__ == "__main__":
-    main()
+    raise SystemExit(main())
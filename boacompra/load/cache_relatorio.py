@@ -0,0 +1,128 @@
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import asdict, dataclass
+from datetime import date
+from decimal import Decimal
+from typing import Callable, Hashable, Optional
+
+TAMANHO_MAXIMO_PADRAO = 128
+TTL_PADRAO_SEGUNDOS = 300.0
+
+
+@dataclass
+class EstatisticasCache:
+    acertos: int = 0
+    falhas: int = 0
+    despejos: int = 0
+    expirados: int = 0
+    invalidacoes: int = 0
+
+
+@dataclass
+class EntradaCache:
+    valor: dict
+    expira_em: float
+
+
+# ========== FUNÇÕES AUXILIARES ==========
+def normalizar_parametro(valor):
+    # Parâmetros equivalentes para a procedure geram a mesma chave:
+    # date("2025-01-01") e "2025-01-01", 10000 e 10000.00, "concluido" e
+    # "CONCLUIDO" (as colunas usam collation case-insensitive).
+    if isinstance(valor, date):
+        return valor.isoformat()
+    if isinstance(valor, str):
+        return valor.rstrip().upper()
+    if isinstance(valor, bool) or valor is None:
+        return valor
+    if isinstance(valor, (int, float, Decimal)):
+        return Decimal(str(valor)).normalize()
+    return valor
+
+
+def chave_relatorio(procedure: str, *parametros) -> tuple:
+    return (procedure,) + tuple(normalizar_parametro(p) for p in parametros)
+
+
+# ========== CACHE ==========
+# LRU com TTL para o JSON das procedures de relatório. A cada consulta,
+# consultar_marca devolve a marca d'água das tabelas de origem; quando ela muda,
+# todo o cache é descartado antes de responder.
+class CacheRelatorio:
+    def __init__(
+        self,
+        consultar_marca: Callable[[], Hashable],
+        tamanho_maximo: int = TAMANHO_MAXIMO_PADRAO,
+        ttl_segundos: float = TTL_PADRAO_SEGUNDOS,
+        relogio: Callable[[], float] = time.monotonic,
+    ):
+        self.consultar_marca = consultar_marca
+        self.tamanho_maximo = tamanho_maximo
+        self.ttl_segundos = ttl_segundos
+        self.relogio = relogio
+        self.estatisticas = EstatisticasCache()
+        self._entradas: OrderedDict[tuple, EntradaCache] = OrderedDict()
+        self._marca: Optional[Hashable] = None
+        self._trava = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._entradas)
+
+    def obter(self, chave: tuple, carregar: Callable[[], Optional[dict]]):
+        # O dicionário devolvido é compartilhado entre as chamadas: não alterar.
+        marca = self.consultar_marca()
+        agora = self.relogio()
+        with self._trava:
+            if marca != self._marca:
+                if self._entradas:
+                    self.estatisticas.invalidacoes += 1
+                self._entradas.clear()
+                self._marca = marca
+
+            entrada = self._entradas.get(chave)
+            if entrada is not None and entrada.expira_em <= agora:
+                del self._entradas[chave]
+                self.estatisticas.expirados += 1
+                entrada = None
+
+            if entrada is not None:
+                self._entradas.move_to_end(chave)
+                self.estatisticas.acertos += 1
+                return entrada.valor
+            self.estatisticas.falhas += 1
+
+        # A procedure roda fora da trava: chaves diferentes não esperam umas
+        # pelas outras.
+        valor = carregar()
+        if valor is None:
+            return None
+
+        with self._trava:
+            # Resultado calculado com dados anteriores a uma nova marca não entra.
+            if marca == self._marca:
+                self._entradas[chave] = EntradaCache(
+                    valor, self.relogio() + self.ttl_segundos
+                )
+                self._entradas.move_to_end(chave)
+                while len(self._entradas) > self.tamanho_maximo:
+                    self._entradas.popitem(last=False)
+                    self.estatisticas.despejos += 1
+        return valor
+
+    def invalidar(self) -> None:
+        with self._trava:
+            if self._entradas:
+                self.estatisticas.invalidacoes += 1
+            self._entradas.clear()
+
+    def resumo(self) -> dict:
+        with self._trava:
+            total = self.estatisticas.acertos + self.estatisticas.falhas
+            return {
+                **asdict(self.estatisticas),
+                "tamanho": len(self._entradas),
+                "taxa_acerto": (
+                    round(self.estatisticas.acertos / total, 4) if total else 0.0
+                ),
+            }
@@ -0,0 +1,348 @@
+import logging
+import time
+from contextlib import contextmanager
+from typing import Iterator, Optional, Sequence
+
+from sqlalchemy import text
+from sqlalchemy.engine import Connection, Engine
+
+from progresso_carga import (
+    ExecucaoCarga,
+    abrir_execucao,
+    buscar_ultima_execucao,
+    concluir_execucao,
+)
+
+logger = logging.getLogger(__name__)
+
+# Modo de carga rápida: antes da carga, remove os índices secundários (inclusive
+# os únicos) e as chaves estrangeiras das tabelas geradas; as sessões da carga
+# rodam com foreign_key_checks e unique_checks desligados. Ao final, uma única
+# passada de validação confere unicidade e integridade referencial, e os
+# índices são reconstruídos em um ALTER TABLE por tabela.
+#
+# As definições removidas ficam em tb_carga_execucao (etapa "carga_rapida")
+# até a reconstrução: uma carga interrompida é restaurada na execução seguinte.
+ETAPA_CARGA_RAPIDA = "carga_rapida"
+TABELAS_CARGA_RAPIDA = (
+    "tb_cliente",
+    "tb_cliente_endereco",
+    "tb_cliente_email",
+    "tb_cliente_contato",
+    "tb_produto",
+    "tb_pedido",
+    "tb_pedido_item",
+)
+LIMITE_EXEMPLOS = 20
+
+
+# ========== DEFINIÇÕES ==========
+def escapar_parametros(sql: str) -> str:
+    # Os comandos passam por text(): ":nome" em uma expressão ou comentário
+    # seria lido como parâmetro.
+    return sql.replace(":", "\\:")
+
+
+def ler_indices(conn: Connection, tabela: str) -> list:
+    # Guarda tudo o que define o índice: tipo, partes (coluna com prefixo ou
+    # expressão de índice funcional, e ordem DESC), visibilidade e comentário.
+    linhas = conn.execute(
+        text(
+            """
+            SELECT index_name, non_unique, index_type, column_name, sub_part,
+                   expression, collation, is_visible, index_comment
+            FROM information_schema.statistics
+            WHERE table_schema = DATABASE()
+              AND table_name = :tabela
+              AND index_name <> 'PRIMARY'
+            ORDER BY index_name, seq_in_index
+        """
+        ),
+        {"tabela": tabela},
+    ).all()
+
+    indices: dict[str, dict] = {}
+    for (
+        nome,
+        nao_unico,
+        tipo,
+        coluna,
+        prefixo,
+        expressao,
+        ordem,
+        visivel,
+        comentario,
+    ) in linhas:
+        indice = indices.setdefault(
+            nome,
+            {
+                "nome": nome,
+                "unico": not nao_unico,
+                "tipo": tipo,
+                "colunas": [],
+                "expressoes": [],
+                "visivel": visivel != "NO",
+                "comentario": comentario or "",
+            },
+        )
+        # "colunas" são as partes do ADD INDEX; "expressoes", o valor de cada
+        # parte, usado na validação de unicidade.
+        if expressao is not None:
+            parte = valor = f"({escapar_parametros(expressao)})"
+        elif prefixo:
+            parte = f"{coluna}({prefixo})"
+            valor = f"LEFT({coluna}, {prefixo})"
+        else:
+            parte = valor = coluna
+        indice["colunas"].append(f"{parte} DESC" if ordem == "D" else parte)
+        indice["expressoes"].append(valor)
+    return list(indices.values())
+
+
+def ler_chaves_estrangeiras(conn: Connection, tabela: str) -> list:
+    linhas = conn.execute(
+        text(
+            """
+            SELECT kcu.constraint_name, kcu.column_name,
+                   kcu.referenced_table_name, kcu.referenced_column_name,
+                   rc.update_rule, rc.delete_rule
+            FROM information_schema.key_column_usage kcu
+            INNER JOIN information_schema.referential_constraints rc
+                ON rc.constraint_schema = kcu.constraint_schema
+               AND rc.constraint_name = kcu.constraint_name
+            WHERE kcu.table_schema = DATABASE()
+              AND kcu.table_name = :tabela
+              AND kcu.referenced_table_name IS NOT NULL
+            ORDER BY kcu.constraint_name, kcu.ordinal_position
+        """
+        ),
+        {"tabela": tabela},
+    ).all()
+
+    chaves: dict[str, dict] = {}
+    for nome, coluna, tabela_ref, coluna_ref, ao_atualizar, ao_excluir in linhas:
+        chave = chaves.setdefault(
+            nome,
+            {
+                "nome": nome,
+                "colunas": [],
+                "tabela_referenciada": tabela_ref,
+                "colunas_referenciadas": [],
+                "ao_atualizar": ao_atualizar,
+                "ao_excluir": ao_excluir,
+            },
+        )
+        chave["colunas"].append(coluna)
+        chave["colunas_referenciadas"].append(coluna_ref)
+    return list(chaves.values())
+
+
+def sql_indice(indice: dict) -> str:
+    if indice["tipo"] in ("FULLTEXT", "SPATIAL"):
+        tipo = f"{indice['tipo']} INDEX"
+    else:
+        tipo = "UNIQUE INDEX" if indice["unico"] else "INDEX"
+    sql = f"ADD {tipo} {indice['nome']} ({', '.join(indice['colunas'])})"
+    if indice["comentario"]:
+        comentario = indice["comentario"].replace("\\", "\\\\").replace("'", "''")
+        sql += f" COMMENT '{escapar_parametros(comentario)}'"
+    if not indice["visivel"]:
+        sql += " INVISIBLE"
+    return sql
+
+
+def sql_chave_estrangeira(chave: dict) -> str:
+    return (
+        f"ADD CONSTRAINT {chave['nome']} FOREIGN KEY ({', '.join(chave['colunas'])}) "
+        f"REFERENCES {chave['tabela_referenciada']} "
+        f"({', '.join(chave['colunas_referenciadas'])}) "
+        f"ON UPDATE {chave['ao_atualizar']} ON DELETE {chave['ao_excluir']}"
+    )
+
+
+# ========== VALIDAÇÃO ==========
+def validar_unicidade(conn: Connection, tabela: str, indice: dict) -> list:
+    colunas = ", ".join(indice["expressoes"])
+    return [
+        tuple(linha)
+        for linha in conn.execute(
+            text(
+                f"SELECT {colunas}, COUNT(*) FROM {tabela} "
+                f"GROUP BY {colunas} HAVING COUNT(*) > 1 LIMIT {LIMITE_EXEMPLOS}"
+            )
+        ).all()
+    ]
+
+
+def validar_chave_estrangeira(conn: Connection, tabela: str, chave: dict) -> list:
+    juncao = " AND ".join(
+        f"filho.{coluna} = pai.{coluna_ref}"
+        for coluna, coluna_ref in zip(chave["colunas"], chave["colunas_referenciadas"])
+    )
+    colunas = ", ".join(f"filho.{coluna}" for coluna in chave["colunas"])
+    return [
+        tuple(linha)
+        for linha in conn.execute(
+            text(
+                f"SELECT DISTINCT {colunas} FROM {tabela} filho "
+                f"LEFT JOIN {chave['tabela_referenciada']} pai ON {juncao} "
+                f"WHERE pai.{chave['colunas_referenciadas'][0]} IS NULL "
+                f"AND filho.{chave['colunas'][0]} IS NOT NULL "
+                f"LIMIT {LIMITE_EXEMPLOS}"
+            )
+        ).all()
+    ]
+
+
+def validar(engine: Engine, definicoes: dict) -> int:
+    # Uma consulta por índice único e por chave estrangeira removidos.
+    violacoes = 0
+    with engine.connect() as conn:
+        for tabela, definicao in definicoes.items():
+            for indice in definicao["indices"]:
+                if not indice["unico"]:
+                    continue
+                duplicados = validar_unicidade(conn, tabela, indice)
+                if duplicados:
+                    violacoes += 1
+                    logger.error(
+                        f"{tabela}.{indice['nome']}: valores duplicados "
+                        f"(valores, ocorrências): {duplicados}"
+                    )
+            for chave in definicao["chaves_estrangeiras"]:
+                orfaos = validar_chave_estrangeira(conn, tabela, chave)
+                if orfaos:
+                    violacoes += 1
+                    logger.error(
+                        f"{tabela}.{chave['nome']}: valores sem registro em "
+                        f"{chave['tabela_referenciada']}: {orfaos}"
+                    )
+    return violacoes
+
+
+# ========== EXECUÇÃO ==========
+@contextmanager
+def sem_verificacao_chaves(engine: Engine) -> Iterator[Connection]:
+    # A variável de sessão volta ao valor anterior (a sessão da carga rápida já
+    # a desliga) antes de a conexão voltar ao pool.
+    with engine.connect() as conn:
+        anterior = conn.execute(text("SELECT @@SESSION.foreign_key_checks")).scalar()
+        conn.execute(text("SET foreign_key_checks = 0"))
+        try:
+            yield conn
+        finally:
+            conn.execute(
+                text("SET foreign_key_checks = :anterior"), {"anterior": anterior}
+            )
+
+
+def buscar_execucao_pendente(engine: Engine) -> Optional[ExecucaoCarga]:
+    execucao = buscar_ultima_execucao(engine, ETAPA_CARGA_RAPIDA)
+    if execucao is None or execucao.concluida:
+        return None
+    return execucao
+
+
+def remover_indices(
+    engine: Engine, tabelas: Sequence[str] = TABELAS_CARGA_RAPIDA
+) -> ExecucaoCarga:
+    with engine.connect() as conn:
+        definicoes = {
+            tabela: {
+                "indices": ler_indices(conn, tabela),
+                "chaves_estrangeiras": ler_chaves_estrangeiras(conn, tabela),
+            }
+            for tabela in tabelas
+        }
+
+    # As definições são gravadas antes do primeiro DROP.
+    execucao = abrir_execucao(
+        engine,
+        ETAPA_CARGA_RAPIDA,
+        {"definicoes": definicoes},
+        len(definicoes),
+        anexar=False,
+    )
+
+    inicio = time.perf_counter()
+    with sem_verificacao_chaves(engine) as conn:
+        # As chaves estrangeiras saem antes: um índice que sustenta uma chave
+        # estrangeira não pode ser removido enquanto ela existir.
+        for tabela, definicao in definicoes.items():
+            remocoes = [
+                f"DROP FOREIGN KEY {chave['nome']}"
+                for chave in definicao["chaves_estrangeiras"]
+            ]
+            if remocoes:
+                conn.execute(text(f"ALTER TABLE {tabela} {', '.join(remocoes)}"))
+        for tabela, definicao in definicoes.items():
+            remocoes = [
+                f"DROP INDEX {indice['nome']}" for indice in definicao["indices"]
+            ]
+            if remocoes:
+                conn.execute(text(f"ALTER TABLE {tabela} {', '.join(remocoes)}"))
+
+    qt_indices = sum(len(d["indices"]) for d in definicoes.values())
+    qt_chaves = sum(len(d["chaves_estrangeiras"]) for d in definicoes.values())
+    logger.info(
+        f"Carga rápida: {qt_indices} índices e {qt_chaves} chaves estrangeiras "
+        f"removidos em {time.perf_counter() - inicio:.2f}s."
+    )
+    return execucao
+
+
+def reconstruir_indices(engine: Engine, execucao: ExecucaoCarga) -> None:
+    definicoes = execucao.parametros["definicoes"]
+
+    inicio = time.perf_counter()
+    violacoes = validar(engine, definicoes)
+    logger.info(
+        f"Carga rápida: validação de unicidade e integridade referencial em "
+        f"{time.perf_counter() - inicio:.2f}s."
+    )
+    if violacoes:
+        raise RuntimeError(
+            f"Carga rápida: {violacoes} restrições violadas; os índices continuam "
+            f"removidos até a correção dos dados e uma nova execução da carga."
+        )
+
+    # Com as restrições já validadas, as chaves estrangeiras voltam sem nova
+    # verificação (foreign_key_checks = 0).
+    with sem_verificacao_chaves(engine) as conn:
+        existentes = {
+            tabela: {indice["nome"] for indice in ler_indices(conn, tabela)}
+            for tabela in definicoes
+        }
+        for tabela, definicao in definicoes.items():
+            # Uma restauração interrompida pode ter recriado parte dos índices.
+            adicoes = [
+                sql_indice(indice)
+                for indice in definicao["indices"]
+                if indice["nome"] not in existentes[tabela]
+            ]
+            if adicoes:
+                inicio_tabela = time.perf_counter()
+                conn.execute(text(f"ALTER TABLE {tabela} {', '.join(adicoes)}"))
+                logger.info(
+                    f"Carga rápida: {len(adicoes)} índices de {tabela} "
+                    f"reconstruídos em {time.perf_counter() - inicio_tabela:.2f}s."
+                )
+
+        existentes = {
+            tabela: {chave["nome"] for chave in ler_chaves_estrangeiras(conn, tabela)}
+            for tabela in definicoes
+        }
+        for tabela, definicao in definicoes.items():
+            adicoes = [
+                sql_chave_estrangeira(chave)
+                for chave in definicao["chaves_estrangeiras"]
+                if chave["nome"] not in existentes[tabela]
+            ]
+            if adicoes:
+                conn.execute(text(f"ALTER TABLE {tabela} {', '.join(adicoes)}"))
+
+    concluir_execucao(engine, execucao)
+    logger.info(
+        f"Carga rápida: índices e chaves estrangeiras restaurados em "
+        f"{time.perf_counter() - inicio:.2f}s."
+    )
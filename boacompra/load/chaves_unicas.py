@@ -0,0 +1,144 @@
+import unicodedata
+
+import numpy as np
+from faker.providers.company.pt_BR import Provider as ProvedorEmpresa
+from faker.providers.internet.pt_BR import Provider as ProvedorInternet
+from faker.providers.person.pt_BR import Provider as ProvedorPessoa
+
+# Colunas com chave única (CPF, e-mail e nome do produto) geradas sem sorteio
+# com rejeição: o valor é função do id do registro, por uma permutação do
+# espaço de valores, então ids distintos produzem valores distintos. Não há
+# conjunto de valores usados nem nova tentativa, e a geração é vetorizada por
+# lote. O id de cada registro é pré-alocado pela carga.
+#
+# A permutação é afim: (MULTIPLICADOR * valor + deslocamento) mod espaço, com o
+# MULTIPLICADOR primo e sem divisor comum com os espaços usados. Ela espalha
+# ids consecutivos pelo espaço e é fixa (não depende da semente): cargas
+# anexadas, com ids novos, não repetem valores das anteriores.
+MULTIPLICADOR = 999_983  # < 2**20: o produto com valores < 2**43 cabe em int64
+ALFABETO = np.array(list("0123456789ABCDEFGHIJKLMNOPQRSTUVWXYZ"))
+
+# CPF: 9 dígitos de base e 2 verificadores. As 10 bases de dígitos repetidos
+# (000000000, 111111111, ...) são inválidas e ficam fora do espaço.
+BASES_CPF_REPETIDAS = np.arange(10, dtype=np.int64) * 111_111_111
+ESPACO_CPF = 10**9 - len(BASES_CPF_REPETIDAS)
+DESLOCAMENTO_CPF = 271_828_182
+
+# E-mail: nome.sobrenome.CODIGO@dominio, com CODIGO (8 caracteres em base 36)
+# único por (id_cliente, ordinal do e-mail no cliente).
+ORDINAL_MAXIMO_EMAIL = 100
+DIGITOS_CODIGO_EMAIL = 8
+DESLOCAMENTO_EMAIL = 161_803_398_874
+
+# Produto: frase de efeito + " - " + CODIGO (7 caracteres em base 36) do id.
+DIGITOS_CODIGO_PRODUTO = 7
+DESLOCAMENTO_PRODUTO = 14_142_135_623
+TAMANHO_NOME_PRODUTO = 150
+
+
+# ========== FUNÇÕES AUXILIARES ==========
+def normalizar(texto: str) -> str:
+    texto = unicodedata.normalize("NFKD", texto)
+    return "".join(c for c in texto if not unicodedata.combining(c))
+
+
+def permutar(valores: np.ndarray, espaco: int, deslocamento: int) -> np.ndarray:
+    valores = np.asarray(valores, dtype=np.int64)
+    if len(valores) and (valores.min() < 0 or valores.max() >= espaco):
+        raise ValueError(f"Valores fora do espaço da permutação [0, {espaco}).")
+    return (valores * MULTIPLICADOR + deslocamento % espaco) % espaco
+
+
+def digitos(valores: np.ndarray, quantidade: int, base: int = 10) -> np.ndarray:
+    # Matriz (n, quantidade) com os dígitos de cada valor, do mais significativo.
+    potencias = base ** np.arange(quantidade - 1, -1, -1, dtype=np.int64)
+    return (np.asarray(valores, dtype=np.int64)[:, None] // potencias) % base
+
+
+def texto_fixo(matriz_digitos: np.ndarray) -> np.ndarray:
+    # Junta cada linha da matriz de dígitos em um texto, sem laço por linha.
+    caracteres = np.ascontiguousarray(ALFABETO[matriz_digitos])
+    return caracteres.view(f"<U{matriz_digitos.shape[1]}").ravel()
+
+
+def codigo(valores: np.ndarray, quantidade: int, deslocamento: int) -> np.ndarray:
+    espaco = len(ALFABETO) ** quantidade
+    return texto_fixo(
+        digitos(permutar(valores, espaco, deslocamento), quantidade, len(ALFABETO))
+    )
+
+
+def digito_verificador_cpf(matriz_digitos: np.ndarray) -> np.ndarray:
+    pesos = np.arange(matriz_digitos.shape[1] + 1, 1, -1)
+    resto = (matriz_digitos * pesos).sum(axis=1) % 11
+    return np.where(resto < 2, 0, 11 - resto)
+
+
+# ========== GERADORES ==========
+def gerar_cpfs(ids: np.ndarray) -> np.ndarray:
+    # CPFs válidos (11 dígitos, sem máscara), um por id, distintos entre si.
+    base = permutar(ids, ESPACO_CPF, DESLOCAMENTO_CPF)
+    # Pula as bases repetidas: a k-ésima posição vira a k-ésima base válida.
+    for repetida in BASES_CPF_REPETIDAS:
+        base = base + (base >= repetida)
+    matriz = digitos(base, 9)
+    primeiro = digito_verificador_cpf(matriz)
+    matriz = np.column_stack([matriz, primeiro])
+    segundo = digito_verificador_cpf(matriz)
+    return texto_fixo(np.column_stack([matriz, segundo]))
+
+
+NOMES_EMAIL = np.array(
+    sorted({normalizar(n).lower().split()[0] for n in ProvedorPessoa.first_names})
+)
+SOBRENOMES_EMAIL = np.array(
+    sorted({normalizar(n).lower().replace(" ", "") for n in ProvedorPessoa.last_names})
+)
+DOMINIOS_EMAIL = np.array(ProvedorInternet.free_email_domains)
+
+
+def gerar_emails(
+    ids_cliente: np.ndarray, ordinais: np.ndarray, rng: np.random.Generator
+) -> np.ndarray:
+    # O nome e o domínio são sorteados; a unicidade vem só do código.
+    ordinais = np.asarray(ordinais, dtype=np.int64)
+    if len(ordinais) and ordinais.max() >= ORDINAL_MAXIMO_EMAIL:
+        raise ValueError(f"No máximo {ORDINAL_MAXIMO_EMAIL} e-mails por cliente.")
+    chave = np.asarray(ids_cliente, dtype=np.int64) * ORDINAL_MAXIMO_EMAIL + ordinais
+    qtd = len(chave)
+    partes = (
+        NOMES_EMAIL[rng.integers(0, len(NOMES_EMAIL), qtd)],
+        ".",
+        SOBRENOMES_EMAIL[rng.integers(0, len(SOBRENOMES_EMAIL), qtd)],
+        ".",
+        np.char.lower(codigo(chave, DIGITOS_CODIGO_EMAIL, DESLOCAMENTO_EMAIL)),
+        "@",
+        DOMINIOS_EMAIL[rng.integers(0, len(DOMINIOS_EMAIL), qtd)],
+    )
+    email = partes[0]
+    for parte in partes[1:]:
+        email = np.char.add(email, parte)
+    return email
+
+
+# O catch_phrase do Faker pt_BR combina 11 x 9 x 12 = 1.188 frases: o
+# fake.unique esgotava esse espaço em cargas maiores. A frase continua vindo
+# dessas listas, e o código do id garante a unicidade.
+SUBSTANTIVOS_PRODUTO = np.array(ProvedorEmpresa.nouns)
+VERBOS_PRODUTO = np.array(ProvedorEmpresa.verbs)
+ATRIBUTOS_PRODUTO = np.array(ProvedorEmpresa.attributes)
+
+
+def gerar_nomes_produto(ids: np.ndarray, rng: np.random.Generator) -> np.ndarray:
+    # Nomes em maiúsculas, como no_produto é gravado.
+    qtd = len(ids)
+    frase = SUBSTANTIVOS_PRODUTO[rng.integers(0, len(SUBSTANTIVOS_PRODUTO), qtd)]
+    for lista in (VERBOS_PRODUTO, ATRIBUTOS_PRODUTO):
+        frase = np.char.add(
+            np.char.add(frase, " "), lista[rng.integers(0, len(lista), qtd)]
+        )
+    sufixo = np.char.add(
+        " - ", codigo(ids, DIGITOS_CODIGO_PRODUTO, DESLOCAMENTO_PRODUTO)
+    )
+    limite = TAMANHO_NOME_PRODUTO - DIGITOS_CODIGO_PRODUTO - 3
+    return np.char.add(np.char.upper(frase).astype(f"<U{limite}"), sufixo)
@@ -0,0 +1,233 @@
+import json
+import logging
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from dataclasses import dataclass, field
+from datetime import date, timedelta
+from typing import Iterable, Optional, Sequence
+
+from sqlalchemy import create_engine
+from sqlalchemy.engine import Engine
+from sqlalchemy.pool import NullPool
+
+logger = logging.getLogger(__name__)
+
+WORKERS_PADRAO = 8
+TIMEOUT_PADRAO_SEGUNDOS = 30.0
+INTERVALO_VERIFICACAO_SEGUNDOS = 0.05
+ERRO_TIMEOUT = "timeout"
+
+
+@dataclass
+class RequisicaoRelatorio:
+    procedure: str
+    # Parâmetros de entrada, sem o OUT do JSON (acrescentado na chamada).
+    parametros: Sequence
+    timeout: Optional[float] = None
+
+
+@dataclass
+class ResultadoRelatorio:
+    requisicao: RequisicaoRelatorio
+    relatorio: Optional[dict] = None
+    erro: Optional[str] = None
+    duracao: float = 0.0
+
+    @property
+    def sucesso(self) -> bool:
+        return self.erro is None
+
+
+@dataclass
+class ExecucaoRelatorio:
+    # Estado compartilhado entre o worker e o coordenador, que acompanha o
+    # prazo de cada chamada a partir do início da execução (não da fila).
+    inicio: Optional[float] = None
+    fim: Optional[float] = None
+    id_conexao: Optional[int] = None
+    expirada: bool = False
+    trava: threading.Lock = field(default_factory=threading.Lock)
+
+
+# ========== FUNÇÕES AUXILIARES ==========
+def requisicoes_venda_periodo_mensal(
+    ano: int, categorias: Iterable[str], timeout: Optional[float] = None
+) -> list:
+    # Todas as categorias em todos os meses do ano, na ordem (mês, categoria).
+    requisicoes = []
+    for mes in range(1, 13):
+        inicio = date(ano, mes, 1)
+        fim = date(ano + mes // 12, mes % 12 + 1, 1) - timedelta(days=1)
+        for categoria in categorias:
+            requisicoes.append(
+                RequisicaoRelatorio(
+                    "prc_relatorio_venda_periodo",
+                    [inicio.isoformat(), fim.isoformat(), categoria],
+                    timeout,
+                )
+            )
+    return requisicoes
+
+
+# ========== CLIENTE ==========
+class ClienteRelatorio:
+    # Executa lotes de chamadas de procedures de relatório em paralelo. Cada
+    # worker usa uma conexão do pool do engine. O KILL QUERY de um prazo
+    # vencido abre uma conexão própria, fora do pool: com todas as conexões do
+    # pool ocupadas pelos workers, esperar uma delas travaria o coordenador até
+    # o pool_timeout, e a consulta não seria interrompida.
+    def __init__(
+        self,
+        engine: Engine,
+        workers: int = WORKERS_PADRAO,
+        timeout_padrao: Optional[float] = TIMEOUT_PADRAO_SEGUNDOS,
+    ):
+        self.engine = engine
+        self.workers = max(1, workers)
+        self.timeout_padrao = timeout_padrao
+        self.engine_interrupcao = create_engine(engine.url, poolclass=NullPool)
+
+    def chamar(self, requisicao: RequisicaoRelatorio, execucao: ExecucaoRelatorio):
+        raw_conn = self.engine.raw_connection()
+        cursor = None
+        try:
+            cursor = raw_conn.cursor()
+            # O id da sessão fica guardado na conexão do pool para não custar
+            # uma ida ao banco a cada chamada.
+            if "id_conexao" not in raw_conn.info:
+                cursor.execute("SELECT CONNECTION_ID()")
+                raw_conn.info["id_conexao"] = cursor.fetchone()[0]
+
+            with execucao.trava:
+                execucao.id_conexao = raw_conn.info["id_conexao"]
+                execucao.inicio = time.perf_counter()
+
+            resultado = cursor.callproc(
+                requisicao.procedure, [*requisicao.parametros, None]
+            )
+            return json.loads(resultado[-1]) if resultado[-1] else None
+
+        except Exception:
+            # Conexão com a consulta interrompida (KILL QUERY) ou com erro não
+            # volta ao pool.
+            raw_conn.invalidate()
+            raise
+
+        finally:
+            with execucao.trava:
+                execucao.fim = time.perf_counter()
+            if cursor is not None:
+                try:
+                    cursor.close()
+                except Exception:
+                    pass
+            raw_conn.close()
+
+    def interromper(self, execucao: ExecucaoRelatorio) -> None:
+        with execucao.trava:
+            if execucao.fim is not None or execucao.expirada:
+                return
+
+        # A conexão do KILL é aberta antes de pegar a trava, que o worker
+        # também precisa para encerrar a chamada.
+        try:
+            raw_conn = self.engine_interrupcao.raw_connection()
+        except Exception as e:
+            with execucao.trava:
+                if execucao.fim is None:
+                    execucao.expirada = True
+            logger.error(
+                f"Erro ao interromper a consulta da conexão "
+                f"{execucao.id_conexao}: {e}"
+            )
+            return
+
+        # A trava fica presa durante o KILL: o worker só devolve a conexão ao
+        # pool depois de registrar o fim, então o KILL nunca atinge a chamada
+        # de outra requisição que reutilize a mesma conexão.
+        try:
+            with execucao.trava:
+                if execucao.fim is not None or execucao.expirada:
+                    return
+                execucao.expirada = True
+                cursor = raw_conn.cursor()
+                cursor.execute(f"KILL QUERY {int(execucao.id_conexao)}")
+                cursor.close()
+        except Exception as e:
+            logger.error(
+                f"Erro ao interromper a consulta da conexão "
+                f"{execucao.id_conexao}: {e}"
+            )
+        finally:
+            raw_conn.close()
+
+    def executar(self, requisicoes: Sequence[RequisicaoRelatorio]) -> list:
+        # Devolve um ResultadoRelatorio por requisição, na mesma ordem.
+        resultados = [ResultadoRelatorio(requisicao) for requisicao in requisicoes]
+        execucoes = [ExecucaoRelatorio() for _ in requisicoes]
+        com_prazo = any(
+            self.timeout(requisicao) is not None for requisicao in requisicoes
+        )
+        with ThreadPoolExecutor(
+            max_workers=self.workers, thread_name_prefix="relatorio"
+        ) as executor:
+            em_execucao: dict[Future, int] = {
+                executor.submit(self.chamar, requisicao, execucoes[posicao]): posicao
+                for posicao, requisicao in enumerate(requisicoes)
+            }
+
+            while em_execucao:
+                # Com prazos, o coordenador acorda periodicamente para conferir
+                # também as chamadas que saíram da fila depois da última espera.
+                finalizados, _ = wait(
+                    em_execucao,
+                    timeout=INTERVALO_VERIFICACAO_SEGUNDOS if com_prazo else None,
+                    return_when=FIRST_COMPLETED,
+                )
+                for futuro in finalizados:
+                    posicao = em_execucao.pop(futuro)
+                    self.registrar(resultados[posicao], execucoes[posicao], futuro)
+
+                agora = time.perf_counter()
+                for posicao in em_execucao.values():
+                    timeout = self.timeout(requisicoes[posicao])
+                    inicio = execucoes[posicao].inicio
+                    if (
+                        timeout is not None
+                        and inicio is not None
+                        and inicio + timeout <= agora
+                    ):
+                        self.interromper(execucoes[posicao])
+
+        falhas = sum(not resultado.sucesso for resultado in resultados)
+        if falhas:
+            logger.warning(f"{falhas} de {len(resultados)} relatórios falharam.")
+        return resultados
+
+    def timeout(self, requisicao: RequisicaoRelatorio) -> Optional[float]:
+        if requisicao.timeout is not None:
+            return requisicao.timeout
+        return self.timeout_padrao
+
+    def registrar(
+        self,
+        resultado: ResultadoRelatorio,
+        execucao: ExecucaoRelatorio,
+        futuro: Future,
+    ) -> None:
+        if execucao.inicio is not None and execucao.fim is not None:
+            resultado.duracao = execucao.fim - execucao.inicio
+        if execucao.expirada:
+            resultado.erro = ERRO_TIMEOUT
+        elif futuro.exception() is not None:
+            resultado.erro = str(futuro.exception())
+        else:
+            resultado.relatorio = futuro.result()
+            if resultado.relatorio is None:
+                resultado.erro = "Procedure retornou resultado vazio."
+        if resultado.erro:
+            logger.error(
+                f"Erro no relatório {resultado.requisicao.procedure} "
+                f"{list(resultado.requisicao.parametros)}: {resultado.erro}"
+            )
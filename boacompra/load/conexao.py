@@ -0,0 +1,99 @@
+import os
+import threading
+from typing import Optional
+
+# Conexão com o banco, sem efeitos colaterais na importação: o .env só é lido,
+# e o SQLAlchemy só é importado, quando a primeira engine é criada. A URL vem,
+# nesta ordem, do argumento, de DATABASE_URL ou das variáveis DB_* (ambiente ou
+# .env). Os módulos pedem a engine a obter_engine(), que a cria no primeiro uso;
+# configurar_engine() troca as opções (ex.: workers e sessões da carga).
+VARIAVEIS_CONEXAO = ("DB_USER", "DB_PASSWORD", "DB_HOST", "DB_NAME")
+
+_trava = threading.Lock()
+_engine = None
+_opcoes: dict = {}
+
+
+def url_banco():
+    from dotenv import load_dotenv
+
+    load_dotenv()
+    url = os.getenv("DATABASE_URL")
+    if url:
+        return url
+
+    faltando = [nome for nome in VARIAVEIS_CONEXAO if not os.getenv(nome)]
+    if faltando:
+        raise RuntimeError(
+            f"Conexão não configurada: defina DATABASE_URL ou {', '.join(faltando)}."
+        )
+
+    from sqlalchemy.engine import URL
+
+    # URL.create não exige escapar caracteres especiais da senha.
+    return URL.create(
+        "mysql+mysqlconnector",
+        username=os.getenv("DB_USER"),
+        password=os.getenv("DB_PASSWORD"),
+        host=os.getenv("DB_HOST"),
+        port=int(os.getenv("DB_PORT", "3306")),
+        database=os.getenv("DB_NAME"),
+    )
+
+
+def criar_engine(
+    workers: int = 1,
+    ignorar_rollup: bool = False,
+    carga_rapida: bool = False,
+    url: Optional[str] = None,
+):
+    from sqlalchemy import create_engine, event
+
+    # Cada etapa em execução usa a sua própria conexão do pool.
+    engine = create_engine(
+        url or url_banco(),
+        connect_args={"allow_local_infile": True},
+        pool_size=max(5, workers + 1),
+        max_overflow=workers,
+        pool_pre_ping=True,
+    )
+
+    comandos_sessao = []
+    if ignorar_rollup:
+        # Desliga, nas sessões da carga, os triggers que mantêm tb_venda_dia e
+        # tb_venda_produto_dia; os consolidados são recalculados ao final.
+        comandos_sessao.append("SET @fl_ignorar_rollup_venda = 1")
+    if carga_rapida:
+        # As restrições são validadas em uma única passada ao final da carga.
+        comandos_sessao.append("SET foreign_key_checks = 0, unique_checks = 0")
+
+    if comandos_sessao:
+
+        @event.listens_for(engine, "connect")
+        def configurar_sessao(dbapi_conn, connection_record):
+            cursor = dbapi_conn.cursor()
+            for comando in comandos_sessao:
+                cursor.execute(comando)
+            cursor.close()
+
+    return engine
+
+
+def configurar_engine(**opcoes) -> None:
+    # Opções de criar_engine para a engine compartilhada. Uma engine já criada
+    # é descartada; a próxima chamada de obter_engine() cria outra.
+    global _engine, _opcoes
+    with _trava:
+        if _engine is not None:
+            _engine.dispose()
+            _engine = None
+        _opcoes = opcoes
+
+
+def obter_engine():
+    global _engine
+    if _engine is None:
+        with _trava:
+            if _engine is None:
+                _engine = criar_engine(**_opcoes)
+    return _engine
@@ -0,0 +1,308 @@
+import json
+import logging
+import os
+from typing import Iterator, Optional, Sequence
+
+from cache_relatorio import CacheRelatorio, chave_relatorio
+from conexao import obter_engine
+
+logger = logging.getLogger(__name__)
+
+# Cliente dos relatórios: chama as procedures pela engine compartilhada de
+# conexao.py e não importa pandas, NumPy, Faker nem SQLAlchemy (este só quando a
+# primeira consulta cria a engine). Quem só consulta relatórios importa este
+# módulo em vez de boa_compra_carga, que traz a geração e a carga dos dados.
+
+
+# ========== RELATÓRIOS ==========
+def consultar_relatorio_venda_periodo(
+    data_inicio: str = "2025-01-01",
+    data_fim: str = "2025-06-01",
+    categoria: str = "ELETRONICOS",
+) -> Optional[dict]:
+    raw_conn = None
+    cursor = None
+    try:
+        raw_conn = obter_engine().raw_connection()
+        cursor = raw_conn.cursor()
+
+        params = [data_inicio, data_fim, categoria, None]
+        resultado = cursor.callproc("prc_relatorio_venda_periodo", params)
+
+        relatorio_str = resultado[-1]
+
+        if relatorio_str:
+            relatorio_json = json.loads(relatorio_str)
+            # O JSON completo só é reformatado quando o nível DEBUG está ativo.
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug(
+                    "Relatório de venda por período consultado com sucesso:\n"
+                    + json.dumps(relatorio_json, indent=4, ensure_ascii=False)
+                )
+            return relatorio_json
+        else:
+            logger.warning("Procedure retornou resultado vazio.")
+            return None
+
+    except Exception as e:
+        logger.error(f"Erro ao consultar relatório de venda por período: {e}")
+        return None
+
+    finally:
+        if cursor is not None:
+            cursor.close()
+        if raw_conn is not None:
+            raw_conn.close()
+
+
+def consultar_relatorio_venda_periodo_categorias(
+    data_inicio: str = "2025-01-01",
+    data_fim: str = "2025-06-01",
+    categorias: Optional[Sequence[str]] = None,
+) -> Optional[dict]:
+    # Uma chamada para várias categorias (None = todas): devolve
+    # {categoria: JSON de prc_relatorio_venda_periodo}.
+    raw_conn = None
+    cursor = None
+    try:
+        raw_conn = obter_engine().raw_connection()
+        cursor = raw_conn.cursor()
+
+        params = [
+            data_inicio,
+            data_fim,
+            None if categorias is None else json.dumps(list(categorias)),
+            None,
+        ]
+        resultado = cursor.callproc("prc_relatorio_venda_periodo_categorias", params)
+
+        relatorio_str = resultado[-1]
+
+        if relatorio_str:
+            relatorio_json = json.loads(relatorio_str)
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug(
+                    "Relatório de venda por período e categorias consultado com sucesso:\n"
+                    + json.dumps(relatorio_json, indent=4, ensure_ascii=False)
+                )
+            return relatorio_json
+        else:
+            logger.warning("Procedure retornou resultado vazio.")
+            return None
+
+    except Exception as e:
+        logger.error(
+            f"Erro ao consultar relatório de venda por período e categorias: {e}"
+        )
+        return None
+
+    finally:
+        if cursor is not None:
+            cursor.close()
+        if raw_conn is not None:
+            raw_conn.close()
+
+
+def consultar_relatorio_pedido_cliente_valor_minino(
+    data_inicio: str = "2025-01-01",
+    data_fim: str = "2025-06-01",
+    situacao_pedido: str = "CONCLUIDO",
+    valor_minimo: float = 10000.00,
+    valor_limit: int = 20,
+    nu_pagina: int = 1,
+) -> Optional[dict]:
+    raw_conn = None
+    cursor = None
+    try:
+        raw_conn = obter_engine().raw_connection()
+        cursor = raw_conn.cursor()
+
+        params = [
+            data_inicio,
+            data_fim,
+            situacao_pedido,
+            valor_minimo,
+            valor_limit,
+            nu_pagina,
+            None,
+        ]
+        resultado = cursor.callproc("prc_relatorio_pedido_cliente_valor_minino", params)
+
+        relatorio_str = resultado[-1]
+
+        if relatorio_str:
+            relatorio_json = json.loads(relatorio_str)
+            # O JSON completo só é reformatado quando o nível DEBUG está ativo.
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug(
+                    "Relatório de pedido por cliente (valor mínimo) consultado com sucesso:\n"
+                    + json.dumps(relatorio_json, indent=4, ensure_ascii=False)
+                )
+            return relatorio_json
+        else:
+            logger.warning(
+                "Procedure prc_relatorio_pedido_cliente_valor_minino retornou resultado vazio."
+            )
+            return None
+
+    except Exception as e:
+        logger.error(
+            f"Erro ao consultar relatório de pedido por cliente (valor mínimo): {e}"
+        )
+        return None
+
+    finally:
+        if cursor is not None:
+            cursor.close()
+        if raw_conn is not None:
+            raw_conn.close()
+
+
+def consultar_relatorio_pedido_cliente_valor_minino_cursor(
+    data_inicio: str = "2025-01-01",
+    data_fim: str = "2025-06-01",
+    situacao_pedido: str = "CONCLUIDO",
+    valor_minimo: float = 10000.00,
+    valor_limit: int = 20,
+    dt_cursor: Optional[str] = None,
+    id_cursor: Optional[int] = None,
+) -> Optional[dict]:
+    raw_conn = None
+    cursor = None
+    try:
+        raw_conn = obter_engine().raw_connection()
+        cursor = raw_conn.cursor()
+
+        params = [
+            data_inicio,
+            data_fim,
+            situacao_pedido,
+            valor_minimo,
+            valor_limit,
+            dt_cursor,
+            id_cursor,
+            None,
+        ]
+        resultado = cursor.callproc(
+            "prc_relatorio_pedido_cliente_valor_minino_cursor", params
+        )
+
+        relatorio_str = resultado[-1]
+
+        if relatorio_str:
+            return json.loads(relatorio_str)
+        else:
+            logger.warning(
+                "Procedure prc_relatorio_pedido_cliente_valor_minino_cursor retornou resultado vazio."
+            )
+            return None
+
+    except Exception as e:
+        logger.error(
+            f"Erro ao consultar relatório de pedido por cliente (valor mínimo, cursor): {e}"
+        )
+        return None
+
+    finally:
+        if cursor is not None:
+            cursor.close()
+        if raw_conn is not None:
+            raw_conn.close()
+
+
+def iterar_relatorio_pedido_cliente_valor_minino(
+    data_inicio: str = "2025-01-01",
+    data_fim: str = "2025-06-01",
+    situacao_pedido: str = "CONCLUIDO",
+    valor_minimo: float = 10000.00,
+    valor_limit: int = 20,
+) -> Iterator[dict]:
+    # Percorre todas as páginas seguindo o cursor (dt_pedido, id_pedido) devolvido
+    # pela procedure; cada página custa o mesmo, independentemente da posição.
+    dt_cursor, id_cursor = None, None
+    nu_pagina = 0
+    while True:
+        pagina = consultar_relatorio_pedido_cliente_valor_minino_cursor(
+            data_inicio,
+            data_fim,
+            situacao_pedido,
+            valor_minimo,
+            valor_limit,
+            dt_cursor,
+            id_cursor,
+        )
+        if pagina is None:
+            return
+
+        nu_pagina += 1
+        logger.debug(
+            f"Página {nu_pagina} do relatório de pedido por cliente: "
+            f"{pagina['qt_registro']} registros."
+        )
+        yield pagina
+
+        proximo_cursor = pagina.get("dc_proximo_cursor")
+        if not proximo_cursor:
+            return
+        dt_cursor = proximo_cursor["dt_pedido"]
+        id_cursor = proximo_cursor["id_pedido"]
+
+
+def consultar_marca_dagua_pedido() -> int:
+    # Soma do contador de tb_versao_relatorio (V027), incrementado pelos
+    # triggers de tb_pedido, tb_pedido_item e tb_produto e por
+    # prc_carga_rollup_venda na mesma transação da alteração: qualquer
+    # alteração confirmada, inclusive exclusões, muda a marca. As sessões da
+    # carga em massa (@fl_ignorar_rollup_venda) só mudam a marca ao final, em
+    # prc_carga_rollup_venda.
+    raw_conn = obter_engine().raw_connection()
+    try:
+        cursor = raw_conn.cursor()
+        cursor.execute("SELECT SUM(nu_versao) FROM tb_versao_relatorio")
+        marca = cursor.fetchone()[0]
+        cursor.close()
+    finally:
+        raw_conn.close()
+    return int(marca or 0)
+
+
+cache_relatorio = CacheRelatorio(
+    consultar_marca_dagua_pedido,
+    tamanho_maximo=int(os.getenv("CACHE_RELATORIO_TAMANHO", "128")),
+    ttl_segundos=float(os.getenv("CACHE_RELATORIO_TTL", "300")),
+)
+
+
+def consultar_relatorio_venda_periodo_cache(
+    data_inicio: str = "2025-01-01",
+    data_fim: str = "2025-06-01",
+    categoria: str = "ELETRONICOS",
+) -> Optional[dict]:
+    return cache_relatorio.obter(
+        chave_relatorio(
+            "prc_relatorio_venda_periodo", data_inicio, data_fim, categoria
+        ),
+        lambda: consultar_relatorio_venda_periodo(data_inicio, data_fim, categoria),
+    )
+
+
+def consultar_relatorio_pedido_cliente_valor_minino_cache(
+    data_inicio: str = "2025-01-01",
+    data_fim: str = "2025-06-01",
+    situacao_pedido: str = "CONCLUIDO",
+    valor_minimo: float = 10000.00,
+    valor_limit: int = 20,
+    nu_pagina: int = 1,
+) -> Optional[dict]:
+    parametros = (
+        data_inicio,
+        data_fim,
+        situacao_pedido,
+        valor_minimo,
+        valor_limit,
+        nu_pagina,
+    )
+    return cache_relatorio.obter(
+        chave_relatorio("prc_relatorio_pedido_cliente_valor_minino", *parametros),
+        lambda: consultar_relatorio_pedido_cliente_valor_minino(*parametros),
+    )
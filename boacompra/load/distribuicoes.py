@@ -0,0 +1,435 @@
+import json
+import zlib
+from dataclasses import asdict, dataclass, field
+from datetime import date
+from pathlib import Path
+from typing import Optional
+
+import numpy as np
+
+# Distribuições da geração de pedidos, configuráveis por tabela e coluna. A
+# configuração é um dicionário {tabela: {coluna: {"tipo": nome, **parâmetros}}}
+# (ver PERFIS); o que não for informado fica uniforme. Com tudo uniforme, a
+# geração faz exatamente os mesmos sorteios de antes e, com a mesma semente,
+# produz os mesmos dados. Uso na carga:
+#   python boa_compra_carga.py --distribuicoes producao
+#   python boa_compra_carga.py --distribuicoes minhas_distribuicoes.json
+PERFIL_PADRAO = "uniforme"
+DIAS_RECENTES_PADRAO = 15
+MESES = (
+    "jan",
+    "fev",
+    "mar",
+    "abr",
+    "mai",
+    "jun",
+    "jul",
+    "ago",
+    "set",
+    "out",
+    "nov",
+    "dez",
+)
+DIAS_SEMANA = ("seg", "ter", "qua", "qui", "sex", "sab", "dom")
+FAIXAS_PRECO_CENTAVOS = (0, 5000, 20000, 100000, 500000)
+ZIPF_S_MAXIMO = 10
+
+
+# ========== DISTRIBUIÇÕES ==========
+@dataclass
+class Uniforme:
+    pass
+
+
+@dataclass
+class Zipf:
+    # Popularidade 1 / posição^s. As posições são embaralhadas com a semente
+    # da carga: os mais populares não são os de menor id (no caso dos
+    # produtos, todos da primeira categoria).
+    s: float = 1.1
+
+    def __post_init__(self):
+        # Com s = 10, o mais popular já tem 99,9% do peso: valores maiores não
+        # mudam a amostra e só concentram ainda mais o sorteio sem repetição.
+        if isinstance(self.s, bool) or not isinstance(self.s, (int, float)):
+            raise ValueError(f"Zipf: s deve ser numérico, recebido {self.s!r}.")
+        if not 0 < self.s <= ZIPF_S_MAXIMO:
+            raise ValueError(f"Zipf: s deve estar entre 0 e {ZIPF_S_MAXIMO}.")
+
+    def pesos(self, qtd: int, rng: np.random.Generator) -> np.ndarray:
+        return 1.0 / (rng.permutation(qtd) + 1.0) ** self.s
+
+
+@dataclass
+class CaudaPesada:
+    # Atividade log-normal: poucos concentram boa parte dos registros e a
+    # maioria aparece pouco.
+    sigma: float = 1.5
+
+    def pesos(self, qtd: int, rng: np.random.Generator) -> np.ndarray:
+        return rng.lognormal(0.0, self.sigma, qtd)
+
+
+@dataclass
+class Sazonal:
+    # Volume diário = peso do mês x peso do dia da semana x tendência linear
+    # (o último dia do período pesa 1 + crescimento vezes o primeiro).
+    pesos_mes: list = field(
+        default_factory=lambda: [
+            0.8,
+            0.75,
+            0.9,
+            0.85,
+            1.0,
+            0.9,
+            0.95,
+            1.0,
+            0.9,
+            1.0,
+            1.6,
+            1.8,
+        ]
+    )
+    pesos_dia_semana: list = field(
+        default_factory=lambda: [1.15, 1.1, 1.05, 1.0, 1.05, 0.85, 0.8]
+    )
+    crescimento: float = 0.3
+
+    def pesos(self, dias: np.ndarray) -> np.ndarray:
+        mes = dias.astype("datetime64[M]").astype(np.int64) % 12
+        # 1970-01-01 foi uma quinta-feira (posição 3 a partir da segunda).
+        dia_semana = (dias.astype(np.int64) + 3) % 7
+        tendencia = 1.0 + self.crescimento * np.linspace(0.0, 1.0, len(dias))
+        return (
+            np.asarray(self.pesos_mes, dtype=float)[mes]
+            * np.asarray(self.pesos_dia_semana, dtype=float)[dia_semana]
+            * tendencia
+        )
+
+
+@dataclass
+class SituacaoPorIdade:
+    # Pedidos recentes ainda estão em aberto; os antigos já foram concluídos
+    # ou rejeitados. Os pesos são por nome (no_pedido_situacao).
+    recentes: dict = field(
+        default_factory=lambda: {
+            "PENDENTE": 0.3,
+            "EM ANDAMENTO": 0.3,
+            "APROVADO": 0.2,
+            "CONCLUIDO": 0.15,
+            "REJEITADO": 0.05,
+        }
+    )
+    antigos: dict = field(
+        default_factory=lambda: {"CONCLUIDO": 0.9, "REJEITADO": 0.08, "APROVADO": 0.02}
+    )
+    dias_recentes: int = DIAS_RECENTES_PADRAO
+
+
+@dataclass
+class DescontoPorPreco:
+    # Só parte dos itens tem desconto, e o percentual máximo cai com o preço
+    # unitário: (preco_referencia / preço)^elasticidade do máximo da carga
+    # acima do preço de referência (em reais).
+    probabilidade: float = 0.35
+    preco_referencia: float = 100.0
+    elasticidade: float = 0.5
+
+
+DISTRIBUICOES = {
+    "tb_pedido": {
+        "id_cliente": {
+            "uniforme": Uniforme,
+            "zipf": Zipf,
+            "cauda_pesada": CaudaPesada,
+        },
+        "dt_pedido": {"uniforme": Uniforme, "sazonal": Sazonal},
+        "co_pedido_situacao": {"uniforme": Uniforme, "por_idade": SituacaoPorIdade},
+    },
+    "tb_pedido_item": {
+        "id_produto": {
+            "uniforme": Uniforme,
+            "zipf": Zipf,
+            "cauda_pesada": CaudaPesada,
+        },
+        "vl_desconto": {"uniforme": Uniforme, "por_preco": DescontoPorPreco},
+    },
+}
+
+PERFIS = {
+    "uniforme": {},
+    "producao": {
+        "tb_pedido": {
+            "id_cliente": {"tipo": "cauda_pesada"},
+            "dt_pedido": {"tipo": "sazonal"},
+            "co_pedido_situacao": {"tipo": "por_idade"},
+        },
+        "tb_pedido_item": {
+            "id_produto": {"tipo": "zipf"},
+            "vl_desconto": {"tipo": "por_preco"},
+        },
+    },
+}
+
+
+# ========== CONFIGURAÇÃO ==========
+def montar_distribuicoes(configuracao: dict) -> dict:
+    # {(tabela, coluna): distribuição}, com Uniforme no que não foi informado.
+    desconhecidas = [
+        f"{tabela}.{coluna}"
+        for tabela, colunas in configuracao.items()
+        for coluna in colunas
+        if coluna not in DISTRIBUICOES.get(tabela, {})
+    ]
+    if desconhecidas:
+        raise ValueError(f"Colunas sem distribuição configurável: {desconhecidas}")
+
+    distribuicoes = {}
+    for tabela, colunas in DISTRIBUICOES.items():
+        for coluna, tipos in colunas.items():
+            parametros = dict(configuracao.get(tabela, {}).get(coluna, {}))
+            tipo = parametros.pop("tipo", "uniforme")
+            if tipo not in tipos:
+                raise ValueError(
+                    f"Distribuição {tipo!r} inválida para {tabela}.{coluna}: "
+                    f"use {', '.join(tipos)}."
+                )
+            distribuicoes[(tabela, coluna)] = tipos[tipo](**parametros)
+    return distribuicoes
+
+
+def descrever_distribuicoes(distribuicoes: dict) -> dict:
+    # Configuração completa, serializável, gravada nos parâmetros da execução.
+    descricao = {}
+    for (tabela, coluna), distribuicao in distribuicoes.items():
+        tipo = next(
+            nome
+            for nome, classe in DISTRIBUICOES[tabela][coluna].items()
+            if type(distribuicao) is classe
+        )
+        descricao.setdefault(tabela, {})[coluna] = {
+            "tipo": tipo,
+            **asdict(distribuicao),
+        }
+    return descricao
+
+
+def ler_distribuicoes(valor: str) -> dict:
+    # Nome de um perfil ou arquivo JSON. O arquivo pode partir de um perfil
+    # ("perfil": "producao") e sobrescrever colunas.
+    if valor in PERFIS:
+        configuracao = {"perfil": valor}
+    else:
+        configuracao = json.loads(Path(valor).read_text(encoding="utf-8"))
+    perfil = configuracao.pop("perfil", PERFIL_PADRAO)
+    if perfil not in PERFIS:
+        raise ValueError(f"Perfil {perfil!r} inexistente: use {', '.join(PERFIS)}.")
+    combinada = {tabela: dict(colunas) for tabela, colunas in PERFIS[perfil].items()}
+    for tabela, colunas in configuracao.items():
+        combinada.setdefault(tabela, {}).update(colunas)
+    return descrever_distribuicoes(montar_distribuicoes(combinada))
+
+
+def sortear_indices(cdf: np.ndarray, qtd: int, rng: np.random.Generator) -> np.ndarray:
+    return np.searchsorted(cdf, rng.random(qtd), side="right")
+
+
+def acumular(pesos: np.ndarray) -> np.ndarray:
+    cdf = np.cumsum(pesos, dtype=float)
+    cdf /= cdf[-1]
+    cdf[-1] = 1.0
+    return cdf
+
+
+# ========== AMOSTRAGEM ==========
+class AmostragemPedido:
+    # Distribuições de tb_pedido e tb_pedido_item prontas para a geração em
+    # lotes. Os métodos devolvem None quando a coluna é uniforme: o gerador
+    # faz então o sorteio original. A popularidade de clientes e produtos é
+    # sorteada uma única vez, com a semente da carga: todos os lotes, e uma
+    # retomada, têm os mesmos clientes e produtos populares.
+    def __init__(
+        self,
+        configuracao: Optional[dict] = None,
+        semente: int = 0,
+        situacoes: Optional[dict] = None,
+    ):
+        self.distribuicoes = montar_distribuicoes(configuracao or {})
+        self.semente = semente
+        self.situacoes = situacoes or {}  # co_pedido_situacao -> no_pedido_situacao
+        self.cdfs: dict = {}
+
+    def distribuicao(self, tabela: str, coluna: str):
+        return self.distribuicoes[(tabela, coluna)]
+
+    def cdf_ids(self, tabela: str, coluna: str, qtd: int) -> Optional[np.ndarray]:
+        distribuicao = self.distribuicao(tabela, coluna)
+        if isinstance(distribuicao, Uniforme) or qtd == 0:
+            return None
+        chave = (tabela, coluna, qtd)
+        if chave not in self.cdfs:
+            rng = np.random.default_rng(
+                [self.semente, zlib.crc32(f"{tabela}.{coluna}".encode())]
+            )
+            self.cdfs[chave] = acumular(distribuicao.pesos(qtd, rng))
+        return self.cdfs[chave]
+
+    def pesos_ids(self, tabela: str, coluna: str, qtd: int) -> Optional[np.ndarray]:
+        cdf = self.cdf_ids(tabela, coluna, qtd)
+        return None if cdf is None else np.diff(cdf, prepend=0.0)
+
+    def cdf_dias_atras(
+        self, data_referencia: date, qt_dias: int
+    ) -> Optional[np.ndarray]:
+        # Posição k = k dias antes da data de referência.
+        distribuicao = self.distribuicao("tb_pedido", "dt_pedido")
+        if isinstance(distribuicao, Uniforme):
+            return None
+        chave = ("tb_pedido", "dt_pedido", data_referencia, qt_dias)
+        if chave not in self.cdfs:
+            dias = np.datetime64(data_referencia, "D") - np.arange(
+                qt_dias - 1, -1, -1
+            ).astype("timedelta64[D]")
+            self.cdfs[chave] = acumular(distribuicao.pesos(dias)[::-1])
+        return self.cdfs[chave]
+
+    def sortear_situacoes(
+        self,
+        codigos_situacao: np.ndarray,
+        dt_pedido: np.ndarray,
+        data_referencia: date,
+        rng: np.random.Generator,
+    ) -> Optional[np.ndarray]:
+        distribuicao = self.distribuicao("tb_pedido", "co_pedido_situacao")
+        if isinstance(distribuicao, Uniforme):
+            return None
+        nomes = [self.situacoes.get(int(codigo), "") for codigo in codigos_situacao]
+        recente = (np.datetime64(data_referencia, "D") - dt_pedido).astype(
+            np.int64
+        ) < distribuicao.dias_recentes
+        sorteio = rng.random(len(dt_pedido))
+        situacoes = np.empty(len(dt_pedido), dtype=np.int64)
+        for mascara, pesos_nome in (
+            (recente, distribuicao.recentes),
+            (~recente, distribuicao.antigos),
+        ):
+            pesos = np.array([pesos_nome.get(nome, 0.0) for nome in nomes], dtype=float)
+            if pesos.sum() <= 0:
+                pesos = np.ones(len(nomes))
+            indices = np.searchsorted(acumular(pesos), sorteio[mascara], side="right")
+            situacoes[mascara] = codigos_situacao[indices]
+        return situacoes
+
+    def sortear_descontos(
+        self,
+        vl_unitario: np.ndarray,
+        vl_bruto: np.ndarray,
+        percentual_maximo: float,
+        rng: np.random.Generator,
+    ) -> Optional[np.ndarray]:
+        # Valores em centavos; o desconto nunca passa de percentual_maximo.
+        distribuicao = self.distribuicao("tb_pedido_item", "vl_desconto")
+        if isinstance(distribuicao, Uniforme):
+            return None
+        fator_preco = np.minimum(
+            1.0,
+            (distribuicao.preco_referencia * 100 / np.maximum(vl_unitario, 1))
+            ** distribuicao.elasticidade,
+        )
+        vl_desconto_maximo = np.floor(vl_bruto * percentual_maximo * fator_preco)
+        com_desconto = rng.random(len(vl_bruto)) < distribuicao.probabilidade
+        vl_desconto = np.floor(rng.random(len(vl_bruto)) * vl_desconto_maximo + 0.5)
+        return np.where(
+            com_desconto, np.minimum(vl_desconto, vl_desconto_maximo), 0
+        ).astype(np.int64)
+
+
+# ========== RESUMO ==========
+def resumir_popularidade(contagens: np.ndarray, qt_total: int) -> dict:
+    # contagens: registros por chave com ao menos um registro; qt_total: total
+    # de chaves (as que não aparecem contam como zero).
+    ordenadas = np.sort(np.r_[contagens, np.zeros(qt_total - len(contagens))])[::-1]
+    soma = ordenadas.sum()
+    if soma == 0:
+        return {"chaves": qt_total, "registros": 0}
+    acumulada = np.cumsum(ordenadas) / soma
+
+    def participacao(fracao: float) -> float:
+        return round(float(acumulada[max(1, int(qt_total * fracao)) - 1]), 4)
+
+    # Gini: 0 = todas as chaves com o mesmo volume; perto de 1 = concentrado.
+    crescentes = ordenadas[::-1]
+    posicoes = np.arange(1, qt_total + 1)
+    gini = float(
+        (2 * (posicoes * crescentes).sum()) / (qt_total * soma)
+        - (qt_total + 1) / qt_total
+    )
+    return {
+        "chaves": qt_total,
+        "registros": int(soma),
+        "sem_registro": int(qt_total - len(contagens)),
+        "maior": int(ordenadas[0]),
+        "mediana": float(np.median(ordenadas)),
+        "participacao_top_1pct": participacao(0.01),
+        "participacao_top_10pct": participacao(0.10),
+        "participacao_top_20pct": participacao(0.20),
+        "gini": round(gini, 4),
+    }
+
+
+def resumir_datas(datas: np.ndarray, contagens: np.ndarray) -> dict:
+    datas = datas.astype("datetime64[D]")
+    mes = datas.astype("datetime64[M]").astype(np.int64) % 12
+    dia_semana = (datas.astype(np.int64) + 3) % 7
+    total = contagens.sum()
+    por_mes = np.bincount(mes, weights=contagens, minlength=12)
+    por_dia_semana = np.bincount(dia_semana, weights=contagens, minlength=7)
+    return {
+        "dias": len(datas),
+        "pedidos_dia_minimo": int(contagens.min()) if len(datas) else 0,
+        "pedidos_dia_maximo": int(contagens.max()) if len(datas) else 0,
+        "pedidos_dia_medio": round(float(contagens.mean()), 2) if len(datas) else 0,
+        "por_mes": {
+            nome: round(float(valor / total), 4) for nome, valor in zip(MESES, por_mes)
+        },
+        "por_dia_semana": {
+            nome: round(float(valor / total), 4)
+            for nome, valor in zip(DIAS_SEMANA, por_dia_semana)
+        },
+    }
+
+
+def faixa_preco(vl_unitario_centavos: np.ndarray) -> np.ndarray:
+    return (
+        np.searchsorted(FAIXAS_PRECO_CENTAVOS, vl_unitario_centavos, side="right") - 1
+    )
+
+
+def nome_faixa_preco(faixa: int) -> str:
+    inicio = FAIXAS_PRECO_CENTAVOS[faixa] // 100
+    if faixa + 1 < len(FAIXAS_PRECO_CENTAVOS):
+        return f"{inicio}-{FAIXAS_PRECO_CENTAVOS[faixa + 1] // 100}"
+    return f"{inicio}+"
+
+
+def resumir_descontos(
+    vl_unitario: np.ndarray, vl_bruto: np.ndarray, vl_desconto: np.ndarray
+) -> dict:
+    # Por faixa de preço unitário (em reais): itens, parcela com desconto e
+    # percentual médio de desconto sobre o valor bruto.
+    faixas = faixa_preco(vl_unitario)
+    resumo = {}
+    for faixa in range(len(FAIXAS_PRECO_CENTAVOS)):
+        mascara = faixas == faixa
+        if not mascara.any():
+            continue
+        bruto = vl_bruto[mascara]
+        desconto = vl_desconto[mascara]
+        resumo[nome_faixa_preco(faixa)] = {
+            "itens": int(mascara.sum()),
+            "com_desconto": round(float((desconto > 0).mean()), 4),
+            "percentual_medio": round(
+                float((desconto / np.maximum(bruto, 1)).mean() * 100), 2
+            ),
+        }
+    return resumo
@@ -0,0 +1,200 @@
+import os
+import tempfile
+from typing import Optional
+
+import pandas as pd
+from sqlalchemy.engine import Engine
+
+METODO_TO_SQL = "to_sql"
+METODO_MULTI = "multi"
+METODO_LOAD_DATA = "load_data"
+METODOS_CARGA = (METODO_TO_SQL, METODO_MULTI, METODO_LOAD_DATA)
+
+TAMANHO_LOTE_PADRAO = 5000
+
+
+# ========== FUNÇÕES AUXILIARES ==========
+def fatiar(df: pd.DataFrame, tamanho_lote: int):
+    for inicio in range(0, len(df), tamanho_lote):
+        yield df.iloc[inicio : inicio + tamanho_lote]
+
+
+def linhas_para_driver(df: pd.DataFrame) -> list:
+    # O conector MySQL não aceita tipos NumPy nem NaN: converte para objetos Python.
+    df_objeto = df.astype(object).where(pd.notna(df), None)
+    return list(df_objeto.itertuples(index=False, name=None))
+
+
+def escapar_texto(valor):
+    if not isinstance(valor, str):
+        return valor
+    return valor.replace("\\", "\\\\").replace("\t", "\\t").replace("\n", "\\n")
+
+
+def dataframe_para_tsv(df: pd.DataFrame, caminho: str) -> None:
+    # Formato padrão do LOAD DATA: campos separados por TAB, NULL como \N e
+    # caracteres especiais escapados com barra invertida.
+    colunas = []
+    for coluna in df.columns:
+        serie = df[coluna]
+        if pd.api.types.is_datetime64_any_dtype(serie):
+            texto = serie.dt.strftime("%Y-%m-%d %H:%M:%S")
+        elif serie.dtype == object:
+            texto = serie.map(escapar_texto).astype(str)
+        else:
+            texto = serie.astype(str)
+        colunas.append(texto.mask(serie.isna(), "\\N"))
+
+    linhas = colunas[0].str.cat(colunas[1:], sep="\t")
+    with open(caminho, "w", encoding="utf-8", newline="\n") as arquivo:
+        arquivo.write("\n".join(linhas))
+        arquivo.write("\n")
+
+
+def carregar_arquivo_tsv(
+    cursor, caminho: str, tabela: str, colunas: list, qt_linhas: int
+) -> None:
+    # O LOAD DATA LOCAL trata erros como o IGNORE: chave duplicada e conversão
+    # inválida viram avisos e a linha é descartada. Confere a quantidade de
+    # linhas e os avisos antes do commit, para que um lote incompleto não seja
+    # confirmado (nem registrado como gravado).
+    cursor.execute(
+        f"LOAD DATA LOCAL INFILE '{caminho}' INTO TABLE {tabela} "
+        "CHARACTER SET utf8mb4 "
+        "FIELDS TERMINATED BY '\\t' LINES TERMINATED BY '\\n' "
+        f"({', '.join(colunas)})"
+    )
+    qt_gravada = cursor.rowcount
+    cursor.execute("SHOW WARNINGS LIMIT 5")
+    avisos = cursor.fetchall()
+    if qt_gravada != qt_linhas or avisos:
+        detalhes = "; ".join(
+            f"{nivel} {codigo}: {mensagem}" for nivel, codigo, mensagem in avisos
+        )
+        raise RuntimeError(
+            f"LOAD DATA em {tabela} gravou {qt_gravada} de {qt_linhas} linhas"
+            + (f" ({detalhes})" if detalhes else "")
+        )
+
+
+# ========== MÉTODOS DE CARGA ==========
+# `registro` é um comando (sql, parâmetros) executado na mesma transação das
+# linhas, usado para registrar o lote como gravado. Quando informado, o
+# DataFrame inteiro é confirmado em um único commit; sem ele, cada fatia de
+# `tamanho_lote` linhas tem o seu commit.
+#
+# Os carregadores devolvem quantas idas ao banco (comandos e commits) fizeram
+# pelo cursor do driver, que não passam pelos eventos do SQLAlchemy; o to_sql
+# usa a conexão do SQLAlchemy e devolve 0.
+def inserir_to_sql(
+    engine: Engine,
+    df: pd.DataFrame,
+    tabela: str,
+    registro: Optional[tuple] = None,
+    **_,
+) -> int:
+    with engine.begin() as conn:
+        df.to_sql(tabela, con=conn, if_exists="append", index=False)
+        if registro is not None:
+            conn.exec_driver_sql(*registro)
+    return 0
+
+
+def inserir_multi(
+    engine: Engine,
+    df: pd.DataFrame,
+    tabela: str,
+    tamanho_lote: int,
+    registro: Optional[tuple] = None,
+) -> int:
+    colunas = ", ".join(df.columns)
+    marcadores = ", ".join(["%s"] * len(df.columns))
+    sql = f"INSERT INTO {tabela} ({colunas}) VALUES ({marcadores})"
+
+    raw_conn = engine.raw_connection()
+    cursor = None
+    idas_banco = 0
+    try:
+        cursor = raw_conn.cursor()
+        for lote in fatiar(df, tamanho_lote):
+            # O mysql-connector reescreve o executemany de INSERT em um único
+            # INSERT com várias linhas em VALUES.
+            cursor.executemany(sql, linhas_para_driver(lote))
+            idas_banco += 1
+            if registro is None:
+                raw_conn.commit()
+                idas_banco += 1
+        if registro is not None:
+            cursor.execute(*registro)
+            raw_conn.commit()
+            idas_banco += 2
+        return idas_banco
+    except Exception:
+        raw_conn.rollback()
+        raise
+    finally:
+        if cursor is not None:
+            cursor.close()
+        raw_conn.close()
+
+
+def inserir_load_data(
+    engine: Engine,
+    df: pd.DataFrame,
+    tabela: str,
+    tamanho_lote: int,
+    registro: Optional[tuple] = None,
+) -> int:
+    raw_conn = engine.raw_connection()
+    cursor = None
+    idas_banco = 0
+    arquivo = tempfile.NamedTemporaryFile(suffix=".tsv", delete=False)
+    arquivo.close()
+    try:
+        cursor = raw_conn.cursor()
+        for lote in fatiar(df, tamanho_lote):
+            dataframe_para_tsv(lote, arquivo.name)
+            carregar_arquivo_tsv(
+                cursor, arquivo.name, tabela, list(df.columns), len(lote)
+            )
+            idas_banco += 2
+            if registro is None:
+                raw_conn.commit()
+                idas_banco += 1
+        if registro is not None:
+            cursor.execute(*registro)
+            raw_conn.commit()
+            idas_banco += 2
+        return idas_banco
+    except Exception:
+        raw_conn.rollback()
+        raise
+    finally:
+        if cursor is not None:
+            cursor.close()
+        raw_conn.close()
+        os.remove(arquivo.name)
+
+
+CARREGADORES = {
+    METODO_TO_SQL: inserir_to_sql,
+    METODO_MULTI: inserir_multi,
+    METODO_LOAD_DATA: inserir_load_data,
+}
+
+
+def inserir_em_massa(
+    engine: Engine,
+    df: pd.DataFrame,
+    tabela: str,
+    metodo: str = METODO_MULTI,
+    tamanho_lote: int = TAMANHO_LOTE_PADRAO,
+    registro: Optional[tuple] = None,
+) -> int:
+    if metodo not in CARREGADORES:
+        raise ValueError(
+            f"Método de carga inválido: {metodo}. Opções: {', '.join(METODOS_CARGA)}"
+        )
+    return CARREGADORES[metodo](
+        engine, df, tabela, tamanho_lote=tamanho_lote, registro=registro
+    )
@@ -0,0 +1,252 @@
+import gzip
+import json
+import logging
+import os
+import shutil
+import tempfile
+import threading
+from pathlib import Path
+from typing import Iterator, Optional
+
+import pandas as pd
+from sqlalchemy import text
+from sqlalchemy.engine import Engine
+
+from escrita_bulk import (
+    METODO_LOAD_DATA,
+    TAMANHO_LOTE_PADRAO,
+    carregar_arquivo_tsv,
+    dataframe_para_tsv,
+    inserir_em_massa,
+)
+
+logger = logging.getLogger(__name__)
+
+# Exportação do conjunto de dados gerado pela carga para arquivos particionados
+# (um diretório por tabela, um arquivo por lote gravado) e reprodução desses
+# arquivos em outro banco, sem gerar os dados de novo. O manifesto lista as
+# tabelas na ordem em que a carga as gravou, que respeita as chaves
+# estrangeiras, e as partes de cada uma.
+#
+# Formatos:
+# - parquet: colunar, lido em blocos pelo pyarrow (importado só quando usado;
+#   sem ele, o padrão passa a ser tsv.gz);
+# - tsv.gz: o formato do LOAD DATA comprimido, descomprimido direto para o
+#   arquivo do LOAD DATA na reprodução, sem passar por DataFrame.
+FORMATO_PARQUET = "parquet"
+FORMATO_TSV_GZ = "tsv.gz"
+FORMATOS_EXPORTACAO = (FORMATO_PARQUET, FORMATO_TSV_GZ)
+ARQUIVO_MANIFESTO = "manifesto.json"
+LINHAS_POR_LEITURA = 100_000
+NIVEL_COMPRESSAO_GZIP = 1
+
+
+# ========== FUNÇÕES AUXILIARES ==========
+def pyarrow_disponivel() -> bool:
+    try:
+        import pyarrow.parquet  # noqa: F401
+    except ImportError:
+        return False
+    return True
+
+
+def formato_padrao() -> str:
+    return FORMATO_PARQUET if pyarrow_disponivel() else FORMATO_TSV_GZ
+
+
+def gravar_atomico(caminho: Path, gravar) -> None:
+    # O arquivo só aparece com o nome final depois de escrito por inteiro.
+    temporario = caminho.with_name(f".{caminho.name}.{os.getpid()}")
+    gravar(temporario)
+    temporario.replace(caminho)
+
+
+def gravar_tsv_gz(df: pd.DataFrame, caminho: Path) -> None:
+    with tempfile.NamedTemporaryFile(suffix=".tsv", delete=False) as arquivo:
+        pass
+    try:
+        dataframe_para_tsv(df, arquivo.name)
+        with open(arquivo.name, "rb") as origem, gzip.open(
+            caminho, "wb", compresslevel=NIVEL_COMPRESSAO_GZIP
+        ) as destino:
+            shutil.copyfileobj(origem, destino)
+    finally:
+        os.remove(arquivo.name)
+
+
+def chaves_primarias(engine: Engine, tabelas: list) -> dict:
+    with engine.connect() as conn:
+        linhas = conn.execute(
+            text(
+                """
+                SELECT table_name, column_name
+                FROM information_schema.key_column_usage
+                WHERE table_schema = DATABASE()
+                  AND constraint_name = 'PRIMARY'
+            """
+            )
+        ).all()
+    return {tabela: coluna for tabela, coluna in linhas if tabela in tabelas}
+
+
+# ========== EXPORTAÇÃO ==========
+class ExportadorCarga:
+    def __init__(self, diretorio: Path, formato: Optional[str] = None):
+        self.diretorio = Path(diretorio)
+        self.formato = formato or formato_padrao()
+        if self.formato not in FORMATOS_EXPORTACAO:
+            raise ValueError(
+                f"Formato inválido: {self.formato}. "
+                f"Opções: {', '.join(FORMATOS_EXPORTACAO)}"
+            )
+        if self.formato == FORMATO_PARQUET and not pyarrow_disponivel():
+            raise RuntimeError("A exportação em parquet requer o pacote pyarrow.")
+        # Ordem de inserção no dicionário = ordem da primeira gravação.
+        self.tabelas: dict[str, dict] = {}
+        self._trava = threading.Lock()
+
+    def gravar(self, tabela: str, df: pd.DataFrame) -> None:
+        with self._trava:
+            entrada = self.tabelas.setdefault(
+                tabela, {"tabela": tabela, "colunas": list(df.columns), "partes": []}
+            )
+            nu_parte = len(entrada["partes"]) + 1
+            nome = f"parte-{nu_parte:05d}.{self.formato}"
+            entrada["partes"].append({"arquivo": nome, "qt_registro": len(df)})
+
+        caminho = self.diretorio / tabela / nome
+        caminho.parent.mkdir(parents=True, exist_ok=True)
+        if self.formato == FORMATO_PARQUET:
+            gravar_atomico(caminho, lambda destino: df.to_parquet(destino, index=False))
+        else:
+            gravar_atomico(caminho, lambda destino: gravar_tsv_gz(df, destino))
+
+    def exportar_tabela(self, engine: Engine, tabela: str) -> None:
+        # Substitui as partes da tabela por uma cópia do banco.
+        df = pd.read_sql(text(f"SELECT * FROM {tabela}"), engine)
+        with self._trava:
+            partes = self.tabelas[tabela]["partes"]
+            self.tabelas[tabela] = {
+                "tabela": tabela,
+                "colunas": list(df.columns),
+                "partes": [],
+            }
+        for parte in partes:
+            (self.diretorio / tabela / parte["arquivo"]).unlink(missing_ok=True)
+        self.gravar(tabela, df)
+
+    def concluir(self, engine: Engine, parametros: dict) -> Path:
+        # Tabelas cujo id vem do AUTO_INCREMENT (ex.: tb_produto_categoria) não
+        # têm o id nas partes; quando outra tabela exportada as referencia, a
+        # reprodução precisa dos mesmos ids, então elas são exportadas de novo a
+        # partir do banco, já com o id. São as tabelas de referência, pequenas.
+        tabelas = list(self.tabelas)
+        chaves = chaves_primarias(engine, tabelas)
+        with engine.connect() as conn:
+            referenciadas = set(
+                conn.execute(
+                    text(
+                        """
+                        SELECT DISTINCT referenced_table_name
+                        FROM information_schema.key_column_usage
+                        WHERE table_schema = DATABASE()
+                          AND referenced_table_name IS NOT NULL
+                    """
+                    )
+                )
+                .scalars()
+                .all()
+            )
+        for tabela in tabelas:
+            sem_id = chaves.get(tabela) not in self.tabelas[tabela]["colunas"]
+            if tabela in referenciadas and sem_id:
+                self.exportar_tabela(engine, tabela)
+
+        ordem = {tabela: posicao for posicao, tabela in enumerate(tabelas)}
+        manifesto = {
+            "formato": self.formato,
+            "parametros": parametros,
+            "tabelas": sorted(self.tabelas.values(), key=lambda e: ordem[e["tabela"]]),
+        }
+        caminho = self.diretorio / ARQUIVO_MANIFESTO
+        gravar_atomico(
+            caminho,
+            lambda destino: destino.write_text(
+                json.dumps(manifesto, indent=2, ensure_ascii=False)
+            ),
+        )
+        qt_registros = sum(
+            p["qt_registro"] for e in self.tabelas.values() for p in e["partes"]
+        )
+        logger.info(
+            f"Exportação: {len(self.tabelas)} tabelas e {qt_registros} registros "
+            f"em {self.diretorio} ({self.formato})."
+        )
+        return caminho
+
+
+# ========== REPRODUÇÃO ==========
+def ler_manifesto(diretorio: Path) -> dict:
+    caminho = Path(diretorio) / ARQUIVO_MANIFESTO
+    if not caminho.exists():
+        raise FileNotFoundError(
+            f"{caminho} não encontrado: a exportação não foi concluída."
+        )
+    return json.loads(caminho.read_text())
+
+
+def ler_parquet(caminho: Path, linhas_por_leitura: int) -> Iterator[pd.DataFrame]:
+    # Leitura em blocos do arquivo mapeado em memória: um bloco por vez em DataFrame.
+    import pyarrow.parquet as pq
+
+    arquivo = pq.ParquetFile(caminho, memory_map=True)
+    for bloco in arquivo.iter_batches(batch_size=linhas_por_leitura):
+        yield bloco.to_pandas()
+
+
+def reproduzir_tsv_gz(
+    engine: Engine, caminho: Path, tabela: str, colunas: list, qt_registro: int
+) -> None:
+    with tempfile.NamedTemporaryFile(suffix=".tsv", delete=False) as arquivo:
+        with gzip.open(caminho, "rb") as origem:
+            shutil.copyfileobj(origem, arquivo)
+    raw_conn = engine.raw_connection()
+    cursor = None
+    try:
+        cursor = raw_conn.cursor()
+        carregar_arquivo_tsv(cursor, arquivo.name, tabela, colunas, qt_registro)
+        raw_conn.commit()
+    except Exception:
+        raw_conn.rollback()
+        raise
+    finally:
+        if cursor is not None:
+            cursor.close()
+        raw_conn.close()
+        os.remove(arquivo.name)
+
+
+def reproduzir_tabela(
+    engine: Engine,
+    diretorio: Path,
+    formato: str,
+    entrada: dict,
+    metodo: str = METODO_LOAD_DATA,
+    tamanho_lote: int = TAMANHO_LOTE_PADRAO,
+    linhas_por_leitura: int = LINHAS_POR_LEITURA,
+) -> int:
+    tabela = entrada["tabela"]
+    qt_registros = 0
+    for parte in entrada["partes"]:
+        caminho = Path(diretorio) / tabela / parte["arquivo"]
+        if formato == FORMATO_TSV_GZ:
+            # As partes já estão no formato do LOAD DATA: vão direto ao banco,
+            # qualquer que seja o método escolhido.
+            reproduzir_tsv_gz(
+                engine, caminho, tabela, entrada["colunas"], parte["qt_registro"]
+            )
+        else:
+            for df in ler_parquet(caminho, linhas_por_leitura):
+                inserir_em_massa(engine, df, tabela, metodo, tamanho_lote)
+        qt_registros += parte["qt_registro"]
+    return qt_registros
@@ -0,0 +1,93 @@
+import argparse
+import sys
+import time
+from datetime import date
+from decimal import Decimal
+
+from conexao import obter_engine
+from relatorio_stream import (
+    codificar_json,
+    codificar_ndjson,
+    consultar_totais_venda_periodo,
+    iterar_pedido_cliente_valor_minimo,
+    iterar_venda_periodo_produto,
+)
+
+# Exporta um relatório linha a linha (NDJSON) ou no formato JSON da procedure,
+# escrevendo cada linha assim que ela chega do servidor. Uso:
+#   python exportar_relatorio.py pedido --data-inicio 2025-01-01 \
+#       --data-fim 2025-06-01 --valor-minimo 10000 > pedidos.ndjson
+#   python exportar_relatorio.py venda --categoria ELETRONICOS --formato json
+
+
+class Cronometro:
+    # Marca o tempo até a primeira linha e conta as linhas entregues.
+    def __init__(self, linhas):
+        self.linhas = linhas
+        self.inicio = time.perf_counter()
+        self.primeira_linha = None
+        self.quantidade = 0
+
+    def __iter__(self):
+        for linha in self.linhas:
+            if self.primeira_linha is None:
+                self.primeira_linha = time.perf_counter() - self.inicio
+            self.quantidade += 1
+            yield linha
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("relatorio", choices=("venda", "pedido"))
+    parser.add_argument("--data-inicio", type=date.fromisoformat, default="2025-01-01")
+    parser.add_argument("--data-fim", type=date.fromisoformat, default="2025-06-01")
+    parser.add_argument("--categoria", default="ELETRONICOS")
+    parser.add_argument("--situacao", default="CONCLUIDO")
+    parser.add_argument("--valor-minimo", type=Decimal, default=Decimal("10000"))
+    parser.add_argument("--formato", choices=("ndjson", "json"), default="ndjson")
+    args = parser.parse_args()
+
+    if args.relatorio == "venda":
+        linhas = Cronometro(
+            iterar_venda_periodo_produto(
+                obter_engine(), args.data_inicio, args.data_fim, args.categoria
+            )
+        )
+        chave_lista = "dc_produto"
+        cabecalho = (
+            consultar_totais_venda_periodo(
+                obter_engine(), args.data_inicio, args.data_fim
+            )._asdict()
+            if args.formato == "json"
+            else None
+        )
+    else:
+        linhas = Cronometro(
+            iterar_pedido_cliente_valor_minimo(
+                obter_engine(),
+                args.data_inicio,
+                args.data_fim,
+                args.situacao,
+                args.valor_minimo,
+            )
+        )
+        chave_lista = "dc_resultado"
+        cabecalho = None
+
+    if args.formato == "ndjson":
+        partes = codificar_ndjson(linhas)
+    else:
+        partes = codificar_json(linhas, chave_lista, cabecalho)
+    for parte in partes:
+        sys.stdout.write(parte)
+    sys.stdout.flush()
+
+    print(
+        f"{linhas.quantidade} linhas; primeira em {linhas.primeira_linha or 0:.3f}s, "
+        f"total em {time.perf_counter() - linhas.inicio:.3f}s",
+        file=sys.stderr,
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,365 @@
+from datetime import date
+from typing import Callable, Collection, Iterable, Iterator, Optional, Sequence
+
+import numpy as np
+import pandas as pd
+
+from distribuicoes import AmostragemPedido, sortear_indices
+
+# Valores monetários são tratados em centavos (int64) durante toda a geração.
+# A conversão para reais acontece apenas na montagem do DataFrame.
+QT_ITEM_MAXIMA = 50
+PERCENTUAL_MAXIMO_DESCONTO = 3  # em décimos: 3/10 = 30%
+DIAS_PERIODO_PEDIDO = 365
+RODADAS_REJEICAO = 8
+CELULAS_POR_BLOCO = 4_000_000  # chaves por bloco do sorteio sem repetição
+
+
+# ========== FUNÇÕES AUXILIARES ==========
+def arredondar_meio_para_cima(numerador: np.ndarray, denominador: int) -> np.ndarray:
+    # Equivalente ao ROUND_HALF_UP do Decimal para valores não negativos.
+    return (2 * numerador + denominador) // (2 * denominador)
+
+
+def centavos_para_reais(centavos: np.ndarray) -> np.ndarray:
+    return centavos / 100
+
+
+def fatiar_ids(ids: np.ndarray, tamanho_lote: int) -> Iterator[np.ndarray]:
+    for inicio in range(0, len(ids), tamanho_lote):
+        yield ids[inicio : inicio + tamanho_lote]
+
+
+def pedidos_por_lote(tamanho_lote: int, max_itens: int) -> int:
+    # Quantidade de pedidos que gera, em média, tamanho_lote itens.
+    return max(1, 2 * tamanho_lote // (max_itens + 1))
+
+
+def sortear_matriz_sem_repeticao(
+    qt_por_pedido: np.ndarray,
+    qt_produtos: int,
+    rng: np.random.Generator,
+    cdf: Optional[np.ndarray] = None,
+) -> np.ndarray:
+    # Embaralha uma matriz (pedidos x produtos) por linha e fica com os
+    # primeiros de cada pedido, em blocos de pedidos para limitar a memória.
+    pesos = None
+    if cdf is not None:
+        pesos = np.maximum(np.diff(cdf, prepend=0.0), np.finfo(float).tiny)
+    pedidos_por_bloco = max(1, CELULAS_POR_BLOCO // qt_produtos)
+    blocos = []
+    for inicio in range(0, len(qt_por_pedido), pedidos_por_bloco):
+        qt_bloco = qt_por_pedido[inicio : inicio + pedidos_por_bloco]
+        chaves = rng.random((len(qt_bloco), qt_produtos))
+        if pesos is not None:
+            # Chaves exponenciais divididas pelo peso: a ordem crescente é um
+            # sorteio ponderado sem reposição (Efraimidis-Spirakis).
+            chaves = -np.log1p(-chaves) / pesos
+        permutacao = np.argsort(chaves, axis=1)
+        posicao = np.arange(int(qt_bloco.sum())) - np.repeat(
+            np.cumsum(qt_bloco) - qt_bloco, qt_bloco
+        )
+        blocos.append(
+            permutacao[np.repeat(np.arange(len(qt_bloco)), qt_bloco), posicao]
+        )
+    return np.concatenate(blocos) if blocos else np.empty(0, dtype=np.int64)
+
+
+def sortear_produtos_sem_repeticao(
+    qt_por_pedido: np.ndarray,
+    qt_produtos: int,
+    rng: np.random.Generator,
+    cdf: Optional[np.ndarray] = None,
+) -> np.ndarray:
+    """Sorteia índices de produtos sem repetição dentro de cada pedido.
+
+    Com cdf (popularidade acumulada dos produtos), cada produto é sorteado
+    com o seu peso; sem, todos têm a mesma chance.
+    """
+    qt_total = int(qt_por_pedido.sum())
+    indice_pedido = np.repeat(np.arange(len(qt_por_pedido)), qt_por_pedido)
+
+    def sortear(qtd: int) -> np.ndarray:
+        if cdf is None:
+            return rng.integers(0, qt_produtos, size=qtd)
+        return sortear_indices(cdf, qtd, rng)
+
+    # Quando o pedido pode ocupar boa parte do catálogo, o sorteio por rejeição
+    # degrada; nesse caso sorteia direto sem repetição.
+    if int(qt_por_pedido.max(initial=0)) * 2 > qt_produtos:
+        return sortear_matriz_sem_repeticao(qt_por_pedido, qt_produtos, rng, cdf)
+
+    # Cada rodada sorteia de novo só as repetições e confere só os pedidos que
+    # as tinham. Com popularidade concentrada (Zipf com s alto), os poucos
+    # produtos populares se repetem rodada após rodada: depois de
+    # RODADAS_REJEICAO, os pedidos ainda com repetição são sorteados inteiros
+    # sem repetição. Sem cdf, a rejeição sempre converge e não tem limite.
+    escolhidos = sortear(qt_total)
+    pendentes = np.arange(qt_total)
+    rodada = 0
+    while True:
+        chave = indice_pedido[pendentes] * qt_produtos + escolhidos[pendentes]
+        ordem = np.argsort(chave, kind="stable")
+        repetido = np.zeros(len(pendentes), dtype=bool)
+        repetido[ordem[1:]] = chave[ordem[1:]] == chave[ordem[:-1]]
+        qt_repetido = int(repetido.sum())
+        if qt_repetido == 0:
+            return escolhidos
+        repetidos = pendentes[repetido]
+        pedidos_repetidos = np.unique(indice_pedido[repetidos])
+        pendentes = pendentes[np.isin(indice_pedido[pendentes], pedidos_repetidos)]
+        rodada += 1
+        if cdf is not None and rodada > RODADAS_REJEICAO:
+            escolhidos[pendentes] = sortear_matriz_sem_repeticao(
+                qt_por_pedido[pedidos_repetidos], qt_produtos, rng, cdf
+            )
+            return escolhidos
+        escolhidos[repetidos] = sortear(qt_repetido)
+
+
+def sortear_datas_pedido(
+    qtd: int,
+    rng: np.random.Generator,
+    data_referencia: Optional[date] = None,
+    amostragem: Optional[AmostragemPedido] = None,
+) -> np.ndarray:
+    data_referencia = data_referencia or date.today()
+    cdf = (
+        amostragem.cdf_dias_atras(data_referencia, DIAS_PERIODO_PEDIDO + 1)
+        if amostragem is not None
+        else None
+    )
+    if cdf is None:
+        dias_atras = rng.integers(0, DIAS_PERIODO_PEDIDO + 1, size=qtd)
+    else:
+        dias_atras = sortear_indices(cdf, qtd, rng)
+    return np.datetime64(data_referencia, "D") - dias_atras.astype("timedelta64[D]")
+
+
+def inicio_pedidos(id_pedido: np.ndarray) -> np.ndarray:
+    # Os itens saem agrupados por pedido, na mesma ordem de ids_pedido, e todo
+    # pedido tem ao menos um item: posição do primeiro item de cada pedido.
+    return np.flatnonzero(np.r_[True, id_pedido[1:] != id_pedido[:-1]])
+
+
+# ========== GERAÇÃO ==========
+def gerar_pedidos(
+    ids_pedido: np.ndarray,
+    ids_cliente: np.ndarray,
+    codigos_situacao: np.ndarray,
+    textos_observacao: Sequence[str],
+    rng: np.random.Generator,
+    id_usuario: int,
+    vl_pedido_total: Optional[np.ndarray] = None,
+    data_referencia: Optional[date] = None,
+    amostragem: Optional[AmostragemPedido] = None,
+) -> pd.DataFrame:
+    qtd = len(ids_pedido)
+    data_referencia = data_referencia or date.today()
+    dt_pedido = sortear_datas_pedido(qtd, rng, data_referencia, amostragem)
+
+    textos = np.asarray(textos_observacao, dtype=object)
+    com_observacao = rng.random(qtd) > 0.5
+    tx_observacao = np.where(
+        com_observacao, textos[rng.integers(0, len(textos), size=qtd)], None
+    )
+
+    cdf_cliente = None
+    co_pedido_situacao = None
+    if amostragem is not None:
+        cdf_cliente = amostragem.cdf_ids("tb_pedido", "id_cliente", len(ids_cliente))
+    if cdf_cliente is None:
+        id_cliente = rng.choice(ids_cliente, size=qtd)
+    else:
+        id_cliente = ids_cliente[sortear_indices(cdf_cliente, qtd, rng)]
+    if amostragem is not None:
+        co_pedido_situacao = amostragem.sortear_situacoes(
+            codigos_situacao, dt_pedido, data_referencia, rng
+        )
+    if co_pedido_situacao is None:
+        co_pedido_situacao = rng.choice(codigos_situacao, size=qtd)
+
+    if vl_pedido_total is None:
+        vl_pedido_total = np.zeros(qtd, dtype=np.int64)
+
+    return pd.DataFrame(
+        {
+            "id_pedido": ids_pedido,
+            "id_cliente": id_cliente,
+            "co_pedido_situacao": co_pedido_situacao,
+            "dt_pedido": dt_pedido,
+            "vl_pedido_total": centavos_para_reais(vl_pedido_total),
+            "tx_observacao": tx_observacao,
+            "id_usuario_criacao": id_usuario,
+            "id_usuario_atualizacao": id_usuario,
+        }
+    )
+
+
+def gerar_itens_pedido(
+    ids_pedido: np.ndarray,
+    ids_produto: np.ndarray,
+    categorias_produto: np.ndarray,
+    precos_centavos: np.ndarray,
+    max_itens: int,
+    rng: np.random.Generator,
+    amostragem: Optional[AmostragemPedido] = None,
+) -> dict:
+    """Gera as colunas de tb_pedido_item (valores em centavos) para os pedidos.
+
+    dt_pedido, copiada do pedido, é preenchida por datar_itens.
+    """
+    qt_produtos = len(ids_produto)
+    limite_itens = min(max_itens, qt_produtos)
+    qt_por_pedido = rng.integers(1, limite_itens + 1, size=len(ids_pedido))
+
+    cdf_produto = None
+    vl_desconto = None
+    if amostragem is not None:
+        cdf_produto = amostragem.cdf_ids("tb_pedido_item", "id_produto", qt_produtos)
+    indice_produto = sortear_produtos_sem_repeticao(
+        qt_por_pedido, qt_produtos, rng, cdf_produto
+    )
+    qt_item = rng.integers(1, QT_ITEM_MAXIMA + 1, size=len(indice_produto))
+    vl_unitario = precos_centavos[indice_produto]
+    vl_bruto = vl_unitario * qt_item
+
+    if amostragem is not None:
+        vl_desconto = amostragem.sortear_descontos(
+            vl_unitario, vl_bruto, PERCENTUAL_MAXIMO_DESCONTO / 10, rng
+        )
+    if vl_desconto is None:
+        vl_desconto_maximo = arredondar_meio_para_cima(
+            vl_bruto * PERCENTUAL_MAXIMO_DESCONTO, 10
+        )
+        vl_desconto = np.floor(rng.random(len(vl_bruto)) * vl_desconto_maximo + 0.5)
+        vl_desconto = np.minimum(vl_desconto.astype(np.int64), vl_desconto_maximo)
+
+    return {
+        "id_pedido": np.repeat(ids_pedido, qt_por_pedido),
+        "id_produto": ids_produto[indice_produto],
+        "id_produto_categoria": categorias_produto[indice_produto],
+        "qt_item": qt_item,
+        "vl_unitario": vl_unitario,
+        "vl_desconto": vl_desconto,
+        "vl_item_total": vl_bruto - vl_desconto,
+    }
+
+
+def totalizar_pedidos(itens: dict) -> np.ndarray:
+    return np.add.reduceat(itens["vl_item_total"], inicio_pedidos(itens["id_pedido"]))
+
+
+def datar_itens(itens: dict, dt_pedido: np.ndarray) -> None:
+    # Copia a data de cada pedido (na ordem de ids_pedido) para os seus itens.
+    qt_por_pedido = np.diff(
+        np.r_[inicio_pedidos(itens["id_pedido"]), len(itens["id_pedido"])]
+    )
+    itens["dt_pedido"] = np.repeat(dt_pedido, qt_por_pedido)
+
+
+def itens_para_dataframe(itens: dict, id_usuario: int) -> pd.DataFrame:
+    return pd.DataFrame(
+        {
+            "id_pedido": itens["id_pedido"],
+            "id_produto": itens["id_produto"],
+            "dt_pedido": itens["dt_pedido"],
+            "id_produto_categoria": itens["id_produto_categoria"],
+            "qt_item": itens["qt_item"],
+            "vl_unitario": centavos_para_reais(itens["vl_unitario"]),
+            "vl_desconto": centavos_para_reais(itens["vl_desconto"]),
+            "vl_item_total": centavos_para_reais(itens["vl_item_total"]),
+            "id_usuario_criacao": id_usuario,
+            "id_usuario_atualizacao": id_usuario,
+        }
+    )
+
+
+def gerar_lotes_pedidos(
+    qtd: int,
+    id_inicial: int,
+    ids_cliente: np.ndarray,
+    codigos_situacao: np.ndarray,
+    textos_observacao: Sequence[str],
+    ids_produto: np.ndarray,
+    categorias_produto: np.ndarray,
+    precos_centavos: np.ndarray,
+    max_itens: int,
+    rng_lote: Callable[[int], np.random.Generator],
+    id_usuario: int,
+    tamanho_lote: int,
+    data_referencia: Optional[date] = None,
+    lotes_ignorados: Collection[int] = (),
+    amostragem: Optional[AmostragemPedido] = None,
+) -> Iterator[tuple]:
+    """Gera pedidos e seus itens juntos, com vl_pedido_total já calculado.
+
+    rng_lote recebe o número do lote e devolve o gerador aleatório dele, o que
+    permite gerar qualquer lote de forma independente dos demais. Os lotes em
+    lotes_ignorados (já gravados em uma execução anterior) não são gerados.
+    Cada item é a tupla (nu_lote, df_pedidos, df_itens). amostragem define as
+    distribuições de clientes, datas, situações, produtos e descontos (sem ela,
+    todas são uniformes).
+    """
+    qt_pedidos_lote = pedidos_por_lote(tamanho_lote, max_itens)
+    for nu_lote, inicio in enumerate(range(0, qtd, qt_pedidos_lote)):
+        if nu_lote in lotes_ignorados:
+            continue
+        rng = rng_lote(nu_lote)
+        ids_pedido = np.arange(
+            id_inicial + inicio,
+            id_inicial + min(inicio + qt_pedidos_lote, qtd),
+            dtype=np.int64,
+        )
+        itens = gerar_itens_pedido(
+            ids_pedido,
+            ids_produto,
+            categorias_produto,
+            precos_centavos,
+            max_itens,
+            rng,
+            amostragem,
+        )
+        df_pedidos = gerar_pedidos(
+            ids_pedido,
+            ids_cliente,
+            codigos_situacao,
+            textos_observacao,
+            rng,
+            id_usuario,
+            totalizar_pedidos(itens),
+            data_referencia,
+            amostragem,
+        )
+        datar_itens(itens, df_pedidos["dt_pedido"].to_numpy(dtype="datetime64[D]"))
+        yield nu_lote, df_pedidos, itens_para_dataframe(itens, id_usuario)
+
+
+def gerar_lotes_itens_pedido(
+    lotes_ids_pedido: Iterable[np.ndarray],
+    ids_produto: np.ndarray,
+    categorias_produto: np.ndarray,
+    precos_centavos: np.ndarray,
+    max_itens: int,
+    rng: np.random.Generator,
+    id_usuario: int,
+    data_referencia: Optional[date] = None,
+    amostragem: Optional[AmostragemPedido] = None,
+) -> Iterator[pd.DataFrame]:
+    # Só os itens, para pedidos sem DataFrame: as datas são sorteadas como em
+    # gerar_pedidos.
+    for ids_pedido in lotes_ids_pedido:
+        itens = gerar_itens_pedido(
+            ids_pedido,
+            ids_produto,
+            categorias_produto,
+            precos_centavos,
+            max_itens,
+            rng,
+            amostragem,
+        )
+        datar_itens(
+            itens,
+            sortear_datas_pedido(len(ids_pedido), rng, data_referencia, amostragem),
+        )
+        yield itens_para_dataframe(itens, id_usuario)
@@ -0,0 +1,416 @@
+import logging
+import threading
+import time
+from dataclasses import dataclass, field
+from datetime import date
+from decimal import Decimal, InvalidOperation
+from typing import Optional, Sequence
+
+from sqlalchemy.engine import Engine
+
+logger = logging.getLogger(__name__)
+
+# Gravação de pedidos reais em lote. Cada chamada de IngestaoPedido.gravar
+# recebe pedidos com itens, valida cada um contra o cache de preços de
+# tb_produto, calcula os valores dos itens e do pedido em centavos e grava o
+# lote inteiro em uma transação (group commit): um INSERT de várias linhas em
+# tb_pedido e INSERTs de várias linhas em tb_pedido_item, sem o UPDATE de
+# vl_pedido_total da carga sintética. Pedidos inválidos são recusados com o
+# motivo e não impedem a gravação dos demais. Os ids gerados voltam na ordem
+# da entrada.
+ERRO_DEADLOCK = 1213
+ERRO_ESPERA_BLOQUEIO = 1205
+TENTATIVAS_TRANSACAO = 3
+TTL_PRECOS_SEGUNDOS = 300.0
+ITENS_POR_INSERT = 5000
+TAMANHO_MAXIMO_OBSERVACAO = 500
+
+COLUNAS_PEDIDO = (
+    "id_cliente",
+    "co_pedido_situacao",
+    "dt_pedido",
+    "vl_pedido_total",
+    "tx_observacao",
+    "id_usuario_criacao",
+    "id_usuario_atualizacao",
+)
+COLUNAS_ITEM = (
+    "id_pedido",
+    "id_produto",
+    "dt_pedido",
+    "id_produto_categoria",
+    "qt_item",
+    "vl_unitario",
+    "vl_desconto",
+    "vl_item_total",
+    "id_usuario_criacao",
+    "id_usuario_atualizacao",
+)
+SQL_PRODUTOS = """
+SELECT id_produto, CAST(vl_produto_unitario * 100 AS SIGNED), id_produto_categoria, in_ativo
+FROM tb_produto
+"""
+SQL_SITUACOES = "SELECT co_pedido_situacao FROM tb_pedido_situacao WHERE in_ativo = 1"
+
+
+class PedidoInvalido(ValueError):
+    pass
+
+
+class ProdutoDesatualizado(PedidoInvalido):
+    # Produto desconhecido ou preço diferente do cache: o cache pode estar
+    # desatualizado e é recarregado antes de o pedido ser recusado.
+    pass
+
+
+@dataclass
+class ItemPedidoEntrada:
+    id_produto: int
+    qt_item: int
+    vl_desconto: Decimal = Decimal("0.00")
+    # Quando informado, deve ser o preço vigente do produto.
+    vl_unitario: Optional[Decimal] = None
+
+
+@dataclass
+class PedidoEntrada:
+    id_cliente: int
+    co_pedido_situacao: int
+    itens: Sequence[ItemPedidoEntrada]
+    dt_pedido: Optional[date] = None  # padrão: hoje
+    tx_observacao: Optional[str] = None
+
+
+@dataclass
+class ProdutoPreco:
+    vl_centavos: int
+    id_produto_categoria: int
+    ativo: bool
+
+
+@dataclass
+class ResultadoIngestao:
+    # Id gerado de cada pedido, na ordem da entrada (None se recusado).
+    ids_pedido: list = field(default_factory=list)
+    # Posição do pedido na entrada -> motivo da recusa.
+    recusados: dict = field(default_factory=dict)
+    tentativas: int = 0
+    duracao: float = 0.0
+
+    @property
+    def qt_gravados(self) -> int:
+        return len(self.ids_pedido) - len(self.recusados)
+
+
+@dataclass
+class PedidoValidado:
+    posicao: int
+    pedido: tuple  # valores de COLUNAS_PEDIDO
+    itens: list  # valores de COLUNAS_ITEM, sem id_pedido
+
+
+# ========== FUNÇÕES AUXILIARES ==========
+def centavos(valor) -> int:
+    # Valores monetários chegam como Decimal (ou texto/int) com até 2 casas.
+    try:
+        valor_centavos = Decimal(str(valor)).scaleb(2)
+    except InvalidOperation:
+        raise PedidoInvalido(f"valor monetário inválido: {valor!r}")
+    if not valor_centavos.is_finite() or valor_centavos != valor_centavos.to_integral():
+        raise PedidoInvalido(f"valor monetário com mais de 2 casas: {valor!r}")
+    return int(valor_centavos)
+
+
+def centavos_para_decimal(valor_centavos: int) -> Decimal:
+    return Decimal(int(valor_centavos)).scaleb(-2)
+
+
+def insert_varias_linhas(tabela: str, colunas: Sequence[str], qt_linhas: int) -> str:
+    marcadores = f"({', '.join(['%s'] * len(colunas))})"
+    return f"INSERT INTO {tabela} ({', '.join(colunas)}) VALUES " + ", ".join(
+        [marcadores] * qt_linhas
+    )
+
+
+def codigo_erro(erro: Exception) -> Optional[int]:
+    return getattr(erro, "errno", None)
+
+
+# ========== INGESTÃO ==========
+class IngestaoPedido:
+    def __init__(
+        self,
+        engine: Engine,
+        id_usuario: int,
+        ttl_precos_segundos: float = TTL_PRECOS_SEGUNDOS,
+    ):
+        self.engine = engine
+        self.id_usuario = id_usuario
+        self.ttl_precos_segundos = ttl_precos_segundos
+        self.trava = threading.Lock()
+        self.produtos: dict[int, ProdutoPreco] = {}
+        self.situacoes: frozenset = frozenset()
+        self.carregado_em: Optional[float] = None
+        self.incremento_id: Optional[int] = None
+
+    # ========== CACHE DE PREÇOS ==========
+    def recarregar_precos(self) -> None:
+        raw_conn = self.engine.raw_connection()
+        try:
+            cursor = raw_conn.cursor()
+            cursor.execute(SQL_PRODUTOS)
+            produtos = {
+                id_produto: ProdutoPreco(vl_centavos, id_categoria, bool(ativo))
+                for id_produto, vl_centavos, id_categoria, ativo in cursor.fetchall()
+            }
+            cursor.execute(SQL_SITUACOES)
+            situacoes = frozenset(row[0] for row in cursor.fetchall())
+            cursor.execute("SELECT @@auto_increment_increment")
+            incremento_id = cursor.fetchone()[0]
+            cursor.close()
+        finally:
+            raw_conn.close()
+        with self.trava:
+            self.produtos = produtos
+            self.situacoes = situacoes
+            self.incremento_id = incremento_id
+            self.carregado_em = time.monotonic()
+        logger.info(f"Cache de preços carregado: {len(produtos)} produtos.")
+
+    def garantir_precos(self, forcar: bool = False) -> None:
+        carregado_em = self.carregado_em
+        if (
+            forcar
+            or carregado_em is None
+            or time.monotonic() - carregado_em > self.ttl_precos_segundos
+        ):
+            self.recarregar_precos()
+
+    # ========== VALIDAÇÃO ==========
+    def validar(self, posicao: int, pedido: PedidoEntrada) -> PedidoValidado:
+        if pedido.co_pedido_situacao not in self.situacoes:
+            raise PedidoInvalido(f"situação {pedido.co_pedido_situacao} inexistente")
+        if not pedido.itens:
+            raise PedidoInvalido("pedido sem itens")
+        observacao = pedido.tx_observacao
+        if observacao is not None and len(observacao) > TAMANHO_MAXIMO_OBSERVACAO:
+            raise PedidoInvalido(
+                f"observação com mais de {TAMANHO_MAXIMO_OBSERVACAO} caracteres"
+            )
+        dt_pedido = pedido.dt_pedido or date.today()
+
+        itens = []
+        vl_pedido_total = 0
+        produtos_pedido = set()
+        for item in pedido.itens:
+            produto = self.produtos.get(item.id_produto)
+            if produto is None:
+                raise ProdutoDesatualizado(f"produto {item.id_produto} inexistente")
+            if not produto.ativo:
+                raise PedidoInvalido(f"produto {item.id_produto} inativo")
+            if item.id_produto in produtos_pedido:
+                # uk_pediitem_01: um produto aparece uma vez por pedido.
+                raise PedidoInvalido(f"produto {item.id_produto} repetido no pedido")
+            produtos_pedido.add(item.id_produto)
+            if not isinstance(item.qt_item, int) or item.qt_item < 1:
+                raise PedidoInvalido(f"quantidade inválida: {item.qt_item!r}")
+            if (
+                item.vl_unitario is not None
+                and centavos(item.vl_unitario) != produto.vl_centavos
+            ):
+                raise ProdutoDesatualizado(
+                    f"preço do produto {item.id_produto} diferente do vigente "
+                    f"({centavos_para_decimal(produto.vl_centavos)})"
+                )
+            vl_bruto = produto.vl_centavos * item.qt_item
+            vl_desconto = centavos(item.vl_desconto)
+            if not 0 <= vl_desconto <= vl_bruto:
+                raise PedidoInvalido(f"desconto inválido no produto {item.id_produto}")
+            vl_item_total = vl_bruto - vl_desconto
+            vl_pedido_total += vl_item_total
+            itens.append(
+                (
+                    item.id_produto,
+                    dt_pedido,
+                    produto.id_produto_categoria,
+                    item.qt_item,
+                    centavos_para_decimal(produto.vl_centavos),
+                    centavos_para_decimal(vl_desconto),
+                    centavos_para_decimal(vl_item_total),
+                    self.id_usuario,
+                    self.id_usuario,
+                )
+            )
+
+        return PedidoValidado(
+            posicao,
+            (
+                pedido.id_cliente,
+                pedido.co_pedido_situacao,
+                dt_pedido,
+                centavos_para_decimal(vl_pedido_total),
+                observacao,
+                self.id_usuario,
+                self.id_usuario,
+            ),
+            itens,
+        )
+
+    def validar_lote(
+        self, pedidos: Sequence[PedidoEntrada], resultado: ResultadoIngestao
+    ) -> list:
+        self.garantir_precos()
+        recarregado = False
+        validados = []
+        for posicao, pedido in enumerate(pedidos):
+            try:
+                try:
+                    validados.append(self.validar(posicao, pedido))
+                except ProdutoDesatualizado:
+                    # Produto novo ou preço alterado desde a carga do cache:
+                    # recarrega no máximo uma vez por lote e valida de novo.
+                    if recarregado:
+                        raise
+                    self.garantir_precos(forcar=True)
+                    recarregado = True
+                    validados.append(self.validar(posicao, pedido))
+            except PedidoInvalido as e:
+                resultado.recusados[posicao] = str(e)
+        return validados
+
+    # ========== GRAVAÇÃO ==========
+    def recusar_clientes_inexistentes(
+        self, cursor, validados: list, resultado: ResultadoIngestao
+    ) -> list:
+        # Uma leitura por lote, na mesma transação: um cliente inexistente
+        # recusa o pedido em vez de desfazer o lote inteiro pela chave estrangeira.
+        ids_cliente = sorted({validado.pedido[0] for validado in validados})
+        if not ids_cliente:
+            return validados
+        cursor.execute(
+            "SELECT id_cliente FROM tb_cliente WHERE id_cliente IN "
+            f"({', '.join(['%s'] * len(ids_cliente))})",
+            ids_cliente,
+        )
+        existentes = {row[0] for row in cursor.fetchall()}
+        aceitos = []
+        for validado in validados:
+            if validado.pedido[0] in existentes:
+                aceitos.append(validado)
+            else:
+                resultado.recusados[validado.posicao] = (
+                    f"cliente {validado.pedido[0]} inexistente"
+                )
+        return aceitos
+
+    def inserir_pedidos(self, cursor, ordem: list) -> list:
+        # Um INSERT de várias linhas recebe valores consecutivos do
+        # AUTO_INCREMENT a partir do LAST_INSERT_ID, salvo com
+        # innodb_autoinc_lock_mode = 2 e inserts em massa simultâneos, ou com
+        # a carga gravando ids próprios (MAX + 1) ao mesmo tempo. Os ids
+        # deduzidos só são usados se as linhas lidas de volta na faixa forem
+        # exatamente as gravadas; senão, o INSERT é desfeito até o savepoint e
+        # cada pedido é gravado com o seu INSERT (id exato no LAST_INSERT_ID).
+        cursor.execute("SAVEPOINT sp_pedidos")
+        cursor.execute(
+            insert_varias_linhas("tb_pedido", COLUNAS_PEDIDO, len(ordem)),
+            [valor for validado in ordem for valor in validado.pedido],
+        )
+        primeiro_id = cursor.lastrowid
+        ids_pedido = [
+            primeiro_id + indice * self.incremento_id for indice in range(len(ordem))
+        ]
+        if cursor.rowcount == len(ordem):
+            cursor.execute(
+                f"SELECT id_pedido, {', '.join(COLUNAS_PEDIDO)} FROM tb_pedido "
+                "WHERE id_pedido BETWEEN %s AND %s ORDER BY id_pedido",
+                (ids_pedido[0], ids_pedido[-1]),
+            )
+            gravados = [(row[0], tuple(row[1:])) for row in cursor.fetchall()]
+            if gravados == [
+                (id_pedido, validado.pedido)
+                for id_pedido, validado in zip(ids_pedido, ordem)
+            ]:
+                cursor.execute("RELEASE SAVEPOINT sp_pedidos")
+                return ids_pedido
+
+        logger.warning(
+            f"Ids de {len(ordem)} pedidos não consecutivos a partir de {primeiro_id}: "
+            f"gravando um pedido por INSERT."
+        )
+        cursor.execute("ROLLBACK TO SAVEPOINT sp_pedidos")
+        ids_pedido = []
+        for validado in ordem:
+            cursor.execute(
+                insert_varias_linhas("tb_pedido", COLUNAS_PEDIDO, 1), validado.pedido
+            )
+            ids_pedido.append(cursor.lastrowid)
+        cursor.execute("RELEASE SAVEPOINT sp_pedidos")
+        return ids_pedido
+
+    def inserir(self, cursor, validados: list) -> list:
+        # Pedidos e itens vão em ordem de (dt_pedido, categoria, produto): as
+        # linhas de tb_venda_dia e tb_venda_produto_dia atualizadas pelos
+        # triggers são bloqueadas na mesma ordem por lotes concorrentes, o que
+        # evita deadlocks entre eles.
+        ordem = sorted(validados, key=lambda validado: validado.pedido[2])
+        ids_pedido = self.inserir_pedidos(cursor, ordem)
+
+        itens = sorted(
+            (
+                (id_pedido, *item)
+                for id_pedido, validado in zip(ids_pedido, ordem)
+                for item in validado.itens
+            ),
+            key=lambda item: (item[2], item[3], item[1]),
+        )
+        for inicio in range(0, len(itens), ITENS_POR_INSERT):
+            fatia = itens[inicio : inicio + ITENS_POR_INSERT]
+            cursor.execute(
+                insert_varias_linhas("tb_pedido_item", COLUNAS_ITEM, len(fatia)),
+                [valor for item in fatia for valor in item],
+            )
+        return [
+            (validado.posicao, id_pedido)
+            for validado, id_pedido in zip(ordem, ids_pedido)
+        ]
+
+    def gravar(self, pedidos: Sequence[PedidoEntrada]) -> ResultadoIngestao:
+        inicio = time.perf_counter()
+        resultado = ResultadoIngestao(ids_pedido=[None] * len(pedidos))
+        validados = self.validar_lote(pedidos, resultado)
+        if not validados:
+            resultado.duracao = time.perf_counter() - inicio
+            return resultado
+
+        raw_conn = self.engine.raw_connection()
+        cursor = raw_conn.cursor()
+        try:
+            for tentativa in range(1, TENTATIVAS_TRANSACAO + 1):
+                resultado.tentativas = tentativa
+                try:
+                    aceitos = self.recusar_clientes_inexistentes(
+                        cursor, validados, resultado
+                    )
+                    gravados = self.inserir(cursor, aceitos) if aceitos else []
+                    raw_conn.commit()
+                    break
+                except Exception as e:
+                    raw_conn.rollback()
+                    if (
+                        codigo_erro(e) not in (ERRO_DEADLOCK, ERRO_ESPERA_BLOQUEIO)
+                        or tentativa == TENTATIVAS_TRANSACAO
+                    ):
+                        raise
+                    logger.warning(
+                        f"Lote de {len(validados)} pedidos desfeito ({e}); "
+                        f"tentativa {tentativa + 1} de {TENTATIVAS_TRANSACAO}."
+                    )
+        finally:
+            cursor.close()
+            raw_conn.close()
+
+        for posicao, id_pedido in gravados:
+            resultado.ids_pedido[posicao] = id_pedido
+        resultado.duracao = time.perf_counter() - inicio
+        return resultado
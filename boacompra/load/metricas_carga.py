@@ -0,0 +1,238 @@
+import json
+import os
+import resource
+import threading
+import time
+from contextlib import contextmanager
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+from typing import Callable, Iterable, Iterator, Optional
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+# Métricas por etapa da carga. A etapa corrente é guardada por thread: as
+# etapas rodam em paralelo, cada uma na sua thread do agendador, e tudo o que
+# a thread mede (tempos, registros, idas ao banco) vai para a etapa dela.
+FORA_DE_ETAPA = "(fora de etapa)"
+PREFIXO_PROMETHEUS = "boacompra_carga"
+MAXIMO_ERROS_POR_ETAPA = 20
+
+
+@dataclass
+class MetricasEtapa:
+    etapa: str
+    duracao: float = 0.0
+    # Tempo por fase: geração dos registros, montagem do DataFrame e escrita.
+    tempo_geracao: float = 0.0
+    tempo_dataframe: float = 0.0
+    tempo_escrita: float = 0.0
+    registros: int = 0
+    lotes: int = 0
+    idas_banco: int = 0
+    # Pico de RSS do processo ao final da etapa. Etapas paralelas dividem o
+    # processo: o valor é o pico até ali, não o consumo isolado da etapa.
+    rss_pico_mb: float = 0.0
+    erros: list = field(default_factory=list)
+    # Por tabela gravada pela etapa: [registros, segundos de escrita].
+    tabelas: dict = field(default_factory=dict)
+
+    @property
+    def registros_por_segundo(self) -> float:
+        return self.registros / max(self.tempo_escrita, 1e-9)
+
+
+# ========== FUNÇÕES AUXILIARES ==========
+def rss_pico_mb() -> float:
+    # ru_maxrss é em KB no Linux.
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+def rotulo_prometheus(valor: str) -> str:
+    return valor.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+# ========== COLETOR ==========
+class ColetorMetricas:
+    def __init__(self):
+        self.etapas: dict[str, MetricasEtapa] = {}
+        self.inicio = time.perf_counter()
+        self._local = threading.local()
+        self._trava = threading.Lock()
+
+    def metricas(self, etapa: Optional[str] = None) -> MetricasEtapa:
+        etapa = etapa or getattr(self._local, "etapa", None) or FORA_DE_ETAPA
+        with self._trava:
+            if etapa not in self.etapas:
+                self.etapas[etapa] = MetricasEtapa(etapa)
+            return self.etapas[etapa]
+
+    @contextmanager
+    def etapa(self, nome: str) -> Iterator[MetricasEtapa]:
+        anterior = getattr(self._local, "etapa", None)
+        self._local.etapa = nome
+        metricas = self.metricas(nome)
+        inicio = time.perf_counter()
+        try:
+            yield metricas
+        finally:
+            metricas.duracao += time.perf_counter() - inicio
+            metricas.rss_pico_mb = rss_pico_mb()
+            self._local.etapa = anterior
+
+    def instrumentar(self, nome: str, funcao: Callable[[], None]) -> Callable[[], None]:
+        def executar():
+            with self.etapa(nome):
+                funcao()
+
+        return executar
+
+    @contextmanager
+    def medir(self, fase: str) -> Iterator[None]:
+        inicio = time.perf_counter()
+        try:
+            yield
+        finally:
+            metricas = self.metricas()
+            atributo = f"tempo_{fase}"
+            setattr(
+                metricas,
+                atributo,
+                getattr(metricas, atributo) + (time.perf_counter() - inicio),
+            )
+
+    def medir_iteracao(self, iteravel: Iterable, fase: str) -> Iterator:
+        # Atribui à fase o tempo de produzir cada item de um gerador.
+        iterador = iter(iteravel)
+        while True:
+            with self.medir(fase):
+                try:
+                    item = next(iterador)
+                except StopIteration:
+                    return
+            yield item
+
+    def registrar_escrita(self, tabela: str, registros: int, duracao: float) -> None:
+        metricas = self.metricas()
+        metricas.registros += registros
+        metricas.lotes += 1
+        metricas.tempo_escrita += duracao
+        acumulado = metricas.tabelas.setdefault(tabela, [0, 0.0])
+        acumulado[0] += registros
+        acumulado[1] += duracao
+
+    def registrar_idas_banco(self, quantidade: int = 1) -> None:
+        self.metricas().idas_banco += quantidade
+
+    def registrar_erro(self, mensagem: str) -> None:
+        erros = self.metricas().erros
+        if len(erros) < MAXIMO_ERROS_POR_ETAPA:
+            erros.append(mensagem)
+
+    def totais_tabela(self, tabela: str) -> tuple:
+        # (registros, segundos de escrita) somados entre as etapas.
+        with self._trava:
+            etapas = list(self.etapas.values())
+        registros, duracao = 0, 0.0
+        for metricas in etapas:
+            acumulado = metricas.tabelas.get(tabela)
+            if acumulado:
+                registros += acumulado[0]
+                duracao += acumulado[1]
+        return registros, duracao
+
+    def tabelas(self) -> list:
+        with self._trava:
+            etapas = list(self.etapas.values())
+        return list(dict.fromkeys(t for m in etapas for t in m.tabelas))
+
+    def instrumentar_engine(self, engine: Engine) -> None:
+        # Cada comando enviado pelo SQLAlchemy (inclusive o to_sql) e cada
+        # commit contam uma ida ao banco. Os carregadores que usam o cursor do
+        # driver diretamente informam as suas por registrar_idas_banco.
+        @event.listens_for(engine, "before_cursor_execute")
+        def contar_comando(conn, cursor, statement, parameters, context, executemany):
+            self.registrar_idas_banco()
+
+        @event.listens_for(engine, "commit")
+        def contar_commit(conn):
+            self.registrar_idas_banco()
+
+    # ========== RELATÓRIOS ==========
+    def relatorio(self, extras: Optional[dict] = None) -> dict:
+        with self._trava:
+            etapas = list(self.etapas.values())
+        return {
+            "duracao_total": round(time.perf_counter() - self.inicio, 3),
+            "rss_pico_mb": round(rss_pico_mb(), 1),
+            **(extras or {}),
+            "etapas": [
+                {
+                    **asdict(metricas),
+                    "registros_por_segundo": round(metricas.registros_por_segundo, 1),
+                }
+                for metricas in etapas
+            ],
+        }
+
+    def gravar_json(self, caminho: Path, extras: Optional[dict] = None) -> None:
+        caminho.parent.mkdir(parents=True, exist_ok=True)
+        caminho.write_text(
+            json.dumps(
+                self.relatorio(extras), indent=2, ensure_ascii=False, sort_keys=True
+            )
+        )
+
+    def gravar_prometheus(self, caminho: Path) -> None:
+        # Formato textfile do node_exporter. O arquivo é escrito ao lado e
+        # renomeado, para o coletor nunca ler um arquivo pela metade.
+        with self._trava:
+            etapas = list(self.etapas.values())
+        series = {
+            "duracao_segundos": ("gauge", "Duração da etapa", "duracao"),
+            "geracao_segundos": ("gauge", "Tempo gerando registros", "tempo_geracao"),
+            "dataframe_segundos": (
+                "gauge",
+                "Tempo montando DataFrames",
+                "tempo_dataframe",
+            ),
+            "escrita_segundos": ("gauge", "Tempo gravando no banco", "tempo_escrita"),
+            "registros": ("gauge", "Registros gravados", "registros"),
+            "registros_por_segundo": (
+                "gauge",
+                "Vazão da escrita",
+                "registros_por_segundo",
+            ),
+            "idas_banco": (
+                "gauge",
+                "Comandos e commits enviados ao banco",
+                "idas_banco",
+            ),
+            "rss_pico_mb": (
+                "gauge",
+                "Pico de RSS do processo ao fim da etapa",
+                "rss_pico_mb",
+            ),
+            "erros": ("gauge", "Erros de escrita", "erros"),
+        }
+        linhas = []
+        for nome, (tipo, ajuda, atributo) in series.items():
+            metrica = f"{PREFIXO_PROMETHEUS}_{nome}"
+            linhas.append(f"# HELP {metrica} {ajuda}.")
+            linhas.append(f"# TYPE {metrica} {tipo}")
+            for metricas in etapas:
+                valor = getattr(metricas, atributo)
+                if isinstance(valor, list):
+                    valor = len(valor)
+                linhas.append(
+                    f'{metrica}{{etapa="{rotulo_prometheus(metricas.etapa)}"}} {valor}'
+                )
+        metrica = f"{PREFIXO_PROMETHEUS}_ultima_execucao_timestamp_segundos"
+        linhas.append(f"# HELP {metrica} Fim da última carga (epoch).")
+        linhas.append(f"# TYPE {metrica} gauge")
+        linhas.append(f"{metrica} {time.time():.0f}")
+
+        caminho.parent.mkdir(parents=True, exist_ok=True)
+        temporario = caminho.with_name(f".{caminho.name}.{os.getpid()}")
+        temporario.write_text("\n".join(linhas) + "\n")
+        temporario.replace(caminho)
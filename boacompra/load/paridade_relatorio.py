@@ -0,0 +1,178 @@
+import argparse
+import json
+import time
+from datetime import date, timedelta
+from decimal import Decimal
+
+from sqlalchemy import text
+
+from analise_relatorio import AnaliseRelatorio
+from conexao import obter_engine
+
+# Confere os relatórios calculados em memória (analise_relatorio.py) com as
+# procedures, sobre uma matriz de períodos, categorias, situações e valores
+# mínimos, e compara o tempo das duas formas. Termina com código 1 se houver
+# divergência. Uso:
+#   python paridade_relatorio.py --data-referencia 2025-06-01
+PERIODOS_DIAS = (7, 30, 90, 365)
+VALORES_MINIMOS = (0, 1000, 10000)
+LIMITE_PAGINA = 50
+MAXIMO_PAGINAS = 20
+
+
+def chamar_procedure(procedure: str, parametros: list):
+    raw_conn = obter_engine().raw_connection()
+    try:
+        cursor = raw_conn.cursor()
+        resultado = cursor.callproc(procedure, [*parametros, None])
+        cursor.close()
+    finally:
+        raw_conn.close()
+    return json.loads(resultado[-1], parse_float=Decimal)
+
+
+def comparar_venda(analise: AnaliseRelatorio, inicio, fim, categoria) -> tuple:
+    inicio_memoria = time.perf_counter()
+    obtido = analise.relatorio_venda_periodo(inicio, fim, categoria)
+    duracao_memoria = time.perf_counter() - inicio_memoria
+
+    inicio_procedure = time.perf_counter()
+    esperado = chamar_procedure(
+        "prc_relatorio_venda_periodo", [inicio.isoformat(), fim.isoformat(), categoria]
+    )
+    duracao_procedure = time.perf_counter() - inicio_procedure
+
+    # A ordem de dc_produto não é definida na procedure.
+    esperado["dc_produto"] = sorted(
+        (p["no_produto"], p["qt_item_vendido"]) for p in esperado["dc_produto"]
+    )
+    obtido["dc_produto"] = [
+        (p["no_produto"], p["qt_item_vendido"]) for p in obtido["dc_produto"]
+    ]
+    divergencias = [chave for chave in esperado if esperado[chave] != obtido.get(chave)]
+    return divergencias, duracao_memoria, duracao_procedure
+
+
+def comparar_pedido(analise: AnaliseRelatorio, inicio, fim, situacao, minimo) -> tuple:
+    # A procedure ordena só por dt_pedido: a ordem entre pedidos da mesma data
+    # não é definida. Cada página é comparada pelo cabeçalho e pela sequência
+    # de datas, e o conjunto de pedidos de todas as páginas deve ser o mesmo.
+    divergencias = []
+    duracao_memoria = duracao_procedure = 0.0
+    ids_esperados, ids_obtidos = set(), set()
+    for pagina in range(1, MAXIMO_PAGINAS + 1):
+        inicio_memoria = time.perf_counter()
+        obtido = analise.relatorio_pedido_cliente_valor_minimo(
+            inicio, fim, situacao, minimo, LIMITE_PAGINA, pagina
+        )
+        duracao_memoria += time.perf_counter() - inicio_memoria
+
+        inicio_procedure = time.perf_counter()
+        esperado = chamar_procedure(
+            "prc_relatorio_pedido_cliente_valor_minino",
+            [
+                inicio.isoformat(),
+                fim.isoformat(),
+                situacao,
+                minimo,
+                LIMITE_PAGINA,
+                pagina,
+            ],
+        )
+        duracao_procedure += time.perf_counter() - inicio_procedure
+
+        for chave in ("dt_inicio_relatorio", "dt_fim_relatorio", "qt_registro"):
+            if esperado[chave] != obtido[chave]:
+                divergencias.append(f"página {pagina}: {chave}")
+        datas_esperadas = [p["dt_pedido"] for p in esperado["dc_resultado"]]
+        datas_obtidas = [p["dt_pedido"] for p in obtido["dc_resultado"]]
+        if datas_esperadas != datas_obtidas:
+            divergencias.append(f"página {pagina}: dt_pedido")
+        ids_esperados |= {
+            (p["id_pedido"], p["no_cliente"], p["vl_pedido_total"])
+            for p in esperado["dc_resultado"]
+        }
+        ids_obtidos |= {
+            (p["id_pedido"], p["no_cliente"], p["vl_pedido_total"])
+            for p in obtido["dc_resultado"]
+        }
+        if esperado["qt_registro"] < LIMITE_PAGINA:
+            break
+
+    if ids_esperados != ids_obtidos:
+        divergencias.append(
+            f"pedidos: {len(ids_esperados - ids_obtidos)} só na procedure, "
+            f"{len(ids_obtidos - ids_esperados)} só em memória"
+        )
+    return divergencias, duracao_memoria, duracao_procedure
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser()
+    parser.add_argument(
+        "--data-referencia", type=date.fromisoformat, default=date.today()
+    )
+    args = parser.parse_args()
+
+    analise = AnaliseRelatorio.carregar(obter_engine())
+    with obter_engine().connect() as conn:
+        categorias = (
+            conn.execute(text("SELECT no_produto_categoria FROM tb_produto_categoria"))
+            .scalars()
+            .all()
+        )
+        situacoes = (
+            conn.execute(text("SELECT no_pedido_situacao FROM tb_pedido_situacao"))
+            .scalars()
+            .all()
+        )
+
+    casos = []
+    for dias in PERIODOS_DIAS:
+        inicio = args.data_referencia - timedelta(days=dias)
+        fim = args.data_referencia
+        for categoria in categorias:
+            casos.append(
+                (
+                    f"venda {dias}d {categoria}",
+                    comparar_venda(analise, inicio, fim, categoria),
+                )
+            )
+        # Nomes com outra caixa: as procedures comparam sem diferenciar
+        # maiúsculas (utf8mb4_unicode_ci).
+        for categoria in categorias[:1]:
+            for variante in (categoria.lower(), categoria.upper()):
+                casos.append(
+                    (
+                        f"venda {dias}d {variante}",
+                        comparar_venda(analise, inicio, fim, variante),
+                    )
+                )
+        # None usa a situação padrão das procedures ('Concluido').
+        situacoes_caso = [*situacoes, None]
+        situacoes_caso += [situacao.swapcase() for situacao in situacoes[:1]]
+        for situacao in situacoes_caso:
+            for minimo in VALORES_MINIMOS:
+                casos.append(
+                    (
+                        f"pedido {dias}d {situacao or 'padrão'} > {minimo}",
+                        comparar_pedido(analise, inicio, fim, situacao, minimo),
+                    )
+                )
+
+    total_memoria = sum(caso[1][1] for caso in casos)
+    total_procedure = sum(caso[1][2] for caso in casos)
+    falhas = [
+        (nome, divergencias) for nome, (divergencias, _, _) in casos if divergencias
+    ]
+    for nome, divergencias in falhas:
+        print(f"DIVERGENTE {nome}: {', '.join(divergencias)}")
+    print(
+        f"{len(casos) - len(falhas)} de {len(casos)} casos iguais. "
+        f"Em memória: {total_memoria:.3f}s; procedures: {total_procedure:.3f}s."
+    )
+    return 1 if falhas else 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,137 @@
+import json
+from dataclasses import dataclass, field
+from typing import Optional
+
+from sqlalchemy import text
+from sqlalchemy.engine import Engine
+
+from sementes import GeradorSementes
+
+# Cada etapa da carga abre uma execução em tb_carga_execucao com os parâmetros
+# que determinam o conteúdo dos lotes (semente, quantidade, tamanho do lote,
+# faixas de ids). Cada lote gravado é registrado em tb_carga_lote na mesma
+# transação das suas linhas; assim, após uma interrupção, --resume refaz apenas
+# os lotes sem registro, com os mesmos dados que a execução original geraria.
+SQL_REGISTRAR_LOTE = (
+    "INSERT INTO tb_carga_lote (id_carga_execucao, nu_lote, qt_registro) "
+    "VALUES (%s, %s, %s)"
+)
+
+
+@dataclass
+class ExecucaoCarga:
+    id_carga_execucao: int
+    no_etapa: str
+    nu_execucao: int
+    parametros: dict
+    qt_lote: int
+    concluida: bool = False
+    lotes_concluidos: set = field(default_factory=set)
+    retomada: bool = False
+
+    @property
+    def sementes(self) -> GeradorSementes:
+        return GeradorSementes(self.parametros["semente"])
+
+    @property
+    def chave_semente(self) -> str:
+        return self.parametros["chave_semente"]
+
+    def lote_concluido(self, nu_lote: int) -> bool:
+        return nu_lote in self.lotes_concluidos
+
+    def registro_lote(self, nu_lote: int, qt_registro: int) -> tuple:
+        return SQL_REGISTRAR_LOTE, (self.id_carga_execucao, nu_lote, qt_registro)
+
+    @property
+    def lotes_pendentes(self) -> int:
+        return self.qt_lote - len(self.lotes_concluidos)
+
+
+# ========== CONSULTAS ==========
+def buscar_ultima_execucao(engine: Engine, no_etapa: str) -> Optional[ExecucaoCarga]:
+    with engine.connect() as conn:
+        linha = conn.execute(
+            text(
+                """
+                SELECT id_carga_execucao, nu_execucao, dc_parametro, qt_lote, in_concluida
+                FROM tb_carga_execucao
+                WHERE no_etapa = :no_etapa
+                ORDER BY nu_execucao DESC
+                LIMIT 1
+            """
+            ),
+            {"no_etapa": no_etapa},
+        ).first()
+        if linha is None:
+            return None
+
+        execucao = ExecucaoCarga(
+            id_carga_execucao=linha[0],
+            no_etapa=no_etapa,
+            nu_execucao=linha[1],
+            parametros=json.loads(linha[2]),
+            qt_lote=linha[3],
+            concluida=bool(linha[4]),
+        )
+        if not execucao.concluida:
+            execucao.lotes_concluidos = set(
+                conn.execute(
+                    text(
+                        "SELECT nu_lote FROM tb_carga_lote "
+                        "WHERE id_carga_execucao = :id_carga_execucao"
+                    ),
+                    {"id_carga_execucao": execucao.id_carga_execucao},
+                )
+                .scalars()
+                .all()
+            )
+    return execucao
+
+
+def abrir_execucao(
+    engine: Engine, no_etapa: str, parametros: dict, qt_lote: int, anexar: bool
+) -> ExecucaoCarga:
+    with engine.begin() as conn:
+        nu_execucao = conn.execute(
+            text(
+                "SELECT COALESCE(MAX(nu_execucao), 0) + 1 FROM tb_carga_execucao "
+                "WHERE no_etapa = :no_etapa"
+            ),
+            {"no_etapa": no_etapa},
+        ).scalar()
+        # Uma carga em tabela vazia usa as sementes da própria tabela, como uma
+        # carga sem controle de progresso; cada --append usa sementes próprias.
+        parametros = {
+            **parametros,
+            "chave_semente": f"{no_etapa}#{nu_execucao}" if anexar else no_etapa,
+        }
+        resultado = conn.execute(
+            text(
+                """
+                INSERT INTO tb_carga_execucao (no_etapa, nu_execucao, dc_parametro, qt_lote)
+                VALUES (:no_etapa, :nu_execucao, :dc_parametro, :qt_lote)
+            """
+            ),
+            {
+                "no_etapa": no_etapa,
+                "nu_execucao": nu_execucao,
+                "dc_parametro": json.dumps(parametros, sort_keys=True),
+                "qt_lote": qt_lote,
+            },
+        )
+    return ExecucaoCarga(
+        resultado.lastrowid, no_etapa, nu_execucao, parametros, qt_lote
+    )
+
+
+def concluir_execucao(engine: Engine, execucao: ExecucaoCarga) -> None:
+    with engine.begin() as conn:
+        conn.execute(
+            text(
+                "UPDATE tb_carga_execucao SET in_concluida = 1 "
+                "WHERE id_carga_execucao = :id_carga_execucao"
+            ),
+            {"id_carga_execucao": execucao.id_carga_execucao},
+        )
+    execucao.concluida = True
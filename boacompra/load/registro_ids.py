@@ -0,0 +1,82 @@
+import threading
+from typing import Callable, Optional
+
+import numpy as np
+
+# Colunas de uma tabela registrada: "id" (ordenado) e atributos alinhados a ele.
+Colunas = dict[str, np.ndarray]
+
+
+# ========== REGISTRO ==========
+# Ids das tabelas pai gravadas pela carga, em arrays int64 (8 bytes por id,
+# contra ~36 de um int em uma lista Python). As etapas filhas sorteiam e
+# fatiam os ids daqui em vez de reler a tabela inteira. Uma tabela que a carga
+# não registrou (ex.: já tinha dados) é lida do banco uma única vez, por
+# `carregar`, e compartilhada entre as etapas que precisam dela.
+class RegistroIds:
+    def __init__(self):
+        self._tabelas: dict[str, Colunas] = {}
+        self._travas: dict[str, threading.Lock] = {}
+        self._trava = threading.Lock()
+
+    def _trava_tabela(self, tabela: str) -> threading.Lock:
+        with self._trava:
+            return self._travas.setdefault(tabela, threading.Lock())
+
+    def registrar(self, tabela: str, ids: np.ndarray, **atributos: np.ndarray) -> None:
+        ids = np.asarray(ids, dtype=np.int64)
+        colunas = {"id": ids, **{k: np.asarray(v) for k, v in atributos.items()}}
+        if len(ids) > 1 and not np.all(ids[1:] > ids[:-1]):
+            ordem = np.argsort(ids, kind="stable")
+            colunas = {k: v[ordem] for k, v in colunas.items()}
+        with self._trava:
+            self._tabelas[tabela] = colunas
+
+    def registrar_faixa(self, tabela: str, id_inicial: int, qtd: int, **atributos):
+        # Ids atribuídos pela carga em sequência (faixa pré-alocada).
+        self.registrar(
+            tabela, np.arange(id_inicial, id_inicial + qtd, dtype=np.int64), **atributos
+        )
+
+    def descartar(self, tabela: str) -> None:
+        with self._trava:
+            self._tabelas.pop(tabela, None)
+
+    def colunas(
+        self, tabela: str, carregar: Optional[Callable[[], Colunas]] = None
+    ) -> Colunas:
+        with self._trava_tabela(tabela):
+            with self._trava:
+                colunas = self._tabelas.get(tabela)
+            if colunas is None:
+                if carregar is None:
+                    raise KeyError(f"Ids de {tabela} não registrados.")
+                colunas = carregar()
+                self.registrar(tabela, colunas.pop("id"), **colunas)
+                with self._trava:
+                    colunas = self._tabelas[tabela]
+        return colunas
+
+    def faixa(
+        self,
+        tabela: str,
+        carregar: Optional[Callable[[], Colunas]] = None,
+        id_inicio: int = 0,
+        id_fim: Optional[int] = None,
+    ) -> Colunas:
+        # Linhas com id na faixa (id_inicio, id_fim]; sem id_fim, todas acima de
+        # id_inicio. As fatias são views dos arrays registrados: não alterar.
+        colunas = self.colunas(tabela, carregar)
+        ids = colunas["id"]
+        inicio = np.searchsorted(ids, id_inicio, side="right")
+        fim = len(ids) if id_fim is None else np.searchsorted(ids, id_fim, "right")
+        return {nome: valores[inicio:fim] for nome, valores in colunas.items()}
+
+    def ids(
+        self,
+        tabela: str,
+        carregar: Optional[Callable[[], Colunas]] = None,
+        id_inicio: int = 0,
+        id_fim: Optional[int] = None,
+    ) -> np.ndarray:
+        return self.faixa(tabela, carregar, id_inicio, id_fim)["id"]
@@ -0,0 +1,193 @@
+import json
+from datetime import date, datetime, time
+from decimal import Decimal
+from typing import Iterable, Iterator, NamedTuple, Optional, TextIO
+
+from sqlalchemy.engine import Engine
+
+# Versões linha a linha dos relatórios. As procedures montam o resultado
+# inteiro em um único JSON (JSON_ARRAYAGG no parâmetro OUT), que existe
+# completo no servidor, no driver e no Python. Aqui as consultas equivalentes
+# são lidas por um cursor não bufferizado (o servidor envia as linhas conforme
+# são produzidas) e entregues como tuplas tipadas por geradores, em leituras de
+# LINHAS_POR_LEITURA linhas: a memória não depende do tamanho do resultado.
+LINHAS_POR_LEITURA = 1000
+
+SQL_VENDA_PERIODO_TOTAIS = """
+SELECT IFNULL(SUM(venddia.qt_pedido), 0),
+       ROUND(IFNULL(SUM(venddia.vl_pedido_total), 0), 2),
+       ROUND(IFNULL(SUM(venddia.vl_pedido_total) / NULLIF(SUM(venddia.qt_pedido_valor), 0), 0), 2)
+FROM boacompra_adm.tb_venda_dia venddia
+WHERE venddia.dt_venda BETWEEN %(data_inicio)s AND %(data_fim)s
+"""
+
+SQL_VENDA_PERIODO_PRODUTOS = """
+SELECT produto.no_produto, IFNULL(SUM(vendprod.qt_item_vendido), 0)
+FROM boacompra_adm.tb_venda_produto_dia vendprod
+    INNER JOIN boacompra_adm.tb_produto produto ON vendprod.id_produto = produto.id_produto
+WHERE vendprod.id_produto_categoria = (
+        SELECT id_produto_categoria FROM boacompra_adm.tb_produto_categoria
+        WHERE no_produto_categoria = %(categoria)s)
+  AND vendprod.dt_venda BETWEEN %(data_inicio)s AND %(data_fim)s
+GROUP BY produto.no_produto
+"""
+
+# Mesma ordem da procedure por cursor (V017): percorre idx_pedido_04 a partir
+# do fim, sem ordenação, e a primeira linha sai antes de a última ser lida.
+SQL_PEDIDO_CLIENTE_VALOR_MINIMO = """
+SELECT cliente.no_cliente, pedido.id_pedido, pedido.vl_pedido_total, pedido.dt_pedido
+FROM boacompra_adm.tb_pedido pedido
+    INNER JOIN boacompra_adm.tb_cliente cliente ON cliente.id_cliente = pedido.id_cliente
+WHERE pedido.co_pedido_situacao = (
+        SELECT co_pedido_situacao FROM boacompra_adm.tb_pedido_situacao
+        WHERE no_pedido_situacao = %(situacao)s)
+  AND pedido.dt_pedido BETWEEN %(data_inicio)s AND %(data_fim)s
+  AND pedido.vl_pedido_total > %(valor_minimo)s
+ORDER BY pedido.dt_pedido DESC, pedido.id_pedido DESC
+"""
+
+
+class TotaisVendaPeriodo(NamedTuple):
+    qt_total_pedido: int
+    vl_total_pedido: Decimal
+    vl_media_pedido: Decimal
+
+
+class LinhaVendaProduto(NamedTuple):
+    no_produto: str
+    qt_item_vendido: Decimal
+
+
+class LinhaPedidoCliente(NamedTuple):
+    no_cliente: str
+    id_pedido: int
+    vl_pedido_total: Decimal
+    dt_pedido: date
+
+
+# ========== CONSULTAS ==========
+def iterar_consulta(
+    engine: Engine,
+    sql: str,
+    parametros: dict,
+    linhas_por_leitura: int = LINHAS_POR_LEITURA,
+) -> Iterator[tuple]:
+    raw_conn = engine.raw_connection()
+    cursor = None
+    lida = False
+    try:
+        cursor = raw_conn.cursor(buffered=False)
+        cursor.execute(sql, parametros)
+        while True:
+            linhas = cursor.fetchmany(linhas_por_leitura)
+            if not linhas:
+                break
+            yield from linhas
+        lida = True
+    finally:
+        if lida:
+            cursor.close()
+        else:
+            # Consumidor parou antes do fim (ou erro): o restante do resultado
+            # ainda está na conexão, que é descartada em vez de voltar ao pool.
+            raw_conn.invalidate()
+        raw_conn.close()
+
+
+def consultar_totais_venda_periodo(
+    engine: Engine, data_inicio: date, data_fim: date
+) -> TotaisVendaPeriodo:
+    parametros = {"data_inicio": data_inicio, "data_fim": data_fim}
+    (linha,) = iterar_consulta(engine, SQL_VENDA_PERIODO_TOTAIS, parametros)
+    return TotaisVendaPeriodo(int(linha[0]), linha[1], linha[2])
+
+
+def iterar_venda_periodo_produto(
+    engine: Engine,
+    data_inicio: date,
+    data_fim: date,
+    categoria: str,
+    linhas_por_leitura: int = LINHAS_POR_LEITURA,
+) -> Iterator[LinhaVendaProduto]:
+    parametros = {
+        "data_inicio": data_inicio,
+        "data_fim": data_fim,
+        "categoria": categoria,
+    }
+    for no_produto, qt_item_vendido in iterar_consulta(
+        engine, SQL_VENDA_PERIODO_PRODUTOS, parametros, linhas_por_leitura
+    ):
+        yield LinhaVendaProduto(no_produto, qt_item_vendido)
+
+
+def iterar_pedido_cliente_valor_minimo(
+    engine: Engine,
+    data_inicio: date,
+    data_fim: date,
+    situacao_pedido: str = "CONCLUIDO",
+    valor_minimo: Decimal = Decimal("10000"),
+    linhas_por_leitura: int = LINHAS_POR_LEITURA,
+) -> Iterator[LinhaPedidoCliente]:
+    # Mesmo período da procedure: do início do primeiro dia ao fim do último.
+    parametros = {
+        "data_inicio": datetime.combine(data_inicio, time.min),
+        "data_fim": datetime.combine(data_fim, time(23, 59, 59)),
+        "situacao": situacao_pedido,
+        "valor_minimo": valor_minimo,
+    }
+    for no_cliente, id_pedido, vl_pedido_total, dt_pedido in iterar_consulta(
+        engine, SQL_PEDIDO_CLIENTE_VALOR_MINIMO, parametros, linhas_por_leitura
+    ):
+        if isinstance(dt_pedido, datetime):
+            dt_pedido = dt_pedido.date()
+        yield LinhaPedidoCliente(no_cliente, id_pedido, vl_pedido_total, dt_pedido)
+
+
+# ========== CODIFICAÇÃO ==========
+def valor_json(valor) -> str:
+    # Decimal sai como número com todos os dígitos (json.dumps exigiria float).
+    if isinstance(valor, Decimal):
+        return str(valor)
+    if isinstance(valor, (date, datetime)):
+        return json.dumps(valor.isoformat())
+    return json.dumps(valor, ensure_ascii=False)
+
+
+def objeto_json(campos: dict) -> str:
+    return (
+        "{"
+        + ", ".join(
+            f"{json.dumps(nome)}: {valor_json(valor)}" for nome, valor in campos.items()
+        )
+        + "}"
+    )
+
+
+def codificar_ndjson(linhas: Iterable[NamedTuple]) -> Iterator[str]:
+    # Um objeto JSON por linha.
+    for linha in linhas:
+        yield objeto_json(linha._asdict()) + "\n"
+
+
+def codificar_json(
+    linhas: Iterable[NamedTuple],
+    chave_lista: str,
+    cabecalho: Optional[dict] = None,
+) -> Iterator[str]:
+    # Mesmo formato do JSON da procedure ({cabecalho..., chave_lista: [...]}),
+    # gerado em partes: cada linha é codificada e entregue assim que lida.
+    inicio = objeto_json(cabecalho or {})[:-1]
+    separador = ", " if cabecalho else ""
+    yield f"{inicio}{separador}{json.dumps(chave_lista)}: ["
+    for posicao, linha in enumerate(linhas):
+        yield ("" if posicao == 0 else ", ") + objeto_json(linha._asdict())
+    yield "]}"
+
+
+def escrever(partes: Iterable[str], arquivo: TextIO) -> int:
+    # Devolve a quantidade de caracteres escritos.
+    total = 0
+    for parte in partes:
+        arquivo.write(parte)
+        total += len(parte)
+    return total
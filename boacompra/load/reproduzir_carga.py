@@ -0,0 +1,75 @@
+import argparse
+import logging
+import time
+from datetime import date
+from pathlib import Path
+
+import boa_compra_carga as carga
+from carga_rapida import reconstruir_indices, remover_indices
+from conexao import configurar_engine, obter_engine
+from escrita_bulk import METODO_LOAD_DATA, METODOS_CARGA, TAMANHO_LOTE_PADRAO
+from exportacao_carga import ler_manifesto, reproduzir_tabela
+
+logger = logging.getLogger(__name__)
+
+# Grava em um banco vazio (ex.: outra variante de esquema ou de índices) o
+# conjunto de dados exportado por boa_compra_carga.py --exportar, sem gerar os
+# dados de novo. As tabelas são gravadas na ordem do manifesto e os
+# consolidados de venda são recalculados ao final, como na carga. Uso:
+#   python boa_compra_carga.py --seed 42 --exportar dados/sf10 --scale-factor 10
+#   python reproduzir_carga.py --origem dados/sf10 --carga-rapida
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Reprodução de uma carga exportada")
+    parser.add_argument("--origem", type=Path, required=True)
+    parser.add_argument("--metodo", choices=METODOS_CARGA, default=METODO_LOAD_DATA)
+    parser.add_argument("--tamanho-lote", type=int, default=TAMANHO_LOTE_PADRAO)
+    parser.add_argument(
+        "--carga-rapida",
+        action="store_true",
+        help="Remove índices secundários e chaves estrangeiras durante a gravação",
+    )
+    args = parser.parse_args()
+
+    manifesto = ler_manifesto(args.origem)
+    configurar_engine(ignorar_rollup=True, carga_rapida=args.carga_rapida)
+    engine = obter_engine()
+    carga.data_referencia = date.fromisoformat(
+        manifesto["parametros"]["data_referencia"]
+    )
+
+    tabelas = [entrada["tabela"] for entrada in manifesto["tabelas"]]
+    preenchidas = [t for t in tabelas if not carga.tabela_esta_vazia(t)]
+    if preenchidas:
+        logger.error(f"A reprodução requer tabelas vazias; com dados: {preenchidas}")
+        return 1
+
+    inicio = time.perf_counter()
+    execucao_carga_rapida = remover_indices(engine) if args.carga_rapida else None
+    for entrada in manifesto["tabelas"]:
+        inicio_tabela = time.perf_counter()
+        qt_registros = reproduzir_tabela(
+            engine,
+            args.origem,
+            manifesto["formato"],
+            entrada,
+            args.metodo,
+            args.tamanho_lote,
+        )
+        duracao = time.perf_counter() - inicio_tabela
+        logger.info(
+            f"{qt_registros} registros gravados em {entrada['tabela']} em "
+            f"{duracao:.2f}s ({qt_registros / max(duracao, 1e-9):.0f} registros/s)."
+        )
+    if execucao_carga_rapida is not None:
+        reconstruir_indices(engine, execucao_carga_rapida)
+    carga.atualizar_rollup_venda()
+    logger.info(
+        f"Carga {args.origem} reproduzida em {time.perf_counter() - inicio:.2f}s."
+    )
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
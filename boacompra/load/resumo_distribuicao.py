@@ -0,0 +1,175 @@
+import argparse
+import json
+from datetime import date, datetime
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+from sqlalchemy import text
+
+from conexao import obter_engine
+from distribuicoes import (
+    DIAS_RECENTES_PADRAO,
+    resumir_datas,
+    resumir_descontos,
+    resumir_popularidade,
+)
+
+# Resumo das distribuições dos pedidos gravados: concentração de pedidos por
+# cliente e de itens por produto (participação dos mais frequentes e Gini),
+# volume por mês e dia da semana, situações de pedidos recentes e antigos e
+# descontos por faixa de preço. Serve para conferir o perfil usado na carga
+# (--distribuicoes) contra o esperado. Uso:
+#   python resumo_distribuicao.py --saida resumo_distribuicao.json
+
+
+def ler(conn, sql: str, **parametros) -> pd.DataFrame:
+    return pd.read_sql(text(sql), conn, params=parametros)
+
+
+def resumir_situacoes(conn, data_referencia: date, dias_recentes: int) -> dict:
+    df = ler(
+        conn,
+        "SELECT DATEDIFF(:data_referencia, pedido.dt_pedido) < :dias_recentes "
+        "AS fl_recente, situacao.no_pedido_situacao, COUNT(*) AS qt_pedido "
+        "FROM tb_pedido pedido INNER JOIN tb_pedido_situacao situacao "
+        "ON pedido.co_pedido_situacao = situacao.co_pedido_situacao "
+        "GROUP BY fl_recente, situacao.no_pedido_situacao",
+        data_referencia=data_referencia,
+        dias_recentes=dias_recentes,
+    )
+    resumo = {}
+    for recente, grupo in df.groupby("fl_recente"):
+        total = grupo["qt_pedido"].sum()
+        resumo["recentes" if recente else "antigos"] = {
+            "pedidos": int(total),
+            **{
+                nome: round(float(quantidade / total), 4)
+                for nome, quantidade in zip(
+                    grupo["no_pedido_situacao"], grupo["qt_pedido"]
+                )
+            },
+        }
+    return resumo
+
+
+def resumir_banco(data_referencia, dias_recentes: int) -> dict:
+    with obter_engine().connect() as conn:
+        qt_cliente = conn.execute(text("SELECT COUNT(*) FROM tb_cliente")).scalar()
+        qt_produto = conn.execute(text("SELECT COUNT(*) FROM tb_produto")).scalar()
+        if data_referencia is None:
+            data_referencia = conn.execute(
+                text("SELECT MAX(dt_pedido) FROM tb_pedido")
+            ).scalar()
+        if data_referencia is None:
+            return {}
+
+        pedidos_cliente = ler(
+            conn,
+            "SELECT COUNT(*) AS qt_pedido FROM tb_pedido GROUP BY id_cliente",
+        )
+        itens_produto = ler(
+            conn,
+            "SELECT COUNT(*) AS qt_item FROM tb_pedido_item GROUP BY id_produto",
+        )
+        pedidos_dia = ler(
+            conn,
+            "SELECT dt_pedido, COUNT(*) AS qt_pedido FROM tb_pedido "
+            "GROUP BY dt_pedido ORDER BY dt_pedido",
+        )
+        # Valores em centavos, como na geração.
+        itens = ler(
+            conn,
+            "SELECT ROUND(vl_unitario * 100) AS vl_unitario, "
+            "ROUND(qt_item * vl_unitario * 100) AS vl_bruto, "
+            "ROUND(vl_desconto * 100) AS vl_desconto FROM tb_pedido_item",
+        )
+        situacoes = resumir_situacoes(conn, data_referencia, dias_recentes)
+
+    return {
+        "data_referencia": data_referencia.isoformat(),
+        "clientes": resumir_popularidade(
+            pedidos_cliente["qt_pedido"].to_numpy(), qt_cliente
+        ),
+        "produtos": resumir_popularidade(
+            itens_produto["qt_item"].to_numpy(), qt_produto
+        ),
+        "datas": resumir_datas(
+            pd.to_datetime(pedidos_dia["dt_pedido"]).to_numpy(),
+            pedidos_dia["qt_pedido"].to_numpy(),
+        ),
+        "situacoes": situacoes,
+        "descontos": resumir_descontos(
+            itens["vl_unitario"].to_numpy(dtype=np.int64),
+            itens["vl_bruto"].to_numpy(dtype=np.int64),
+            itens["vl_desconto"].to_numpy(dtype=np.int64),
+        ),
+    }
+
+
+def imprimir(resumo: dict) -> None:
+    print(f"Data de referência: {resumo['data_referencia']}")
+    print(
+        f"{'chave':<10} {'chaves':>8} {'registros':>10} {'top 1%':>7} "
+        f"{'top 10%':>8} {'top 20%':>8} {'gini':>6} {'sem registro':>13}"
+    )
+    for nome in ("clientes", "produtos"):
+        popularidade = resumo[nome]
+        print(
+            f"{nome:<10} {popularidade['chaves']:>8} {popularidade['registros']:>10} "
+            f"{popularidade.get('participacao_top_1pct', 0):>7.1%} "
+            f"{popularidade.get('participacao_top_10pct', 0):>8.1%} "
+            f"{popularidade.get('participacao_top_20pct', 0):>8.1%} "
+            f"{popularidade.get('gini', 0):>6.3f} "
+            f"{popularidade.get('sem_registro', 0):>13}"
+        )
+
+    datas = resumo["datas"]
+    print(
+        f"Pedidos por dia: mínimo {datas['pedidos_dia_minimo']}, "
+        f"médio {datas['pedidos_dia_medio']}, máximo {datas['pedidos_dia_maximo']}"
+    )
+    for chave in ("por_mes", "por_dia_semana"):
+        print("  " + " ".join(f"{n}={v:.1%}" for n, v in datas[chave].items()))
+
+    for idade, mix in resumo["situacoes"].items():
+        situacoes = " ".join(f"{n}={v:.1%}" for n, v in mix.items() if n != "pedidos")
+        print(f"Situações ({idade}, {mix['pedidos']} pedidos): {situacoes}")
+
+    print(f"{'faixa (R$)':<12} {'itens':>10} {'com desconto':>13} {'% médio':>8}")
+    for faixa, desconto in resumo["descontos"].items():
+        print(
+            f"{faixa:<12} {desconto['itens']:>10} {desconto['com_desconto']:>13.1%} "
+            f"{desconto['percentual_medio']:>8.2f}"
+        )
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument(
+        "--data-referencia",
+        type=date.fromisoformat,
+        help="Data base para separar pedidos recentes (padrão: maior dt_pedido)",
+    )
+    parser.add_argument("--dias-recentes", type=int, default=DIAS_RECENTES_PADRAO)
+    parser.add_argument("--saida", type=Path)
+    args = parser.parse_args()
+
+    resumo = resumir_banco(args.data_referencia, args.dias_recentes)
+    if not resumo:
+        print("Nenhum pedido encontrado: execute a carga antes.")
+        return
+    imprimir(resumo)
+
+    if args.saida is not None:
+        resumo["gerado_em"] = datetime.now().isoformat(timespec="seconds")
+        args.saida.parent.mkdir(parents=True, exist_ok=True)
+        args.saida.write_text(
+            json.dumps(resumo, indent=2, sort_keys=True, ensure_ascii=False),
+            encoding="utf-8",
+        )
+        print(f"Resumo gravado em {args.saida}")
+
+
+if __name__ == "__main__":
+    main()
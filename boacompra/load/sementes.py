@@ -0,0 +1,47 @@
+import random
+import threading
+import zlib
+from typing import Optional
+
+import numpy as np
+from faker import Faker
+
+# Cada lote de cada tabela recebe uma semente própria, derivada de
+# (semente da carga, tabela, número do lote). Assim o conteúdo de um lote não
+# depende dos lotes anteriores nem de quem o gera: dividir a geração entre
+# vários workers produz os mesmos dados que uma execução sequencial.
+_locais = threading.local()
+
+
+def faker_da_thread() -> Faker:
+    # Instanciar o Faker pt_BR é caro; cada thread mantém a sua instância e a
+    # semente é redefinida a cada lote.
+    if not hasattr(_locais, "fake"):
+        _locais.fake = Faker("pt_BR")
+    return _locais.fake
+
+
+class GeradorSementes:
+    def __init__(self, semente: Optional[int] = None):
+        if semente is None:
+            semente = int(np.random.SeedSequence().generate_state(1)[0])
+        self.semente = semente
+
+    def sequencia(self, tabela: str, nu_lote: int) -> np.random.SeedSequence:
+        return np.random.SeedSequence(
+            [self.semente, zlib.crc32(tabela.encode("utf-8")), nu_lote]
+        )
+
+    def inteiro(self, tabela: str, nu_lote: int) -> int:
+        return int(self.sequencia(tabela, nu_lote).generate_state(1)[0])
+
+    def numpy(self, tabela: str, nu_lote: int) -> np.random.Generator:
+        return np.random.default_rng(self.sequencia(tabela, nu_lote))
+
+    def aleatorio(self, tabela: str, nu_lote: int) -> random.Random:
+        return random.Random(self.inteiro(tabela, nu_lote))
+
+    def faker(self, tabela: str, nu_lote: int) -> Faker:
+        fake = faker_da_thread()
+        fake.seed_instance(self.inteiro(tabela, nu_lote))
+        return fake
@@ -0,0 +1,168 @@
+/*
+---------------------------------------------------------------------------------------------------
+-- MOTIVO:       CARD-002 >> Paginação por cursor (keyset) do relatório de pedidos de clientes acima do mínimo
+-- AUTOR:        Welington Lima
+-- DATA :        18/10/2026
+-- SISTEMA:      Boa Compra - Ecommerce
+---------------------------------------------------------------------------------------------------
+*/
+
+USE boacompra_adm;
+
+-- +---------------------------------------------------------+--
+-- 1. Exclusao da procedure de migration
+-- +---------------------------------------------------------+--
+DROP PROCEDURE IF EXISTS prc_migration_pedido_cursor;
+
+-- +---------------------------------------------------------+--
+-- 2. Criacao da procedure de migration
+-- +---------------------------------------------------------+--
+DELIMITER //
+CREATE PROCEDURE prc_migration_pedido_cursor()
+BEGIN
+    DECLARE v_exists INT;
+    DECLARE v_schema_name VARCHAR(128) DEFAULT 'boacompra_adm';
+    DECLARE v_table_name  VARCHAR(128) DEFAULT 'tb_pedido';
+
+    -- 1. Criar o indice IDX_PEDIDO_04 (situacao + ordem do cursor; vl_pedido_total filtrado no proprio indice)
+    SELECT COUNT(1) INTO v_exists FROM information_schema.statistics
+    WHERE table_schema = v_schema_name AND table_name = v_table_name AND index_name = 'idx_pedido_04';
+    IF v_exists = 0 THEN
+        SET @sql := '
+          CREATE INDEX idx_pedido_04 ON boacompra_adm.tb_pedido (co_pedido_situacao, dt_pedido, id_pedido, vl_pedido_total);
+        ';
+        PREPARE stmt FROM @sql;
+        EXECUTE stmt;
+        DEALLOCATE PREPARE stmt;
+
+        SELECT 'Índice idx_pedido_04 criado.' AS mensagem;
+    ELSE
+        SELECT 'Índice idx_pedido_04 já existe.' AS mensagem;
+    END IF;
+END;
+//
+DELIMITER ;
+
+-- +---------------------------------------------------------+--
+-- 3. Execucao da procedure de migration
+-- +---------------------------------------------------------+--
+CALL prc_migration_pedido_cursor();
+
+-- +---------------------------------------------------------+--
+-- 4. Exclusao da procedure de migration
+-- +---------------------------------------------------------+--
+DROP PROCEDURE IF EXISTS prc_migration_pedido_cursor;
+
+-- +---------------------------------------------------------+--
+-- 5. Exclusao da procedure de relatorio
+-- +---------------------------------------------------------+--
+DROP PROCEDURE IF EXISTS boacompra_adm.prc_relatorio_pedido_cliente_valor_minino_cursor;
+
+-- +---------------------------------------------------------+--
+-- 6. Criacao da procedure de relatorio
+-- +---------------------------------------------------------+--
+-- A pagina seguinte comeca logo apos o ultimo pedido devolvido (dt_pedido, id_pedido),
+-- em vez de descartar OFFSET linhas: o custo de uma pagina nao depende da sua posicao.
+-- Sem cursor (pdt_cursor_pedido NULL) a procedure devolve a primeira pagina.
+DELIMITER //
+CREATE PROCEDURE boacompra_adm.prc_relatorio_pedido_cliente_valor_minino_cursor (
+    IN pdt_inicio_pedido      DATE,
+    IN pdt_fim_pedido         DATE,
+    IN pno_situacao_pedido    VARCHAR(100),
+    IN pvl_minino_pedido      DECIMAL(15,0),
+    IN pnu_limite             INT,
+    IN pdt_cursor_pedido      DATE,
+    IN pid_cursor_pedido      BIGINT,
+    OUT podc_resultado_relatorio JSON
+)
+BEGIN
+    DECLARE vdc_pedido           JSON DEFAULT JSON_ARRAY();
+    DECLARE vdc_proximo_cursor   JSON DEFAULT NULL;
+    DECLARE vdt_inicio           DATE;
+    DECLARE vdt_fim              DATE;
+    DECLARE vdt_cursor           DATE;
+    DECLARE vid_cursor           BIGINT;
+    DECLARE vno_situacao         VARCHAR(100);
+    DECLARE vco_situacao         TINYINT;
+    DECLARE vvl_minino_pedido    DECIMAL(15,0);
+    DECLARE vnu_limite           INT;
+    DECLARE vqt_registro         INT;
+
+    SET vdt_inicio = COALESCE(pdt_inicio_pedido, CURDATE() - INTERVAL 12 MONTH);
+    SET vdt_fim    = COALESCE(pdt_fim_pedido, CURDATE());
+
+    SET vno_situacao      = IFNULL(pno_situacao_pedido, 'Concluido');
+    SET vvl_minino_pedido = IFNULL(pvl_minino_pedido, 1000);
+    SET vnu_limite        = IFNULL(pnu_limite, 50);
+
+    -- Sem cursor, parte de uma posicao posterior a qualquer pedido do periodo; assim a
+    -- condicao de busca e sempre a mesma e o otimizador usa o range de idx_pedido_04.
+    IF pdt_cursor_pedido IS NULL THEN
+        SET vdt_cursor = vdt_fim + INTERVAL 1 DAY;
+        SET vid_cursor = 9223372036854775807;
+    ELSE
+        SET vdt_cursor = pdt_cursor_pedido;
+        SET vid_cursor = IFNULL(pid_cursor_pedido, 9223372036854775807);
+    END IF;
+
+    SELECT situacao.co_pedido_situacao
+    INTO vco_situacao
+    FROM boacompra_adm.tb_pedido_situacao situacao
+    WHERE situacao.no_pedido_situacao = vno_situacao;
+
+    DROP TEMPORARY TABLE IF EXISTS tmp_pagina_pedido;
+    CREATE TEMPORARY TABLE tmp_pagina_pedido AS
+    SELECT cliente.no_cliente       AS no_cliente,
+           pedido.id_pedido         AS id_pedido,
+           pedido.vl_pedido_total   AS vl_pedido_total,
+           pedido.dt_pedido         AS dt_pedido
+    FROM boacompra_adm.tb_pedido           pedido
+        INNER JOIN boacompra_adm.tb_cliente cliente ON cliente.id_cliente = pedido.id_cliente
+    WHERE 1 = 1
+      AND pedido.co_pedido_situacao = vco_situacao
+      AND pedido.dt_pedido BETWEEN vdt_inicio AND vdt_fim
+      AND (pedido.dt_pedido < vdt_cursor
+           OR (pedido.dt_pedido = vdt_cursor AND pedido.id_pedido < vid_cursor))
+      AND pedido.vl_pedido_total > vvl_minino_pedido
+    ORDER BY pedido.dt_pedido DESC, pedido.id_pedido DESC
+    LIMIT vnu_limite;
+
+    SELECT IFNULL(JSON_ARRAYAGG(
+                          JSON_OBJECT(
+                                  'no_cliente', no_cliente,
+                                  'id_pedido', id_pedido,
+                                  'vl_pedido_total', vl_pedido_total,
+                                  'dt_pedido', DATE_FORMAT(dt_pedido, '%Y-%m-%d')
+                          )
+                  ), JSON_ARRAY())
+    INTO vdc_pedido
+    FROM (SELECT no_cliente, id_pedido, vl_pedido_total, dt_pedido
+          FROM tmp_pagina_pedido
+          ORDER BY dt_pedido DESC, id_pedido DESC
+          LIMIT vnu_limite) tmp;
+
+    SET vqt_registro = JSON_LENGTH(vdc_pedido);
+
+    -- Pagina cheia: o proximo cursor e o ultimo pedido da pagina na ordem do relatorio.
+    IF vqt_registro = vnu_limite THEN
+        SELECT JSON_OBJECT('dt_pedido', DATE_FORMAT(dt_pedido, '%Y-%m-%d'), 'id_pedido', id_pedido)
+        INTO vdc_proximo_cursor
+        FROM tmp_pagina_pedido
+        ORDER BY dt_pedido ASC, id_pedido ASC
+        LIMIT 1;
+    END IF;
+
+    DROP TEMPORARY TABLE IF EXISTS tmp_pagina_pedido;
+
+    SET podc_resultado_relatorio = JSON_OBJECT(
+        'dt_inicio_relatorio', DATE_FORMAT(vdt_inicio, '%Y-%m-%d'),
+        'dt_fim_relatorio', DATE_FORMAT(vdt_fim, '%Y-%m-%d'),
+        'dc_cursor', IF(pdt_cursor_pedido IS NULL, NULL,
+                        JSON_OBJECT('dt_pedido', DATE_FORMAT(vdt_cursor, '%Y-%m-%d'), 'id_pedido', vid_cursor)),
+        'qt_registro', IFNULL(vqt_registro, 0),
+        'dc_resultado', vdc_pedido,
+        'dc_proximo_cursor', vdc_proximo_cursor
+    );
+END;
+//
+DELIMITER ;
@@ -0,0 +1,64 @@
+/*
+---------------------------------------------------------------------------------------------------
+-- MOTIVO:       CARD-003 >> Consolidado diário de pedidos para o relatório de venda no período
+-- AUTOR:        Welington Lima
+-- DATA :        18/10/2026
+-- SISTEMA:      Boa Compra - Ecommerce
+---------------------------------------------------------------------------------------------------
+*/
+
+USE boacompra_adm;
+
+-- +---------------------------------------------------------+--
+-- 1. Exclusao da procedure de migration
+-- +---------------------------------------------------------+--
+DROP PROCEDURE IF EXISTS prc_migration_venda_dia;
+
+-- +---------------------------------------------------------+--
+-- 2. Criacao da procedure de migration
+-- +---------------------------------------------------------+--
+DELIMITER //
+CREATE PROCEDURE prc_migration_venda_dia()
+BEGIN
+    DECLARE v_exists INT;
+    DECLARE v_schema_name VARCHAR(128) DEFAULT 'boacompra_adm';
+    DECLARE v_table_name  VARCHAR(128) DEFAULT 'tb_venda_dia';
+
+    -- 1. Criar a tabela TB_VENDA_DIA
+    SELECT COUNT(*) INTO v_exists
+    FROM information_schema.tables
+    WHERE table_schema = v_schema_name AND table_name = v_table_name;
+
+    IF v_exists = 0 THEN
+        SET @sql := '
+          CREATE TABLE boacompra_adm.tb_venda_dia (
+             dt_venda                     DATE           NOT NULL                                                       COMMENT ''[DADO_PUBLICO] Chave primaria [PK_VENDDIA]. Data dos pedidos (tb_pedido.dt_pedido)'',
+             qt_pedido                    BIGINT         NOT NULL DEFAULT 0                                             COMMENT ''[ESTRATEGICO_OPERACIONAL] Quantidade de pedidos na data'',
+             qt_pedido_valor              BIGINT         NOT NULL DEFAULT 0                                             COMMENT ''[ESTRATEGICO_OPERACIONAL] Quantidade de pedidos na data com valor total informado (base da media)'',
+             vl_pedido_total              DECIMAL(17,2)  NOT NULL DEFAULT 0                                             COMMENT ''[ESTRATEGICO_FINACEIRO] Soma do valor total dos pedidos na data'',
+             dt_atualizacao               TIMESTAMP      NOT NULL DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP COMMENT ''[DADO_PUBLICO] Data e hora da ultima atualizacao do registro'',
+             CONSTRAINT pk_venddia PRIMARY KEY (dt_venda)
+          ) COMMENT = ''[ESTRATEGICO_FINACEIRO] Consolidado diario dos pedidos, mantido por trigger em tb_pedido''
+            ENGINE = InnoDB DEFAULT CHARSET = utf8mb4 COLLATE = utf8mb4_unicode_ci;
+        ';
+        PREPARE stmt FROM @sql;
+        EXECUTE stmt;
+        DEALLOCATE PREPARE stmt;
+
+        SELECT 'Tabela boacompra_adm.tb_venda_dia criada com sucesso!' AS mensagem;
+    ELSE
+        SELECT 'Tabela boacompra_adm.tb_venda_dia já existe.' AS mensagem;
+    END IF;
+END;
+//
+DELIMITER ;
+
+-- +---------------------------------------------------------+--
+-- 3. Execucao da procedure de migration
+-- +---------------------------------------------------------+--
+CALL prc_migration_venda_dia();
+
+-- +---------------------------------------------------------+--
+-- 4. Exclusao da procedure de migration
+-- +---------------------------------------------------------+--
+DROP PROCEDURE IF EXISTS prc_migration_venda_dia;
@@ -0,0 +1,99 @@
+/*
+---------------------------------------------------------------------------------------------------
+-- MOTIVO:       CARD-003 >> Consolidado diário de itens vendidos por categoria e produto
+-- AUTOR:        Welington Lima
+-- DATA :        18/10/2026
+-- SISTEMA:      Boa Compra - Ecommerce
+---------------------------------------------------------------------------------------------------
+*/
+
+USE boacompra_adm;
+
+-- +---------------------------------------------------------+--
+-- 1. Exclusao da procedure de migration
+-- +---------------------------------------------------------+--
+DROP PROCEDURE IF EXISTS prc_migration_venda_produto_dia;
+
+-- +---------------------------------------------------------+--
+-- 2. Criacao da procedure de migration
+-- +---------------------------------------------------------+--
+DELIMITER //
+CREATE PROCEDURE prc_migration_venda_produto_dia()
+BEGIN
+    DECLARE v_exists INT;
+    DECLARE v_schema_name VARCHAR(128) DEFAULT 'boacompra_adm';
+    DECLARE v_table_name  VARCHAR(128) DEFAULT 'tb_venda_produto_dia';
+
+    -- 1. Criar a tabela TB_VENDA_PRODUTO_DIA
+    SELECT COUNT(*) INTO v_exists
+    FROM information_schema.tables
+    WHERE table_schema = v_schema_name AND table_name = v_table_name;
+
+    IF v_exists = 0 THEN
+        SET @sql := '
+          CREATE TABLE boacompra_adm.tb_venda_produto_dia (
+             dt_venda                     DATE           NOT NULL                                                       COMMENT ''[DADO_PUBLICO] Parte da chave primaria [PK_VENDPROD]. Data dos pedidos (tb_pedido.dt_pedido)'',
+             id_produto_categoria         SMALLINT       NOT NULL                                                       COMMENT ''[DADO_PUBLICO] Parte da chave primaria [PK_VENDPROD] e chave estrangeira [FK_PRODCATE_VENDPROD]. Identificador da categoria do produto'',
+             id_produto                   BIGINT         NOT NULL                                                       COMMENT ''[DADO_PUBLICO] Parte da chave primaria [PK_VENDPROD] e chave estrangeira [FK_PRODUTO_VENDPROD]. Identificador do produto'',
+             qt_item_vendido              BIGINT         NOT NULL DEFAULT 0                                             COMMENT ''[ESTRATEGICO_OPERACIONAL] Soma da quantidade de itens do produto vendidos na data'',
+             qt_pedido_item               BIGINT         NOT NULL DEFAULT 0                                             COMMENT ''[ESTRATEGICO_OPERACIONAL] Quantidade de registros de tb_pedido_item consolidados no registro'',
+             dt_atualizacao               TIMESTAMP      NOT NULL DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP COMMENT ''[DADO_PUBLICO] Data e hora da ultima atualizacao do registro'',
+             CONSTRAINT pk_vendprod PRIMARY KEY (dt_venda, id_produto_categoria, id_produto),
+             CONSTRAINT fk_prodcate_vendprod FOREIGN KEY (id_produto_categoria) REFERENCES boacompra_adm.tb_produto_categoria (id_produto_categoria),
+             CONSTRAINT fk_produto_vendprod FOREIGN KEY (id_produto) REFERENCES boacompra_adm.tb_produto (id_produto)
+          ) COMMENT = ''[ESTRATEGICO_OPERACIONAL] Consolidado diario dos itens vendidos por categoria e produto, mantido por trigger em tb_pedido_item''
+            ENGINE = InnoDB DEFAULT CHARSET = utf8mb4 COLLATE = utf8mb4_unicode_ci;
+        ';
+        PREPARE stmt FROM @sql;
+        EXECUTE stmt;
+        DEALLOCATE PREPARE stmt;
+
+        SELECT 'Tabela boacompra_adm.tb_venda_produto_dia criada com sucesso!' AS mensagem;
+    ELSE
+        SELECT 'Tabela boacompra_adm.tb_venda_produto_dia já existe.' AS mensagem;
+    END IF;
+
+    -- 2. Criar o indice IDX_VENDPROD_01 (relatorio por categoria e periodo)
+    SELECT COUNT(1) INTO v_exists FROM information_schema.statistics
+    WHERE table_schema = v_schema_name AND table_name = v_table_name AND index_name = 'idx_vendprod_01';
+    IF v_exists = 0 THEN
+        SET @sql := '
+          CREATE INDEX idx_vendprod_01 ON boacompra_adm.tb_venda_produto_dia (id_produto_categoria, dt_venda, id_produto, qt_item_vendido);
+        ';
+        PREPARE stmt FROM @sql;
+        EXECUTE stmt;
+        DEALLOCATE PREPARE stmt;
+
+        SELECT 'Índice idx_vendprod_01 criado.' AS mensagem;
+    ELSE
+        SELECT 'Índice idx_vendprod_01 já existe.' AS mensagem;
+    END IF;
+
+    -- 3. Criar o indice IDX_VENDPROD_02 (troca de categoria do produto)
+    SELECT COUNT(1) INTO v_exists FROM information_schema.statistics
+    WHERE table_schema = v_schema_name AND table_name = v_table_name AND index_name = 'idx_vendprod_02';
+    IF v_exists = 0 THEN
+        SET @sql := '
+          CREATE INDEX idx_vendprod_02 ON boacompra_adm.tb_venda_produto_dia (id_produto);
+        ';
+        PREPARE stmt FROM @sql;
+        EXECUTE stmt;
+        DEALLOCATE PREPARE stmt;
+
+        SELECT 'Índice idx_vendprod_02 criado.' AS mensagem;
+    ELSE
+        SELECT 'Índice idx_vendprod_02 já existe.' AS mensagem;
+    END IF;
+END;
+//
+DELIMITER ;
+
+-- +---------------------------------------------------------+--
+-- 3. Execucao da procedure de migration
+-- +---------------------------------------------------------+--
+CALL prc_migration_venda_produto_dia();
+
+-- +---------------------------------------------------------+--
+-- 4. Exclusao da procedure de migration
+-- +---------------------------------------------------------+--
+DROP PROCEDURE IF EXISTS prc_migration_venda_produto_dia;
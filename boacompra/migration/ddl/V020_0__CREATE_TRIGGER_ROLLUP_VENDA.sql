@@ -0,0 +1,243 @@
+/*
+---------------------------------------------------------------------------------------------------
+-- MOTIVO:       CARD-003 >> Manutenção incremental dos consolidados de venda (tb_venda_dia e tb_venda_produto_dia)
+-- AUTOR:        Welington Lima
+-- DATA :        18/10/2026
+-- SISTEMA:      Boa Compra - Ecommerce
+---------------------------------------------------------------------------------------------------
+*/
+
+-- Os triggers aplicam a diferenca de cada insert/update/delete em tb_pedido e tb_pedido_item
+-- sobre os consolidados. Uma sessao de carga em massa pode desliga-los com
+-- SET @fl_ignorar_rollup_venda = 1 e, ao final, recalcular o periodo carregado com
+-- CALL prc_carga_rollup_venda(inicio, fim).
+
+USE boacompra_adm;
+
+-- +---------------------------------------------------------+--
+-- 1. Exclusao das procedures e triggers
+-- +---------------------------------------------------------+--
+DROP TRIGGER IF EXISTS boacompra_adm.trg_pedido_ai;
+DROP TRIGGER IF EXISTS boacompra_adm.trg_pedido_au;
+DROP TRIGGER IF EXISTS boacompra_adm.trg_pedido_ad;
+DROP TRIGGER IF EXISTS boacompra_adm.trg_pediitem_ai;
+DROP TRIGGER IF EXISTS boacompra_adm.trg_pediitem_au;
+DROP TRIGGER IF EXISTS boacompra_adm.trg_pediitem_ad;
+DROP TRIGGER IF EXISTS boacompra_adm.trg_produto_au;
+DROP PROCEDURE IF EXISTS boacompra_adm.prc_rollup_venda_dia;
+DROP PROCEDURE IF EXISTS boacompra_adm.prc_rollup_venda_produto_dia;
+DROP PROCEDURE IF EXISTS boacompra_adm.prc_carga_rollup_venda;
+
+-- +---------------------------------------------------------+--
+-- 2. Criacao das procedures de aplicacao da diferenca
+-- +---------------------------------------------------------+--
+DELIMITER //
+CREATE PROCEDURE boacompra_adm.prc_rollup_venda_dia (
+    IN pdt_venda           DATE,
+    IN pqt_pedido          BIGINT,
+    IN pqt_pedido_valor    BIGINT,
+    IN pvl_pedido_total    DECIMAL(17,2)
+)
+BEGIN
+    INSERT INTO boacompra_adm.tb_venda_dia (dt_venda, qt_pedido, qt_pedido_valor, vl_pedido_total)
+    VALUES (pdt_venda, pqt_pedido, pqt_pedido_valor, pvl_pedido_total)
+    ON DUPLICATE KEY UPDATE
+        qt_pedido       = qt_pedido + VALUES(qt_pedido),
+        qt_pedido_valor = qt_pedido_valor + VALUES(qt_pedido_valor),
+        vl_pedido_total = vl_pedido_total + VALUES(vl_pedido_total);
+
+    DELETE FROM boacompra_adm.tb_venda_dia
+    WHERE dt_venda = pdt_venda
+      AND qt_pedido = 0;
+END;
+//
+
+CREATE PROCEDURE boacompra_adm.prc_rollup_venda_produto_dia (
+    IN pdt_venda               DATE,
+    IN pid_produto_categoria   SMALLINT,
+    IN pid_produto             BIGINT,
+    IN pqt_item_vendido        BIGINT,
+    IN pqt_pedido_item         BIGINT
+)
+BEGIN
+    INSERT INTO boacompra_adm.tb_venda_produto_dia (dt_venda, id_produto_categoria, id_produto, qt_item_vendido, qt_pedido_item)
+    VALUES (pdt_venda, pid_produto_categoria, pid_produto, pqt_item_vendido, pqt_pedido_item)
+    ON DUPLICATE KEY UPDATE
+        qt_item_vendido = qt_item_vendido + VALUES(qt_item_vendido),
+        qt_pedido_item  = qt_pedido_item + VALUES(qt_pedido_item);
+
+    DELETE FROM boacompra_adm.tb_venda_produto_dia
+    WHERE dt_venda = pdt_venda
+      AND id_produto_categoria = pid_produto_categoria
+      AND id_produto = pid_produto
+      AND qt_pedido_item = 0;
+END;
+//
+
+-- +---------------------------------------------------------+--
+-- 3. Criacao da procedure de carga em massa dos consolidados
+-- +---------------------------------------------------------+--
+CREATE PROCEDURE boacompra_adm.prc_carga_rollup_venda (
+    IN pdt_inicio_pedido DATE,
+    IN pdt_fim_pedido    DATE
+)
+BEGIN
+    DECLARE vdt_inicio DATE;
+    DECLARE vdt_fim    DATE;
+
+    SET vdt_inicio = COALESCE(pdt_inicio_pedido, (SELECT MIN(dt_pedido) FROM boacompra_adm.tb_pedido), CURDATE());
+    SET vdt_fim    = COALESCE(pdt_fim_pedido, (SELECT MAX(dt_pedido) FROM boacompra_adm.tb_pedido), CURDATE());
+
+    DELETE FROM boacompra_adm.tb_venda_produto_dia WHERE dt_venda BETWEEN vdt_inicio AND vdt_fim;
+    DELETE FROM boacompra_adm.tb_venda_dia WHERE dt_venda BETWEEN vdt_inicio AND vdt_fim;
+
+    INSERT INTO boacompra_adm.tb_venda_dia (dt_venda, qt_pedido, qt_pedido_valor, vl_pedido_total)
+    SELECT pedido.dt_pedido,
+           COUNT(1),
+           COUNT(pedido.vl_pedido_total),
+           IFNULL(SUM(pedido.vl_pedido_total), 0)
+    FROM boacompra_adm.tb_pedido pedido
+    WHERE pedido.dt_pedido BETWEEN vdt_inicio AND vdt_fim
+    GROUP BY pedido.dt_pedido;
+
+    INSERT INTO boacompra_adm.tb_venda_produto_dia (dt_venda, id_produto_categoria, id_produto, qt_item_vendido, qt_pedido_item)
+    SELECT pedido.dt_pedido,
+           produto.id_produto_categoria,
+           pediitem.id_produto,
+           SUM(pediitem.qt_item),
+           COUNT(1)
+    FROM boacompra_adm.tb_pedido_item           pediitem
+        INNER JOIN boacompra_adm.tb_pedido      pedido ON pediitem.id_pedido = pedido.id_pedido
+        INNER JOIN boacompra_adm.tb_produto     produto ON pediitem.id_produto = produto.id_produto
+    WHERE pedido.dt_pedido BETWEEN vdt_inicio AND vdt_fim
+    GROUP BY pedido.dt_pedido, produto.id_produto_categoria, pediitem.id_produto;
+END;
+//
+
+-- +---------------------------------------------------------+--
+-- 4. Criacao dos triggers de TB_PEDIDO
+-- +---------------------------------------------------------+--
+CREATE TRIGGER boacompra_adm.trg_pedido_ai
+AFTER INSERT ON boacompra_adm.tb_pedido
+FOR EACH ROW
+BEGIN
+    IF IFNULL(@fl_ignorar_rollup_venda, 0) = 0 THEN
+        CALL boacompra_adm.prc_rollup_venda_dia(NEW.dt_pedido, 1, NEW.vl_pedido_total IS NOT NULL, IFNULL(NEW.vl_pedido_total, 0));
+    END IF;
+END;
+//
+
+CREATE TRIGGER boacompra_adm.trg_pedido_au
+AFTER UPDATE ON boacompra_adm.tb_pedido
+FOR EACH ROW
+BEGIN
+    IF IFNULL(@fl_ignorar_rollup_venda, 0) = 0 THEN
+        IF NOT (OLD.dt_pedido <=> NEW.dt_pedido) OR NOT (OLD.vl_pedido_total <=> NEW.vl_pedido_total) THEN
+            CALL boacompra_adm.prc_rollup_venda_dia(OLD.dt_pedido, -1, -(OLD.vl_pedido_total IS NOT NULL), -IFNULL(OLD.vl_pedido_total, 0));
+            CALL boacompra_adm.prc_rollup_venda_dia(NEW.dt_pedido, 1, NEW.vl_pedido_total IS NOT NULL, IFNULL(NEW.vl_pedido_total, 0));
+        END IF;
+
+        -- Mudanca de data leva os itens do pedido para o consolidado da nova data
+        IF OLD.dt_pedido <> NEW.dt_pedido THEN
+            INSERT INTO boacompra_adm.tb_venda_produto_dia (dt_venda, id_produto_categoria, id_produto, qt_item_vendido, qt_pedido_item)
+            SELECT venda.dt_venda, produto.id_produto_categoria, pediitem.id_produto, venda.nu_sinal * pediitem.qt_item, venda.nu_sinal
+            FROM boacompra_adm.tb_pedido_item       pediitem
+                INNER JOIN boacompra_adm.tb_produto produto ON pediitem.id_produto = produto.id_produto
+                CROSS JOIN (SELECT OLD.dt_pedido AS dt_venda, -1 AS nu_sinal
+                            UNION ALL
+                            SELECT NEW.dt_pedido AS dt_venda, 1 AS nu_sinal) venda
+            WHERE pediitem.id_pedido = NEW.id_pedido
+            ON DUPLICATE KEY UPDATE
+                qt_item_vendido = qt_item_vendido + VALUES(qt_item_vendido),
+                qt_pedido_item  = qt_pedido_item + VALUES(qt_pedido_item);
+
+            DELETE FROM boacompra_adm.tb_venda_produto_dia
+            WHERE dt_venda = OLD.dt_pedido
+              AND qt_pedido_item = 0;
+        END IF;
+    END IF;
+END;
+//
+
+CREATE TRIGGER boacompra_adm.trg_pedido_ad
+AFTER DELETE ON boacompra_adm.tb_pedido
+FOR EACH ROW
+BEGIN
+    IF IFNULL(@fl_ignorar_rollup_venda, 0) = 0 THEN
+        CALL boacompra_adm.prc_rollup_venda_dia(OLD.dt_pedido, -1, -(OLD.vl_pedido_total IS NOT NULL), -IFNULL(OLD.vl_pedido_total, 0));
+    END IF;
+END;
+//
+
+-- +---------------------------------------------------------+--
+-- 5. Criacao dos triggers de TB_PEDIDO_ITEM
+-- +---------------------------------------------------------+--
+CREATE TRIGGER boacompra_adm.trg_pediitem_ai
+AFTER INSERT ON boacompra_adm.tb_pedido_item
+FOR EACH ROW
+BEGIN
+    DECLARE vdt_pedido            DATE;
+    DECLARE vid_produto_categoria SMALLINT;
+
+    IF IFNULL(@fl_ignorar_rollup_venda, 0) = 0 THEN
+        SELECT dt_pedido INTO vdt_pedido FROM boacompra_adm.tb_pedido WHERE id_pedido = NEW.id_pedido;
+        SELECT id_produto_categoria INTO vid_produto_categoria FROM boacompra_adm.tb_produto WHERE id_produto = NEW.id_produto;
+
+        CALL boacompra_adm.prc_rollup_venda_produto_dia(vdt_pedido, vid_produto_categoria, NEW.id_produto, NEW.qt_item, 1);
+    END IF;
+END;
+//
+
+CREATE TRIGGER boacompra_adm.trg_pediitem_au
+AFTER UPDATE ON boacompra_adm.tb_pedido_item
+FOR EACH ROW
+BEGIN
+    DECLARE vdt_pedido            DATE;
+    DECLARE vid_produto_categoria SMALLINT;
+
+    IF IFNULL(@fl_ignorar_rollup_venda, 0) = 0
+       AND (OLD.id_pedido <> NEW.id_pedido OR OLD.id_produto <> NEW.id_produto OR OLD.qt_item <> NEW.qt_item) THEN
+        SELECT dt_pedido INTO vdt_pedido FROM boacompra_adm.tb_pedido WHERE id_pedido = OLD.id_pedido;
+        SELECT id_produto_categoria INTO vid_produto_categoria FROM boacompra_adm.tb_produto WHERE id_produto = OLD.id_produto;
+        CALL boacompra_adm.prc_rollup_venda_produto_dia(vdt_pedido, vid_produto_categoria, OLD.id_produto, -OLD.qt_item, -1);
+
+        SELECT dt_pedido INTO vdt_pedido FROM boacompra_adm.tb_pedido WHERE id_pedido = NEW.id_pedido;
+        SELECT id_produto_categoria INTO vid_produto_categoria FROM boacompra_adm.tb_produto WHERE id_produto = NEW.id_produto;
+        CALL boacompra_adm.prc_rollup_venda_produto_dia(vdt_pedido, vid_produto_categoria, NEW.id_produto, NEW.qt_item, 1);
+    END IF;
+END;
+//
+
+CREATE TRIGGER boacompra_adm.trg_pediitem_ad
+AFTER DELETE ON boacompra_adm.tb_pedido_item
+FOR EACH ROW
+BEGIN
+    DECLARE vdt_pedido            DATE;
+    DECLARE vid_produto_categoria SMALLINT;
+
+    IF IFNULL(@fl_ignorar_rollup_venda, 0) = 0 THEN
+        SELECT dt_pedido INTO vdt_pedido FROM boacompra_adm.tb_pedido WHERE id_pedido = OLD.id_pedido;
+        SELECT id_produto_categoria INTO vid_produto_categoria FROM boacompra_adm.tb_produto WHERE id_produto = OLD.id_produto;
+
+        CALL boacompra_adm.prc_rollup_venda_produto_dia(vdt_pedido, vid_produto_categoria, OLD.id_produto, -OLD.qt_item, -1);
+    END IF;
+END;
+//
+
+-- +---------------------------------------------------------+--
+-- 6. Criacao do trigger de TB_PRODUTO
+-- +---------------------------------------------------------+--
+-- Um produto pertence a uma unica categoria: ao trocar de categoria, todo o historico
+-- consolidado do produto passa para a nova categoria, como no relatorio original.
+CREATE TRIGGER boacompra_adm.trg_produto_au
+AFTER UPDATE ON boacompra_adm.tb_produto
+FOR EACH ROW
+BEGIN
+    IF IFNULL(@fl_ignorar_rollup_venda, 0) = 0 AND OLD.id_produto_categoria <> NEW.id_produto_categoria THEN
+        UPDATE boacompra_adm.tb_venda_produto_dia
+        SET id_produto_categoria = NEW.id_produto_categoria
+        WHERE id_produto = NEW.id_produto;
+    END IF;
+END;
+//
+DELIMITER ;
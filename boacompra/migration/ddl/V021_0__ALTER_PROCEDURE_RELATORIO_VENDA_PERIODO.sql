@@ -0,0 +1,73 @@
+/*
+---------------------------------------------------------------------------------------------------
+-- MOTIVO:       CARD-003 >> Relatório de venda no período a partir dos consolidados diários
+-- AUTOR:        Welington Lima
+-- DATA :        18/10/2026
+-- SISTEMA:      Boa Compra - Ecommerce
+---------------------------------------------------------------------------------------------------
+*/
+
+-- Mesma assinatura e mesmo JSON da versao V015, mas os totais vem de tb_venda_dia (uma linha
+-- por dia) e os produtos de tb_venda_produto_dia (uma linha por dia e produto da categoria),
+-- em vez de agregar tb_pedido e tb_pedido_item no periodo inteiro.
+
+USE boacompra_adm;
+
+-- +---------------------------------------------------------+--
+-- 1. Exclusao da procedure de relatorio
+-- +---------------------------------------------------------+--
+DROP PROCEDURE IF EXISTS boacompra_adm.prc_relatorio_venda_periodo;
+
+-- +---------------------------------------------------------+--
+-- 2. Criacao da procedure de relatorio
+-- +---------------------------------------------------------+--
+DELIMITER //
+CREATE PROCEDURE boacompra_adm.prc_relatorio_venda_periodo(
+    IN pdt_inicio_pedido DATE,
+    IN pdt_fim_pedido    DATE,
+    IN pno_categoria     VARCHAR(100),
+    OUT podc_resultado_relatorio JSON
+)
+BEGIN
+    DECLARE vqt_pedido            BIGINT DEFAULT 0;
+    DECLARE vvl_pedido_total      DECIMAL(15, 2) DEFAULT 0.00;
+    DECLARE vvl_pedido_media      DECIMAL(15, 2) DEFAULT 0.00;
+    DECLARE vdc_produto_vendido   JSON DEFAULT JSON_ARRAY();
+    DECLARE vid_produto_categoria SMALLINT;
+
+    SELECT IFNULL(SUM(venddia.qt_pedido), 0)                                                   AS qt_pedido,
+           ROUND(IFNULL(SUM(venddia.vl_pedido_total), 0), 2)                                   AS vl_pedido_total,
+           ROUND(IFNULL(SUM(venddia.vl_pedido_total) / NULLIF(SUM(venddia.qt_pedido_valor), 0), 0), 2) AS vl_pedido_medio
+    INTO vqt_pedido, vvl_pedido_total, vvl_pedido_media
+    FROM boacompra_adm.tb_venda_dia venddia
+    WHERE 1 = 1
+      AND venddia.dt_venda BETWEEN pdt_inicio_pedido AND pdt_fim_pedido;
+
+    SELECT prodcate.id_produto_categoria
+    INTO vid_produto_categoria
+    FROM boacompra_adm.tb_produto_categoria prodcate
+    WHERE prodcate.no_produto_categoria = pno_categoria;
+
+    SELECT IFNULL(JSON_ARRAYAGG(
+                      JSON_OBJECT(
+                          'no_produto', no_produto,
+                          'qt_item_vendido', qt_total_item_vendido)),
+                  JSON_ARRAY()) AS produtos_vendidos
+    INTO vdc_produto_vendido
+    FROM (SELECT produto.no_produto                        AS no_produto,
+                 IFNULL(SUM(vendprod.qt_item_vendido), 0)  AS qt_total_item_vendido
+          FROM boacompra_adm.tb_venda_produto_dia   vendprod
+              INNER JOIN boacompra_adm.tb_produto   produto ON vendprod.id_produto = produto.id_produto
+          WHERE 1 = 1
+            AND vendprod.id_produto_categoria = vid_produto_categoria
+            AND vendprod.dt_venda BETWEEN pdt_inicio_pedido AND pdt_fim_pedido
+          GROUP BY produto.no_produto) AS temp;
+
+    SET podc_resultado_relatorio = JSON_OBJECT(
+            'qt_total_pedido', vqt_pedido,
+            'vl_total_pedido', vvl_pedido_total,
+            'vl_media_pedido', vvl_pedido_media,
+            'dc_produto', vdc_produto_vendido);
+END;
+//
+DELIMITER ;
@@ -0,0 +1,71 @@
+/*
+---------------------------------------------------------------------------------------------------
+-- MOTIVO:       CARD-004 >> Índices de data de atualização para a marca d'água do cache de relatórios
+-- AUTOR:        Welington Lima
+-- DATA :        18/10/2026
+-- SISTEMA:      Boa Compra - Ecommerce
+---------------------------------------------------------------------------------------------------
+*/
+
+-- Com os indices, MAX(dt_atualizacao) le apenas a ultima entrada do indice em vez de varrer a tabela.
+
+USE boacompra_adm;
+
+-- +---------------------------------------------------------+--
+-- 1. Exclusao da procedure de migration
+-- +---------------------------------------------------------+--
+DROP PROCEDURE IF EXISTS prc_migration_pedido_atualizacao;
+
+-- +---------------------------------------------------------+--
+-- 2. Criacao da procedure de migration
+-- +---------------------------------------------------------+--
+DELIMITER //
+CREATE PROCEDURE prc_migration_pedido_atualizacao()
+BEGIN
+    DECLARE v_exists INT;
+    DECLARE v_schema_name VARCHAR(128) DEFAULT 'boacompra_adm';
+
+    -- 1. Criar o indice IDX_PEDIDO_05
+    SELECT COUNT(1) INTO v_exists FROM information_schema.statistics
+    WHERE table_schema = v_schema_name AND table_name = 'tb_pedido' AND index_name = 'idx_pedido_05';
+    IF v_exists = 0 THEN
+        SET @sql := '
+          CREATE INDEX idx_pedido_05 ON boacompra_adm.tb_pedido (dt_atualizacao);
+        ';
+        PREPARE stmt FROM @sql;
+        EXECUTE stmt;
+        DEALLOCATE PREPARE stmt;
+
+        SELECT 'Índice idx_pedido_05 criado.' AS mensagem;
+    ELSE
+        SELECT 'Índice idx_pedido_05 já existe.' AS mensagem;
+    END IF;
+
+    -- 2. Criar o indice IDX_PEDIITEM_03
+    SELECT COUNT(1) INTO v_exists FROM information_schema.statistics
+    WHERE table_schema = v_schema_name AND table_name = 'tb_pedido_item' AND index_name = 'idx_pediitem_03';
+    IF v_exists = 0 THEN
+        SET @sql := '
+          CREATE INDEX idx_pediitem_03 ON boacompra_adm.tb_pedido_item (dt_atualizacao);
+        ';
+        PREPARE stmt FROM @sql;
+        EXECUTE stmt;
+        DEALLOCATE PREPARE stmt;
+
+        SELECT 'Índice idx_pediitem_03 criado.' AS mensagem;
+    ELSE
+        SELECT 'Índice idx_pediitem_03 já existe.' AS mensagem;
+    END IF;
+END;
+//
+DELIMITER ;
+
+-- +---------------------------------------------------------+--
+-- 3. Execucao da procedure de migration
+-- +---------------------------------------------------------+--
+CALL prc_migration_pedido_atualizacao();
+
+-- +---------------------------------------------------------+--
+-- 4. Exclusao da procedure de migration
+-- +---------------------------------------------------------+--
+DROP PROCEDURE IF EXISTS prc_migration_pedido_atualizacao;
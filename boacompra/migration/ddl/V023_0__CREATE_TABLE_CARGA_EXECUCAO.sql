@@ -0,0 +1,69 @@
+/*
+---------------------------------------------------------------------------------------------------
+-- MOTIVO:       CARD-005 >> Controle das execuções da carga de dados por etapa
+-- AUTOR:        Welington Lima
+-- DATA :        18/10/2026
+-- SISTEMA:      Boa Compra - Ecommerce
+---------------------------------------------------------------------------------------------------
+*/
+
+USE boacompra_adm;
+
+-- +---------------------------------------------------------+--
+-- 1. Exclusao da procedure de migration
+-- +---------------------------------------------------------+--
+DROP PROCEDURE IF EXISTS prc_migration_carga_execucao;
+
+-- +---------------------------------------------------------+--
+-- 2. Criacao da procedure de migration
+-- +---------------------------------------------------------+--
+DELIMITER //
+CREATE PROCEDURE prc_migration_carga_execucao()
+BEGIN
+    DECLARE v_exists INT;
+    DECLARE v_schema_name VARCHAR(128) DEFAULT 'boacompra_adm';
+    DECLARE v_table_name  VARCHAR(128) DEFAULT 'tb_carga_execucao';
+
+    -- 1. Criar a tabela TB_CARGA_EXECUCAO
+    SELECT COUNT(*) INTO v_exists
+    FROM information_schema.tables
+    WHERE table_schema = v_schema_name AND table_name = v_table_name;
+
+    IF v_exists = 0 THEN
+        SET @sql := '
+          CREATE TABLE boacompra_adm.tb_carga_execucao (
+             id_carga_execucao            BIGINT         NOT NULL AUTO_INCREMENT                                        COMMENT ''[DADO_PUBLICO] Chave primaria [PK_CARGEXEC]. Identificador da execucao da carga'',
+             no_etapa                     VARCHAR(100)   NOT NULL                                                       COMMENT ''[DADO_PUBLICO] Parte da chave unica [UK_CARGEXEC_01]. Etapa da carga (tabela gerada)'',
+             nu_execucao                  INT            NOT NULL                                                       COMMENT ''[DADO_PUBLICO] Parte da chave unica [UK_CARGEXEC_01]. Sequencial da execucao na etapa: 1 na carga inicial e seguintes a cada --append'',
+             dc_parametro                 JSON           NOT NULL                                                       COMMENT ''[DADO_PUBLICO] Parametros da execucao (semente, quantidade, tamanho do lote, faixas de ids), reutilizados no --resume'',
+             qt_lote                      INT            NOT NULL                                                       COMMENT ''[DADO_PUBLICO] Quantidade de lotes da execucao'',
+             in_concluida                 TINYINT        NOT NULL DEFAULT 0                                             COMMENT ''[DADO_PUBLICO] Indica se todos os lotes foram gravados. Aceita os valores: 0 (Nao) e 1 (Sim)'',
+             dt_criacao                   TIMESTAMP      NOT NULL DEFAULT CURRENT_TIMESTAMP                             COMMENT ''[DADO_PUBLICO] Data e hora de criacao do registro'',
+             dt_atualizacao               TIMESTAMP      NOT NULL DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP COMMENT ''[DADO_PUBLICO] Data e hora da ultima atualizacao do registro'',
+             CONSTRAINT pk_cargexec PRIMARY KEY (id_carga_execucao),
+             CONSTRAINT uk_cargexec_01 UNIQUE (no_etapa, nu_execucao),
+             CONSTRAINT ck_cargexec_01 CHECK (in_concluida IN (0,1))
+          ) COMMENT = ''[DADO_PUBLICO] Armazena as execucoes da carga de dados por etapa''
+            ENGINE = InnoDB DEFAULT CHARSET = utf8mb4 COLLATE = utf8mb4_unicode_ci;
+        ';
+        PREPARE stmt FROM @sql;
+        EXECUTE stmt;
+        DEALLOCATE PREPARE stmt;
+
+        SELECT 'Tabela boacompra_adm.tb_carga_execucao criada com sucesso!' AS mensagem;
+    ELSE
+        SELECT 'Tabela boacompra_adm.tb_carga_execucao já existe.' AS mensagem;
+    END IF;
+END;
+//
+DELIMITER ;
+
+-- +---------------------------------------------------------+--
+-- 3. Execucao da procedure de migration
+-- +---------------------------------------------------------+--
+CALL prc_migration_carga_execucao();
+
+-- +---------------------------------------------------------+--
+-- 4. Exclusao da procedure de migration
+-- +---------------------------------------------------------+--
+DROP PROCEDURE IF EXISTS prc_migration_carga_execucao;
@@ -0,0 +1,64 @@
+/*
+---------------------------------------------------------------------------------------------------
+-- MOTIVO:       CARD-005 >> Lotes gravados em cada execução da carga de dados
+-- AUTOR:        Welington Lima
+-- DATA :        18/10/2026
+-- SISTEMA:      Boa Compra - Ecommerce
+---------------------------------------------------------------------------------------------------
+*/
+
+USE boacompra_adm;
+
+-- +---------------------------------------------------------+--
+-- 1. Exclusao da procedure de migration
+-- +---------------------------------------------------------+--
+DROP PROCEDURE IF EXISTS prc_migration_carga_lote;
+
+-- +---------------------------------------------------------+--
+-- 2. Criacao da procedure de migration
+-- +---------------------------------------------------------+--
+DELIMITER //
+CREATE PROCEDURE prc_migration_carga_lote()
+BEGIN
+    DECLARE v_exists INT;
+    DECLARE v_schema_name VARCHAR(128) DEFAULT 'boacompra_adm';
+    DECLARE v_table_name  VARCHAR(128) DEFAULT 'tb_carga_lote';
+
+    -- 1. Criar a tabela TB_CARGA_LOTE
+    SELECT COUNT(*) INTO v_exists
+    FROM information_schema.tables
+    WHERE table_schema = v_schema_name AND table_name = v_table_name;
+
+    IF v_exists = 0 THEN
+        SET @sql := '
+          CREATE TABLE boacompra_adm.tb_carga_lote (
+             id_carga_execucao            BIGINT         NOT NULL                                                       COMMENT ''[DADO_PUBLICO] Parte da chave primaria [PK_CARGLOTE] e chave estrangeira [FK_CARGEXEC_CARGLOTE]. Identificador da execucao da carga'',
+             nu_lote                      INT            NOT NULL                                                       COMMENT ''[DADO_PUBLICO] Parte da chave primaria [PK_CARGLOTE]. Numero do lote na execucao'',
+             qt_registro                  INT            NOT NULL                                                       COMMENT ''[DADO_PUBLICO] Quantidade de registros gravados no lote'',
+             dt_criacao                   TIMESTAMP      NOT NULL DEFAULT CURRENT_TIMESTAMP                             COMMENT ''[DADO_PUBLICO] Data e hora de criacao do registro'',
+             CONSTRAINT pk_carglote PRIMARY KEY (id_carga_execucao, nu_lote),
+             CONSTRAINT fk_cargexec_carglote FOREIGN KEY (id_carga_execucao) REFERENCES boacompra_adm.tb_carga_execucao (id_carga_execucao)
+          ) COMMENT = ''[DADO_PUBLICO] Armazena os lotes gravados em cada execucao da carga; o registro entra na mesma transacao do lote''
+            ENGINE = InnoDB DEFAULT CHARSET = utf8mb4 COLLATE = utf8mb4_unicode_ci;
+        ';
+        PREPARE stmt FROM @sql;
+        EXECUTE stmt;
+        DEALLOCATE PREPARE stmt;
+
+        SELECT 'Tabela boacompra_adm.tb_carga_lote criada com sucesso!' AS mensagem;
+    ELSE
+        SELECT 'Tabela boacompra_adm.tb_carga_lote já existe.' AS mensagem;
+    END IF;
+END;
+//
+DELIMITER ;
+
+-- +---------------------------------------------------------+--
+-- 3. Execucao da procedure de migration
+-- +---------------------------------------------------------+--
+CALL prc_migration_carga_lote();
+
+-- +---------------------------------------------------------+--
+-- 4. Exclusao da procedure de migration
+-- +---------------------------------------------------------+--
+DROP PROCEDURE IF EXISTS prc_migration_carga_lote;
@@ -0,0 +1,304 @@
+/*
+---------------------------------------------------------------------------------------------------
+-- MOTIVO:       CARD-006 >> Data do pedido e categoria do produto no item do pedido, com indice de cobertura
+-- AUTOR:        Welington Lima
+-- DATA :        18/10/2026
+-- SISTEMA:      Boa Compra - Ecommerce
+---------------------------------------------------------------------------------------------------
+*/
+
+-- Filtrar itens por categoria e data exigia o caminho tb_pedido_item -> tb_pedido -> tb_produto,
+-- e os indices idx_pediitem_01 (id_pedido) e idx_pedido_03 (dt_pedido) nao atendem a juncao e o
+-- filtro juntos. Os itens passam a ter copia de tb_pedido.dt_pedido e de
+-- tb_produto.id_produto_categoria, e o indice idx_pediitem_04 (id_produto_categoria, dt_pedido,
+-- id_produto, qt_item) responde sozinho "quanto de cada produto da categoria foi vendido no
+-- periodo", sem ler a tabela.
+--
+-- Sincronismo das copias:
+-- - a carga grava as colunas ja preenchidas; nas demais gravacoes, trg_pediitem_bi as preenche
+--   quando vierem nulas e trg_pediitem_bu as atualiza quando o item trocar de pedido ou produto;
+-- - trg_pedido_au e trg_produto_au propagam a mudanca de data do pedido e de categoria do produto.
+-- Esses triggers nao dependem de @fl_ignorar_rollup_venda.
+--
+-- prc_relatorio_venda_periodo (V021) continua lendo os consolidados, que tem uma linha por dia. Passam
+-- a usar as copias, sem juncao, a recarga dos consolidados (prc_carga_rollup_venda) e os triggers de
+-- tb_pedido_item e tb_pedido, que antes buscavam data e categoria a cada item.
+
+USE boacompra_adm;
+
+-- +---------------------------------------------------------+--
+-- 1. Exclusao das procedures e triggers
+-- +---------------------------------------------------------+--
+DROP PROCEDURE IF EXISTS prc_migration_pedido_item_venda;
+DROP TRIGGER IF EXISTS boacompra_adm.trg_pedido_au;
+DROP TRIGGER IF EXISTS boacompra_adm.trg_pediitem_bi;
+DROP TRIGGER IF EXISTS boacompra_adm.trg_pediitem_bu;
+DROP TRIGGER IF EXISTS boacompra_adm.trg_pediitem_ai;
+DROP TRIGGER IF EXISTS boacompra_adm.trg_pediitem_au;
+DROP TRIGGER IF EXISTS boacompra_adm.trg_pediitem_ad;
+DROP TRIGGER IF EXISTS boacompra_adm.trg_produto_au;
+DROP PROCEDURE IF EXISTS boacompra_adm.prc_carga_rollup_venda;
+
+-- +---------------------------------------------------------+--
+-- 2. Criacao da procedure de migration
+-- +---------------------------------------------------------+--
+DELIMITER //
+CREATE PROCEDURE prc_migration_pedido_item_venda()
+BEGIN
+    DECLARE v_exists INT;
+    DECLARE v_schema_name VARCHAR(128) DEFAULT 'boacompra_adm';
+    DECLARE v_table_name  VARCHAR(128) DEFAULT 'tb_pedido_item';
+    DECLARE v_id_inicio   BIGINT;
+    DECLARE v_id_maximo   BIGINT;
+    DECLARE v_tamanho_lote BIGINT DEFAULT 100000;
+
+    -- 1. Criar as colunas DT_PEDIDO e ID_PRODUTO_CATEGORIA, ainda nulas
+    SELECT COUNT(1) INTO v_exists FROM information_schema.columns
+    WHERE table_schema = v_schema_name AND table_name = v_table_name AND column_name = 'dt_pedido';
+    IF v_exists = 0 THEN
+        SET @sql := '
+          ALTER TABLE boacompra_adm.tb_pedido_item
+            ADD COLUMN dt_pedido            DATE     NULL COMMENT ''[DADO_PUBLICO] Data do pedido, copia de tb_pedido.dt_pedido'' AFTER id_produto,
+            ADD COLUMN id_produto_categoria SMALLINT NULL COMMENT ''[DADO_PUBLICO] Categoria do produto, copia de tb_produto.id_produto_categoria'' AFTER dt_pedido;
+        ';
+        PREPARE stmt FROM @sql;
+        EXECUTE stmt;
+        DEALLOCATE PREPARE stmt;
+
+        SELECT 'Colunas dt_pedido e id_produto_categoria criadas em tb_pedido_item.' AS mensagem;
+    ELSE
+        SELECT 'Colunas dt_pedido e id_produto_categoria já existem em tb_pedido_item.' AS mensagem;
+    END IF;
+
+    -- 2. Preencher os itens existentes, em faixas de id_pedido_item
+    SELECT IFNULL(MIN(id_pedido_item), 1), IFNULL(MAX(id_pedido_item), 0)
+    INTO v_id_inicio, v_id_maximo
+    FROM boacompra_adm.tb_pedido_item;
+
+    WHILE v_id_inicio <= v_id_maximo DO
+        UPDATE boacompra_adm.tb_pedido_item      pediitem
+            INNER JOIN boacompra_adm.tb_pedido  pedido ON pediitem.id_pedido = pedido.id_pedido
+            INNER JOIN boacompra_adm.tb_produto produto ON pediitem.id_produto = produto.id_produto
+        SET pediitem.dt_pedido            = pedido.dt_pedido,
+            pediitem.id_produto_categoria = produto.id_produto_categoria
+        WHERE pediitem.id_pedido_item BETWEEN v_id_inicio AND v_id_inicio + v_tamanho_lote - 1
+          AND (pediitem.dt_pedido IS NULL OR pediitem.id_produto_categoria IS NULL);
+        COMMIT;
+
+        SET v_id_inicio = v_id_inicio + v_tamanho_lote;
+    END WHILE;
+
+    -- 3. Tornar as colunas obrigatorias
+    SELECT COUNT(1) INTO v_exists FROM information_schema.columns
+    WHERE table_schema = v_schema_name AND table_name = v_table_name AND column_name = 'dt_pedido' AND is_nullable = 'YES';
+    IF v_exists > 0 THEN
+        SET @sql := '
+          ALTER TABLE boacompra_adm.tb_pedido_item
+            MODIFY COLUMN dt_pedido            DATE     NOT NULL COMMENT ''[DADO_PUBLICO] Data do pedido, copia de tb_pedido.dt_pedido'',
+            MODIFY COLUMN id_produto_categoria SMALLINT NOT NULL COMMENT ''[DADO_PUBLICO] Categoria do produto, copia de tb_produto.id_produto_categoria'';
+        ';
+        PREPARE stmt FROM @sql;
+        EXECUTE stmt;
+        DEALLOCATE PREPARE stmt;
+
+        SELECT 'Colunas dt_pedido e id_produto_categoria de tb_pedido_item obrigatórias.' AS mensagem;
+    ELSE
+        SELECT 'Colunas dt_pedido e id_produto_categoria de tb_pedido_item já são obrigatórias.' AS mensagem;
+    END IF;
+
+    -- 4. Criar o indice IDX_PEDIITEM_04
+    SELECT COUNT(1) INTO v_exists FROM information_schema.statistics
+    WHERE table_schema = v_schema_name AND table_name = v_table_name AND index_name = 'idx_pediitem_04';
+    IF v_exists = 0 THEN
+        SET @sql := '
+          CREATE INDEX idx_pediitem_04 ON boacompra_adm.tb_pedido_item (id_produto_categoria, dt_pedido, id_produto, qt_item);
+        ';
+        PREPARE stmt FROM @sql;
+        EXECUTE stmt;
+        DEALLOCATE PREPARE stmt;
+
+        SELECT 'Índice idx_pediitem_04 criado.' AS mensagem;
+    ELSE
+        SELECT 'Índice idx_pediitem_04 já existe.' AS mensagem;
+    END IF;
+END;
+//
+DELIMITER ;
+
+-- +---------------------------------------------------------+--
+-- 3. Execucao da procedure de migration
+-- +---------------------------------------------------------+--
+CALL prc_migration_pedido_item_venda();
+
+-- +---------------------------------------------------------+--
+-- 4. Exclusao da procedure de migration
+-- +---------------------------------------------------------+--
+DROP PROCEDURE IF EXISTS prc_migration_pedido_item_venda;
+
+-- +---------------------------------------------------------+--
+-- 5. Criacao da procedure de carga em massa dos consolidados
+-- +---------------------------------------------------------+--
+-- Os itens do periodo saem de idx_pediitem_04 na ordem do agrupamento (categoria, data, produto).
+DELIMITER //
+CREATE PROCEDURE boacompra_adm.prc_carga_rollup_venda (
+    IN pdt_inicio_pedido DATE,
+    IN pdt_fim_pedido    DATE
+)
+BEGIN
+    DECLARE vdt_inicio DATE;
+    DECLARE vdt_fim    DATE;
+
+    SET vdt_inicio = COALESCE(pdt_inicio_pedido, (SELECT MIN(dt_pedido) FROM boacompra_adm.tb_pedido), CURDATE());
+    SET vdt_fim    = COALESCE(pdt_fim_pedido, (SELECT MAX(dt_pedido) FROM boacompra_adm.tb_pedido), CURDATE());
+
+    DELETE FROM boacompra_adm.tb_venda_produto_dia WHERE dt_venda BETWEEN vdt_inicio AND vdt_fim;
+    DELETE FROM boacompra_adm.tb_venda_dia WHERE dt_venda BETWEEN vdt_inicio AND vdt_fim;
+
+    INSERT INTO boacompra_adm.tb_venda_dia (dt_venda, qt_pedido, qt_pedido_valor, vl_pedido_total)
+    SELECT pedido.dt_pedido,
+           COUNT(1),
+           COUNT(pedido.vl_pedido_total),
+           IFNULL(SUM(pedido.vl_pedido_total), 0)
+    FROM boacompra_adm.tb_pedido pedido
+    WHERE pedido.dt_pedido BETWEEN vdt_inicio AND vdt_fim
+    GROUP BY pedido.dt_pedido;
+
+    INSERT INTO boacompra_adm.tb_venda_produto_dia (dt_venda, id_produto_categoria, id_produto, qt_item_vendido, qt_pedido_item)
+    SELECT pediitem.dt_pedido,
+           pediitem.id_produto_categoria,
+           pediitem.id_produto,
+           SUM(pediitem.qt_item),
+           COUNT(1)
+    FROM boacompra_adm.tb_pedido_item pediitem
+    WHERE pediitem.dt_pedido BETWEEN vdt_inicio AND vdt_fim
+    GROUP BY pediitem.id_produto_categoria, pediitem.dt_pedido, pediitem.id_produto;
+END;
+//
+
+-- +---------------------------------------------------------+--
+-- 6. Criacao do trigger de TB_PEDIDO
+-- +---------------------------------------------------------+--
+CREATE TRIGGER boacompra_adm.trg_pedido_au
+AFTER UPDATE ON boacompra_adm.tb_pedido
+FOR EACH ROW
+BEGIN
+    IF IFNULL(@fl_ignorar_rollup_venda, 0) = 0 THEN
+        IF NOT (OLD.dt_pedido <=> NEW.dt_pedido) OR NOT (OLD.vl_pedido_total <=> NEW.vl_pedido_total) THEN
+            CALL boacompra_adm.prc_rollup_venda_dia(OLD.dt_pedido, -1, -(OLD.vl_pedido_total IS NOT NULL), -IFNULL(OLD.vl_pedido_total, 0));
+            CALL boacompra_adm.prc_rollup_venda_dia(NEW.dt_pedido, 1, NEW.vl_pedido_total IS NOT NULL, IFNULL(NEW.vl_pedido_total, 0));
+        END IF;
+
+        -- Mudanca de data leva os itens do pedido para o consolidado da nova data
+        IF OLD.dt_pedido <> NEW.dt_pedido THEN
+            INSERT INTO boacompra_adm.tb_venda_produto_dia (dt_venda, id_produto_categoria, id_produto, qt_item_vendido, qt_pedido_item)
+            SELECT venda.dt_venda, pediitem.id_produto_categoria, pediitem.id_produto, venda.nu_sinal * pediitem.qt_item, venda.nu_sinal
+            FROM boacompra_adm.tb_pedido_item pediitem
+                CROSS JOIN (SELECT OLD.dt_pedido AS dt_venda, -1 AS nu_sinal
+                            UNION ALL
+                            SELECT NEW.dt_pedido AS dt_venda, 1 AS nu_sinal) venda
+            WHERE pediitem.id_pedido = NEW.id_pedido
+            ON DUPLICATE KEY UPDATE
+                qt_item_vendido = qt_item_vendido + VALUES(qt_item_vendido),
+                qt_pedido_item  = qt_pedido_item + VALUES(qt_pedido_item);
+
+            DELETE FROM boacompra_adm.tb_venda_produto_dia
+            WHERE dt_venda = OLD.dt_pedido
+              AND qt_pedido_item = 0;
+        END IF;
+    END IF;
+
+    -- Copia da data nos itens (depois do consolidado, que ainda nao a considera)
+    IF OLD.dt_pedido <> NEW.dt_pedido THEN
+        UPDATE boacompra_adm.tb_pedido_item
+        SET dt_pedido = NEW.dt_pedido
+        WHERE id_pedido = NEW.id_pedido;
+    END IF;
+END;
+//
+
+-- +---------------------------------------------------------+--
+-- 7. Criacao dos triggers de TB_PEDIDO_ITEM
+-- +---------------------------------------------------------+--
+CREATE TRIGGER boacompra_adm.trg_pediitem_bi
+BEFORE INSERT ON boacompra_adm.tb_pedido_item
+FOR EACH ROW
+BEGIN
+    IF NEW.dt_pedido IS NULL THEN
+        SET NEW.dt_pedido = (SELECT dt_pedido FROM boacompra_adm.tb_pedido WHERE id_pedido = NEW.id_pedido);
+    END IF;
+    IF NEW.id_produto_categoria IS NULL THEN
+        SET NEW.id_produto_categoria = (SELECT id_produto_categoria FROM boacompra_adm.tb_produto WHERE id_produto = NEW.id_produto);
+    END IF;
+END;
+//
+
+CREATE TRIGGER boacompra_adm.trg_pediitem_bu
+BEFORE UPDATE ON boacompra_adm.tb_pedido_item
+FOR EACH ROW
+BEGIN
+    IF OLD.id_pedido <> NEW.id_pedido THEN
+        SET NEW.dt_pedido = (SELECT dt_pedido FROM boacompra_adm.tb_pedido WHERE id_pedido = NEW.id_pedido);
+    END IF;
+    IF OLD.id_produto <> NEW.id_produto THEN
+        SET NEW.id_produto_categoria = (SELECT id_produto_categoria FROM boacompra_adm.tb_produto WHERE id_produto = NEW.id_produto);
+    END IF;
+END;
+//
+
+CREATE TRIGGER boacompra_adm.trg_pediitem_ai
+AFTER INSERT ON boacompra_adm.tb_pedido_item
+FOR EACH ROW
+BEGIN
+    IF IFNULL(@fl_ignorar_rollup_venda, 0) = 0 THEN
+        CALL boacompra_adm.prc_rollup_venda_produto_dia(NEW.dt_pedido, NEW.id_produto_categoria, NEW.id_produto, NEW.qt_item, 1);
+    END IF;
+END;
+//
+
+-- Mudancas so de dt_pedido ou id_produto_categoria vem de trg_pedido_au e trg_produto_au, que ja
+-- movem os consolidados de uma vez para o pedido ou produto inteiro.
+CREATE TRIGGER boacompra_adm.trg_pediitem_au
+AFTER UPDATE ON boacompra_adm.tb_pedido_item
+FOR EACH ROW
+BEGIN
+    IF IFNULL(@fl_ignorar_rollup_venda, 0) = 0
+       AND (OLD.id_pedido <> NEW.id_pedido OR OLD.id_produto <> NEW.id_produto OR OLD.qt_item <> NEW.qt_item) THEN
+        CALL boacompra_adm.prc_rollup_venda_produto_dia(OLD.dt_pedido, OLD.id_produto_categoria, OLD.id_produto, -OLD.qt_item, -1);
+        CALL boacompra_adm.prc_rollup_venda_produto_dia(NEW.dt_pedido, NEW.id_produto_categoria, NEW.id_produto, NEW.qt_item, 1);
+    END IF;
+END;
+//
+
+CREATE TRIGGER boacompra_adm.trg_pediitem_ad
+AFTER DELETE ON boacompra_adm.tb_pedido_item
+FOR EACH ROW
+BEGIN
+    IF IFNULL(@fl_ignorar_rollup_venda, 0) = 0 THEN
+        CALL boacompra_adm.prc_rollup_venda_produto_dia(OLD.dt_pedido, OLD.id_produto_categoria, OLD.id_produto, -OLD.qt_item, -1);
+    END IF;
+END;
+//
+
+-- +---------------------------------------------------------+--
+-- 8. Criacao do trigger de TB_PRODUTO
+-- +---------------------------------------------------------+--
+-- Um produto pertence a uma unica categoria: ao trocar de categoria, todo o historico
+-- consolidado do produto e a copia da categoria nos itens passam para a nova categoria.
+CREATE TRIGGER boacompra_adm.trg_produto_au
+AFTER UPDATE ON boacompra_adm.tb_produto
+FOR EACH ROW
+BEGIN
+    IF OLD.id_produto_categoria <> NEW.id_produto_categoria THEN
+        IF IFNULL(@fl_ignorar_rollup_venda, 0) = 0 THEN
+            UPDATE boacompra_adm.tb_venda_produto_dia
+            SET id_produto_categoria = NEW.id_produto_categoria
+            WHERE id_produto = NEW.id_produto;
+        END IF;
+
+        UPDATE boacompra_adm.tb_pedido_item
+        SET id_produto_categoria = NEW.id_produto_categoria
+        WHERE id_produto = NEW.id_produto;
+    END IF;
+END;
+//
+DELIMITER ;
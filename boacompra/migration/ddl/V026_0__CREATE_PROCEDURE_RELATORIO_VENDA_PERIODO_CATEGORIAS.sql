@@ -0,0 +1,91 @@
+/*
+---------------------------------------------------------------------------------------------------
+-- MOTIVO:       CARD-007 >> Relatório de venda no período para várias categorias em uma chamada
+-- AUTOR:        Welington Lima
+-- DATA :        18/10/2026
+-- SISTEMA:      Boa Compra - Ecommerce
+---------------------------------------------------------------------------------------------------
+*/
+
+-- Versao em lote de prc_relatorio_venda_periodo: recebe um array JSON de nomes de categoria (NULL para
+-- todas as categorias de tb_produto_categoria) e devolve um objeto JSON com uma chave por categoria,
+-- cujo valor e o mesmo JSON da procedure de uma categoria. Os totais do periodo sao lidos uma unica vez
+-- de tb_venda_dia e os produtos de todas as categorias saem de uma unica leitura agrupada de
+-- tb_venda_produto_dia, em vez de uma chamada (e uma leitura do periodo) por categoria.
+-- Categorias inexistentes aparecem com dc_produto vazio, como na procedure de uma categoria.
+
+USE boacompra_adm;
+
+-- +---------------------------------------------------------+--
+-- 1. Exclusao da procedure de relatorio
+-- +---------------------------------------------------------+--
+DROP PROCEDURE IF EXISTS boacompra_adm.prc_relatorio_venda_periodo_categorias;
+
+-- +---------------------------------------------------------+--
+-- 2. Criacao da procedure de relatorio
+-- +---------------------------------------------------------+--
+DELIMITER //
+CREATE PROCEDURE boacompra_adm.prc_relatorio_venda_periodo_categorias(
+    IN pdt_inicio_pedido DATE,
+    IN pdt_fim_pedido    DATE,
+    IN pdc_categoria     JSON,
+    OUT podc_resultado_relatorio JSON
+)
+BEGIN
+    DECLARE vqt_pedido            BIGINT DEFAULT 0;
+    DECLARE vvl_pedido_total      DECIMAL(15, 2) DEFAULT 0.00;
+    DECLARE vvl_pedido_media      DECIMAL(15, 2) DEFAULT 0.00;
+    DECLARE vdc_categoria         JSON;
+
+    SELECT IFNULL(SUM(venddia.qt_pedido), 0)                                                   AS qt_pedido,
+           ROUND(IFNULL(SUM(venddia.vl_pedido_total), 0), 2)                                   AS vl_pedido_total,
+           ROUND(IFNULL(SUM(venddia.vl_pedido_total) / NULLIF(SUM(venddia.qt_pedido_valor), 0), 0), 2) AS vl_pedido_medio
+    INTO vqt_pedido, vvl_pedido_total, vvl_pedido_media
+    FROM boacompra_adm.tb_venda_dia venddia
+    WHERE 1 = 1
+      AND venddia.dt_venda BETWEEN pdt_inicio_pedido AND pdt_fim_pedido;
+
+    IF pdc_categoria IS NULL THEN
+        SELECT IFNULL(JSON_ARRAYAGG(prodcate.no_produto_categoria), JSON_ARRAY())
+        INTO vdc_categoria
+        FROM boacompra_adm.tb_produto_categoria prodcate;
+    ELSE
+        SET vdc_categoria = pdc_categoria;
+    END IF;
+
+    SELECT IFNULL(JSON_OBJECTAGG(
+                      categoria.no_produto_categoria,
+                      JSON_OBJECT(
+                          'qt_total_pedido', vqt_pedido,
+                          'vl_total_pedido', vvl_pedido_total,
+                          'vl_media_pedido', vvl_pedido_media,
+                          'dc_produto', IFNULL(venda.dc_produto, JSON_ARRAY()))),
+                  JSON_OBJECT()) AS relatorio
+    INTO podc_resultado_relatorio
+    FROM JSON_TABLE(vdc_categoria, '$[*]' COLUMNS (no_produto_categoria VARCHAR(100) PATH '$')) AS categoria
+        LEFT JOIN boacompra_adm.tb_produto_categoria prodcate
+            ON prodcate.no_produto_categoria = categoria.no_produto_categoria COLLATE utf8mb4_unicode_ci
+        LEFT JOIN (SELECT vendido.id_produto_categoria,
+                          JSON_ARRAYAGG(
+                              JSON_OBJECT(
+                                  'no_produto', produto.no_produto,
+                                  'qt_item_vendido', vendido.qt_total_item_vendido)) AS dc_produto
+                   FROM (SELECT vendprod.id_produto_categoria                  AS id_produto_categoria,
+                                vendprod.id_produto                            AS id_produto,
+                                IFNULL(SUM(vendprod.qt_item_vendido), 0)       AS qt_total_item_vendido
+                         FROM boacompra_adm.tb_venda_produto_dia vendprod
+                         WHERE 1 = 1
+                           AND vendprod.dt_venda BETWEEN pdt_inicio_pedido AND pdt_fim_pedido
+                           AND (pdc_categoria IS NULL
+                                OR vendprod.id_produto_categoria IN (
+                                    SELECT listcate.id_produto_categoria
+                                    FROM JSON_TABLE(vdc_categoria, '$[*]' COLUMNS (no_produto_categoria VARCHAR(100) PATH '$')) AS lista
+                                        INNER JOIN boacompra_adm.tb_produto_categoria listcate
+                                            ON listcate.no_produto_categoria = lista.no_produto_categoria COLLATE utf8mb4_unicode_ci))
+                         GROUP BY vendprod.id_produto_categoria, vendprod.id_produto) AS vendido
+                       INNER JOIN boacompra_adm.tb_produto produto ON vendido.id_produto = produto.id_produto
+                   GROUP BY vendido.id_produto_categoria) AS venda
+            ON venda.id_produto_categoria = prodcate.id_produto_categoria;
+END;
+//
+DELIMITER ;
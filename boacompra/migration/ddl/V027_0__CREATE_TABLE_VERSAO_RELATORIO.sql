@@ -0,0 +1,308 @@
+/*
+---------------------------------------------------------------------------------------------------
+-- MOTIVO:       CARD-004 >> Contador de alteracoes das tabelas de origem para a marca d'agua do cache de relatorios
+-- AUTOR:        Welington Lima
+-- DATA :        18/10/2026
+-- SISTEMA:      Boa Compra - Ecommerce
+---------------------------------------------------------------------------------------------------
+*/
+
+-- A marca d'agua por MAX(dt_atualizacao) e MAX(id) (V022) nao muda com alteracoes no mesmo
+-- segundo da ultima, com transacoes confirmadas depois de um horario mais novo ja visivel, com
+-- exclusoes e com alteracoes de tb_produto. Os triggers de tb_pedido, tb_pedido_item e tb_produto
+-- passam a somar 1 em tb_versao_relatorio a cada insert/update/delete, na mesma transacao da
+-- alteracao, e prc_carga_rollup_venda soma 1 ao recalcular os consolidados. A marca d'agua e
+-- SUM(nu_versao): muda sempre que uma alteracao e confirmada.
+--
+-- O contador e dividido em 16 linhas, escolhidas por CONNECTION_ID(): sessoes gravando em paralelo
+-- (carga e ingestao de pedidos) atualizam linhas diferentes e nao esperam umas pelas outras.
+-- Sessoes com @fl_ignorar_rollup_venda = 1 (a carga em massa) nao somam por linha, como nao
+-- atualizam os consolidados: a carga soma 1 uma unica vez ao chamar prc_carga_rollup_venda no final.
+--
+-- Os triggers sao os de V020 e V025, com a chamada a prc_versao_relatorio_incrementar.
+
+USE boacompra_adm;
+
+-- +---------------------------------------------------------+--
+-- 1. Exclusao das procedures e triggers
+-- +---------------------------------------------------------+--
+DROP PROCEDURE IF EXISTS prc_migration_versao_relatorio;
+DROP TRIGGER IF EXISTS boacompra_adm.trg_pedido_ai;
+DROP TRIGGER IF EXISTS boacompra_adm.trg_pedido_au;
+DROP TRIGGER IF EXISTS boacompra_adm.trg_pedido_ad;
+DROP TRIGGER IF EXISTS boacompra_adm.trg_pediitem_ai;
+DROP TRIGGER IF EXISTS boacompra_adm.trg_pediitem_au;
+DROP TRIGGER IF EXISTS boacompra_adm.trg_pediitem_ad;
+DROP TRIGGER IF EXISTS boacompra_adm.trg_produto_ai;
+DROP TRIGGER IF EXISTS boacompra_adm.trg_produto_au;
+DROP TRIGGER IF EXISTS boacompra_adm.trg_produto_ad;
+DROP PROCEDURE IF EXISTS boacompra_adm.prc_versao_relatorio_incrementar;
+DROP PROCEDURE IF EXISTS boacompra_adm.prc_carga_rollup_venda;
+
+-- +---------------------------------------------------------+--
+-- 2. Criacao da procedure de migration
+-- +---------------------------------------------------------+--
+DELIMITER //
+CREATE PROCEDURE prc_migration_versao_relatorio()
+BEGIN
+    DECLARE v_exists INT;
+    DECLARE v_schema_name VARCHAR(128) DEFAULT 'boacompra_adm';
+    DECLARE v_table_name  VARCHAR(128) DEFAULT 'tb_versao_relatorio';
+
+    -- 1. Criar a tabela TB_VERSAO_RELATORIO
+    SELECT COUNT(*) INTO v_exists
+    FROM information_schema.tables
+    WHERE table_schema = v_schema_name AND table_name = v_table_name;
+
+    IF v_exists = 0 THEN
+        SET @sql := '
+          CREATE TABLE boacompra_adm.tb_versao_relatorio (
+             nu_particao                  TINYINT        NOT NULL                                                       COMMENT ''[DADO_PUBLICO] Chave primaria [PK_VERSRELA]. Particao do contador (CONNECTION_ID() % 16)'',
+             nu_versao                    BIGINT         NOT NULL DEFAULT 0                                             COMMENT ''[DADO_PUBLICO] Quantidade de alteracoes de tb_pedido, tb_pedido_item e tb_produto registradas na particao'',
+             CONSTRAINT pk_versrela PRIMARY KEY (nu_particao)
+          ) COMMENT = ''[DADO_PUBLICO] Contador de alteracoes das tabelas de origem dos relatorios; a soma e a versao dos dados no cache''
+            ENGINE = InnoDB DEFAULT CHARSET = utf8mb4 COLLATE = utf8mb4_unicode_ci;
+        ';
+        PREPARE stmt FROM @sql;
+        EXECUTE stmt;
+        DEALLOCATE PREPARE stmt;
+
+        SELECT 'Tabela boacompra_adm.tb_versao_relatorio criada com sucesso!' AS mensagem;
+    ELSE
+        SELECT 'Tabela boacompra_adm.tb_versao_relatorio já existe.' AS mensagem;
+    END IF;
+
+    -- 2. Criar as particoes do contador
+    INSERT IGNORE INTO boacompra_adm.tb_versao_relatorio (nu_particao, nu_versao)
+    VALUES (0, 0), (1, 0), (2, 0), (3, 0), (4, 0), (5, 0), (6, 0), (7, 0),
+           (8, 0), (9, 0), (10, 0), (11, 0), (12, 0), (13, 0), (14, 0), (15, 0);
+END;
+//
+DELIMITER ;
+
+-- +---------------------------------------------------------+--
+-- 3. Execucao da procedure de migration
+-- +---------------------------------------------------------+--
+CALL prc_migration_versao_relatorio();
+
+-- +---------------------------------------------------------+--
+-- 4. Exclusao da procedure de migration
+-- +---------------------------------------------------------+--
+DROP PROCEDURE IF EXISTS prc_migration_versao_relatorio;
+
+-- +---------------------------------------------------------+--
+-- 5. Criacao da procedure de incremento do contador
+-- +---------------------------------------------------------+--
+DELIMITER //
+CREATE PROCEDURE boacompra_adm.prc_versao_relatorio_incrementar ()
+BEGIN
+    UPDATE boacompra_adm.tb_versao_relatorio
+    SET nu_versao = nu_versao + 1
+    WHERE nu_particao = CONNECTION_ID() % 16;
+END;
+//
+
+-- +---------------------------------------------------------+--
+-- 6. Criacao da procedure de carga em massa dos consolidados
+-- +---------------------------------------------------------+--
+-- Os itens do periodo saem de idx_pediitem_04 na ordem do agrupamento (categoria, data, produto).
+CREATE PROCEDURE boacompra_adm.prc_carga_rollup_venda (
+    IN pdt_inicio_pedido DATE,
+    IN pdt_fim_pedido    DATE
+)
+BEGIN
+    DECLARE vdt_inicio DATE;
+    DECLARE vdt_fim    DATE;
+
+    SET vdt_inicio = COALESCE(pdt_inicio_pedido, (SELECT MIN(dt_pedido) FROM boacompra_adm.tb_pedido), CURDATE());
+    SET vdt_fim    = COALESCE(pdt_fim_pedido, (SELECT MAX(dt_pedido) FROM boacompra_adm.tb_pedido), CURDATE());
+
+    DELETE FROM boacompra_adm.tb_venda_produto_dia WHERE dt_venda BETWEEN vdt_inicio AND vdt_fim;
+    DELETE FROM boacompra_adm.tb_venda_dia WHERE dt_venda BETWEEN vdt_inicio AND vdt_fim;
+
+    INSERT INTO boacompra_adm.tb_venda_dia (dt_venda, qt_pedido, qt_pedido_valor, vl_pedido_total)
+    SELECT pedido.dt_pedido,
+           COUNT(1),
+           COUNT(pedido.vl_pedido_total),
+           IFNULL(SUM(pedido.vl_pedido_total), 0)
+    FROM boacompra_adm.tb_pedido pedido
+    WHERE pedido.dt_pedido BETWEEN vdt_inicio AND vdt_fim
+    GROUP BY pedido.dt_pedido;
+
+    INSERT INTO boacompra_adm.tb_venda_produto_dia (dt_venda, id_produto_categoria, id_produto, qt_item_vendido, qt_pedido_item)
+    SELECT pediitem.dt_pedido,
+           pediitem.id_produto_categoria,
+           pediitem.id_produto,
+           SUM(pediitem.qt_item),
+           COUNT(1)
+    FROM boacompra_adm.tb_pedido_item pediitem
+    WHERE pediitem.dt_pedido BETWEEN vdt_inicio AND vdt_fim
+    GROUP BY pediitem.id_produto_categoria, pediitem.dt_pedido, pediitem.id_produto;
+
+    -- Os relatorios em cache foram calculados sobre os consolidados anteriores
+    CALL boacompra_adm.prc_versao_relatorio_incrementar();
+END;
+//
+
+-- +---------------------------------------------------------+--
+-- 7. Criacao dos triggers de TB_PEDIDO
+-- +---------------------------------------------------------+--
+CREATE TRIGGER boacompra_adm.trg_pedido_ai
+AFTER INSERT ON boacompra_adm.tb_pedido
+FOR EACH ROW
+BEGIN
+    IF IFNULL(@fl_ignorar_rollup_venda, 0) = 0 THEN
+        CALL boacompra_adm.prc_rollup_venda_dia(NEW.dt_pedido, 1, NEW.vl_pedido_total IS NOT NULL, IFNULL(NEW.vl_pedido_total, 0));
+
+        CALL boacompra_adm.prc_versao_relatorio_incrementar();
+    END IF;
+END;
+//
+
+CREATE TRIGGER boacompra_adm.trg_pedido_au
+AFTER UPDATE ON boacompra_adm.tb_pedido
+FOR EACH ROW
+BEGIN
+    IF IFNULL(@fl_ignorar_rollup_venda, 0) = 0 THEN
+        IF NOT (OLD.dt_pedido <=> NEW.dt_pedido) OR NOT (OLD.vl_pedido_total <=> NEW.vl_pedido_total) THEN
+            CALL boacompra_adm.prc_rollup_venda_dia(OLD.dt_pedido, -1, -(OLD.vl_pedido_total IS NOT NULL), -IFNULL(OLD.vl_pedido_total, 0));
+            CALL boacompra_adm.prc_rollup_venda_dia(NEW.dt_pedido, 1, NEW.vl_pedido_total IS NOT NULL, IFNULL(NEW.vl_pedido_total, 0));
+        END IF;
+
+        -- Mudanca de data leva os itens do pedido para o consolidado da nova data
+        IF OLD.dt_pedido <> NEW.dt_pedido THEN
+            INSERT INTO boacompra_adm.tb_venda_produto_dia (dt_venda, id_produto_categoria, id_produto, qt_item_vendido, qt_pedido_item)
+            SELECT venda.dt_venda, pediitem.id_produto_categoria, pediitem.id_produto, venda.nu_sinal * pediitem.qt_item, venda.nu_sinal
+            FROM boacompra_adm.tb_pedido_item pediitem
+                CROSS JOIN (SELECT OLD.dt_pedido AS dt_venda, -1 AS nu_sinal
+                            UNION ALL
+                            SELECT NEW.dt_pedido AS dt_venda, 1 AS nu_sinal) venda
+            WHERE pediitem.id_pedido = NEW.id_pedido
+            ON DUPLICATE KEY UPDATE
+                qt_item_vendido = qt_item_vendido + VALUES(qt_item_vendido),
+                qt_pedido_item  = qt_pedido_item + VALUES(qt_pedido_item);
+
+            DELETE FROM boacompra_adm.tb_venda_produto_dia
+            WHERE dt_venda = OLD.dt_pedido
+              AND qt_pedido_item = 0;
+        END IF;
+    END IF;
+
+    -- Copia da data nos itens (depois do consolidado, que ainda nao a considera)
+    IF OLD.dt_pedido <> NEW.dt_pedido THEN
+        UPDATE boacompra_adm.tb_pedido_item
+        SET dt_pedido = NEW.dt_pedido
+        WHERE id_pedido = NEW.id_pedido;
+    END IF;
+
+    IF IFNULL(@fl_ignorar_rollup_venda, 0) = 0 THEN
+        CALL boacompra_adm.prc_versao_relatorio_incrementar();
+    END IF;
+END;
+//
+
+CREATE TRIGGER boacompra_adm.trg_pedido_ad
+AFTER DELETE ON boacompra_adm.tb_pedido
+FOR EACH ROW
+BEGIN
+    IF IFNULL(@fl_ignorar_rollup_venda, 0) = 0 THEN
+        CALL boacompra_adm.prc_rollup_venda_dia(OLD.dt_pedido, -1, -(OLD.vl_pedido_total IS NOT NULL), -IFNULL(OLD.vl_pedido_total, 0));
+
+        CALL boacompra_adm.prc_versao_relatorio_incrementar();
+    END IF;
+END;
+//
+
+-- +---------------------------------------------------------+--
+-- 8. Criacao dos triggers de TB_PEDIDO_ITEM
+-- +---------------------------------------------------------+--
+CREATE TRIGGER boacompra_adm.trg_pediitem_ai
+AFTER INSERT ON boacompra_adm.tb_pedido_item
+FOR EACH ROW
+BEGIN
+    IF IFNULL(@fl_ignorar_rollup_venda, 0) = 0 THEN
+        CALL boacompra_adm.prc_rollup_venda_produto_dia(NEW.dt_pedido, NEW.id_produto_categoria, NEW.id_produto, NEW.qt_item, 1);
+
+        CALL boacompra_adm.prc_versao_relatorio_incrementar();
+    END IF;
+END;
+//
+
+-- Mudancas so de dt_pedido ou id_produto_categoria vem de trg_pedido_au e trg_produto_au, que ja
+-- movem os consolidados de uma vez para o pedido ou produto inteiro.
+CREATE TRIGGER boacompra_adm.trg_pediitem_au
+AFTER UPDATE ON boacompra_adm.tb_pedido_item
+FOR EACH ROW
+BEGIN
+    IF IFNULL(@fl_ignorar_rollup_venda, 0) = 0
+       AND (OLD.id_pedido <> NEW.id_pedido OR OLD.id_produto <> NEW.id_produto OR OLD.qt_item <> NEW.qt_item) THEN
+        CALL boacompra_adm.prc_rollup_venda_produto_dia(OLD.dt_pedido, OLD.id_produto_categoria, OLD.id_produto, -OLD.qt_item, -1);
+        CALL boacompra_adm.prc_rollup_venda_produto_dia(NEW.dt_pedido, NEW.id_produto_categoria, NEW.id_produto, NEW.qt_item, 1);
+    END IF;
+
+    IF IFNULL(@fl_ignorar_rollup_venda, 0) = 0 THEN
+        CALL boacompra_adm.prc_versao_relatorio_incrementar();
+    END IF;
+END;
+//
+
+CREATE TRIGGER boacompra_adm.trg_pediitem_ad
+AFTER DELETE ON boacompra_adm.tb_pedido_item
+FOR EACH ROW
+BEGIN
+    IF IFNULL(@fl_ignorar_rollup_venda, 0) = 0 THEN
+        CALL boacompra_adm.prc_rollup_venda_produto_dia(OLD.dt_pedido, OLD.id_produto_categoria, OLD.id_produto, -OLD.qt_item, -1);
+
+        CALL boacompra_adm.prc_versao_relatorio_incrementar();
+    END IF;
+END;
+//
+
+-- +---------------------------------------------------------+--
+-- 9. Criacao dos triggers de TB_PRODUTO
+-- +---------------------------------------------------------+--
+-- O relatorio de venda mostra no_produto: qualquer alteracao do produto conta como alteracao.
+CREATE TRIGGER boacompra_adm.trg_produto_ai
+AFTER INSERT ON boacompra_adm.tb_produto
+FOR EACH ROW
+BEGIN
+    IF IFNULL(@fl_ignorar_rollup_venda, 0) = 0 THEN
+        CALL boacompra_adm.prc_versao_relatorio_incrementar();
+    END IF;
+END;
+//
+
+-- Um produto pertence a uma unica categoria: ao trocar de categoria, todo o historico
+-- consolidado do produto e a copia da categoria nos itens passam para a nova categoria.
+CREATE TRIGGER boacompra_adm.trg_produto_au
+AFTER UPDATE ON boacompra_adm.tb_produto
+FOR EACH ROW
+BEGIN
+    IF OLD.id_produto_categoria <> NEW.id_produto_categoria THEN
+        IF IFNULL(@fl_ignorar_rollup_venda, 0) = 0 THEN
+            UPDATE boacompra_adm.tb_venda_produto_dia
+            SET id_produto_categoria = NEW.id_produto_categoria
+            WHERE id_produto = NEW.id_produto;
+        END IF;
+
+        UPDATE boacompra_adm.tb_pedido_item
+        SET id_produto_categoria = NEW.id_produto_categoria
+        WHERE id_produto = NEW.id_produto;
+    END IF;
+
+    IF IFNULL(@fl_ignorar_rollup_venda, 0) = 0 THEN
+        CALL boacompra_adm.prc_versao_relatorio_incrementar();
+    END IF;
+END;
+//
+
+CREATE TRIGGER boacompra_adm.trg_produto_ad
+AFTER DELETE ON boacompra_adm.tb_produto
+FOR EACH ROW
+BEGIN
+    IF IFNULL(@fl_ignorar_rollup_venda, 0) = 0 THEN
+        CALL boacompra_adm.prc_versao_relatorio_incrementar();
+    END IF;
+END;
+//
+DELIMITER ;
@@ -0,0 +1,73 @@
+/*
+---------------------------------------------------------------------------------------------------
+-- MOTIVO:       CARD-004 >> Exclusão dos índices de data de atualização da marca d'água anterior do cache de relatórios
+-- AUTOR:        Welington Lima
+-- DATA :        18/10/2026
+-- SISTEMA:      Boa Compra - Ecommerce
+---------------------------------------------------------------------------------------------------
+*/
+
+-- Os indices de V022 serviam apenas a marca d'agua por MAX(dt_atualizacao), substituida pelo
+-- contador de tb_versao_relatorio (V027). Nenhuma consulta os usa e eles so aumentam o custo de
+-- escrita das duas maiores tabelas.
+
+USE boacompra_adm;
+
+-- +---------------------------------------------------------+--
+-- 1. Exclusao da procedure de migration
+-- +---------------------------------------------------------+--
+DROP PROCEDURE IF EXISTS prc_migration_pedido_atualizacao_exclusao;
+
+-- +---------------------------------------------------------+--
+-- 2. Criacao da procedure de migration
+-- +---------------------------------------------------------+--
+DELIMITER //
+CREATE PROCEDURE prc_migration_pedido_atualizacao_exclusao()
+BEGIN
+    DECLARE v_exists INT;
+    DECLARE v_schema_name VARCHAR(128) DEFAULT 'boacompra_adm';
+
+    -- 1. Excluir o indice IDX_PEDIDO_05
+    SELECT COUNT(1) INTO v_exists FROM information_schema.statistics
+    WHERE table_schema = v_schema_name AND table_name = 'tb_pedido' AND index_name = 'idx_pedido_05';
+    IF v_exists > 0 THEN
+        SET @sql := '
+          DROP INDEX idx_pedido_05 ON boacompra_adm.tb_pedido;
+        ';
+        PREPARE stmt FROM @sql;
+        EXECUTE stmt;
+        DEALLOCATE PREPARE stmt;
+
+        SELECT 'Índice idx_pedido_05 excluído.' AS mensagem;
+    ELSE
+        SELECT 'Índice idx_pedido_05 não existe.' AS mensagem;
+    END IF;
+
+    -- 2. Excluir o indice IDX_PEDIITEM_03
+    SELECT COUNT(1) INTO v_exists FROM information_schema.statistics
+    WHERE table_schema = v_schema_name AND table_name = 'tb_pedido_item' AND index_name = 'idx_pediitem_03';
+    IF v_exists > 0 THEN
+        SET @sql := '
+          DROP INDEX idx_pediitem_03 ON boacompra_adm.tb_pedido_item;
+        ';
+        PREPARE stmt FROM @sql;
+        EXECUTE stmt;
+        DEALLOCATE PREPARE stmt;
+
+        SELECT 'Índice idx_pediitem_03 excluído.' AS mensagem;
+    ELSE
+        SELECT 'Índice idx_pediitem_03 não existe.' AS mensagem;
+    END IF;
+END;
+//
+DELIMITER ;
+
+-- +---------------------------------------------------------+--
+-- 3. Execucao da procedure de migration
+-- +---------------------------------------------------------+--
+CALL prc_migration_pedido_atualizacao_exclusao();
+
+-- +---------------------------------------------------------+--
+-- 4. Exclusao da procedure de migration
+-- +---------------------------------------------------------+--
+DROP PROCEDURE IF EXISTS prc_migration_pedido_atualizacao_exclusao;
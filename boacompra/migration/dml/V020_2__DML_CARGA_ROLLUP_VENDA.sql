@@ -0,0 +1,15 @@
+/*
+---------------------------------------------------------------------------------------------------
+-- MOTIVO:       CARD-003 >> Carga inicial dos consolidados de venda com os pedidos existentes
+-- AUTOR:        Welington Lima
+-- DATA :        18/10/2026
+-- SISTEMA:      Boa Compra - Ecommerce
+---------------------------------------------------------------------------------------------------
+*/
+
+USE boacompra_adm;
+
+-- +---------------------------------------------------------+--
+-- 1. Recalculo dos consolidados para todo o periodo de pedidos
+-- +---------------------------------------------------------+--
+CALL boacompra_adm.prc_carga_rollup_venda(NULL, NULL);
@@ -0,0 +1,74 @@
+/*
+---------------------------------------------------------------------------------------------------
+-- MOTIVO:       CARD-002 >> Validacao da paginação por cursor (keyset) do relatório de pedidos de clientes acima do mínimo
+-- AUTOR:        Welington Lima
+-- DATA :        18/10/2026
+-- SISTEMA:      Boa Compra - Ecommerce
+---------------------------------------------------------------------------------------------------
+*/
+
+USE boacompra_adm;
+
+
+-- +---------------------------------------------------------+--
+-- 1. Exclusao da procedure de migration
+-- +---------------------------------------------------------+--
+DROP PROCEDURE IF EXISTS prc_validation_relatorio_pedido_cliente_valor_minino_cursor;
+
+-- +---------------------------------------------------------+--
+-- 2. Criacao da procedure de migration
+-- +---------------------------------------------------------+--
+DELIMITER //
+CREATE PROCEDURE prc_validation_relatorio_pedido_cliente_valor_minino_cursor()
+BEGIN
+    DECLARE v_erros INT;
+
+    SELECT COUNT(*) INTO v_erros
+    FROM (
+        SELECT 'CARD-002' AS request,
+               'VSQL_101' AS script,
+               'CREATE INDEX [BOACOMPRA_ADM.TB_PEDIDO.IDX_PEDIDO_04]' AS operation,
+               CASE
+                   WHEN (SELECT COUNT(*)
+                         FROM information_schema.statistics
+                         WHERE table_schema = 'boacompra_adm'
+                           AND table_name   = 'tb_pedido'
+                           AND index_name   = 'idx_pedido_04') = 4 THEN 'OK'
+                   ELSE 'ERROR'
+               END AS result,
+               NOW() AS dat_validation,
+               NULL AS comment
+        UNION ALL
+        SELECT 'CARD-002' AS request,
+               'VSQL_102' AS script,
+               'CREATE PROCEDURE [BOACOMPRA_ADM.PRC_RELATORIO_PEDIDO_CLIENTE_VALOR_MININO_CURSOR]' AS operation,
+               CASE
+                   WHEN (SELECT COUNT(*)
+                         FROM information_schema.routines
+                         WHERE routine_schema = 'boacompra_adm'
+                           AND routine_name   = 'prc_relatorio_pedido_cliente_valor_minino_cursor'
+                           AND routine_type   = 'PROCEDURE') > 0 THEN 'OK'
+                   ELSE 'ERROR'
+               END AS result,
+               NOW() AS dat_validation,
+               NULL AS comment
+    ) AS validation
+    WHERE result = 'ERROR';
+
+    IF v_erros > 0 THEN
+        SIGNAL SQLSTATE '45000'
+        SET MESSAGE_TEXT = 'Erro de validação';
+    END IF;
+END;
+//
+DELIMITER ;
+
+-- +---------------------------------------------------------+--
+-- 3. Execucao da procedure de migration
+-- +---------------------------------------------------------+--
+CALL prc_validation_relatorio_pedido_cliente_valor_minino_cursor();
+
+-- +---------------------------------------------------------+--
+-- 4. Exclusao da procedure de migration
+-- +---------------------------------------------------------+--
+DROP PROCEDURE IF EXISTS prc_validation_relatorio_pedido_cliente_valor_minino_cursor;
@@ -0,0 +1,87 @@
+/*
+---------------------------------------------------------------------------------------------------
+-- MOTIVO:       CARD-003 >> Validacao da criação do consolidado diário de itens vendidos por categoria e produto
+-- AUTOR:        Welington Lima
+-- DATA :        18/10/2026
+-- SISTEMA:      Boa Compra - Ecommerce
+---------------------------------------------------------------------------------------------------
+*/
+
+USE boacompra_adm;
+
+
+-- +---------------------------------------------------------+--
+-- 1. Exclusao da procedure de migration
+-- +---------------------------------------------------------+--
+DROP PROCEDURE IF EXISTS prc_validation_venda_produto_dia;
+
+-- +---------------------------------------------------------+--
+-- 2. Criacao da procedure de migration
+-- +---------------------------------------------------------+--
+DELIMITER //
+CREATE PROCEDURE prc_validation_venda_produto_dia()
+BEGIN
+    DECLARE v_erros INT;
+
+    SELECT COUNT(*) INTO v_erros
+    FROM (
+        SELECT 'CARD-003' AS request,
+               'VSQL_101' AS script,
+               'CREATE TABLE [BOACOMPRA_ADM.TB_VENDA_PRODUTO_DIA]' AS operation,
+               CASE
+                   WHEN (SELECT COUNT(*)
+                         FROM information_schema.tables
+                         WHERE table_schema = 'boacompra_adm'
+                           AND table_name = 'tb_venda_produto_dia') > 0 THEN 'OK'
+                   ELSE 'ERROR'
+               END AS result,
+               NOW() AS dat_validation,
+               NULL AS comment
+        UNION
+        SELECT 'CARD-003' AS request,
+               'VSQL_102' AS script,
+               'CREATE INDEX [BOACOMPRA_ADM.IDX_VENDPROD_01] FOR [BOACOMPRA_ADM.TB_VENDA_PRODUTO_DIA]' AS operation,
+               CASE
+                   WHEN (SELECT COUNT(*)
+                         FROM information_schema.statistics
+                         WHERE table_schema = 'boacompra_adm'
+                           AND table_name = 'tb_venda_produto_dia'
+                           AND index_name = 'idx_vendprod_01') > 0 THEN 'OK'
+                   ELSE 'ERROR'
+               END AS result,
+               NOW() AS dat_validation,
+               NULL AS comment
+        UNION
+        SELECT 'CARD-003' AS request,
+               'VSQL_103' AS script,
+               'CREATE INDEX [BOACOMPRA_ADM.IDX_VENDPROD_02] FOR [BOACOMPRA_ADM.TB_VENDA_PRODUTO_DIA]' AS operation,
+               CASE
+                   WHEN (SELECT COUNT(*)
+                         FROM information_schema.statistics
+                         WHERE table_schema = 'boacompra_adm'
+                           AND table_name = 'tb_venda_produto_dia'
+                           AND index_name = 'idx_vendprod_02') > 0 THEN 'OK'
+                   ELSE 'ERROR'
+               END AS result,
+               NOW() AS dat_validation,
+               NULL AS comment
+    ) AS validation
+    WHERE result = 'ERROR';
+
+    IF v_erros > 0 THEN
+        SIGNAL SQLSTATE '45000'
+        SET MESSAGE_TEXT = 'Erro de validação';
+    END IF;
+END;
+//
+DELIMITER ;
+
+-- +---------------------------------------------------------+--
+-- 3. Execucao da procedure de migration
+-- +---------------------------------------------------------+--
+CALL prc_validation_venda_produto_dia();
+
+-- +---------------------------------------------------------+--
+-- 4. Exclusao da procedure de migration
+-- +---------------------------------------------------------+--
+DROP PROCEDURE IF EXISTS prc_validation_venda_produto_dia;
@@ -0,0 +1,179 @@
+/*
+---------------------------------------------------------------------------------------------------
+-- MOTIVO:       CARD-003 >> Validacao da manutenção incremental dos consolidados de venda
+-- AUTOR:        Welington Lima
+-- DATA :        18/10/2026
+-- SISTEMA:      Boa Compra - Ecommerce
+---------------------------------------------------------------------------------------------------
+*/
+
+USE boacompra_adm;
+
+
+-- +---------------------------------------------------------+--
+-- 1. Exclusao da procedure de migration
+-- +---------------------------------------------------------+--
+DROP PROCEDURE IF EXISTS prc_validation_rollup_venda;
+
+-- +---------------------------------------------------------+--
+-- 2. Criacao da procedure de migration
+-- +---------------------------------------------------------+--
+DELIMITER //
+CREATE PROCEDURE prc_validation_rollup_venda()
+BEGIN
+    DECLARE v_erros INT;
+
+    SELECT COUNT(*) INTO v_erros
+    FROM (
+        SELECT 'CARD-003' AS request,
+               'VSQL_101' AS script,
+               'CREATE PROCEDURE [BOACOMPRA_ADM.PRC_ROLLUP_VENDA_DIA]' AS operation,
+               CASE
+                   WHEN (SELECT COUNT(*)
+                         FROM information_schema.routines
+                         WHERE routine_schema = 'boacompra_adm'
+                           AND routine_name   = 'prc_rollup_venda_dia'
+                           AND routine_type   = 'PROCEDURE') > 0 THEN 'OK'
+                   ELSE 'ERROR'
+               END AS result,
+               NOW() AS dat_validation,
+               NULL AS comment
+        UNION
+        SELECT 'CARD-003' AS request,
+               'VSQL_102' AS script,
+               'CREATE PROCEDURE [BOACOMPRA_ADM.PRC_ROLLUP_VENDA_PRODUTO_DIA]' AS operation,
+               CASE
+                   WHEN (SELECT COUNT(*)
+                         FROM information_schema.routines
+                         WHERE routine_schema = 'boacompra_adm'
+                           AND routine_name   = 'prc_rollup_venda_produto_dia'
+                           AND routine_type   = 'PROCEDURE') > 0 THEN 'OK'
+                   ELSE 'ERROR'
+               END AS result,
+               NOW() AS dat_validation,
+               NULL AS comment
+        UNION
+        SELECT 'CARD-003' AS request,
+               'VSQL_103' AS script,
+               'CREATE PROCEDURE [BOACOMPRA_ADM.PRC_CARGA_ROLLUP_VENDA]' AS operation,
+               CASE
+                   WHEN (SELECT COUNT(*)
+                         FROM information_schema.routines
+                         WHERE routine_schema = 'boacompra_adm'
+                           AND routine_name   = 'prc_carga_rollup_venda'
+                           AND routine_type   = 'PROCEDURE') > 0 THEN 'OK'
+                   ELSE 'ERROR'
+               END AS result,
+               NOW() AS dat_validation,
+               NULL AS comment
+        UNION
+        SELECT 'CARD-003' AS request,
+               'VSQL_104' AS script,
+               'CREATE TRIGGER [BOACOMPRA_ADM.TRG_PEDIDO_AI]' AS operation,
+               CASE
+                   WHEN (SELECT COUNT(*)
+                         FROM information_schema.triggers
+                         WHERE trigger_schema = 'boacompra_adm'
+                           AND trigger_name   = 'trg_pedido_ai') > 0 THEN 'OK'
+                   ELSE 'ERROR'
+               END AS result,
+               NOW() AS dat_validation,
+               NULL AS comment
+        UNION
+        SELECT 'CARD-003' AS request,
+               'VSQL_105' AS script,
+               'CREATE TRIGGER [BOACOMPRA_ADM.TRG_PEDIDO_AU]' AS operation,
+               CASE
+                   WHEN (SELECT COUNT(*)
+                         FROM information_schema.triggers
+                         WHERE trigger_schema = 'boacompra_adm'
+                           AND trigger_name   = 'trg_pedido_au') > 0 THEN 'OK'
+                   ELSE 'ERROR'
+               END AS result,
+               NOW() AS dat_validation,
+               NULL AS comment
+        UNION
+        SELECT 'CARD-003' AS request,
+               'VSQL_106' AS script,
+               'CREATE TRIGGER [BOACOMPRA_ADM.TRG_PEDIDO_AD]' AS operation,
+               CASE
+                   WHEN (SELECT COUNT(*)
+                         FROM information_schema.triggers
+                         WHERE trigger_schema = 'boacompra_adm'
+                           AND trigger_name   = 'trg_pedido_ad') > 0 THEN 'OK'
+                   ELSE 'ERROR'
+               END AS result,
+               NOW() AS dat_validation,
+               NULL AS comment
+        UNION
+        SELECT 'CARD-003' AS request,
+               'VSQL_107' AS script,
+               'CREATE TRIGGER [BOACOMPRA_ADM.TRG_PEDIITEM_AI]' AS operation,
+               CASE
+                   WHEN (SELECT COUNT(*)
+                         FROM information_schema.triggers
+                         WHERE trigger_schema = 'boacompra_adm'
+                           AND trigger_name   = 'trg_pediitem_ai') > 0 THEN 'OK'
+                   ELSE 'ERROR'
+               END AS result,
+               NOW() AS dat_validation,
+               NULL AS comment
+        UNION
+        SELECT 'CARD-003' AS request,
+               'VSQL_108' AS script,
+               'CREATE TRIGGER [BOACOMPRA_ADM.TRG_PEDIITEM_AU]' AS operation,
+               CASE
+                   WHEN (SELECT COUNT(*)
+                         FROM information_schema.triggers
+                         WHERE trigger_schema = 'boacompra_adm'
+                           AND trigger_name   = 'trg_pediitem_au') > 0 THEN 'OK'
+                   ELSE 'ERROR'
+               END AS result,
+               NOW() AS dat_validation,
+               NULL AS comment
+        UNION
+        SELECT 'CARD-003' AS request,
+               'VSQL_109' AS script,
+               'CREATE TRIGGER [BOACOMPRA_ADM.TRG_PEDIITEM_AD]' AS operation,
+               CASE
+                   WHEN (SELECT COUNT(*)
+                         FROM information_schema.triggers
+                         WHERE trigger_schema = 'boacompra_adm'
+                           AND trigger_name   = 'trg_pediitem_ad') > 0 THEN 'OK'
+                   ELSE 'ERROR'
+               END AS result,
+               NOW() AS dat_validation,
+               NULL AS comment
+        UNION
+        SELECT 'CARD-003' AS request,
+               'VSQL_110' AS script,
+               'CREATE TRIGGER [BOACOMPRA_ADM.TRG_PRODUTO_AU]' AS operation,
+               CASE
+                   WHEN (SELECT COUNT(*)
+                         FROM information_schema.triggers
+                         WHERE trigger_schema = 'boacompra_adm'
+                           AND trigger_name   = 'trg_produto_au') > 0 THEN 'OK'
+                   ELSE 'ERROR'
+               END AS result,
+               NOW() AS dat_validation,
+               NULL AS comment
+    ) AS validation
+    WHERE result = 'ERROR';
+
+    IF v_erros > 0 THEN
+        SIGNAL SQLSTATE '45000'
+        SET MESSAGE_TEXT = 'Erro de validação';
+    END IF;
+END;
+//
+DELIMITER ;
+
+-- +---------------------------------------------------------+--
+-- 3. Execucao da procedure de migration
+-- +---------------------------------------------------------+--
+CALL prc_validation_rollup_venda();
+
+-- +---------------------------------------------------------+--
+-- 4. Exclusao da procedure de migration
+-- +---------------------------------------------------------+--
+DROP PROCEDURE IF EXISTS prc_validation_rollup_venda;
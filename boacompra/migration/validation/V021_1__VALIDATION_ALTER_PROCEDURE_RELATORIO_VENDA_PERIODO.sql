@@ -0,0 +1,61 @@
+/*
+---------------------------------------------------------------------------------------------------
+-- MOTIVO:       CARD-003 >> Validacao do relatório de venda no período a partir dos consolidados diários
+-- AUTOR:        Welington Lima
+-- DATA :        18/10/2026
+-- SISTEMA:      Boa Compra - Ecommerce
+---------------------------------------------------------------------------------------------------
+*/
+
+USE boacompra_adm;
+
+
+-- +---------------------------------------------------------+--
+-- 1. Exclusao da procedure de migration
+-- +---------------------------------------------------------+--
+DROP PROCEDURE IF EXISTS prc_validation_relatorio_venda_periodo_rollup;
+
+-- +---------------------------------------------------------+--
+-- 2. Criacao da procedure de migration
+-- +---------------------------------------------------------+--
+DELIMITER //
+CREATE PROCEDURE prc_validation_relatorio_venda_periodo_rollup()
+BEGIN
+    DECLARE v_erros INT;
+
+    SELECT COUNT(*) INTO v_erros
+    FROM (
+        SELECT 'CARD-003' AS request,
+               'VSQL_101' AS script,
+               'ALTER PROCEDURE [BOACOMPRA_ADM.PRC_RELATORIO_VENDA_PERIODO]' AS operation,
+               CASE
+                   WHEN (SELECT COUNT(*)
+                         FROM information_schema.routines
+                         WHERE routine_schema = 'boacompra_adm'
+                           AND routine_name   = 'prc_relatorio_venda_periodo'
+                           AND routine_type   = 'PROCEDURE'
+                           AND routine_definition LIKE '%tb_venda_dia%') > 0 THEN 'OK'
+                   ELSE 'ERROR'
+               END AS result,
+               NOW() AS dat_validation,
+               NULL AS comment
+    ) AS validation
+    WHERE result = 'ERROR';
+
+    IF v_erros > 0 THEN
+        SIGNAL SQLSTATE '45000'
+        SET MESSAGE_TEXT = 'Erro de validação';
+    END IF;
+END;
+//
+DELIMITER ;
+
+-- +---------------------------------------------------------+--
+-- 3. Execucao da procedure de migration
+-- +---------------------------------------------------------+--
+CALL prc_validation_relatorio_venda_periodo_rollup();
+
+-- +---------------------------------------------------------+--
+-- 4. Exclusao da procedure de migration
+-- +---------------------------------------------------------+--
+DROP PROCEDURE IF EXISTS prc_validation_relatorio_venda_periodo_rollup;
@@ -0,0 +1,211 @@
+/*
+---------------------------------------------------------------------------------------------------
+-- MOTIVO:       CARD-004 >> Validacao do contador de alteracoes para a marca d'agua do cache de relatorios
+-- AUTOR:        Welington Lima
+-- DATA :        18/10/2026
+-- SISTEMA:      Boa Compra - Ecommerce
+---------------------------------------------------------------------------------------------------
+*/
+
+USE boacompra_adm;
+
+
+-- +---------------------------------------------------------+--
+-- 1. Exclusao da procedure de migration
+-- +---------------------------------------------------------+--
+DROP PROCEDURE IF EXISTS prc_validation_versao_relatorio;
+
+-- +---------------------------------------------------------+--
+-- 2. Criacao da procedure de migration
+-- +---------------------------------------------------------+--
+DELIMITER //
+CREATE PROCEDURE prc_validation_versao_relatorio()
+BEGIN
+    DECLARE v_erros INT;
+
+    SELECT COUNT(*) INTO v_erros
+    FROM (
+        SELECT 'CARD-004' AS request,
+               'VSQL_101' AS script,
+               'CREATE TABLE [BOACOMPRA_ADM.TB_VERSAO_RELATORIO]' AS operation,
+               CASE
+                   WHEN (SELECT COUNT(*)
+                         FROM information_schema.tables
+                         WHERE table_schema = 'boacompra_adm'
+                           AND table_name = 'tb_versao_relatorio') > 0 THEN 'OK'
+                   ELSE 'ERROR'
+               END AS result,
+               NOW() AS dat_validation,
+               NULL AS comment
+        UNION
+        SELECT 'CARD-004' AS request,
+               'VSQL_102' AS script,
+               'INSERT [BOACOMPRA_ADM.TB_VERSAO_RELATORIO]' AS operation,
+               CASE
+                   WHEN (SELECT COUNT(*) = 16
+                         FROM boacompra_adm.tb_versao_relatorio) > 0 THEN 'OK'
+                   ELSE 'ERROR'
+               END AS result,
+               NOW() AS dat_validation,
+               NULL AS comment
+        UNION
+        SELECT 'CARD-004' AS request,
+               'VSQL_103' AS script,
+               'ALTER PROCEDURE [BOACOMPRA_ADM.PRC_CARGA_ROLLUP_VENDA]' AS operation,
+               CASE
+                   WHEN (SELECT COUNT(*)
+                         FROM information_schema.routines
+                         WHERE routine_schema = 'boacompra_adm'
+                           AND routine_name   = 'prc_carga_rollup_venda'
+                           AND routine_type   = 'PROCEDURE'
+                           AND routine_definition LIKE '%prc_versao_relatorio_incrementar%') > 0 THEN 'OK'
+                   ELSE 'ERROR'
+               END AS result,
+               NOW() AS dat_validation,
+               NULL AS comment
+        UNION
+        SELECT 'CARD-004' AS request,
+               'VSQL_104' AS script,
+               'CREATE TRIGGER [BOACOMPRA_ADM.TRG_PEDIDO_AI]' AS operation,
+               CASE
+                   WHEN (SELECT COUNT(*)
+                         FROM information_schema.triggers
+                         WHERE trigger_schema = 'boacompra_adm'
+                           AND trigger_name   = 'trg_pedido_ai'
+                           AND action_statement LIKE '%prc_versao_relatorio_incrementar%') > 0 THEN 'OK'
+                   ELSE 'ERROR'
+               END AS result,
+               NOW() AS dat_validation,
+               NULL AS comment
+        UNION
+        SELECT 'CARD-004' AS request,
+               'VSQL_105' AS script,
+               'CREATE TRIGGER [BOACOMPRA_ADM.TRG_PEDIDO_AU]' AS operation,
+               CASE
+                   WHEN (SELECT COUNT(*)
+                         FROM information_schema.triggers
+                         WHERE trigger_schema = 'boacompra_adm'
+                           AND trigger_name   = 'trg_pedido_au'
+                           AND action_statement LIKE '%prc_versao_relatorio_incrementar%') > 0 THEN 'OK'
+                   ELSE 'ERROR'
+               END AS result,
+               NOW() AS dat_validation,
+               NULL AS comment
+        UNION
+        SELECT 'CARD-004' AS request,
+               'VSQL_106' AS script,
+               'CREATE TRIGGER [BOACOMPRA_ADM.TRG_PEDIDO_AD]' AS operation,
+               CASE
+                   WHEN (SELECT COUNT(*)
+                         FROM information_schema.triggers
+                         WHERE trigger_schema = 'boacompra_adm'
+                           AND trigger_name   = 'trg_pedido_ad'
+                           AND action_statement LIKE '%prc_versao_relatorio_incrementar%') > 0 THEN 'OK'
+                   ELSE 'ERROR'
+               END AS result,
+               NOW() AS dat_validation,
+               NULL AS comment
+        UNION
+        SELECT 'CARD-004' AS request,
+               'VSQL_107' AS script,
+               'CREATE TRIGGER [BOACOMPRA_ADM.TRG_PEDIITEM_AI]' AS operation,
+               CASE
+                   WHEN (SELECT COUNT(*)
+                         FROM information_schema.triggers
+                         WHERE trigger_schema = 'boacompra_adm'
+                           AND trigger_name   = 'trg_pediitem_ai'
+                           AND action_statement LIKE '%prc_versao_relatorio_incrementar%') > 0 THEN 'OK'
+                   ELSE 'ERROR'
+               END AS result,
+               NOW() AS dat_validation,
+               NULL AS comment
+        UNION
+        SELECT 'CARD-004' AS request,
+               'VSQL_108' AS script,
+               'CREATE TRIGGER [BOACOMPRA_ADM.TRG_PEDIITEM_AU]' AS operation,
+               CASE
+                   WHEN (SELECT COUNT(*)
+                         FROM information_schema.triggers
+                         WHERE trigger_schema = 'boacompra_adm'
+                           AND trigger_name   = 'trg_pediitem_au'
+                           AND action_statement LIKE '%prc_versao_relatorio_incrementar%') > 0 THEN 'OK'
+                   ELSE 'ERROR'
+               END AS result,
+               NOW() AS dat_validation,
+               NULL AS comment
+        UNION
+        SELECT 'CARD-004' AS request,
+               'VSQL_109' AS script,
+               'CREATE TRIGGER [BOACOMPRA_ADM.TRG_PEDIITEM_AD]' AS operation,
+               CASE
+                   WHEN (SELECT COUNT(*)
+                         FROM information_schema.triggers
+                         WHERE trigger_schema = 'boacompra_adm'
+                           AND trigger_name   = 'trg_pediitem_ad'
+                           AND action_statement LIKE '%prc_versao_relatorio_incrementar%') > 0 THEN 'OK'
+                   ELSE 'ERROR'
+               END AS result,
+               NOW() AS dat_validation,
+               NULL AS comment
+        UNION
+        SELECT 'CARD-004' AS request,
+               'VSQL_110' AS script,
+               'CREATE TRIGGER [BOACOMPRA_ADM.TRG_PRODUTO_AI]' AS operation,
+               CASE
+                   WHEN (SELECT COUNT(*)
+                         FROM information_schema.triggers
+                         WHERE trigger_schema = 'boacompra_adm'
+                           AND trigger_name   = 'trg_produto_ai'
+                           AND action_statement LIKE '%prc_versao_relatorio_incrementar%') > 0 THEN 'OK'
+                   ELSE 'ERROR'
+               END AS result,
+               NOW() AS dat_validation,
+               NULL AS comment
+        UNION
+        SELECT 'CARD-004' AS request,
+               'VSQL_111' AS script,
+               'CREATE TRIGGER [BOACOMPRA_ADM.TRG_PRODUTO_AU]' AS operation,
+               CASE
+                   WHEN (SELECT COUNT(*)
+                         FROM information_schema.triggers
+                         WHERE trigger_schema = 'boacompra_adm'
+                           AND trigger_name   = 'trg_produto_au'
+                           AND action_statement LIKE '%prc_versao_relatorio_incrementar%') > 0 THEN 'OK'
+                   ELSE 'ERROR'
+               END AS result,
+               NOW() AS dat_validation,
+               NULL AS comment
+        UNION
+        SELECT 'CARD-004' AS request,
+               'VSQL_112' AS script,
+               'CREATE TRIGGER [BOACOMPRA_ADM.TRG_PRODUTO_AD]' AS operation,
+               CASE
+                   WHEN (SELECT COUNT(*)
+                         FROM information_schema.triggers
+                         WHERE trigger_schema = 'boacompra_adm'
+                           AND trigger_name   = 'trg_produto_ad'
+                           AND action_statement LIKE '%prc_versao_relatorio_incrementar%') > 0 THEN 'OK'
+                   ELSE 'ERROR'
+               END AS result,
+               NOW() AS dat_validation,
+               NULL AS comment
+    ) AS validation
+    WHERE result = 'ERROR';
+
+    IF v_erros > 0 THEN
+        SIGNAL SQLSTATE '45000'
+        SET MESSAGE_TEXT = 'Erro de validação';
+    END IF;
+END;
+//
+DELIMITER ;
+
+-- +---------------------------------------------------------+--
+-- 3. Execucao da procedure de migration
+-- +---------------------------------------------------------+--
+CALL prc_validation_versao_relatorio();
+
+-- +---------------------------------------------------------+--
+-- 4. Exclusao da procedure de migration
+-- +---------------------------------------------------------+--
+DROP PROCEDURE IF EXISTS prc_validation_versao_relatorio;
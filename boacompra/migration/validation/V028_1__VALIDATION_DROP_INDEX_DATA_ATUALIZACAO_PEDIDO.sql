@@ -0,0 +1,74 @@
+/*
+---------------------------------------------------------------------------------------------------
+-- MOTIVO:       CARD-004 >> Validacao da exclusão dos índices de data de atualização da marca d'água anterior do cache de relatórios
+-- AUTOR:        Welington Lima
+-- DATA :        18/10/2026
+-- SISTEMA:      Boa Compra - Ecommerce
+---------------------------------------------------------------------------------------------------
+*/
+
+USE boacompra_adm;
+
+
+-- +---------------------------------------------------------+--
+-- 1. Exclusao da procedure de migration
+-- +---------------------------------------------------------+--
+DROP PROCEDURE IF EXISTS prc_validation_pedido_atualizacao_exclusao;
+
+-- +---------------------------------------------------------+--
+-- 2. Criacao da procedure de migration
+-- +---------------------------------------------------------+--
+DELIMITER //
+CREATE PROCEDURE prc_validation_pedido_atualizacao_exclusao()
+BEGIN
+    DECLARE v_erros INT;
+
+    SELECT COUNT(*) INTO v_erros
+    FROM (
+        SELECT 'CARD-004' AS request,
+               'VSQL_101' AS script,
+               'DROP INDEX [BOACOMPRA_ADM.IDX_PEDIDO_05] FOR [BOACOMPRA_ADM.TB_PEDIDO]' AS operation,
+               CASE
+                   WHEN (SELECT COUNT(*)
+                         FROM information_schema.statistics
+                         WHERE table_schema = 'boacompra_adm'
+                           AND table_name = 'tb_pedido'
+                           AND index_name = 'idx_pedido_05') = 0 THEN 'OK'
+                   ELSE 'ERROR'
+               END AS result,
+               NOW() AS dat_validation,
+               NULL AS comment
+        UNION
+        SELECT 'CARD-004' AS request,
+               'VSQL_102' AS script,
+               'DROP INDEX [BOACOMPRA_ADM.IDX_PEDIITEM_03] FOR [BOACOMPRA_ADM.TB_PEDIDO_ITEM]' AS operation,
+               CASE
+                   WHEN (SELECT COUNT(*)
+                         FROM information_schema.statistics
+                         WHERE table_schema = 'boacompra_adm'
+                           AND table_name = 'tb_pedido_item'
+                           AND index_name = 'idx_pediitem_03') = 0 THEN 'OK'
+                   ELSE 'ERROR'
+               END AS result,
+               NOW() AS dat_validation,
+               NULL AS comment
+    ) AS validation
+    WHERE result = 'ERROR';
+
+    IF v_erros > 0 THEN
+        SIGNAL SQLSTATE '45000'
+        SET MESSAGE_TEXT = 'Erro de validação';
+    END IF;
+END;
+//
+DELIMITER ;
+
+-- +---------------------------------------------------------+--
+-- 3. Execucao da procedure de migration
+-- +---------------------------------------------------------+--
+CALL prc_validation_pedido_atualizacao_exclusao();
+
+-- +---------------------------------------------------------+--
+-- 4. Exclusao da procedure de migration
+-- +---------------------------------------------------------+--
+DROP PROCEDURE IF EXISTS prc_validation_pedido_atualizacao_exclusao;
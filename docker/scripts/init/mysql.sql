@@ -27,4 +27,6 @@ SET DEFAULT ROLE rl_boacompra_app TO boacompra_app@'%';
 
 -- Conceder permissões
 GRANT ALL PRIVILEGES                 ON boacompra_adm.* TO rl_boacompra_adm;
-GRANT SELECT, INSERT, UPDATE, DELETE ON boacompra_adm.* TO rl_boacompra_app;
\ No newline at end of file
+GRANT SELECT, INSERT, UPDATE, DELETE ON boacompra_adm.* TO rl_boacompra_app;
+-- Leitura do performance_schema para os testes de carga (benchmark_carga_mista.py)
+GRANT SELECT ON performance_schema.* TO rl_boacompra_adm;